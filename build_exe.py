@@ -340,6 +340,22 @@ def get_output_dir():
     output_dir = project_dir / "Uma_release" / "Uma_Musume_Auto_Train"
     return output_dir
 
+def build_template_pack():
+    """Pack template PNGs into one pre-decoded, memory-mapped file shipped with assets"""
+    print_header("Packing Templates")
+
+    try:
+        from core.template_pack import build_template_pack as pack_templates, PACK_FILE
+        count = pack_templates()
+        print_success(f"Packed {count} templates into {PACK_FILE}")
+        return True
+    except ImportError as e:
+        print_warning(f"Template pack skipped, loose PNG files will be used: {e}")
+        return True
+    except Exception as e:
+        print_error(f"Failed to pack templates: {e}")
+        return False
+
 def build_executable():
     """Build the executable using PyInstaller"""
     print_header("Building Executable")
@@ -483,6 +499,24 @@ def create_release_zip():
         return False
 
 
+def create_release_manifest():
+    """Write the per-file manifest used for delta updates next to the release zip"""
+    print_header("Creating Release Manifest")
+
+    output_dir = get_output_dir()
+    zip_path = output_dir.parent / "Uma_Musume_Auto_Train.zip"
+
+    try:
+        from core.delta_update import build_release_manifest, MANIFEST_ASSET
+        from version import APP_VERSION
+        manifest_path = output_dir.parent / MANIFEST_ASSET
+        manifest = build_release_manifest(str(zip_path), APP_VERSION, str(manifest_path))
+        print_success(f"Created {MANIFEST_ASSET} with {len(manifest['files'])} files")
+        return True
+    except Exception as e:
+        print_error(f"Failed to create release manifest: {e}")
+        return False
+
 def cleanup_build_files():
     """Clean up build artifacts including spec files automatically"""
     print_header("Cleaning Up Build Files")
@@ -524,9 +558,11 @@ def main():
         ("Required Files", check_required_files),
         ("Default Config", create_default_config),
         ("Spec File", create_spec_file),
+        ("Template Pack", build_template_pack),
         ("Executable", build_executable),
         ("Distribution Package", create_distribution_package),
-        ("Release Zip", create_release_zip)
+        ("Release Zip", create_release_zip),
+        ("Release Manifest", create_release_manifest)
     ]
 
     failed_steps = []
@@ -563,7 +599,7 @@ def main():
 
         print_colored("\n🚀 How to Distribute:", Colors.BOLD)
         if zip_path.exists():
-            print_info(f"1. Upload '{zip_name}' to GitHub Releases")
+            print_info(f"1. Upload '{zip_name}' and 'release_manifest.json' to GitHub Releases")
         else:
             print_info(f"1. Zip the '{output_dir.name}' folder")
         print_info("2. Send the zip file to users")
@@ -0,0 +1,144 @@
+"""
+Career Checkpoint
+Per-turn journal of career progress in SQLite, so a restarted bot resumes where it left off
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+CAREER_CHECKPOINT_FILE = "career_checkpoint.db"
+# Turns kept in the journal; older rows are only useful for debugging
+MAX_JOURNAL_TURNS = 200
+# A checkpoint older than this is from a session that is not worth resuming
+MAX_RESUME_AGE = 12 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    saved_at REAL NOT NULL,
+    absolute_day INTEGER NOT NULL,
+    year TEXT,
+    turn TEXT,
+    mood TEXT,
+    energy_percentage REAL,
+    energy_max REAL,
+    stats TEXT,
+    decision TEXT,
+    friend_event_date INTEGER,
+    best_train_score REAL,
+    scheduled_races TEXT
+)
+"""
+
+_JSON_COLUMNS = ("stats", "scheduled_races")
+
+
+class CareerCheckpoint:
+    """
+    Append-only journal with one row per decided turn.
+
+    Each turn is written in its own transaction on a WAL journal, so a crash or power loss
+    leaves either the whole turn or none of it, and the latest row is always consistent.
+    """
+
+    def __init__(self, path: str = CAREER_CHECKPOINT_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # NORMAL still keeps the database consistent in WAL mode; at worst the last turn is lost
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def record_turn(self, game_state: Dict[str, Any], stats: Optional[Dict[str, Any]] = None,
+                    decision: Optional[str] = None, friend_event_date: int = -1,
+                    best_train_score: float = 0.0, scheduled_races: Optional[List[Dict]] = None):
+        """Append one turn; failures are logged and never interrupt the bot"""
+        current_date = game_state.get('current_date') or {}
+        row = (
+            time.time(),
+            int(current_date.get('absolute_day', 0) or 0),
+            str(game_state.get('year', '')),
+            str(game_state.get('turn', '')),
+            game_state.get('mood'),
+            game_state.get('energy_percentage'),
+            game_state.get('energy_max'),
+            json.dumps(stats or {}, ensure_ascii=False, default=str),
+            decision,
+            friend_event_date,
+            best_train_score,
+            json.dumps(scheduled_races or [], ensure_ascii=False, default=str),
+        )
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = conn.execute(
+                        "INSERT INTO turns (saved_at, absolute_day, year, turn, mood, energy_percentage, energy_max,"
+                        " stats, decision, friend_event_date, best_train_score, scheduled_races)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                    conn.execute("DELETE FROM turns WHERE id <= ?", (cursor.lastrowid - MAX_JOURNAL_TURNS,))
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            print(f"[WARNING] Could not write career checkpoint: {e}")
+
+    def latest(self, max_age: float = MAX_RESUME_AGE) -> Optional[Dict[str, Any]]:
+        """Most recent turn no older than max_age, or None"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.execute("SELECT * FROM turns ORDER BY id DESC LIMIT 1")
+                values = cursor.fetchone()
+                columns = [description[0] for description in cursor.description]
+        except sqlite3.Error as e:
+            print(f"[WARNING] Could not read career checkpoint: {e}")
+            return None
+        if values is None:
+            return None
+        checkpoint = dict(zip(columns, values))
+        if time.time() - checkpoint['saved_at'] > max_age:
+            return None
+        for column in _JSON_COLUMNS:
+            try:
+                checkpoint[column] = json.loads(checkpoint[column] or "null")
+            except ValueError:
+                checkpoint[column] = None
+        return checkpoint
+
+    def clear(self):
+        """Forget the journal, e.g. when a new career starts"""
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM turns")
+        except sqlite3.Error as e:
+            print(f"[WARNING] Could not clear career checkpoint: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_checkpoint: Optional[CareerCheckpoint] = None
+
+
+def get_career_checkpoint() -> CareerCheckpoint:
+    """Get the shared career checkpoint journal"""
+    global _checkpoint
+    if _checkpoint is None:
+        _checkpoint = CareerCheckpoint()
+    return _checkpoint
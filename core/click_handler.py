@@ -2,12 +2,16 @@ import pyautogui
 import random
 import time
 from typing import Tuple, Optional
-from core.recognizer import match_template
+from core.location_cache import count_template_miss, locate_on_screen, locate_with_prior
+from core.game_window import get_game_window
+from core.input_executor import get_input_executor, wait_for
 
 
 def random_click_in_region(left: int, top: int, width: int, height: int, duration: float = 0.175) -> bool:
     """
-    Click at a random position within the specified region
+    Click at a random position within the specified region.
+    The click is queued on the input executor and this returns once it is queued;
+    the next screen capture waits for it to land.
     """
     try:
         # Generate random coordinates within the region
@@ -21,8 +25,7 @@ def random_click_in_region(left: int, top: int, width: int, height: int, duratio
         random_x = max(left, min(left + width, random_x))
         random_y = max(top, min(top + height, random_y))
 
-        pyautogui.moveTo(random_x, random_y, duration=duration)
-        pyautogui.click()
+        get_input_executor().click(random_x, random_y, duration=duration)
 
         return True
     except Exception as e:
@@ -42,8 +45,12 @@ def enhanced_click(img: str, confidence: float = 0.8, minSearch: float = 2,
     if check_window_func and not check_window_func():
         return False
 
-    btn = pyautogui.locateCenterOnScreen(img, confidence=confidence, minSearchTime=minSearch)
-    if btn:
+    # Check the learned position first, then fall back to a full screen search
+    btn_region = locate_with_prior(img, confidence=confidence, full_search=False)
+    if not btn_region:
+        btn_region = locate_on_screen(img, confidence=confidence, min_search_time=minSearch, use_prior=False)
+    if btn_region:
+        btn = (btn_region[0] + btn_region[2] // 2, btn_region[1] + btn_region[3] // 2)
         if text and log_func:
             log_func(text)
 
@@ -51,25 +58,17 @@ def enhanced_click(img: str, confidence: float = 0.8, minSearch: float = 2,
             return False
 
         if use_random:
-            # Get the full button region for random clicking
-            btn_region = pyautogui.locateOnScreen(img, confidence=confidence, minSearchTime=0.1)
-            if btn_region:
-                # Click randomly within the button region
-                for _ in range(click_count):
-                    if check_stop_func and check_stop_func():
-                        return False
-                    random_click_in_region(btn_region.left, btn_region.top,
-                                           btn_region.width, btn_region.height)
-                    if click_count > 1:
-                        time.sleep(0.1)  # Small delay between multiple clicks
-            else:
-                # Fallback to center click if region detection fails
-                pyautogui.moveTo(btn, duration=0.175)
-                pyautogui.click(clicks=click_count)
+            # Click randomly within the button region
+            left, top, width, height = btn_region
+            for _ in range(click_count):
+                if check_stop_func and check_stop_func():
+                    return False
+                random_click_in_region(left, top, width, height)
+                if click_count > 1:
+                    get_input_executor().submit("pause", time.sleep, 0.1)  # Small delay between multiple clicks
         else:
             # Traditional center click
-            pyautogui.moveTo(btn, duration=0.175)
-            pyautogui.click(clicks=click_count)
+            get_input_executor().click(btn, clicks=click_count, interval=0.1, duration=0.175)
 
         return True
 
@@ -81,7 +80,7 @@ def random_screen_click(offset_range: int = 100) -> None:
         screen_width, screen_height = pyautogui.size()
         center_x = screen_width // 3 + random.randint(-offset_range, offset_range)
         center_y = screen_height // 2 + random.randint(-offset_range, offset_range)
-        pyautogui.click(center_x, center_y)
+        get_input_executor().click(center_x, center_y)
     except Exception as e:
         print(f"[WARNING] Random screen click failed: {e}")
 
@@ -93,10 +92,11 @@ def triple_click_random(region: Tuple[int, int, int, int], interval: float = 0.1
     """
     left, top, width, height = region
 
+    executor = get_input_executor()
     for i in range(3):
         random_click_in_region(left, top, width, height, duration=0.1)
-        if i < 2:  # Don't sleep after the last click
-            time.sleep(interval)
+        if i < 2:  # Don't pause after the last click
+            executor.submit("pause", time.sleep, interval)
 
 
 def move_to_random_position(base_x: int, base_y: int, offset_range: int = 10) -> None:
@@ -106,10 +106,10 @@ def move_to_random_position(base_x: int, base_y: int, offset_range: int = 10) ->
     try:
         random_x = base_x + random.randint(-offset_range, offset_range)
         random_y = base_y + random.randint(-offset_range, offset_range)
-        pyautogui.moveTo(x=random_x, y=random_y)
+        get_input_executor().move(random_x, random_y)
     except Exception as e:
         print(f"[WARNING] Random move failed: {e}")
-        pyautogui.moveTo(x=base_x, y=base_y)  # Fallback to original position
+        get_input_executor().move(base_x, base_y)  # Fallback to original position
 
 
 def find_and_click(img_path: str, region: Optional[Tuple[int, int, int, int]] = None,
@@ -147,13 +147,15 @@ def find_and_click(img_path: str, region: Optional[Tuple[int, int, int, int]] =
     if check_stop_func and check_stop_func():
         return None
 
-    # Resolve search region
-    if full_screen:
-        screen_width, screen_height = pyautogui.size()
-        region = (0, 0, screen_width, screen_height)
-    elif not region:
-        screen_width, screen_height = pyautogui.size()
-        region = (0, 0, screen_width // 2, screen_height)
+    # Resolve search region, limited to the game window when it is known
+    if full_screen or not region:
+        client_region = get_game_window().get_client_region()
+        if client_region:
+            left, top, width, height = client_region
+        else:
+            screen_width, screen_height = pyautogui.size()
+            left, top, width, height = 0, 0, screen_width, screen_height
+        region = (left, top, width, height) if full_screen else (left, top, width // 2, height)
 
     # Extract filename for logging
     filename = img_path.split('/')[-1].replace('.png', '')
@@ -168,11 +170,19 @@ def find_and_click(img_path: str, region: Optional[Tuple[int, int, int, int]] =
             paths_to_try = [img_path] + (alt_img_paths or [])
             boxes = None
             matched_path = img_path
-            for path in paths_to_try:
-                result = match_template(path, threshold=confidence, region=region)
-                if result and len(result) > 0:
-                    boxes = result
-                    matched_path = path
+            # Learned positions of every path are tried before scanning the whole region
+            for full_search in (False, True):
+                for path in paths_to_try:
+                    if full_search:
+                        box = locate_with_prior(path, region=region, confidence=confidence, use_prior=False,
+                                                count_miss=False)
+                    else:
+                        box = locate_with_prior(path, region=region, confidence=confidence, full_search=False)
+                    if box:
+                        boxes = [box]
+                        matched_path = path
+                        break
+                if boxes:
                     break
 
             # Check if any matches found
@@ -194,16 +204,15 @@ def find_and_click(img_path: str, region: Optional[Tuple[int, int, int, int]] =
                     if check_stop_func and check_stop_func():
                         return None
 
-                    pyautogui.moveTo(click_x, click_y, duration=0.175)
-                    for i in range(click_count):
-                        pyautogui.click()
-                        if i < click_count - 1:
-                            time.sleep(click_count_delay)
+                    clicked = get_input_executor().click(click_x, click_y, clicks=click_count,
+                                                         interval=click_count_delay, duration=0.175)
 
                     if log_func:
                         log_func(f"Clicked {matched_path.split('/')[-1].replace('.png', '')}")
 
                     if post_click_delay > 0:
+                        # The delay counts from when the clicks land, not from when they were queued
+                        wait_for(clicked)
                         time.sleep(post_click_delay)
 
                     return (click_x, click_y)
@@ -222,6 +231,8 @@ def find_and_click(img_path: str, region: Optional[Tuple[int, int, int, int]] =
                 return None
             time.sleep(delay_between)
 
+    count_template_miss(img_path)
+
     # Log failure if enabled and multiple attempts were made
     if log_attempts and max_attempts > 1:
         if log_func:
@@ -0,0 +1,313 @@
+"""
+Delta Update
+Applies a release by downloading only the files that differ from the local install
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import struct
+import zipfile
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from core.http_client import HttpClient
+
+MANIFEST_ASSET = "release_manifest.json"
+STAGING_DIR = "update_staging"
+CLEANUP_FILE = "cleanup.json"
+OLD_SUFFIX = ".old"
+NEW_SUFFIX = ".new"
+CHUNK_SIZE = 65536
+
+# Zip local file header: signature, versions, flags, method, time, date, crc, sizes, name and extra lengths
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_release_manifest(zip_path: str, version: str, manifest_path: str) -> dict:
+    """
+    Describe every file in a release zip by content hash and by where its bytes sit in the zip
+
+    Each entry records the sha256 and size of the file, plus the offset, length and compression
+    of its data inside the zip, so a client can fetch one file with a ranged request on the
+    release zip itself. A single top-level folder in the zip is stripped from the paths.
+
+    Returns:
+        The manifest dict, also written to manifest_path
+    """
+    files = {}
+    with zipfile.ZipFile(zip_path, "r") as zf, open(zip_path, "rb") as raw:
+        infos = [info for info in zf.infolist() if not info.is_dir()]
+        top_levels = {info.filename.split("/", 1)[0] for info in infos}
+        prefix = top_levels.pop() + "/" if len(top_levels) == 1 and all("/" in i.filename for i in infos) else ""
+
+        for info in infos:
+            if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                raise ValueError(f"Unsupported compression for {info.filename}")
+
+            raw.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(raw.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_HEADER_SIGNATURE:
+                raise ValueError(f"Bad local header for {info.filename}")
+            name_length, extra_length = header[9], header[10]
+
+            digest = hashlib.sha256()
+            with zf.open(info) as member:
+                for chunk in iter(lambda: member.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+
+            files[info.filename[len(prefix):]] = {
+                "sha256": digest.hexdigest(),
+                "size": info.file_size,
+                "offset": info.header_offset + _LOCAL_HEADER.size + name_length + extra_length,
+                "length": info.compress_size,
+                "method": "deflate" if info.compress_type == zipfile.ZIP_DEFLATED else "store",
+            }
+
+    manifest = {"version": version, "archive": os.path.basename(zip_path), "files": files}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class DeltaUpdate:
+    """
+    Plans, downloads and applies the files of a release that differ from the local install.
+
+    Changed files are fetched with ranged requests on the release zip into a staging folder.
+    Partial downloads survive restarts and resume where they stopped, and every file is
+    checked against its sha256 before it is used. Files are swapped in with renames, so a
+    file is always either the old or the new version, and a failed apply is rolled back.
+    """
+
+    def __init__(self, manifest: dict, archive_url: str, app_dir: str,
+                 protected_files: Optional[List[str]] = None, client: Optional[HttpClient] = None,
+                 staging_dir: Optional[str] = None):
+        self.manifest = manifest
+        self.archive_url = archive_url
+        self.app_dir = app_dir
+        self.protected_files = set(protected_files or [])
+        self.client = client or HttpClient(timeout=60)
+        self.staging_dir = staging_dir or os.path.join(app_dir, STAGING_DIR)
+        self.objects_dir = os.path.join(self.staging_dir, "objects")
+        self.changes: List[Tuple[str, dict]] = []
+
+    @classmethod
+    def from_url(cls, manifest_url: str, archive_url: str, app_dir: str, **kwargs) -> "DeltaUpdate":
+        client = kwargs.pop("client", None) or HttpClient(timeout=60)
+        response = client.request(manifest_url)
+        if not response.ok:
+            raise OSError(f"Release manifest request failed with status {response.status}")
+        manifest = json.loads(response.body.decode("utf-8"))
+        return cls(manifest, archive_url, app_dir, client=client, **kwargs)
+
+    def plan(self) -> List[Tuple[str, dict]]:
+        """Files whose local copy is missing or differs from the manifest, protected files excluded"""
+        changes = []
+        for path, entry in self.manifest["files"].items():
+            if path in self.protected_files:
+                continue
+            local_path = os.path.join(self.app_dir, path)
+            try:
+                if os.path.getsize(local_path) == entry["size"] and sha256_file(local_path) == entry["sha256"]:
+                    continue
+            except OSError:
+                pass
+            changes.append((path, entry))
+        self.changes = changes
+        return changes
+
+    @property
+    def download_size(self) -> int:
+        return sum(entry["length"] for _, entry in self.changes)
+
+    def _object_path(self, entry: dict) -> str:
+        return os.path.join(self.objects_dir, entry["sha256"])
+
+    def _fetch_part(self, entry: dict, part_path: str, on_bytes: Callable[[int], None]):
+        """Download the remaining bytes of one zip member into its part file"""
+        have = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if have > entry["length"]:
+            os.remove(part_path)
+            have = 0
+        if have:
+            on_bytes(have)
+        if have == entry["length"]:
+            return
+
+        start = entry["offset"] + have
+        end = entry["offset"] + entry["length"] - 1
+        with open(part_path, "ab") as f:
+            def sink(status, chunk):
+                # A server that ignores Range answers 200 with the whole zip; stop before saving any of it
+                if status != 206 or f.tell() + len(chunk) > entry["length"]:
+                    raise OSError(f"Ranged request not honoured (status {status})")
+                f.write(chunk)
+                on_bytes(len(chunk))
+
+            response = self.client.request(self.archive_url, headers={"Range": f"bytes={start}-{end}"}, sink=sink)
+        if response.status != 206:
+            raise OSError(f"Ranged request not honoured (status {response.status})")
+        if os.path.getsize(part_path) != entry["length"]:
+            raise OSError("Download ended early")
+
+    def _unpack_part(self, entry: dict, part_path: str, object_path: str):
+        """Decompress a finished part file into the object store, verifying its hash"""
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if entry["method"] == "deflate" else None
+        digest = hashlib.sha256()
+        tmp_path = object_path + ".tmp"
+        with open(part_path, "rb") as src, open(tmp_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                data = decompressor.decompress(chunk) if decompressor else chunk
+                digest.update(data)
+                dst.write(data)
+            if decompressor:
+                data = decompressor.flush()
+                digest.update(data)
+                dst.write(data)
+
+        os.remove(part_path)
+        if digest.hexdigest() != entry["sha256"]:
+            os.remove(tmp_path)
+            raise ValueError("Hash mismatch")
+        os.replace(tmp_path, object_path)
+
+    def download(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> bool:
+        """
+        Stage every planned file, resuming partial downloads
+
+        Args:
+            progress_callback: callable(downloaded_bytes, total_bytes)
+
+        Returns:
+            True when every file is staged and verified
+        """
+        os.makedirs(self.objects_dir, exist_ok=True)
+        total = self.download_size
+        downloaded = 0
+
+        def on_bytes(count):
+            nonlocal downloaded
+            downloaded += count
+            if progress_callback and total > 0:
+                progress_callback(downloaded, total)
+
+        try:
+            for path, entry in self.changes:
+                object_path = self._object_path(entry)
+                if os.path.exists(object_path) and sha256_file(object_path) == entry["sha256"]:
+                    on_bytes(entry["length"])
+                    continue
+
+                part_path = object_path + ".part"
+                self._fetch_part(entry, part_path, on_bytes)
+                self._unpack_part(entry, part_path, object_path)
+            return True
+        except (OSError, ValueError, zlib.error, http.client.HTTPException) as e:
+            print(f"[ERROR] Delta update download failed: {e}")
+            return False
+        finally:
+            self.client.close()
+
+    def apply(self) -> bool:
+        """
+        Swap the staged files into the install
+
+        Each target is renamed aside before the new file is renamed into place; renaming works
+        for files in use, such as the running executable. On failure the swapped files are
+        restored. Renamed-aside files that are still in use are removed on the next start.
+        """
+        swapped = []
+        try:
+            for path, entry in self.changes:
+                target = os.path.join(self.app_dir, path)
+                new_path = target + NEW_SUFFIX
+                old_path = target + OLD_SUFFIX
+                os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+                shutil.copyfile(self._object_path(entry), new_path)
+
+                had_old = os.path.exists(target)
+                if had_old:
+                    if os.path.exists(old_path):
+                        os.remove(old_path)
+                    os.replace(target, old_path)
+                # Recorded before the last rename, so a target already moved aside is restored
+                swapped.append((target, old_path if had_old else None))
+                os.replace(new_path, target)
+        except OSError as e:
+            print(f"[ERROR] Delta update apply failed, rolling back: {e}")
+            self._roll_back(swapped)
+            return False
+
+        leftovers = [old_path for _, old_path in swapped if old_path and not _try_remove(old_path)]
+        if leftovers:
+            with open(os.path.join(self.app_dir, STAGING_DIR + "_" + CLEANUP_FILE), "w", encoding="utf-8") as f:
+                json.dump(leftovers, f)
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        return True
+
+    @staticmethod
+    def _roll_back(swapped: List[Tuple[str, Optional[str]]]):
+        for target, old_path in reversed(swapped):
+            try:
+                if os.path.exists(target + NEW_SUFFIX):
+                    os.remove(target + NEW_SUFFIX)
+                if old_path:
+                    os.replace(old_path, target)
+                elif os.path.exists(target):
+                    os.remove(target)
+            except OSError as e:
+                print(f"[ERROR] Could not restore {target}: {e}")
+
+
+def _try_remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def cleanup_previous_update(app_dir: str):
+    """Remove files renamed aside by the last update that were still in use at the time"""
+    cleanup_path = os.path.join(app_dir, STAGING_DIR + "_" + CLEANUP_FILE)
+    try:
+        with open(cleanup_path, "r", encoding="utf-8") as f:
+            leftovers = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    remaining = [path for path in leftovers if os.path.exists(path) and not _try_remove(path)]
+    if remaining:
+        with open(cleanup_path, "w", encoding="utf-8") as f:
+            json.dump(remaining, f)
+    else:
+        _try_remove(cleanup_path)
+
+
+def main():
+    """Build a release manifest: python -m core.delta_update <release.zip> <version> [manifest.json]"""
+    import sys
+
+    if len(sys.argv) < 3:
+        print(main.__doc__)
+        return 1
+    manifest_path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(os.path.dirname(sys.argv[1]), MANIFEST_ASSET)
+    manifest = build_release_manifest(sys.argv[1], sys.argv[2], manifest_path)
+    print(f"Wrote {manifest_path} with {len(manifest['files'])} files")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+"""
+Event Analyzer
+Reads everything the event handler needs about an event popup from a single frame
+"""
+
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from core.frame_stream import Frame, get_frame_stream
+from core.metrics import get_metrics
+from core.ocr import extract_text
+from utils.constants import get_current_regions, screen_region
+from utils.screenshot import enhance_for_ocr, enhanced_screenshot
+
+EVENT_CHOICE_REGION = (223, 290, 150, 770)
+CHOICE_CONFIDENCE = 0.8
+EVENT_TYPE_CONFIDENCE = 0.8
+MAX_CHOICES = 5
+
+EVENT_TYPE_ICONS = [
+    ("assets/icons/train_event_scenario.png", "train_event_scenario"),
+    ("assets/icons/train_event_uma_musume.png", "train_event_uma_musume"),
+    ("assets/icons/train_event_support_card.png", "train_event_support_card"),
+]
+GENERIC_EVENT_TYPE = "train_event"
+
+
+def choice_icon(number: int) -> str:
+    return f"assets/icons/event_choice_{number}.png"
+
+
+def _event_regions(choice_region):
+    """EVENT_REGION and EVENT_NAME_REGION, with the name region falling back to above the choices"""
+    event_regions = get_current_regions().get('EVENT_REGIONS', {})
+    name_region = event_regions.get('EVENT_NAME_REGION')
+    if not name_region:
+        name_region = (choice_region[0], choice_region[1] - 100, choice_region[2], 80)
+    return event_regions.get('EVENT_REGION'), name_region
+
+
+def crop_image(frame: Frame, region: Tuple[int, int, int, int]) -> Optional[Image.Image]:
+    """RGB PIL crop of a screen region, or None when the region is not fully inside the frame"""
+    image = frame.crop(region)
+    if image is None:
+        return None
+    return Image.fromarray(image[:, :, ::-1].copy())
+
+
+class EventAnalysis:
+    """What one frame shows of an event popup"""
+
+    def __init__(self, frame: Optional[Frame] = None, visible: bool = False,
+                 event_type: Optional[str] = None, choice_centers: Optional[Dict[int, Tuple[int, int]]] = None,
+                 name_region: Optional[Tuple[int, int, int, int]] = None, name_image: Optional[Image.Image] = None):
+        """
+        Args:
+            frame: Frame the analysis was made from
+            visible: Whether the choice buttons of an event are on screen
+            event_type: Event type from the icon next to the title, generic when no icon matched
+            choice_centers: Screen position of each visible choice button, by choice number
+            name_region: Screen region of the event title
+            name_image: OCR-ready crop of the event title from the same frame
+        """
+        self.frame = frame
+        self.visible = visible
+        self.event_type = event_type
+        self.choice_centers = choice_centers or {}
+        self.name_region = name_region
+        self.name_image = name_image
+        self.analyzed_at = time.perf_counter()
+        self._name = None
+
+    @property
+    def num_choices(self) -> int:
+        """Number of choices shown; choices are contiguous, so this is the highest one found"""
+        return max(self.choice_centers) if self.choice_centers else 1
+
+    @property
+    def age(self) -> float:
+        return time.perf_counter() - self.analyzed_at
+
+    def choice_center(self, number: int) -> Optional[Tuple[int, int]]:
+        return self.choice_centers.get(number)
+
+    def read_name(self) -> Optional[str]:
+        """OCR the event title crop once; captures the region only if it fell outside the frame"""
+        if self._name is None:
+            image = self.name_image
+            if image is None and self.name_region:
+                image = enhanced_screenshot(self.name_region)
+            text = extract_text(image) if image is not None else ""
+            self._name = text.strip()
+        return self._name or None
+
+
+def _find_choices(frame: Frame, choice_region) -> Dict[int, Tuple[int, int]]:
+    """
+    Center of each visible choice button. The numbered icons look alike (choice 2 matches icon 1
+    at about 0.89), so every spot goes to the template that scores best there.
+    """
+    peaks = []
+    for number in range(1, MAX_CHOICES + 1):
+        icon = choice_icon(number)
+        if not os.path.exists(icon):
+            break
+        for x, y, w, h, score in frame.find(icon, region=choice_region, confidence=CHOICE_CONFIDENCE,
+                                            return_confidence=True):
+            peaks.append((score, number, (x + w // 2, y + h // 2), min(w, h) // 2))
+
+    # Strongest first: a weaker peak on a spot already taken is a look-alike
+    spots = []
+    for score, number, center, radius in sorted(peaks, key=lambda peak: peak[0], reverse=True):
+        if any(abs(center[0] - taken[0]) <= radius and abs(center[1] - taken[1]) <= radius
+               for taken, _ in spots):
+            continue
+        spots.append((center, number))
+
+    best = {}
+    for center, number in spots:
+        best.setdefault(number, center)
+
+    # Choices are contiguous, so counting stops at the first number not on screen
+    centers = {}
+    for number in range(1, MAX_CHOICES + 1):
+        if number not in best:
+            break
+        centers[number] = best[number]
+    return centers
+
+
+def _find_event_type(frame: Frame, event_region) -> str:
+    if not event_region:
+        return GENERIC_EVENT_TYPE
+    for icon_path, event_type in EVENT_TYPE_ICONS:
+        if os.path.exists(icon_path) and frame.find(icon_path, region=event_region,
+                                                    confidence=EVENT_TYPE_CONFIDENCE):
+            return event_type
+    return GENERIC_EVENT_TYPE
+
+
+def analyze_event(frame: Optional[Frame] = None) -> EventAnalysis:
+    """
+    Analyze the event popup in one frame
+
+    Args:
+        frame: Frame to read, the latest frame of the shared stream by default
+
+    Returns:
+        EventAnalysis; visible is False when there is no popup, in which case nothing else is read
+    """
+    start = time.perf_counter()
+    try:
+        frame = frame or get_frame_stream().latest()
+        if frame is None:
+            return EventAnalysis()
+
+        choice_region = screen_region(EVENT_CHOICE_REGION)
+        choice_centers = _find_choices(frame, choice_region)
+        # The popup counts as an event only with at least two choices, as before
+        if len(choice_centers) < 2:
+            return EventAnalysis(frame, choice_centers=choice_centers)
+
+        event_region, name_region = _event_regions(choice_region)
+        name_crop = crop_image(frame, name_region)
+        return EventAnalysis(
+            frame,
+            visible=True,
+            event_type=_find_event_type(frame, event_region),
+            choice_centers=choice_centers,
+            name_region=name_region,
+            name_image=enhance_for_ocr(name_crop) if name_crop is not None else None,
+        )
+    except Exception as e:
+        print(f"[ERROR] Failed to analyze event: {e}")
+        return EventAnalysis()
+    finally:
+        get_metrics().observe("event_analysis_seconds", time.perf_counter() - start)
@@ -1,4 +1,3 @@
-import pyautogui
 import json
 import os
 import glob
@@ -6,14 +5,20 @@ import hashlib
 import time
 from difflib import SequenceMatcher
 from typing import Optional, Dict, List, Tuple, Any
-from core.ocr import extract_text
 from core.recognizer import find_template_position
-from utils.screenshot import enhanced_screenshot
-from utils.constants import get_current_regions
+from core.event_analyzer import EVENT_CHOICE_REGION, EventAnalysis, analyze_event, choice_icon
+from core.event_memo import EventMemo, name_crop_key
+from core.metrics import get_metrics
+from core.input_executor import get_input_executor
+from utils.constants import screen_region
 import unicodedata
 import re
 
-EVENT_CHOICE_REGION = (223, 290, 150, 770)
+# An analysis is reused until a choice is clicked or it gets this old
+EVENT_ANALYSIS_MAX_AGE = 5.0
+
+# Event map files are identical for every session, so load them once per process
+_shared_event_sources = None
 
 class EventChoiceHandler:
     """Handles automatic event choice selection based on event maps with optimized database caching"""
@@ -35,16 +40,29 @@ class EventChoiceHandler:
         self.cache_file = os.path.join(self.cache_dir, "cached_database.json")
         self.config_hash_file = os.path.join(self.cache_dir, "config_hash.txt")
 
-        self.common_events = self.load_common_events()
-        self.uma_musume_events = {}
-        self.support_card_events = {}
-        self.other_special_events = self.load_other_special_events()
-
-        self.load_uma_musume_events()
-        self.load_support_card_events()
+        self._load_event_sources()
 
         self.cached_database = None
         self.current_config_hash = None
+        self._analysis: Optional[EventAnalysis] = None
+        self.event_memo = EventMemo()
+
+    def _load_event_sources(self, reload: bool = False):
+        """Load event map files, reusing the copy already loaded by another handler"""
+        global _shared_event_sources
+        if _shared_event_sources is None or reload:
+            self.common_events = self.load_common_events()
+            self.uma_musume_events = {}
+            self.support_card_events = {}
+            self.other_special_events = self.load_other_special_events()
+
+            self.load_uma_musume_events()
+            self.load_support_card_events()
+            _shared_event_sources = (self.common_events, self.uma_musume_events,
+                                     self.support_card_events, self.other_special_events)
+        else:
+            (self.common_events, self.uma_musume_events,
+             self.support_card_events, self.other_special_events) = _shared_event_sources
 
     def load_common_events(self) -> Dict[str, List[Dict]]:
         """Load common event maps from assets/event_map/common.json"""
@@ -259,6 +277,7 @@ class EventChoiceHandler:
 
             self.current_config_hash = config_hash
             self.cached_database = database
+            self.event_memo.clear()
 
             return database
 
@@ -445,72 +464,32 @@ class EventChoiceHandler:
 
         return best_match
 
-    def detect_event_type(self) -> Optional[str]:
-        """Detect event type from event region using OpenCV template matching"""
-        try:
-            current_regions = get_current_regions()
-            event_regions = current_regions.get('EVENT_REGIONS', {})
-            event_region = event_regions.get('EVENT_REGION')
-
-            if not event_region:
-                self.log("[WARNING] EVENT_REGION not configured, using fallback")
-                return "train_event"
-
-            event_types = [
-                ("assets/icons/train_event_scenario.png", "train_event_scenario"),
-                ("assets/icons/train_event_uma_musume.png", "train_event_uma_musume"),
-                ("assets/icons/train_event_support_card.png", "train_event_support_card")
-            ]
-
-            for icon_path, event_type in event_types:
-                if os.path.exists(icon_path):
-                    try:
-                        position = find_template_position(
-                            template_path=icon_path,
-                            region=event_region,
-                            threshold=0.8,
-                            return_center=True,
-                            region_format='xywh'
-                        )
-                        if position:
-                            return event_type
-                    except Exception as e:
-                        self.log(f"[WARNING] Failed to check {event_type} icon: {e}")
-                        continue
-
-            self.log("[DEBUG] No specific event type icon detected, using generic")
-            return "train_event"
+    def analyze_event(self) -> EventAnalysis:
+        """Analyze the event popup from one fresh frame and keep the result for this event"""
+        self._analysis = analyze_event()
+        return self._analysis
 
-        except Exception as e:
-            self.log(f"[ERROR] Failed to detect event type: {e}")
+    def current_analysis(self) -> EventAnalysis:
+        """The analysis of the event on screen, reusing the last one while it is still valid"""
+        analysis = self._analysis
+        if analysis is None or not analysis.visible or analysis.age > EVENT_ANALYSIS_MAX_AGE:
+            analysis = self.analyze_event()
+        return analysis
+
+    def detect_event_type(self) -> Optional[str]:
+        """Detect event type from the event icon"""
+        analysis = self.current_analysis()
+        if not analysis.visible:
             return "train_event"
+        return analysis.event_type
 
     def extract_event_name(self) -> Optional[str]:
-        """Extract event name from event name region using OCR"""
+        """Extract event name from the event title using OCR"""
         try:
-            current_regions = get_current_regions()
-            event_regions = current_regions.get('EVENT_REGIONS', {})
-            event_name_region = event_regions.get('EVENT_NAME_REGION')
-
-            if not event_name_region:
-                self.log("[WARNING] EVENT_NAME_REGION not configured, using fallback region")
-                event_name_region = (EVENT_CHOICE_REGION[0], EVENT_CHOICE_REGION[1] - 100,
-                                     EVENT_CHOICE_REGION[2], 80)
-
-            event_name_img = enhanced_screenshot(event_name_region)
-            if event_name_img is None:
-                self.log("[DEBUG] Failed to capture event name region")
-                return None
-
-            event_name_text = extract_text(event_name_img)
-
-            if event_name_text:
-                cleaned_text = event_name_text.strip()
-                return cleaned_text
-            else:
+            event_name = self.current_analysis().read_name()
+            if not event_name:
                 self.log("[DEBUG] No event name text extracted")
-                return None
-
+            return event_name
         except Exception as e:
             self.log(f"[ERROR] Failed to extract event name: {e}")
             return None
@@ -666,8 +645,20 @@ class EventChoiceHandler:
         self.cached_database = self.get_database(uma_musume, support_cards)
         self.log("[DEBUG] Event database preloaded")
 
-    def find_event_choice(self, event_type: str, event_name: str, uma_musume: str, support_cards: List[str]) -> Optional[int]:
-        """Find appropriate event choice based on event type and configuration"""
+    def start_career(self):
+        """Forget events resolved in the previous career"""
+        if len(self.event_memo):
+            self.log(f"[DEBUG] Event memo reset ({len(self.event_memo)} events, "
+                     f"{self.event_memo.hits} repeats skipped OCR)")
+        self.event_memo.clear()
+
+    def match_event(self, event_type: str, event_name: str, uma_musume: str,
+                    support_cards: List[str]) -> Optional[Tuple[str, Dict]]:
+        """Fuzzy match an event name against the database
+
+        Returns:
+            (category, event) of the first category with a match, or None
+        """
         try:
             database = self.cached_database if self.cached_database else self.get_database(uma_musume, support_cards)
 
@@ -691,67 +682,80 @@ class EventChoiceHandler:
                 if not matched_name:
                     continue
 
-                matched_event = None
                 for event in events:
                     if event.get("name") == matched_name:
-                        matched_event = event
-                        break
+                        return category, event
 
-                if not matched_event:
-                    continue
+            return None
 
-                display_name = matched_event.get("original_name", matched_name)
-                self.log(f"[INFO] Found event: '{display_name}' in {category}")
+        except Exception as e:
+            self.log(f"[ERROR] Failed to match event: {e}")
+            return None
 
-                if "choice" in matched_event:
-                    choice = self._resolve_choice(matched_event["choice"])
-                    if choice is not None:
-                        return choice
+    def choose_for_event(self, category: str, matched_event: Dict, uma_musume: str) -> Optional[int]:
+        """Pick the choice for a matched event, evaluating its conditions against the current state"""
+        try:
+            if category == "other_special_events":
+                return self._choose_for_other_special_event(matched_event)
 
-                current_mood = None
-                current_energy = None
-                current_date = None
+            display_name = matched_event.get("original_name", matched_event.get("name", ""))
+            self.log(f"[INFO] Found event: '{display_name}' in {category}")
 
-                if self.requires_mood_check(matched_event):
-                    current_mood = self.get_current_mood()
-                    if current_mood == "UNKNOWN":
-                        self.log("[WARNING] Event requires mood check but mood is UNKNOWN")
+            if "choice" in matched_event:
+                choice = self._resolve_choice(matched_event["choice"])
+                if choice is not None:
+                    return choice
 
-                if self.requires_energy_check(matched_event):
-                    current_energy = self.get_current_energy()
+            current_mood = None
+            current_energy = None
+            current_date = None
 
-                if self.requires_date_check(matched_event):
-                    try:
-                        from core.state import get_current_date_info
-                        current_date = get_current_date_info()
-                        if current_date is None:
-                            self.log("[WARNING] Event requires date check but date is not available")
-                    except Exception as e:
-                        self.log(f"[WARNING] Failed to get date for event check: {e}")
+            if self.requires_mood_check(matched_event):
+                current_mood = self.get_current_mood()
+                if current_mood == "UNKNOWN":
+                    self.log("[WARNING] Event requires mood check but mood is UNKNOWN")
 
-                choice = self.evaluate_event_conditions(matched_event, current_energy, current_mood, uma_musume)
+            if self.requires_energy_check(matched_event):
+                current_energy = self.get_current_energy()
 
-                if choice:
-                    condition_parts = []
-                    if current_energy is not None:
-                        condition_parts.append(f"Energy: {current_energy}%")
-                    if current_mood is not None:
-                        condition_parts.append(f"Mood: {current_mood}")
-
-                    condition_info = f" ({', '.join(condition_parts)})" if condition_parts else ""
-                    self.log(f"[INFO] Selected choice {choice} for event '{display_name}'{condition_info}")
-                    return choice
+            if self.requires_date_check(matched_event):
+                try:
+                    from core.state import get_current_date_info
+                    current_date = get_current_date_info()
+                    if current_date is None:
+                        self.log("[WARNING] Event requires date check but date is not available")
+                except Exception as e:
+                    self.log(f"[WARNING] Failed to get date for event check: {e}")
 
-                self.log(f"[WARNING] No valid choice found for event '{display_name}'")
+            choice = self.evaluate_event_conditions(matched_event, current_energy, current_mood, uma_musume)
 
+            if choice:
+                condition_parts = []
+                if current_energy is not None:
+                    condition_parts.append(f"Energy: {current_energy}%")
+                if current_mood is not None:
+                    condition_parts.append(f"Mood: {current_mood}")
+
+                condition_info = f" ({', '.join(condition_parts)})" if condition_parts else ""
+                self.log(f"[INFO] Selected choice {choice} for event '{display_name}'{condition_info}")
+                return choice
+
+            self.log(f"[WARNING] No valid choice found for event '{display_name}'")
             return None
 
         except Exception as e:
-            self.log(f"[ERROR] Failed to find event choice: {e}")
+            self.log(f"[ERROR] Failed to choose for event: {e}")
             return None
 
-    def find_event_in_other_special_events(self, event_name: str) -> Optional[int]:
-        """Find event in other special events database with improved choice selection"""
+    def find_event_choice(self, event_type: str, event_name: str, uma_musume: str, support_cards: List[str]) -> Optional[int]:
+        """Find appropriate event choice based on event type and configuration"""
+        match = self.match_event(event_type, event_name, uma_musume, support_cards)
+        if not match:
+            return None
+        return self.choose_for_event(match[0], match[1], uma_musume)
+
+    def match_other_special_event(self, event_name: str) -> Optional[Dict]:
+        """Fuzzy match an event name against the other special events database"""
         try:
             database = self.cached_database
             if not database:
@@ -775,33 +779,49 @@ class EventChoiceHandler:
 
             for event in other_events:
                 if event.get("name") == matched_name:
-                    if "choice" in event:
-                        choice = self._resolve_choice(event["choice"])
-                        if choice is not None:
-                            self.log(f"[DEBUG] Using choice {choice} from 'choice' field")
-                            return choice
-                        else:
-                            self.log(f"[WARNING] Invalid choice value in 'choice' field: {event['choice']}, using default")
+                    return event
 
-                    if "default_choice" in event:
-                        default_choice = self._resolve_choice(event["default_choice"])
-                        if default_choice is not None:
-                            self.log(f"[DEBUG] Using choice {default_choice} from 'default_choice' field")
-                            return default_choice
-                        else:
-                            self.log(f"[WARNING] Invalid default_choice value: {event['default_choice']}, using fallback")
+            return None
+
+        except Exception as e:
+            self.log(f"[ERROR] Failed to search in other special events: {e}")
+            return None
 
-                    current_mood = self.get_current_mood()
-                    current_energy = self.get_current_energy()
+    def _choose_for_other_special_event(self, event: Dict) -> int:
+        """Pick the choice for a matched other special event"""
+        if "choice" in event:
+            choice = self._resolve_choice(event["choice"])
+            if choice is not None:
+                self.log(f"[DEBUG] Using choice {choice} from 'choice' field")
+                return choice
+            else:
+                self.log(f"[WARNING] Invalid choice value in 'choice' field: {event['choice']}, using default")
 
-                    conditional_choice = self.evaluate_event_conditions(event, current_energy, current_mood, "")
-                    if conditional_choice:
-                        return conditional_choice
+        if "default_choice" in event:
+            default_choice = self._resolve_choice(event["default_choice"])
+            if default_choice is not None:
+                self.log(f"[DEBUG] Using choice {default_choice} from 'default_choice' field")
+                return default_choice
+            else:
+                self.log(f"[WARNING] Invalid default_choice value: {event['default_choice']}, using fallback")
 
-                    self.log(f"[DEBUG] No valid choice found for event '{matched_name}', using default choice 1")
-                    return 1
+        current_mood = self.get_current_mood()
+        current_energy = self.get_current_energy()
 
-            return None
+        conditional_choice = self.evaluate_event_conditions(event, current_energy, current_mood, "")
+        if conditional_choice:
+            return conditional_choice
+
+        self.log(f"[DEBUG] No valid choice found for event '{event.get('name', '')}', using default choice 1")
+        return 1
+
+    def find_event_in_other_special_events(self, event_name: str) -> Optional[int]:
+        """Find event in other special events database with improved choice selection"""
+        try:
+            event = self.match_other_special_event(event_name)
+            if event is None:
+                return None
+            return self._choose_for_other_special_event(event)
 
         except Exception as e:
             self.log(f"[ERROR] Failed to search in other special events: {e}")
@@ -993,30 +1013,53 @@ class EventChoiceHandler:
                 self.log("[DEBUG] Auto event map disabled")
                 return False
 
-            event_type = self.detect_event_type()
-            if not event_type:
-                self.log("[DEBUG] Could not detect event type")
+            analysis = self.current_analysis()
+            if not analysis.visible:
+                self.log("[DEBUG] Event choices no longer visible")
                 return False
 
+            event_type = analysis.event_type
+            if event_type == "train_event":
+                self.log("[DEBUG] No specific event type icon detected, using generic")
+
+            uma_musume = event_settings.get('uma_musume', 'None')
+            support_cards = event_settings.get('support_cards', ['None'] * 6)
+            unknown_action = event_settings.get('unknown_event_action', 'Auto select first choice')
+
+            # A title seen earlier this career skips OCR and fuzzy matching; conditions still run live
+            memo_key = name_crop_key(analysis.name_image) if analysis.name_image is not None else None
+            remembered = self.event_memo.get(memo_key, event_type)
+            if remembered and (remembered[0] != "other_special_events"
+                               or unknown_action == "Search in other special events"):
+                category, matched_event, event_name = remembered
+                self.log(f"[DEBUG] Event '{event_name}' recognised from earlier this career")
+                choice = self.choose_for_event(category, matched_event, uma_musume)
+                if choice:
+                    return self.click_choice(choice)
+
             event_name = self.extract_event_name()
             if not event_name:
                 self.log("[DEBUG] Could not extract event name")
                 return False
 
-            uma_musume = event_settings.get('uma_musume', 'None')
-            support_cards = event_settings.get('support_cards', ['None'] * 6)
-
-            choice = self.find_event_choice(event_type, event_name, uma_musume, support_cards)
+            match = self.match_event(event_type, event_name, uma_musume, support_cards)
+            choice = None
+            if match:
+                self.event_memo.put(memo_key, event_type, match[0], match[1], event_name)
+                choice = self.choose_for_event(match[0], match[1], uma_musume)
 
             if choice:
                 return self.click_choice(choice)
             else:
-                unknown_action = event_settings.get('unknown_event_action', 'Auto select first choice')
                 if unknown_action == "Wait for user selection":
                     self.log(f"[INFO] Unknown event '{event_name}' - waiting for user selection as configured")
                     return False
                 elif unknown_action == "Search in other special events":
-                    choice = self.find_event_in_other_special_events(event_name)
+                    other_event = self.match_other_special_event(event_name)
+                    choice = None
+                    if other_event is not None:
+                        self.event_memo.put(memo_key, event_type, "other_special_events", other_event, event_name)
+                        choice = self._choose_for_other_special_event(other_event)
                     if choice:
                         self.log(f"[INFO] Found event '{event_name}' in other special events")
                         return self.click_choice(choice)
@@ -1024,6 +1067,7 @@ class EventChoiceHandler:
                         self.log(f"[WARNING] Event '{event_name}' not found.")
                         return False
                 else:  # "Auto select first choice"
+                    get_metrics().inc("event_fallbacks_total", reason="unknown_event")
                     self.log(f"[INFO] Unknown event '{event_name}' - auto selecting first choice")
                     return self.click_choice(1)
 
@@ -1032,29 +1076,8 @@ class EventChoiceHandler:
             return False
 
     def detect_num_choices(self) -> int:
-        """Detect how many choices are visible on screen (2–5).
-        Checks icons choice_2 through choice_5 and returns the highest found.
-        """
-        num_choices = 1
-        for n in range(2, 6):
-            icon = f"assets/icons/event_choice_{n}.png"
-            if not os.path.exists(icon):
-                break
-            try:
-                pos = find_template_position(
-                    template_path=icon,
-                    region=EVENT_CHOICE_REGION,
-                    threshold=0.8,
-                    return_center=True,
-                    region_format='xywh'
-                )
-                if pos:
-                    num_choices = n
-                else:
-                    break  # choices are contiguous; first missing = end
-            except Exception:
-                break
-        return num_choices
+        """Detect how many choices are visible on screen (2–5) from the current event analysis"""
+        return self.current_analysis().num_choices
 
     def _resolve_choice(self, choice_value, cached_num_choices: Optional[int] = None) -> Optional[int]:
         """Resolve a choice value to an integer.
@@ -1082,17 +1105,29 @@ class EventChoiceHandler:
 
             time.sleep(0.5)
             choice_number = max(1, min(5, choice_number))
-            choice_icon = f"assets/icons/event_choice_{choice_number}.png"
+            icon = choice_icon(choice_number)
 
-            if not os.path.exists(choice_icon):
-                self.log(f"[ERROR] Choice icon not found: {choice_icon}")
+            if not os.path.exists(icon):
+                self.log(f"[ERROR] Choice icon not found: {icon}")
                 return False
 
+            # The analysis already located the button; search again only when it did not
+            analysis = self._analysis
+            position = analysis.choice_center(choice_number) if analysis is not None and analysis.visible else None
+            self._analysis = None
+            if position:
+                if self.check_stop():
+                    return False
+                get_input_executor().click(position, duration=0.2)
+                self.log(f"[INFO] Selected event choice {choice_number}")
+                time.sleep(0.5)
+                return True
+
             for attempt in range(max_retries):
                 try:
                     position = find_template_position(
-                        template_path=choice_icon,
-                        region=EVENT_CHOICE_REGION,
+                        template_path=icon,
+                        region=screen_region(EVENT_CHOICE_REGION),
                         threshold=0.85 - attempt * 0.03,
                         return_center=True,
                         region_format='xywh'
@@ -1102,8 +1137,7 @@ class EventChoiceHandler:
                         if self.check_stop():
                             return False
 
-                        pyautogui.moveTo(position, duration=0.2)
-                        pyautogui.click()
+                        get_input_executor().click(position, duration=0.2)
                         self.log(f"[INFO] Selected event choice {choice_number}")
                         time.sleep(0.5)
                         return True
@@ -1127,37 +1161,9 @@ class EventChoiceHandler:
             return False
 
     def is_event_choice_visible(self) -> bool:
-        """Check if event choice buttons are visible on screen"""
+        """Check if event choice buttons are visible on screen, analyzing the event while at it"""
         try:
-            choice_1_icon = "assets/icons/event_choice_1.png"
-            choice_2_icon = "assets/icons/event_choice_2.png"
-
-            if os.path.exists(choice_1_icon) and os.path.exists(choice_2_icon):
-                try:
-                    position_1 = find_template_position(
-                        template_path=choice_1_icon,
-                        region=EVENT_CHOICE_REGION,
-                        threshold=0.8,
-                        return_center=True,
-                        region_format='xywh'
-                    )
-                    position_2 = find_template_position(
-                        template_path=choice_2_icon,
-                        region=EVENT_CHOICE_REGION,
-                        threshold=0.8,
-                        return_center=True,
-                        region_format='xywh'
-                    )
-                    return (position_1 is not None and position_2 is not None)
-                except Exception:
-                    left, top, width, height = EVENT_CHOICE_REGION
-                    region_ltrb = (left, top, left + width, top + height)
-                    choice_1_btn = pyautogui.locateOnScreen(choice_1_icon, confidence=0.8,
-                                                            minSearchTime=0.2, region=region_ltrb)
-                    choice_2_btn = pyautogui.locateOnScreen(choice_2_icon, confidence=0.8,
-                                                            minSearchTime=0.2, region=region_ltrb)
-                    return (choice_1_btn is not None and choice_2_btn is not None)
-            return False
+            return self.analyze_event().visible
         except Exception as e:
             self.log(f"[ERROR] Failed to check event choice visibility: {e}")
             return False
@@ -1167,6 +1173,7 @@ class EventChoiceHandler:
         try:
             self.cached_database = None
             self.current_config_hash = None
+            self.event_memo.clear()
 
             if os.path.exists(self.cache_file):
                 os.remove(self.cache_file)
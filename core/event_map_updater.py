@@ -0,0 +1,288 @@
+"""
+Event Map Updater
+Concurrent, conditional check and download of event map files from the GitHub repository
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from core.http_client import HttpClient
+
+EVENT_MANIFEST_FILE = "assets/event_map/update_manifest.json"
+DEFAULT_MAX_WORKERS = 6
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Hash content the way git does, matching the sha the GitHub Contents API reports"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _count_lines(data: bytes) -> int:
+    return len(data.split(b"\n"))
+
+
+class EventMapManifest:
+    """
+    Local record of event map content hashes and the ETags of the responses they came from.
+    File hashes are reused while a file's size and mtime are unchanged, so a check reads
+    nothing from disk for files that were not touched.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {"files": {}, "listings": {}}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            for key in self.data:
+                self.data[key] = loaded.get(key, {})
+        except (OSError, ValueError):
+            pass
+
+    def local_sha(self, full_path: str, rel_path: str) -> Optional[str]:
+        """git blob sha of a local file, or None if it does not exist"""
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            record = self.data["files"].get(rel_path)
+        if record and record.get("size") == stat.st_size and record.get("mtime") == stat.st_mtime:
+            return record["sha"]
+
+        with open(full_path, "rb") as f:
+            sha = git_blob_sha(f.read())
+        self.record_file(full_path, rel_path, sha)
+        return sha
+
+    def record_file(self, full_path: str, rel_path: str, sha: str):
+        stat = os.stat(full_path)
+        with self._lock:
+            self.data["files"][rel_path] = {"sha": sha, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def listing(self, url: str) -> Optional[dict]:
+        with self._lock:
+            return self.data["listings"].get(url)
+
+    def set_listing(self, url: str, etag: Optional[str], items: list):
+        with self._lock:
+            self.data["listings"][url] = {"etag": etag, "items": items}
+
+    def save(self):
+        """Write the manifest atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with self._lock:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[WARNING] Could not save event map manifest: {e}")
+
+
+class EventMapUpdater:
+    """
+    Checks and downloads event map files with a bounded worker pool.
+
+    Directory listings are requested with If-None-Match, so unchanged directories cost a 304.
+    A file whose local git blob sha matches the remote sha is skipped without downloading.
+    Base URLs are parameters, so the updater can run against a local HTTP server.
+    """
+
+    def __init__(self, contents_api: str, app_dir: str, dirs: List[str], line_check_files: List[str],
+                 client: Optional[HttpClient] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 manifest_file: str = EVENT_MANIFEST_FILE):
+        self.contents_api = contents_api
+        self.app_dir = app_dir
+        self.dirs = dirs
+        self.line_check_files = line_check_files
+        self.client = client or HttpClient()
+        self.max_workers = max_workers
+        self.manifest = EventMapManifest(os.path.join(app_dir, manifest_file))
+        self._fetched: Dict[str, bytes] = {}
+
+    def _fetch_contents(self, path: str):
+        """Contents API entry for a directory or file, revalidated with its stored ETag"""
+        url = self.contents_api + path
+        cached = self.manifest.listing(url)
+        headers = dict(GITHUB_API_HEADERS)
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        response = self.client.request(url, headers=headers)
+        if response.not_modified and cached:
+            return cached["items"]
+        if not response.ok:
+            return None
+
+        items = json.loads(response.body.decode("utf-8"))
+        self.manifest.set_listing(url, response.headers.get("etag"), items)
+        return items
+
+    def _list_dir(self, dir_path: str) -> Optional[List[dict]]:
+        items = self._fetch_contents(dir_path)
+        if items is None:
+            return None
+        return [
+            {"name": item["name"], "path": item["path"], "download_url": item["download_url"],
+             "sha": item.get("sha")}
+            for item in items
+            if item["type"] == "file" and item["name"].endswith(".json")
+        ]
+
+    def _file_info(self, file_path: str) -> Optional[dict]:
+        item = self._fetch_contents(file_path)
+        if not item or item.get("type") != "file":
+            return None
+        return {"name": item["name"], "path": item["path"], "download_url": item["download_url"],
+                "sha": item.get("sha")}
+
+    def _check_line_file(self, remote_file: dict) -> Optional[dict]:
+        """Updated entry if the remote copy differs and has more lines than the local one"""
+        local_path = os.path.join(self.app_dir, remote_file["path"])
+        local_sha = self.manifest.local_sha(local_path, remote_file["path"])
+        if local_sha is None:
+            return dict(remote_file, status="New")
+        if remote_file.get("sha") and remote_file["sha"] == local_sha:
+            return None
+
+        response = self.client.request(remote_file["download_url"])
+        if not response.ok:
+            return None
+        self._fetched[remote_file["download_url"]] = response.body
+
+        with open(local_path, "rb") as f:
+            local_lines = _count_lines(f.read())
+        if _count_lines(response.body) > local_lines:
+            return dict(remote_file, status="Updated")
+        return None
+
+    def check(self) -> dict:
+        """
+        Find new and updated event map files
+
+        Returns:
+            dict with has_updates, files_to_update (path, download_url, sha, status) and error
+        """
+        files_to_update = []
+        errors = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            listings = list(pool.map(self._safe(self._list_dir), self.dirs))
+            infos = list(pool.map(self._safe(self._file_info), self.line_check_files))
+
+            # New files only in the per-character folders
+            for dir_path, remote_files in zip(self.dirs, listings):
+                if not remote_files:
+                    if dir_path == self.dirs[0]:
+                        errors.append(f"Could not fetch {dir_path}")
+                    continue
+                for remote_file in remote_files:
+                    if not os.path.exists(os.path.join(self.app_dir, remote_file["path"])):
+                        files_to_update.append(dict(remote_file, status="New"))
+
+            # Shared files are replaced when the remote copy has grown
+            line_checks = [info for info in infos if info is not None]
+            for result in pool.map(self._safe(self._check_line_file), line_checks):
+                if result is not None:
+                    files_to_update.append(result)
+
+        self.manifest.save()
+        return {
+            "has_updates": len(files_to_update) > 0,
+            "files_to_update": files_to_update,
+            "error": "; ".join(errors) if errors else None,
+        }
+
+    def _download_one(self, file_info: dict) -> bool:
+        local_path = os.path.join(self.app_dir, file_info["path"])
+        data = self._fetched.pop(file_info["download_url"], None)
+        if data is None:
+            response = self.client.request(file_info["download_url"])
+            if not response.ok:
+                return False
+            data = response.body
+
+        expected = file_info.get("sha")
+        if expected and git_blob_sha(data) != expected:
+            print(f"[WARNING] Downloaded {file_info['path']} does not match its expected hash")
+            return False
+
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        tmp_path = local_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, local_path)
+        self.manifest.record_file(local_path, file_info["path"], git_blob_sha(data))
+        return True
+
+    def download(self, files_to_update: List[dict],
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None) -> int:
+        """
+        Download files concurrently
+
+        Args:
+            files_to_update: Entries from check()
+            progress_callback: callable(completed_count, total_count, file_path)
+
+        Returns:
+            Number of files written
+        """
+        total = len(files_to_update)
+        completed = 0
+        success_count = 0
+        lock = threading.Lock()
+
+        def run(file_info):
+            nonlocal completed, success_count
+            ok = self._safe(self._download_one)(file_info)
+            with lock:
+                completed += 1
+                if ok:
+                    success_count += 1
+                if progress_callback:
+                    progress_callback(completed, total, file_info["path"])
+
+        if progress_callback:
+            progress_callback(0, total, files_to_update[0]["path"] if files_to_update else "")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(run, files_to_update))
+
+        self.manifest.save()
+        if progress_callback:
+            progress_callback(total, total, "")
+        return success_count
+
+    @staticmethod
+    def _safe(func):
+        """Wrap a worker so network and file errors count as a miss instead of aborting the pool"""
+        def wrapper(*args):
+            try:
+                return func(*args)
+            except (OSError, ValueError, KeyError, TypeError, http.client.HTTPException) as e:
+                print(f"[WARNING] Event map update step failed: {e}")
+                return None
+        return wrapper
+
+
+_updater = None
+_updater_lock = threading.Lock()
+
+
+def get_event_map_updater(contents_api: str, app_dir: str, dirs: List[str],
+                          line_check_files: List[str]) -> EventMapUpdater:
+    """Shared updater, so files fetched during a check are reused by the following download"""
+    global _updater
+    with _updater_lock:
+        if _updater is None or _updater.contents_api != contents_api or _updater.app_dir != app_dir:
+            _updater = EventMapUpdater(contents_api, app_dir, dirs, line_check_files)
+        return _updater
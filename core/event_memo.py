@@ -0,0 +1,68 @@
+"""
+Event Memo
+Per-career memory of which database entry an event title crop resolved to
+"""
+
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+# Difference hash grid: the title region is wide and short, so the grid is too
+HASH_WIDTH = 64
+HASH_HEIGHT = 8
+
+
+def name_crop_key(image: Image.Image) -> int:
+    """Difference hash of an event title crop; the same title gives the same or a very close key"""
+    small = image.convert("L").resize((HASH_WIDTH + 1, HASH_HEIGHT), Image.BILINEAR)
+    pixels = list(small.getdata())
+    key = 0
+    for row in range(HASH_HEIGHT):
+        offset = row * (HASH_WIDTH + 1)
+        for col in range(HASH_WIDTH):
+            key = (key << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return key
+
+
+class EventMemo:
+    """
+    Title crop key to (category, event) for events resolved earlier in the career.
+
+    A repeat popup looks up its crop here instead of running OCR and fuzzy matching again.
+    Only exact keys are trusted: titles such as "Full-Power Muscles" and "Full-Power Muscles!"
+    hash a few bits apart, so a near key goes through OCR and is remembered in its own right.
+    Only the match is remembered: the event's conditions are still evaluated every time.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, int], Tuple[str, Dict, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Optional[int], event_type: str) -> Optional[Tuple[str, Dict, str]]:
+        """
+        Look up a title crop
+
+        Returns:
+            (category, event, event name as read when it was remembered), or None
+        """
+        if key is None:
+            return None
+        entry = self._entries.get((event_type, key))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: Optional[int], event_type: str, category: str, event: Dict, event_name: str):
+        if key is not None:
+            self._entries[(event_type, key)] = (category, event, event_name)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -12,6 +12,12 @@ from core.race_handler import RaceHandler
 from core.rest_handler import RestHandler
 from core.event_handler import EventChoiceHandler
 from core.click_handler import enhanced_click, find_and_click
+from core.game_window import get_game_window
+from core.metrics import get_metrics
+from core.input_executor import get_input_executor
+from core.career_checkpoint import get_career_checkpoint
+from core.location_cache import get_location_cache
+from utils.log_pipeline import get_logger
 
 # Import core systems
 from core.state import (
@@ -23,7 +29,7 @@ from core.recognizer import is_infirmary_active, match_template
 from core.race_manager import RaceManager, DateManager
 from utils.constants import (
     MOOD_LIST, MINIMUM_ENERGY_PERCENTAGE, CRITICAL_ENERGY_PERCENTAGE,
-    MAX_CAREER_LOBBY_ATTEMPTS, RECREATION_REGION, get_deck_card_count
+    MAX_CAREER_LOBBY_ATTEMPTS, get_current_regions, get_deck_card_count
 )
 
 # Import helper classes
@@ -31,6 +37,8 @@ from core.execute_helpers import (
     EventHandler, CareerLobbyManager, StatusLogger
 )
 
+log = get_logger()
+
 
 class BotController:
     """Main bot controller that orchestrates all operations"""
@@ -99,6 +107,8 @@ class BotController:
     def set_stop_flag(self, value: bool = True):
         """Set the stop flag (called by F3 key)"""
         self.should_stop = value
+        if value:
+            get_input_executor().cancel_pending()
 
     def check_should_stop(self) -> bool:
         """Check if bot should stop"""
@@ -109,8 +119,7 @@ class BotController:
     def is_game_window_active(self) -> bool:
         """Check if Umamusume window exists (does not require it to be focused)"""
         try:
-            windows = gw.getWindowsWithTitle("Umamusume")
-            return bool(windows)
+            return get_game_window().is_available()
         except:
             return False
 
@@ -132,12 +141,18 @@ class BotController:
         return False
 
 
+# Finale stages start at day 73; the CRITERIA_REGION check is skipped on turns before this
+FINALE_CHECK_FROM_DAY = 70
+
+
 class GameStateManager:
     """Manages current game state information"""
 
     def __init__(self, controller: BotController):
         self.controller = controller
         self.current_state = {}
+        # Day of the previous turn, or of the checkpoint after a warm restart; 0 when unknown
+        self.last_absolute_day = 0
 
     def update_game_state(self) -> Dict[str, Any]:
         """Update and return current game state"""
@@ -146,8 +161,9 @@ class GameStateManager:
             turn = check_turn()
             year = check_current_year()
             energy_percentage, energy_max = check_energy_percentage(True)
-            print(f'energy: {energy_percentage} - {energy_max}')
+            log.debug("energy: %s - %s", energy_percentage, energy_max)
             current_date = get_current_date_info()
+            date_parsed = current_date is not None
 
             if current_date is None:
                 self.controller.log_message("[ERROR] Date parsing failed, using safe fallback behavior")
@@ -158,9 +174,12 @@ class GameStateManager:
                     'is_finale': False
                 }
 
-            # Check CRITERIA_REGION for Finale stage detection
+            # Check CRITERIA_REGION for Finale stage detection, unless this career is known to be
+            # far from the Finale, which cannot be reached in one turn
+            known_early = (date_parsed and 0 < self.last_absolute_day < FINALE_CHECK_FROM_DAY
+                           and current_date.get('absolute_day', 0) < FINALE_CHECK_FROM_DAY)
             if year != "Finale Season":
-                finale_day = detect_finale_stage()
+                finale_day = None if known_early else detect_finale_stage()
                 if finale_day is not None:
                     print(f"[INFO] Finale stage detected via CRITERIA_REGION: Day {finale_day}")
                     year = "Finale Season"
@@ -189,6 +208,8 @@ class GameStateManager:
                 'energy_max': energy_max,
                 'current_date': current_date
             }
+            if date_parsed:
+                self.last_absolute_day = current_date.get('absolute_day', 0)
 
             return self.current_state
 
@@ -229,6 +250,15 @@ class DecisionEngine:
         self.date_turn = {}
         self._friend_event_date = -1  # -1 = unknown; 0-4 = date index
         self._last_best_train_score = 0.0
+        self._last_mood = None
+        self._last_absolute_day = 0
+        self._last_stats = None
+        self._last_decision = None
+        self.career_completed = False
+
+    def _sleep(self, seconds: float):
+        """Wait for UI transitions"""
+        time.sleep(seconds)
 
     def _stopped(self) -> bool:
         """Check if bot should stop"""
@@ -250,24 +280,33 @@ class DecisionEngine:
         if self._stopped():
             return False
         self.controller.training_handler.go_to_training()
-        time.sleep(0.5)
+        self._sleep(0.5)
         if self._stopped():
             return False
         self.controller.training_handler.execute_training(training_key)
+        self._last_decision = f"{label}: {training_key.upper()}"
         self._log(f"{label}: {training_key.upper()}")
         return True
 
+    def _start_race_flow(self, allow_continuous_racing: bool, **kwargs) -> bool:
+        """Start the race flow, noting the decision when a race was found"""
+        race_found = self.controller.race_handler.start_race_flow(
+            allow_continuous_racing=allow_continuous_racing, **kwargs)
+        if race_found:
+            self._last_decision = "Race"
+            self.controller.training_handler.invalidate_scan()
+        return race_found
+
     def _try_race_or_rest(self, allow_continuous_racing: bool, energy_percentage: int,
                           strategy_settings: Dict[str, Any], current_date: Dict[str, Any],
                           gui=None, back_log: str = "") -> bool:
         """Try to race; if race not found, click back and rest. Returns True."""
-        race_found = self.controller.race_handler.start_race_flow(
-            allow_continuous_racing=allow_continuous_racing)
+        race_found = self._start_race_flow(allow_continuous_racing)
         if race_found:
             return True
         if not self._stopped():
             self._click_back_button(back_log)
-            time.sleep(0.5)
+            self._sleep(0.5)
             self._handle_rest_case(energy_percentage, strategy_settings, current_date, gui,
                                    click_back=False, click_log="")
         return True
@@ -277,29 +316,53 @@ class DecisionEngine:
                                        current_date: Dict[str, Any], race_manager,
                                        gui=None, back_log: str = "") -> bool:
         """Try to race; if race not found, click back and fall through to training flow."""
-        race_found = self.controller.race_handler.start_race_flow(
-            allow_continuous_racing=allow_continuous_racing)
+        race_found = self._start_race_flow(allow_continuous_racing)
         if race_found:
             return True
         if self._stopped():
             return False
         self._click_back_button(back_log)
-        time.sleep(0.5)
+        self._sleep(0.5)
         return self._execute_training_flow(energy_percentage, energy_max, strategy_settings,
                                            current_date, race_manager, gui)
 
+    def _scan_training(self, energy_percentage: int, energy_max: int):
+        """
+        Scan the training options, reusing this turn's earlier scan when an action was aborted
+
+        Returns:
+            (results_training, current_stats), or None if the training screen could not be opened
+        """
+        training_handler = self.controller.training_handler
+        cached = training_handler.cached_scan(energy_percentage)
+        if cached is not None:
+            self._log("Reusing this turn's training scan")
+            self._last_stats = cached[1]
+            return cached
+
+        if not training_handler.go_to_training():
+            self._log("Could not open the training screen")
+            return None
+
+        self._sleep(0.5)
+        if self._stopped():
+            return {}, None
+
+        results_training, current_stats = training_handler.check_all_training(energy_percentage, energy_max)
+        self._last_stats = current_stats
+        return results_training, current_stats
+
     def _execute_training_flow(self, energy_percentage: int, energy_max: int, strategy_settings: Dict[str, Any],
                                current_date: Dict[str, Any], race_manager, gui=None) -> bool:
         """Execute complete training flow: check options, make decision, execute training or rest"""
-        if not self.controller.training_handler.go_to_training():
-            print('not go_to_training')
+        scan = self._scan_training(energy_percentage, energy_max)
+        if scan is None:
             return True
 
         if self._stopped():
             return False
 
-        time.sleep(0.5)
-        results_training, current_stats = self.controller.training_handler.check_all_training(energy_percentage, energy_max)
+        results_training, current_stats = scan
 
         if results_training:
             self._last_best_train_score = max(
@@ -317,13 +380,35 @@ class DecisionEngine:
             current_date,
             current_stats=current_stats
         )
-        print(f'best_training: {best_training}')
+        log.debug("best_training: %s", best_training)
+        self._log_planner_recommendation(results_training, best_training, energy_percentage,
+                                         current_date, race_manager)
         return self._handle_training_decision(
             best_training, results_training, energy_percentage,
             strategy_settings, current_date, race_manager, gui,
             current_stats=current_stats
         )
 
+    def _log_planner_recommendation(self, results_training: Dict, best_training: Optional[str],
+                                    energy_percentage: int, current_date: Dict[str, Any], race_manager):
+        """Log the lookahead planner's choice next to the greedy one when the planner is enabled"""
+        try:
+            from core.planner import get_planner
+            planner = get_planner()
+            if planner is None or not results_training:
+                return
+
+            plan = planner.plan(results_training, current_date, energy_percentage,
+                                self._last_mood, race_manager)
+            if plan is None:
+                return
+
+            greedy = best_training.upper() if best_training else "NONE"
+            self._log(f"Planner: {plan.label()} (greedy: {greedy}) - depth {plan.depth}, "
+                      f"{plan.elapsed_ms:.0f} ms")
+        except Exception as e:
+            print(f"[WARNING] Lookahead planner failed: {e}")
+
     def _handle_training_decision(self, best_training: str, results_training: Dict,
                                   energy_percentage: int, strategy_settings: Dict[str, Any],
                                   current_date: Dict[str, Any], race_manager, gui=None,
@@ -387,7 +472,7 @@ class DecisionEngine:
                 if self._stopped():
                     return False
 
-                race_found = self.controller.race_handler.start_race_flow(
+                race_found = self._start_race_flow(
                     allow_continuous_racing=allow_continuous_racing
                 )
 
@@ -397,7 +482,7 @@ class DecisionEngine:
                     if self._stopped():
                         return False
                     self._click_back_button("Race not found in game, resting instead")
-                    time.sleep(0.5)
+                    self._sleep(0.5)
 
         # No race available or race failed - rest
         return self._handle_rest_case(energy_percentage, strategy_settings, current_date, gui)
@@ -440,10 +525,12 @@ class DecisionEngine:
 
         if click_back:
             self._click_back_button(click_log)
-            time.sleep(0.5)
+            self._sleep(0.5)
 
         strategy_context = strategy_settings.get('priority_strategy', '')
         self.controller.rest_handler.execute_rest(strategy_context=strategy_context)
+        self.controller.training_handler.invalidate_scan()
+        self._last_decision = "Rest"
         return True
 
     def _handle_no_suitable_training(self, results_training: Dict, energy_percentage: int,
@@ -470,7 +557,7 @@ class DecisionEngine:
                 if self._stopped():
                     return False
 
-                race_found = self.controller.race_handler.start_race_flow(
+                race_found = self._start_race_flow(
                     allow_continuous_racing=allow_continuous_racing
                 )
 
@@ -481,7 +568,7 @@ class DecisionEngine:
                     if self._stopped():
                         return False
                     self._click_back_button("Race not found in game, proceeding to fallback training")
-                    time.sleep(0.5)
+                    self._sleep(0.5)
 
         # Try fallback training if we have normal energy and no race (or race failed)
         if energy_percentage >= MINIMUM_ENERGY_PERCENTAGE and results_training:
@@ -509,14 +596,30 @@ class DecisionEngine:
                       race_manager, gui=None) -> bool:
         """Make training/racing decision based on current game state"""
         self._last_best_train_score = 0.0
+        self._last_decision = None
+        self._last_mood = game_state.get('mood')
         self.date_turn = game_state['turn']
         current_date = game_state.get('current_date', {})
         absolute_day = current_date.get('absolute_day', 0)
 
+        # The day counter only goes back when a new career has started
+        if 0 < absolute_day < self._last_absolute_day:
+            self.start_new_career()
+        # A retried turn shows the same day again and is only counted once
+        if absolute_day > self._last_absolute_day:
+            get_metrics().inc("turns_total")
+        if absolute_day > 0:
+            self._last_absolute_day = absolute_day
+
         year_txt = game_state['year']
         turn = game_state['turn']
         print(f'{year_txt} - {turn}')
 
+        # Training scans are reused only within this turn
+        self.controller.training_handler.begin_turn((
+            year_txt, current_date.get('month'), current_date.get('period'), absolute_day, turn
+        ))
+
         # Handle URA Finale
         if game_state['year'] == "Finale Season":
             stop_on_ura_final = strategy_settings.get('stop_on_ura_final', False)
@@ -525,7 +628,13 @@ class DecisionEngine:
                 self._log("URA Finale detected - Starting finale race")
                 if self._stopped():
                     return False
-                return self.controller.race_handler.handle_race_day(is_ura_final=True)
+                self._last_decision = "URA Finale Race"
+                raced = self.controller.race_handler.handle_race_day(is_ura_final=True)
+                self.controller.training_handler.invalidate_scan()
+                if raced and absolute_day >= 75 and not self.career_completed:
+                    get_metrics().inc("careers_completed_total")
+                    self.finish_career()
+                return raced
             elif stop_on_ura_final:
                 return self._stop_bot(gui, "URA Final reached - Stopping bot")
 
@@ -546,11 +655,14 @@ class DecisionEngine:
                 event_settings = gui.get_event_choice_settings()
                 style_settings = event_settings.get('debut_style', {'style': 'none'})
 
-            return self.controller.race_handler.handle_race_day(
+            self._last_decision = "Race Day"
+            raced = self.controller.race_handler.handle_race_day(
                 is_ura_final=False,
                 style_settings=style_settings,
                 is_pre_debut=is_pre_debut
             )
+            self.controller.training_handler.invalidate_scan()
+            return raced
 
         if self._stopped():
             return False
@@ -584,14 +696,15 @@ class DecisionEngine:
                 race_data = race_manager.get_race_by_name(scheduled_race.get('name', ''))
                 if race_data:
                     scheduled_grade = _grade_map.get(race_data.get('grade', ''), None)
-            race_found = self.controller.race_handler.start_race_flow(
+            race_found = self._start_race_flow(
                 allow_continuous_racing=allow_continuous_racing,
-                scheduled_grade=scheduled_grade)
+                scheduled_grade=scheduled_grade,
+                scheduled_name=scheduled_race.get('name'))
             if race_found:
                 return True
             # Race not found in game, fall through to normal flow
             self._click_back_button("Preferred race not found in game, proceeding normally")
-            time.sleep(0.5)
+            self._sleep(0.5)
 
         if "G1 (no training)" in priority_strategy:
             return self._handle_race_priority_strategy(game_state, strategy_settings, race_manager, gui)
@@ -603,12 +716,12 @@ class DecisionEngine:
             return energy_action
 
         if self._should_prioritize_racing(current_date, energy_percentage, priority_strategy, race_manager):
-            race_found = self.controller.race_handler.start_race_flow(allow_continuous_racing=allow_continuous_racing)
+            race_found = self._start_race_flow(allow_continuous_racing=allow_continuous_racing)
             if race_found:
                 return True
             else:
                 self._click_back_button("Matching race not found in game. Proceeding to training.")
-                time.sleep(0.5)
+                self._sleep(0.5)
 
         if self._stopped():
             return False
@@ -628,14 +741,10 @@ class DecisionEngine:
             return self._navigate_and_train("wit", "Last Day Training")
 
         # Normal energy: go to training, score all options
-        if not self.controller.training_handler.go_to_training():
+        scan = self._scan_training(energy_percentage, energy_max)
+        if scan is None:
             return True
-
-        time.sleep(0.5)
-        if self._stopped():
-            return False
-
-        results_training, current_stats = self.controller.training_handler.check_all_training(energy_percentage, energy_max)
+        results_training, current_stats = scan
 
         if self._stopped():
             return False
@@ -688,6 +797,8 @@ class DecisionEngine:
                 if self._stopped():
                     return False
                 self.controller.rest_handler.execute_recreation()
+                self.controller.training_handler.invalidate_scan()
+                self._last_decision = "Recreation"
                 return True
 
         return True
@@ -738,7 +849,7 @@ class DecisionEngine:
         if not self.controller.training_handler.go_to_training():
             return None
 
-        time.sleep(0.5)
+        self._sleep(0.5)
 
         if self._stopped():
             return False
@@ -758,7 +869,7 @@ class DecisionEngine:
 
         # WIT doesn't meet score - back and check race
         self._click_back_button(f"Medium energy ({energy_percentage}%) - WIT doesn't meet score requirement")
-        time.sleep(0.5)
+        self._sleep(0.5)
 
         if self._stopped():
             return False
@@ -878,7 +989,7 @@ class DecisionEngine:
 
     def _click_back_button(self, text=""):
         """Click back button with logging"""
-        time.sleep(0.5)
+        self._sleep(0.5)
         enhanced_click(
             "assets/buttons/back_btn.png",
             text=text,
@@ -891,6 +1002,42 @@ class DecisionEngine:
         """Reset friend event date state at bot start"""
         self._friend_event_date = -1
 
+    def start_new_career(self):
+        """Drop state carried over from the previous career"""
+        self.reset_friend_event_date()
+        self._last_absolute_day = 0
+        self.controller.event_choice_handler.start_career()
+        self.career_completed = False
+        get_career_checkpoint().clear()
+
+    def finish_career(self):
+        """The final race has been run, so there is nothing left to resume"""
+        self.career_completed = True
+        get_career_checkpoint().clear()
+
+    def restore_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Continue from a career checkpoint instead of starting cold"""
+        self._friend_event_date = checkpoint.get('friend_event_date', -1)
+        self._last_best_train_score = checkpoint.get('best_train_score') or 0.0
+        self._last_mood = checkpoint.get('mood')
+        self._last_absolute_day = checkpoint.get('absolute_day', 0)
+        self._last_stats = checkpoint.get('stats')
+        self._last_decision = checkpoint.get('decision')
+        self.career_completed = False
+
+    def record_turn(self, game_state: Dict[str, Any], race_manager):
+        """Write this turn to the career checkpoint"""
+        if self.career_completed:
+            return
+        get_career_checkpoint().record_turn(
+            game_state,
+            stats=self._last_stats,
+            decision=self._last_decision,
+            friend_event_date=self._friend_event_date,
+            best_train_score=self._last_best_train_score,
+            scheduled_races=getattr(race_manager, 'preferred_races', None)
+        )
+
     def _load_frd_dates(self) -> Optional[list]:
         """Load dates config from the frd support card JSON file in current deck"""
         from utils.constants import CURRENT_DECK
@@ -982,14 +1129,14 @@ class DecisionEngine:
         # Need to be at lobby to check the active icon
         if click_back:
             self._click_back_button(click_log)
-            time.sleep(0.5)
+            self._sleep(0.5)
 
         if self._stopped():
             return False
 
         # Check if friend event active icon is visible in Recreation Region
         active_matches = match_template("assets/ui/friend_event_active.png",
-                                        region=RECREATION_REGION)
+                                        region=get_current_regions()['RECREATION_REGION'])
         if not active_matches:
             self._log("[FRIEND] No active friend event icon detected")
             return None
@@ -1008,7 +1155,7 @@ class DecisionEngine:
         if self._stopped():
             return False
 
-        time.sleep(1)
+        self._sleep(1)
 
         # Detect current date from date images (date_0 = date 1, ..., date_4 = date 5)
         date_paths = [
@@ -1087,8 +1234,7 @@ class DecisionEngine:
         # Click the detected date to do the friend event
         self._log(f"[FRIEND] Doing date {detected_idx + 1} event")
         date_x, date_y, date_w, date_h = date_match
-        pyautogui.moveTo(date_x + date_w // 2, date_y + date_h // 2, duration=0.15)
-        pyautogui.click()
+        get_input_executor().click(date_x + date_w // 2, date_y + date_h // 2, duration=0.15)
         return True
 
 
@@ -1112,8 +1258,12 @@ class MainExecutor:
             if self.controller.check_should_stop():
                 return False
 
+            metrics = get_metrics()
+
             # Priority 1: Handle UI elements first (including event choices)
-            if self.event_handler.handle_ui_elements(gui):
+            with metrics.time_stage("ui_elements"):
+                handled_ui = self.event_handler.handle_ui_elements(gui)
+            if handled_ui:
                 return True
 
             # Priority 2: Check if we're in career lobby
@@ -1134,7 +1284,8 @@ class MainExecutor:
                 return False
 
             # Update game state (only if in lobby)
-            game_state = self.game_state_manager.update_game_state()
+            with metrics.time_stage("game_state"):
+                game_state = self.game_state_manager.update_game_state()
             year_txt = game_state['year']
             print(f'{year_txt}')
             # Check stop conditions immediately after getting game state
@@ -1168,7 +1319,9 @@ class MainExecutor:
                 return False
 
             # Make training/racing decisions (only if in lobby)
-            self.decision_engine.make_decision(game_state, strategy_settings, race_manager, gui)
+            with metrics.time_stage("decision"):
+                self.decision_engine.make_decision(game_state, strategy_settings, race_manager, gui)
+            self.decision_engine.record_turn(game_state, race_manager)
 
             time.sleep(1)
             return True
@@ -1177,6 +1330,42 @@ class MainExecutor:
             self.controller.log_message(f"Error in main iteration: {e}")
             return False
 
+    def warm_restart(self, race_manager) -> bool:
+        """
+        Resume from the last career checkpoint
+
+        Returns:
+            True if a checkpoint was restored, False for a cold start
+        """
+        checkpoint = get_career_checkpoint().latest()
+        if not checkpoint or checkpoint.get('absolute_day', 0) <= 0:
+            return False
+
+        self.decision_engine.restore_checkpoint(checkpoint)
+        self.game_state_manager.last_absolute_day = checkpoint['absolute_day']
+        if not race_manager.preferred_races and checkpoint.get('scheduled_races'):
+            race_manager.set_preferred_races(checkpoint['scheduled_races'])
+
+        last_turn = f"Day {checkpoint['absolute_day']} ({checkpoint.get('year')})"
+        if checkpoint.get('decision'):
+            last_turn += f", last action: {checkpoint['decision']}"
+        self.controller.log_message(f"Resuming career from checkpoint: {last_turn}")
+        return True
+
+    def start_run(self, race_manager):
+        """Prepare a bot run: resume the interrupted career if there is one, otherwise start cold"""
+        self.controller.set_stop_flag(False)
+        # Commands queued after a stop are dropped instead of clicking on
+        get_input_executor().set_stop_check(self.controller.check_should_stop)
+        if not self.warm_restart(race_manager):
+            self.decision_engine.reset_friend_event_date()
+            self.controller.event_choice_handler.start_career()
+
+    def end_run(self):
+        """The bot stopped: keep the checkpoint so the next start resumes the career"""
+        get_location_cache().flush()
+        get_input_executor().set_stop_check(None)
+
     def _handle_career_completion(self, gui) -> bool:
         """Handle career completion scenario"""
         self.controller.log_message("🎉 CAREER COMPLETED! Finale Season detected.")
@@ -1270,9 +1459,6 @@ def career_lobby(gui=None):
     if _main_executor is None:
         initialize_executor()
 
-    _main_executor.controller.set_stop_flag(False)
-    _main_executor.decision_engine.reset_friend_event_date()
-
     race_manager = RaceManager()
 
     if gui:
@@ -1286,6 +1472,10 @@ def career_lobby(gui=None):
         except Exception as e:
             print(f"[WARNING] Could not load race schedule: {e}")
 
+    # A checkpoint means the career was interrupted: keep its state instead of starting cold
+    _main_executor.start_run(race_manager)
+
+    if gui:
         while gui.is_running and not _main_executor.controller.should_stop:
             if not gui.is_running or _main_executor.controller.should_stop:
                 break
@@ -1293,6 +1483,8 @@ def career_lobby(gui=None):
             if not _main_executor.execute_single_iteration(race_manager, gui):
                 time.sleep(1)
 
+        _main_executor.end_run()
+
 
 
 def focus_umamusume():
@@ -1308,6 +1500,7 @@ def focus_umamusume():
         win.activate()
         win.maximize()
         time.sleep(0.5)
+        get_game_window().refresh(force=True)
     except Exception as e:
         print(f"Error focusing Umamusume window: {e}")
 
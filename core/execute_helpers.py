@@ -1,7 +1,9 @@
-import pyautogui
 import time
 from typing import Dict, Any, Callable
 from core.race_handler import RaceHandler
+from core.location_cache import locate_center_on_screen, locate_on_screen, locate_with_prior
+from core.metrics import get_metrics
+from core.input_executor import get_input_executor
 
 
 class EventHandler:
@@ -56,14 +58,15 @@ class EventHandler:
 
     def _handle_cancel_button(self, gui=None) -> bool:
         """Handle cancel button with warning detection"""
-        cancel_btn = pyautogui.locateCenterOnScreen("assets/buttons/cancel_btn.png", confidence=0.8,
-                                                    minSearchTime=0.2)
+        cancel_btn = locate_center_on_screen("assets/buttons/cancel_btn.png", confidence=0.8,
+                                             min_search_time=0.2)
         if not cancel_btn:
             return False
         else:
-            try_again_btn = pyautogui.locateCenterOnScreen("assets/buttons/try_again_btn.png", confidence=0.95,
-                                                      minSearchTime=0.2)
+            try_again_btn = locate_center_on_screen("assets/buttons/try_again_btn.png", confidence=0.95,
+                                                    min_search_time=0.2)
             if try_again_btn:
+                get_metrics().inc("race_failures_total")
                 self.controller.log_message("⚠ Race Failed !")
 
                 # self.controller.log_message("⚠️ Failed Race Day - Trying again!")
@@ -78,8 +81,8 @@ class EventHandler:
 
             if stop_on_warning:
                 if cancel_btn:
-                    race_btn = pyautogui.locateCenterOnScreen("assets/buttons/race_btn.png", confidence=0.8,
-                                                              minSearchTime=0.2)
+                    race_btn = locate_center_on_screen("assets/buttons/race_btn.png", confidence=0.8,
+                                                       min_search_time=0.2)
                     if race_btn:
                         self.controller.log_message("⚠️ Warning detected - Stopping bot")
                         if gui:
@@ -142,11 +145,13 @@ class EventHandler:
 
                     return True
                 else:
+                    get_metrics().inc("event_fallbacks_total", reason="not_handled")
                     self.controller.log_message("🎭 Could not handle event automatically - using fallback choice 1")
                     return self.controller.event_choice_handler.click_choice(1)
 
         except Exception as e:
             self.controller.log_message(f"[ERROR] Event choice handling failed: {e}")
+            get_metrics().inc("event_fallbacks_total", reason="error")
             return self.controller.event_choice_handler.click_choice(1)
 
     def _click(self, img, confidence=0.8, minSearch=1.0, click_count=1, text=""):
@@ -157,7 +162,11 @@ class EventHandler:
         if not self.controller.is_game_window_active():
             return False
 
-        btn = pyautogui.locateCenterOnScreen(img, confidence=confidence, minSearchTime=minSearch)
+        # Check the learned position first, then fall back to a full screen search
+        btn_region = locate_with_prior(img, confidence=confidence, full_search=False)
+        if not btn_region:
+            btn_region = locate_on_screen(img, confidence=confidence, min_search_time=minSearch, use_prior=False)
+        btn = (btn_region[0] + btn_region[2] // 2, btn_region[1] + btn_region[3] // 2) if btn_region else None
         if btn:
             if click_count==0:
                 return True
@@ -165,8 +174,7 @@ class EventHandler:
                 self.controller.log_message(text)
             if self.controller.check_should_stop():
                 return False
-            pyautogui.moveTo(btn, duration=0.175)
-            pyautogui.click(clicks=click_count)
+            get_input_executor().click(btn, clicks=click_count, interval=0.1, duration=0.175)
             return True
 
         return False
@@ -218,10 +226,10 @@ class CareerLobbyManager:
 
     def verify_lobby_state(self, gui=None) -> bool:
         """Verify if currently in career lobby"""
-        tazuna_hint = pyautogui.locateCenterOnScreen(
+        tazuna_hint = locate_center_on_screen(
             "assets/ui/tazuna_hint.png",
             confidence=0.8,
-            minSearchTime=0.2
+            min_search_time=0.2
         )
 
         if tazuna_hint is None:
@@ -245,14 +253,14 @@ class CareerLobbyManager:
         """Handle character debuff status"""
         from core.recognizer import is_infirmary_active
 
-        debuffed = pyautogui.locateOnScreen(
+        debuffed = locate_on_screen(
             "assets/buttons/infirmary_btn2.png",
             confidence=0.9,
-            minSearchTime=1
+            min_search_time=1
         )
 
         if debuffed:
-            if is_infirmary_active((debuffed.left, debuffed.top, debuffed.width, debuffed.height)):
+            if is_infirmary_active(debuffed):
                 if (gui and gui.get_current_settings().get('enable_stop_conditions', False) and
                         gui.get_current_settings().get('stop_on_infirmary', False)):
                     from core.state import get_current_date_info
@@ -266,7 +274,7 @@ class CareerLobbyManager:
 
                 if self.controller.check_should_stop():
                     return False
-                pyautogui.click(debuffed)
+                get_input_executor().click(debuffed[0] + debuffed[2] // 2, debuffed[1] + debuffed[3] // 2)
                 self.controller.log_message("Character has debuff, go to infirmary instead.")
                 self.controller.reset_career_lobby_counter()
                 return True
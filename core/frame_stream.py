@@ -0,0 +1,142 @@
+"""
+Frame Stream
+One shared capture of the game window that every template check in a poll tick reads from
+"""
+
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import ImageGrab
+
+from core.game_window import get_game_window
+from core.input_executor import settle_input
+from core.recognizer import match_screen
+
+DEFAULT_MAX_AGE = 0.1
+CHANGE_SAMPLE_STEP = 8
+CHANGE_THRESHOLD = 4.0
+
+
+class Frame:
+    """A BGR capture of a screen region and when it was taken"""
+
+    __slots__ = ('image', 'region', 'captured_at', '_thumbnail')
+
+    def __init__(self, image, region: Tuple[int, int, int, int], captured_at: float):
+        self.image = image
+        self.region = region
+        self.captured_at = captured_at
+        self._thumbnail = None
+
+    @property
+    def age(self) -> float:
+        return time.perf_counter() - self.captured_at
+
+    def thumbnail(self):
+        """Subsampled grayscale copy used for cheap change detection"""
+        if self._thumbnail is None:
+            gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+            self._thumbnail = gray[::CHANGE_SAMPLE_STEP, ::CHANGE_SAMPLE_STEP].astype(np.int16)
+        return self._thumbnail
+
+    def differs_from(self, other: "Frame", threshold: float = CHANGE_THRESHOLD) -> bool:
+        """Whether the picture changed noticeably since another frame"""
+        a, b = self.thumbnail(), other.thumbnail()
+        if a.shape != b.shape:
+            return True
+        return float(np.abs(a - b).mean()) >= threshold
+
+    def crop(self, region: Tuple[int, int, int, int]):
+        """BGR pixels of a (left, top, width, height) screen region, or None unless it lies fully in the frame"""
+        left, top, width, height = self.region
+        r_left, r_top, r_width, r_height = region
+        if r_left < left or r_top < top or r_left + r_width > left + width or r_top + r_height > top + height:
+            return None
+        return self.image[r_top - top:r_top - top + r_height, r_left - left:r_left - left + r_width]
+
+    def find(self, template_path: str, region: Optional[Tuple[int, int, int, int]] = None,
+             confidence: float = 0.8, return_confidence: bool = False) -> List[Tuple]:
+        """
+        Match a template in this frame
+
+        Args:
+            template_path: Path to the template image
+            region: Optional (left, top, width, height) screen region to limit the search to
+            confidence: Template matching confidence (0-1)
+            return_confidence: Append each match's score to its box
+
+        Returns:
+            Boxes (x, y, w, h) in screen coordinates, or (x, y, w, h, score) with return_confidence
+        """
+        left, top, width, height = self.region
+        image = self.image
+        origin = (left, top)
+        if region:
+            r_left, r_top = max(region[0], left), max(region[1], top)
+            r_right = min(region[0] + region[2], left + width)
+            r_bottom = min(region[1] + region[3], top + height)
+            if r_right <= r_left or r_bottom <= r_top:
+                return []
+            image = image[r_top - top:r_bottom - top, r_left - left:r_right - left]
+            origin = (r_left, r_top)
+        return match_screen(image, origin, template_path, threshold=confidence,
+                            return_confidence=return_confidence)
+
+
+class FrameStream:
+    """
+    Captures the game window at most once per max_age and hands the same frame to every reader,
+    so checking several screens in one tick costs one capture instead of one per template
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._frame: Optional[Frame] = None
+
+    def _capture_region(self) -> Tuple[int, int, int, int]:
+        region = get_game_window().get_client_region()
+        if region:
+            return region
+        import pyautogui
+        width, height = pyautogui.size()
+        return (0, 0, width, height)
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Frame]:
+        """
+        The current frame, captured again when older than max_age, when the window moved or when
+        it was taken before the last mouse action landed
+        """
+        max_age = self.max_age if max_age is None else max_age
+        settled_at = settle_input()
+        region = self._capture_region()
+        with self._lock:
+            frame = self._frame
+            if (frame is not None and frame.region == region and frame.age <= max_age
+                    and frame.captured_at >= settled_at):
+                return frame
+            try:
+                left, top, width, height = region
+                image = np.array(ImageGrab.grab(bbox=(left, top, left + width, top + height)))
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            except Exception as e:
+                print(f"[ERROR] Failed to capture frame: {e}")
+                return None
+            self._frame = Frame(image, region, time.perf_counter())
+            return self._frame
+
+    def invalidate(self):
+        """Drop the cached frame, e.g. right after a click changed the screen"""
+        with self._lock:
+            self._frame = None
+
+
+_frame_stream = FrameStream()
+
+
+def get_frame_stream() -> FrameStream:
+    """Get the shared frame stream"""
+    return _frame_stream
@@ -0,0 +1,199 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+import pygetwindow as gw
+
+try:
+    import win32gui
+except ImportError:
+    win32gui = None
+
+GAME_WINDOW_TITLES = ["Umamusume", "ウマ娘", "Uma Musume", "DMM GAME PLAYER"]
+GAME_WINDOW_KEYWORDS = ['uma', 'ウマ', 'dmm']
+# Regions saved as two points (x1, y1, x2, y2) rather than (left, top, width, height)
+POINT_PAIR_REGIONS = ('ENERGY_BAR',)
+
+
+class GameWindowContext:
+    """Shared handle to the game window and its client area on the desktop"""
+
+    def __init__(self, refresh_interval: float = 0.5):
+        self.refresh_interval = refresh_interval
+        self.window = None
+        self.title = ""
+        self.client_rect: Optional[Tuple[int, int, int, int]] = None
+        self.reference_origin: Optional[Tuple[int, int]] = None
+        self.pinned = False
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+
+    def find_window(self, allow_fallback: bool = False):
+        """Search for the game window by known titles"""
+        for title in GAME_WINDOW_TITLES:
+            try:
+                windows = gw.getWindowsWithTitle(title)
+                if windows:
+                    return windows[0], title
+            except Exception:
+                continue
+
+        if allow_fallback:
+            try:
+                game_windows = [w for w in gw.getAllWindows()
+                                if any(keyword in w.title.lower() for keyword in GAME_WINDOW_KEYWORDS)
+                                and w.title.strip()]
+                if game_windows:
+                    return game_windows[0], game_windows[0].title
+            except Exception:
+                pass
+
+        return None, ""
+
+    def attach(self, window, title: str = "", pin: bool = False):
+        """
+        Use an already located window as the game window
+
+        Args:
+            window: pygetwindow window
+            title: Title the window was found by
+            pin: Keep this window even if it disappears, instead of searching by title again
+        """
+        with self._lock:
+            self.window = window
+            self.title = title or getattr(window, 'title', "")
+            self.pinned = pin
+        self.refresh(force=True)
+
+    def _read_client_rect(self, window) -> Optional[Tuple[int, int, int, int]]:
+        """Read the window's client area as (left, top, width, height) in screen coordinates"""
+        hwnd = getattr(window, '_hWnd', None)
+        if win32gui and hwnd:
+            try:
+                _, _, width, height = win32gui.GetClientRect(hwnd)
+                left, top = win32gui.ClientToScreen(hwnd, (0, 0))
+                return (left, top, width, height)
+            except Exception:
+                pass
+
+        try:
+            return (window.left, window.top, window.width, window.height)
+        except Exception:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-resolve the client rectangle, reusing the window handle when possible
+
+        Returns:
+            True if the window moved or was resized since the last refresh
+        """
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return False
+            self._last_refresh = now
+
+            rect = self._read_client_rect(self.window) if self.window is not None else None
+            if (rect is None or rect[2] <= 0 or rect[3] <= 0) and not self.pinned:
+                self.window, self.title = self.find_window()
+                rect = self._read_client_rect(self.window) if self.window is not None else None
+
+            if rect is None or rect[2] <= 0 or rect[3] <= 0:
+                self.client_rect = None
+                return False
+
+            changed = self.client_rect is not None and rect != self.client_rect
+            self.client_rect = rect
+            if self.reference_origin is None:
+                self.reference_origin = (rect[0], rect[1])
+            return changed
+
+    def is_available(self) -> bool:
+        """Check if the game window exists"""
+        self.refresh()
+        return self.client_rect is not None
+
+    def get_client_region(self) -> Optional[Tuple[int, int, int, int]]:
+        """Get the client area as a (left, top, width, height) capture region"""
+        self.refresh()
+        return self.client_rect
+
+    def get_offset(self) -> Tuple[int, int]:
+        """Get how far the client area has moved from where regions were calibrated"""
+        self.refresh()
+        if self.client_rect is None or self.reference_origin is None:
+            return (0, 0)
+        return (self.client_rect[0] - self.reference_origin[0],
+                self.client_rect[1] - self.reference_origin[1])
+
+    def set_reference_origin(self, origin: Optional[Tuple[int, int]]):
+        """Set the client origin that calibrated regions were measured against"""
+        with self._lock:
+            self.reference_origin = tuple(origin) if origin else None
+
+    def _origins(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Calibration origin and current client origin"""
+        self.refresh()
+        reference = self.reference_origin or (0, 0)
+        origin = (self.client_rect[0], self.client_rect[1]) if self.client_rect else reference
+        return reference, origin
+
+    @staticmethod
+    def _map_point(x: int, y: int, reference, origin, scale: float) -> Tuple[int, int]:
+        return (int(round((x - reference[0]) * scale)) + origin[0],
+                int(round((y - reference[1]) * scale)) + origin[1])
+
+    def to_screen_region(self, region: Tuple[int, int, int, int], scale: float = 1.0) -> Tuple[int, int, int, int]:
+        """Map a calibrated (left, top, width, height) region to current screen coordinates"""
+        reference, origin = self._origins()
+        left, top, width, height = region
+        return self._map_point(left, top, reference, origin, scale) + (int(round(width * scale)),
+                                                                       int(round(height * scale)))
+
+    def to_screen_point_pair(self, points: Tuple[int, int, int, int], scale: float = 1.0) -> Tuple[int, int, int, int]:
+        """Map a calibrated (x1, y1, x2, y2) pair of points, such as the ends of the energy bar"""
+        reference, origin = self._origins()
+        x1, y1, x2, y2 = points
+        return (self._map_point(x1, y1, reference, origin, scale) +
+                self._map_point(x2, y2, reference, origin, scale))
+
+    def to_screen_regions(self, regions: dict, scale: float = 1.0) -> dict:
+        """Map a region settings dict, including nested region groups"""
+        mapped = {}
+        for key, value in regions.items():
+            if isinstance(value, dict):
+                mapped[key] = self.to_screen_regions(value, scale)
+            elif key in POINT_PAIR_REGIONS:
+                mapped[key] = self.to_screen_point_pair(value, scale)
+            else:
+                mapped[key] = self.to_screen_region(value, scale)
+        return mapped
+
+    def to_screen_point(self, x: int, y: int, scale: float = 1.0) -> Tuple[int, int]:
+        """Map a calibrated click position to current screen coordinates"""
+        reference, origin = self._origins()
+        return self._map_point(x, y, reference, origin, scale)
+
+
+def find_game_windows():
+    """Find every open game window, as (window, title) pairs without duplicates"""
+    found, seen = [], set()
+    for title in GAME_WINDOW_TITLES:
+        try:
+            for window in gw.getWindowsWithTitle(title):
+                handle = getattr(window, '_hWnd', id(window))
+                if handle not in seen and window.width > 0 and window.height > 0:
+                    seen.add(handle)
+                    found.append((window, title))
+        except Exception:
+            continue
+    return found
+
+
+_game_window = GameWindowContext()
+
+
+def get_game_window() -> GameWindowContext:
+    """Get the shared game window context"""
+    return _game_window
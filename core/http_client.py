@@ -0,0 +1,162 @@
+"""
+HTTP Client
+Keep-alive HTTP(S) connections reused per thread, for the updaters
+"""
+
+import http.client
+import ssl
+import threading
+from typing import Callable, Dict, Optional
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_USER_AGENT = "UmaAutoTrain-Updater"
+DEFAULT_TIMEOUT = 15
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Errors raised when a kept-alive connection was closed by the server between requests
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                            http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+def get_ssl_context():
+    """Get SSL context for HTTPS requests. Uses certifi if available."""
+    try:
+        import certifi
+        return ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        return ctx
+
+
+class HttpResponse:
+    """Status, lower-cased headers and body of a finished request"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, url: str):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class HttpClient:
+    """
+    Small HTTP/1.1 client that keeps one connection per host per thread, so a worker
+    pool reuses its connections instead of opening one per file
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, user_agent: str = DEFAULT_USER_AGENT,
+                 ssl_context=None):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.ssl_context = ssl_context or get_ssl_context()
+        self._local = threading.local()
+        self._all_connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self, scheme: str, host: str, port: Optional[int], fresh: bool = False):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+
+        key = (scheme, host, port)
+        conn = connections.get(key)
+        if conn is not None and not fresh:
+            return conn
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._all_connections:
+                    self._all_connections.remove(conn)
+
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        connections[key] = conn
+        with self._lock:
+            self._all_connections.append(conn)
+        return conn
+
+    def request(self, url: str, method: str = "GET", headers: Optional[Dict[str, str]] = None,
+                sink: Optional[Callable[[int, bytes], None]] = None, chunk_size: int = 65536) -> HttpResponse:
+        """
+        Send a request, following redirects
+
+        Args:
+            url: Absolute http or https URL
+            method: HTTP method
+            headers: Extra request headers, e.g. If-None-Match or Range
+            sink: If given, a successful body is streamed to it as (status, chunk) instead of being returned
+
+        Returns:
+            HttpResponse; body is empty when streamed to sink
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(url, method, headers, sink, chunk_size)
+            location = response.headers.get("location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            return response
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def _send(self, url, method, headers, sink, chunk_size) -> HttpResponse:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        request_headers = {"User-Agent": self.user_agent, "Accept-Encoding": "identity"}
+        request_headers.update(headers or {})
+
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.hostname, parts.port, fresh=attempt > 0)
+            responded = False
+            try:
+                conn.request(method, path, headers=request_headers)
+                resp = conn.getresponse()
+                responded = True
+                response_headers = {key.lower(): value for key, value in resp.getheaders()}
+
+                body = b""
+                if sink is not None and 200 <= resp.status < 300:
+                    while True:
+                        chunk = resp.read(chunk_size)
+                        if not chunk:
+                            break
+                        sink(resp.status, chunk)
+                else:
+                    body = resp.read()
+
+                if resp.will_close:
+                    conn.close()
+                return HttpResponse(resp.status, response_headers, body, url)
+            except _STALE_CONNECTION_ERRORS:
+                # The server dropped the idle connection before answering; retry once on a new one
+                conn.close()
+                if attempt or responded:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def close(self):
+        """Close every connection opened by any thread"""
+        with self._lock:
+            connections, self._all_connections = self._all_connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
@@ -0,0 +1,203 @@
+"""
+Input Executor
+Runs mouse actions on a worker thread so the decision thread can keep reading the screen
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional
+
+import pyautogui
+
+from core.metrics import get_metrics
+
+# Longest a screen capture waits for queued mouse actions to land
+SETTLE_TIMEOUT = 5.0
+
+
+class _InputCommand:
+    """One queued mouse action and the future that reports its completion"""
+
+    __slots__ = ('name', 'func', 'args', 'kwargs', 'always', 'future', 'queued_at')
+
+    def __init__(self, name: str, func: Callable, args: tuple, kwargs: dict, always: bool = False):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.always = always
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+def _point(x, y):
+    """Accept (x, y), a point tuple in x, or no position at all"""
+    if y is None and x is not None and not isinstance(x, (int, float)):
+        x, y = x[0], x[1]
+    return x, y
+
+
+class InputExecutor:
+    """
+    Single worker thread that performs queued mouse commands in order.
+    Each command returns a Future; on stop, pending commands are cancelled except
+    button releases, so the mouse is never left held down.
+    """
+
+    def __init__(self):
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._stop_check: Optional[Callable[[], bool]] = None
+        self._settled_at = 0.0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="InputExecutor", daemon=True)
+            self._thread.start()
+
+    def set_stop_check(self, stop_check: Optional[Callable[[], bool]]):
+        """Set a function checked before each command; when it returns True the queue is cancelled"""
+        self._stop_check = stop_check
+
+    def submit(self, name: str, func: Callable, *args, always: bool = False, **kwargs) -> Future:
+        """Queue a call to run on the input thread"""
+        command = _InputCommand(name, func, args, kwargs, always)
+        with self._condition:
+            self._queue.append(command)
+            self._ensure_thread()
+            self._condition.notify_all()
+        return command.future
+
+    def _worker(self):
+        metrics = get_metrics()
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._busy = False
+                    self._condition.notify_all()
+                    self._condition.wait()
+                command = self._queue.popleft()
+                self._busy = True
+
+            if not command.always and self._stop_check and self._stop_check():
+                self.cancel_pending()
+                command.future.cancel()
+            if not command.future.set_running_or_notify_cancel():
+                continue
+
+            started = time.perf_counter()
+            metrics.observe("input_wait_seconds", started - command.queued_at, action=command.name)
+            try:
+                command.future.set_result(command.func(*command.args, **command.kwargs))
+            except Exception as e:
+                print(f"[WARNING] Input action {command.name} failed: {e}")
+                command.future.set_exception(e)
+            self._settled_at = time.perf_counter()
+            metrics.observe("input_seconds", time.perf_counter() - started, action=command.name)
+
+    def cancel_pending(self) -> int:
+        """Cancel queued commands that have not started; returns how many were dropped"""
+        cancelled = 0
+        with self._condition:
+            kept = deque()
+            while self._queue:
+                command = self._queue.popleft()
+                if command.always:
+                    kept.append(command)
+                elif command.future.cancel():
+                    cancelled += 1
+            self._queue.extend(kept)
+            self._condition.notify_all()
+        return cancelled
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued command has finished"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    @property
+    def settled_at(self) -> float:
+        """perf_counter time at which the last command finished"""
+        return self._settled_at
+
+    def pending(self) -> int:
+        """Number of commands waiting to run"""
+        return len(self._queue)
+
+    # Mouse commands
+
+    def move(self, x, y=None, duration: float = 0.0) -> Future:
+        """Move the cursor"""
+        x, y = _point(x, y)
+        return self.submit("move", pyautogui.moveTo, x, y, duration=duration)
+
+    def click(self, x=None, y=None, clicks: int = 1, interval: float = 0.0, duration: float = 0.0) -> Future:
+        """Move to a position (if given) over duration seconds, then click"""
+        x, y = _point(x, y)
+        return self.submit("click", pyautogui.click, x, y, clicks=clicks, interval=interval, duration=duration)
+
+    def triple_click(self, x=None, y=None, interval: float = 0.1, duration: float = 0.0) -> Future:
+        """Move to a position (if given) and click three times"""
+        return self.click(x, y, clicks=3, interval=interval, duration=duration)
+
+    def mouse_down(self, x=None, y=None, duration: float = 0.0) -> Future:
+        """Press the left button, moving first if a position is given"""
+        x, y = _point(x, y)
+        if x is not None:
+            self.move(x, y, duration=duration)
+        return self.submit("mouse_down", pyautogui.mouseDown)
+
+    def mouse_up(self) -> Future:
+        """Release the left button; runs even after a stop"""
+        return self.submit("mouse_up", pyautogui.mouseUp, always=True)
+
+    def drag(self, x, y=None, duration: float = 0.2) -> Future:
+        """Drag from the current position to a point with the left button held"""
+        x, y = _point(x, y)
+        return self.submit("drag", pyautogui.dragTo, x, y, duration=duration, button='left')
+
+    def scroll(self, amount: int, x=None, y=None, duration: float = 0.0) -> Future:
+        """Scroll, moving to a position first if given"""
+        x, y = _point(x, y)
+        if x is not None:
+            self.move(x, y, duration=duration)
+        return self.submit("scroll", pyautogui.scroll, amount)
+
+
+def wait_for(future: Future, timeout: Optional[float] = None) -> bool:
+    """Wait for a queued command; True if it ran without error, False if it failed or was cancelled"""
+    try:
+        return future.exception(timeout) is None
+    except (CancelledError, FutureTimeoutError):
+        return False
+
+
+def settle_input(timeout: float = SETTLE_TIMEOUT) -> float:
+    """
+    Block until queued mouse actions have landed, so a capture taken next shows their result.
+    Clicks return once queued; every capture that drives the next click goes through here.
+
+    Returns:
+        perf_counter time at which the last mouse action finished
+    """
+    executor = get_input_executor()
+    executor.wait_idle(timeout)
+    return executor.settled_at
+
+
+_input_executor = InputExecutor()
+
+
+def get_input_executor() -> InputExecutor:
+    """Get the shared input executor"""
+    return _input_executor
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pyautogui
+
+from core.metrics import get_metrics
+from core.recognizer import match_template
+
+LOCATION_CACHE_FILE = "location_cache.json"
+# New positions are written at most this often; flush() writes the rest when the bot stops
+SAVE_INTERVAL = 30.0
+
+
+class TemplateLocationCache:
+    """Remember where each template was last found and search there first"""
+
+    def __init__(self, cache_file: str = LOCATION_CACHE_FILE, history_size: int = 3, padding: int = 40,
+                 save_interval: float = SAVE_INTERVAL):
+        self.cache_file = cache_file
+        self.history_size = history_size
+        self.padding = padding
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, List[List[int]]]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._last_save = 0.0
+
+    def _resolution_key(self) -> str:
+        """Key learned positions by screen resolution"""
+        try:
+            width, height = pyautogui.size()
+            return f"{width}x{height}"
+        except Exception:
+            return "unknown"
+
+    def _load(self):
+        """Load learned positions from disk once"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._data = data
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[WARNING] Could not load location cache: {e}")
+            self._data = {}
+
+    def _save(self):
+        """Write learned positions to disk"""
+        self._dirty = False
+        self._last_save = time.monotonic()
+        try:
+            tmp_path = self.cache_file + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"[WARNING] Could not save location cache: {e}")
+
+    def get_history(self, template_path: str) -> List[Tuple[int, int, int, int]]:
+        """Get known boxes for a template, most recent first"""
+        with self._lock:
+            self._load()
+            entries = self._data.get(self._resolution_key(), {}).get(template_path, [])
+            return [tuple(box) for box in entries]
+
+    def record(self, template_path: str, box: Tuple[int, int, int, int]):
+        """Record a hit, moving it to the front of the template's history"""
+        box = [int(v) for v in box[:4]]
+        with self._lock:
+            self._load()
+            templates = self._data.setdefault(self._resolution_key(), {})
+            history = templates.get(template_path, [])
+            if history and history[0] == box:
+                return
+
+            # Treat hits within a few pixels as the same spot
+            history = [old for old in history
+                       if abs(old[0] - box[0]) > 5 or abs(old[1] - box[1]) > 5]
+            templates[template_path] = ([box] + history)[:self.history_size]
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.save_interval:
+                self._save()
+
+    def flush(self):
+        """Write positions recorded since the last save"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def forget(self, template_path: str):
+        """Drop learned positions for a template"""
+        with self._lock:
+            self._load()
+            templates = self._data.get(self._resolution_key(), {})
+            if templates.pop(template_path, None) is not None:
+                self._save()
+
+    def candidate_regions(self, template_path: str,
+                          bounds: Optional[Tuple[int, int, int, int]] = None) -> List[Tuple[int, int, int, int]]:
+        """Build padded (left, top, width, height) windows around known positions"""
+        regions = []
+        for x, y, w, h in self.get_history(template_path):
+            left, top = x - self.padding, y - self.padding
+            right, bottom = x + w + self.padding, y + h + self.padding
+
+            if bounds:
+                b_left, b_top, b_width, b_height = bounds
+                left, top = max(left, b_left), max(top, b_top)
+                right, bottom = min(right, b_left + b_width), min(bottom, b_top + b_height)
+
+            # Window must still fit the whole template
+            if right - left < w or bottom - top < h:
+                continue
+            regions.append((left, top, right - left, bottom - top))
+        return regions
+
+
+_location_cache = TemplateLocationCache()
+
+
+def get_location_cache() -> TemplateLocationCache:
+    """Get the shared location cache"""
+    return _location_cache
+
+
+def locate_with_prior(template_path: str, region: Optional[Tuple[int, int, int, int]] = None,
+                      confidence: float = 0.8, full_search: bool = True,
+                      use_prior: bool = True, count_miss: bool = True) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Find a template by checking its learned positions before the full region
+
+    Args:
+        template_path: Path to the template image
+        region: Optional (left, top, width, height) bounds for the search
+        confidence: Template matching confidence (0-1)
+        full_search: Whether to scan the whole region when the learned positions miss
+        use_prior: Whether to check the learned positions at all
+        count_miss: Whether a failed full search counts as a template miss
+
+    Returns:
+        Box (x, y, w, h) of the first match, or None
+    """
+    windows = _location_cache.candidate_regions(template_path, region) if use_prior else []
+    for window in windows:
+        boxes = match_template(template_path, region=window, threshold=confidence)
+        if boxes:
+            _location_cache.record(template_path, boxes[0])
+            return boxes[0]
+
+    if not full_search:
+        return None
+
+    boxes = match_template(template_path, region=region, threshold=confidence)
+    if boxes:
+        _location_cache.record(template_path, boxes[0])
+        return boxes[0]
+    if count_miss:
+        count_template_miss(template_path)
+    return None
+
+
+def count_template_miss(template_path: str):
+    """Record a lookup that finally failed, after every position and retry was tried"""
+    get_metrics().inc("template_match_misses_total", template=os.path.basename(template_path))
+
+
+def locate_on_screen(template_path: str, region: Optional[Tuple[int, int, int, int]] = None,
+                     confidence: float = 0.8, min_search_time: float = 0.0,
+                     use_prior: bool = True, poll_interval: float = 0.1) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Find a template at the detected game scale, retrying until min_search_time has passed
+
+    Args:
+        template_path: Path to the template image
+        region: Optional (left, top, width, height) bounds for the search
+        confidence: Template matching confidence (0-1)
+        min_search_time: Seconds to keep searching before giving up
+        use_prior: Whether to check the learned positions before each full search
+        poll_interval: Pause between searches
+
+    Returns:
+        Box (x, y, w, h) of the first match, or None
+    """
+    deadline = time.monotonic() + min_search_time
+    while True:
+        box = locate_with_prior(template_path, region=region, confidence=confidence,
+                                use_prior=use_prior, count_miss=False)
+        if box:
+            return box
+        if time.monotonic() >= deadline:
+            count_template_miss(template_path)
+            return None
+        time.sleep(poll_interval)
+
+
+def locate_center_on_screen(template_path: str, region: Optional[Tuple[int, int, int, int]] = None,
+                            confidence: float = 0.8, min_search_time: float = 0.0) -> Optional[Tuple[int, int]]:
+    """Center (x, y) of a template found with locate_on_screen, or None"""
+    box = locate_on_screen(template_path, region=region, confidence=confidence, min_search_time=min_search_time)
+    if not box:
+        return None
+    x, y, w, h = box
+    return (x + w // 2, y + h // 2)
@@ -1,6 +1,10 @@
 import json
 
 from core.state import check_current_year, stat_state
+from utils.log_pipeline import get_logger
+
+log = get_logger()
+cap_log = get_logger("CAP CHECK")
 
 # Global config cache
 _config_cache = None
@@ -155,7 +159,7 @@ def get_wit_score_requirement(energy_type, training_day):
   for stage in requirement_stages:
     if stage["end_day"] is None or training_day <= stage["end_day"]:
       score =  stage["score"]
-      print(f"wit score: {score}")
+      log.debug("wit score: %s", score)
       return stage["score"]
   # Fallback to default score if no matching stage found
   return 2.0
@@ -443,7 +447,7 @@ def apply_single_training_penalty(stat_key, data, current_date, current_stats=No
   actual_trigger = min(trigger_by_percent, trigger_by_gap)
 
   # Debug log: show stat vs effective cap for all training
-  print(f"[CAP CHECK] {stat_key.upper()}: {current_stat}/{effective_cap} (trigger: {actual_trigger:.0f}, base: {base_cap})")
+  cap_log.debug("%s: %s/%s (trigger: %.0f, base: %s)", stat_key.upper(), current_stat, effective_cap, actual_trigger, base_cap)
 
   primary_penalty_pct = _calculate_single_stat_penalty(
     current_stat, effective_cap, penalty_config
@@ -608,15 +612,15 @@ def unified_training_selection(results, current_date, min_score_threshold=None):
 
 def training_decision(results_training, energy_percentage, energy_max, strategy_settings, current_date, current_stats=None):
   """Enhanced training decision with unified scoring system"""
-  print(f"[DEBUG] === training_decision CALLED ===")
-  print(f"[DEBUG] Energy: {energy_percentage}%, Strategy: {strategy_settings.get('priority_strategy', 'Unknown')}")
+  log.debug("=== training_decision CALLED ===")
+  log.debug("Energy: %s%%, Strategy: %s", energy_percentage, strategy_settings.get('priority_strategy', 'Unknown'))
 
   if not results_training:
-    print(f"[DEBUG] No training results provided")
+    log.debug("No training results provided")
     return None
 
   stage_info = get_career_stage_info(current_date)
-  print(f"[DEBUG] Stage info: {stage_info}")
+  log.debug("Stage info: %s", stage_info)
 
   absolute_day = current_date.get('absolute_day', 0)
   current_config = get_config()
@@ -628,11 +632,11 @@ def training_decision(results_training, energy_percentage, energy_max, strategy_
     # Get current stats for caps filtering (read once, reuse)
     if current_stats is None:
       current_stats = stat_state()
-    print(f'Stat: {current_stats}')
+    log.debug('Stat: %s', current_stats)
     # Filter by stat caps (remove completely capped stats)
     filtered_results = filter_by_stat_caps(results_training, current_stats, current_date)
     if not filtered_results:
-      print(f"[DEBUG] All training filtered out by stat caps")
+      log.debug("All training filtered out by stat caps")
       return None
 
   # Check energy level for critical energy (no training allowed)
@@ -640,12 +644,12 @@ def training_decision(results_training, energy_percentage, energy_max, strategy_
   minimum_energy = get_minimum_energy()
 
   if energy_percentage < critical_energy:
-    print(f"[DEBUG] Critical energy ({energy_percentage}% < {critical_energy}%), no training allowed")
+    log.debug("Critical energy (%s%% < %s%%), no training allowed", energy_percentage, critical_energy)
     return None
 
   # Check energy level for medium energy logic (between critical and minimum)
   if energy_percentage < minimum_energy and energy_percentage >= critical_energy:
-    print(f"[DEBUG] Medium energy ({energy_percentage}%), checking WIT only")
+    log.debug("Medium energy (%s%%), checking WIT only", energy_percentage)
     return medium_energy_wit_training(filtered_results, current_date)
 
   # Mid-game energy restriction for low score training (only after early stage) - using config
@@ -667,10 +671,10 @@ def training_decision(results_training, energy_percentage, energy_max, strategy_
     max_score_threshold = 1.15
 
   energy_shortage_absolute = energy_max - energy_percentage
-  print(f' energy_shortage_absolute: {energy_max} - {energy_percentage}')
+  log.debug('energy_shortage_absolute: %s - %s', energy_max, energy_percentage)
 
   stage = stage_info['stage']
-  print(f'{stage} - e: {energy_shortage_absolute} - {medium_energy_shortage}')
+  log.debug('%s - e: %s - %s', stage, energy_shortage_absolute, medium_energy_shortage)
   if (energy_shortage_absolute >= medium_energy_shortage):
     # Check if any available training score is > threshold using total_score with WIT bonus
     has_high_score_training = False
@@ -687,10 +691,12 @@ def training_decision(results_training, energy_percentage, energy_max, strategy_
         break
 
     if not has_high_score_training:
-      print(f"[DEBUG] Energy shortage ({energy_shortage_absolute} >= {medium_energy_shortage}) and all scores <= {max_score_threshold} (best: {best_score_for_debug:.2f}), prioritizing race or rest")
+      log.debug("Energy shortage (%s >= %s) and all scores <= %s (best: %.2f), prioritizing race or rest",
+                energy_shortage_absolute, medium_energy_shortage, max_score_threshold, best_score_for_debug)
       return "SHOULD_REST"  # This will trigger race check first, then rest if no suitable race
     else:
-      print(f"[DEBUG] Energy shortage detected but high score training available (best: {best_score_for_debug:.2f} > {max_score_threshold}), continuing normal logic")
+      log.debug("Energy shortage detected but high score training available (best: %.2f > %s), continuing normal logic",
+                best_score_for_debug, max_score_threshold)
 
   # Priority strategy and training selection logic continues...
   priority_strategy = strategy_settings.get('priority_strategy', 'Train Score 3.5+')
@@ -740,7 +746,7 @@ def fallback_training(results, current_date, current_stats=None):
     results = filter_by_stat_caps(results, current_stats, current_date)
 
     if not results:
-      print(f"[DEBUG] All training filtered out by stat caps in fallback_training")
+      log.debug("All training filtered out by stat caps in fallback_training")
       return None
 
   # Calculate best training using total_score
@@ -751,14 +757,14 @@ def fallback_training(results, current_date, current_stats=None):
     training_list.append((key, data, total_score, priority_index))
 
     # DEBUG: Log scores used for fallback selection
-    print(f"[DEBUG] Fallback {key.upper()}: Total Score={total_score:.2f}, Priority={priority_index}")
+    log.debug("Fallback %s: Total Score=%.2f, Priority=%s", key.upper(), total_score, priority_index)
 
   # Sort by total_score (descending), then by priority (ascending - lower index = higher priority)
   # Round score to avoid floating point precision issues (consistent with unified_training_selection)
   training_list.sort(key=lambda x: (-round(x[2], 6), x[3]))
 
   # DEBUG: Show selection reasoning
-  print(f"[DEBUG] Fallback selected: {training_list[0][0].upper()} with total score {training_list[0][2]:.2f}")
+  log.debug("Fallback selected: %s with total score %.2f", training_list[0][0].upper(), training_list[0][2])
 
   best_key, best_data, total_score, best_priority = training_list[0]
 
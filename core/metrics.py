@@ -0,0 +1,261 @@
+"""
+Metrics
+Counters and histograms for long runs, served as Prometheus text and written to a snapshot file
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+METRIC_PREFIX = "uma_"
+DEFAULT_METRICS_PORT = 9108
+DEFAULT_SNAPSHOT_FILE = "metrics_snapshot.json"
+DEFAULT_SNAPSHOT_INTERVAL = 60
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "turns_total": ("counter", "Career turns decided"),
+    "careers_completed_total": ("counter", "Careers that reached the final URA race"),
+    "ocr_rereads_total": ("counter", "Stats re-read with enhanced OCR"),
+    "mood_ocr_fallbacks_total": ("counter", "Mood reads that fell back to OCR"),
+    "template_match_misses_total": ("counter", "Template lookups that found nothing after every retry"),
+    "event_fallbacks_total": ("counter", "Events answered with the fallback first choice"),
+    "race_failures_total": ("counter", "Races lost with the try again prompt shown"),
+    "stage_seconds": ("histogram", "Time spent per bot loop stage"),
+    "input_seconds": ("histogram", "Time spent performing each mouse action"),
+    "input_wait_seconds": ("histogram", "Time mouse actions waited in the input queue"),
+    "activity_step_seconds": ("histogram", "Time spent per daily activity step"),
+    "activity_runs_total": ("counter", "Completed daily activity runs"),
+    "event_analysis_seconds": ("histogram", "Time spent reading an event popup from one frame"),
+    "turns_per_hour": ("gauge", "Turns per hour since the registry started"),
+    "uptime_seconds": ("gauge", "Seconds since the registry started"),
+}
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_key: Tuple, extra: Tuple = ()) -> str:
+    pairs = label_key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and histograms"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, list]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # Per-bucket counts, then sum and count
+                state = series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Time a block into the stage latency histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def get(self, name: str, **labels) -> float:
+        """Current value of a counter"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def _derived(self) -> Dict[str, float]:
+        uptime = max(time.time() - self.started, 1e-9)
+        turns = sum(self._counters.get("turns_total", {}).values())
+        return {"uptime_seconds": uptime, "turns_per_hour": turns * 3600 / uptime}
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = METRIC_PREFIX + name
+                metric_type, help_text = METRIC_HELP.get(name, ("counter", name))
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {metric_type}")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, ('', name))[1]}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, state in sorted(series.items()):
+                    for index, bound in enumerate(self.buckets):
+                        lines.append(f"{metric}_bucket{_format_labels(key, (('le', bound),))} {state[index]}")
+                    lines.append(f"{metric}_bucket{_format_labels(key, (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {state[-1]}")
+
+            for name, value in self._derived().items():
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {METRIC_HELP[name][1]}")
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value:.3f}")
+
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict:
+        """Plain dict of all metrics for the snapshot file"""
+        with self._lock:
+            counters = {name: {",".join(f"{k}={v}" for k, v in key) or "total": value
+                               for key, value in series.items()}
+                        for name, series in self._counters.items()}
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = {
+                    ",".join(f"{k}={v}" for k, v in key) or "total": {
+                        'count': state[-1],
+                        'sum': round(state[-2], 4),
+                        'mean': round(state[-2] / state[-1], 4) if state[-1] else 0.0,
+                    }
+                    for key, state in series.items()
+                }
+            derived = self._derived()
+
+        return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms,
+                'gauges': {name: round(value, 3) for name, value in derived.items()}}
+
+    def write_snapshot(self, path: str = DEFAULT_SNAPSHOT_FILE):
+        """Write the snapshot atomically"""
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Could not write metrics snapshot: {e}")
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the shared metrics registry"""
+    return _registry
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serve /metrics from the shared registry"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = _registry.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsExporter:
+    """Local HTTP endpoint plus a periodic snapshot writer, both on daemon threads"""
+
+    def __init__(self, port: int = DEFAULT_METRICS_PORT, host: str = "127.0.0.1",
+                 snapshot_file: Optional[str] = DEFAULT_SNAPSHOT_FILE,
+                 snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL):
+        self.port = port
+        self.host = host
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self._server = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> bool:
+        """Start serving; returns False if the port is unavailable"""
+        if self.snapshot_file:
+            threading.Thread(target=self._snapshot_loop, daemon=True).start()
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+        except OSError as e:
+            print(f"[WARNING] Metrics endpoint could not bind {self.host}:{self.port}: {e}")
+            return False
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"[INFO] Metrics available at http://{self.host}:{self.port}/metrics")
+        return True
+
+    def _snapshot_loop(self):
+        while not self._stop_event.wait(self.snapshot_interval):
+            _registry.write_snapshot(self.snapshot_file)
+
+    def stop(self):
+        """Stop the endpoint and write a final snapshot"""
+        self._stop_event.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.snapshot_file:
+            _registry.write_snapshot(self.snapshot_file)
+
+
+_exporter = None
+
+
+def start_metrics_exporter() -> Optional[MetricsExporter]:
+    """Start the exporter once if metrics are enabled in config.json"""
+    global _exporter
+    if _exporter is not None:
+        return _exporter
+
+    try:
+        with open("config.json", "r", encoding="utf-8") as file:
+            metrics_config = json.load(file).get("metrics", {})
+    except (OSError, ValueError):
+        metrics_config = {}
+
+    if not metrics_config.get("enabled", False):
+        return None
+
+    _exporter = MetricsExporter(
+        port=metrics_config.get("port", DEFAULT_METRICS_PORT),
+        host=metrics_config.get("host", "127.0.0.1"),
+        snapshot_file=metrics_config.get("snapshot_file", DEFAULT_SNAPSHOT_FILE),
+        snapshot_interval=metrics_config.get("snapshot_interval", DEFAULT_SNAPSHOT_INTERVAL),
+    )
+    _exporter.start()
+    return _exporter
@@ -0,0 +1,163 @@
+"""
+Mood Classifier
+Reads the mood badge by its colour instead of its text
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+MOOD_SIGNATURE_FILE = "mood_signatures.json"
+HUE_BINS = 18
+# Pixels below these HSV saturation and value levels are text or panel background, not badge fill
+MIN_SATURATION = 80
+MIN_VALUE = 80
+# Too few coloured pixels means no badge is visible in the region
+MIN_COLOURED_FRACTION = 0.05
+MIN_CONFIDENCE = 0.5
+# Samples kept per signature before new ones start replacing the running mean's weight
+MAX_SIGNATURE_SAMPLES = 50
+# OCR-confirmed captures a mood needs before its colour reading is trusted without OCR
+MIN_CONFIRMED_SAMPLES = 3
+# L1 histogram distance (0-2) at which a capture no longer looks like a signature at all
+MAX_MATCH_DISTANCE = 1.0
+
+# Rough badge fill hue per mood on OpenCV's 0-180 hue scale. These only place the moods apart
+# until OCR has confirmed real captures; a reading is never trusted from them alone.
+DEFAULT_MOOD_HUES = {
+    "GREAT": 167,   # pink
+    "GOOD": 12,     # orange
+    "NORMAL": 25,   # yellow
+    "BAD": 103,     # blue
+    "AWFUL": 137,   # purple
+}
+
+
+def hue_histogram(image_rgb) -> Tuple[np.ndarray, float]:
+    """
+    Hue histogram of the saturated, bright pixels of an RGB image
+
+    Returns:
+        Normalised histogram with HUE_BINS bins, and the fraction of pixels that were counted
+    """
+    hsv = cv2.cvtColor(np.ascontiguousarray(image_rgb[:, :, :3]), cv2.COLOR_RGB2HSV)
+    mask = cv2.inRange(hsv, (0, MIN_SATURATION, MIN_VALUE), (180, 255, 255))
+    counted = cv2.countNonZero(mask)
+    total = mask.shape[0] * mask.shape[1]
+    hist = cv2.calcHist([hsv], [0], mask, [HUE_BINS], [0, 180]).ravel()
+    if counted:
+        hist /= counted
+    return hist, counted / total if total else 0.0
+
+
+def _default_signature(hue: int, spread: float = 6.0) -> np.ndarray:
+    """Histogram of a badge of a single hue, blurred to tolerate shading"""
+    centres = (np.arange(HUE_BINS) + 0.5) * (180 / HUE_BINS)
+    distance = np.abs(centres - hue)
+    distance = np.minimum(distance, 180 - distance)
+    hist = np.exp(-0.5 * (distance / spread) ** 2)
+    return (hist / hist.sum()).astype(np.float32)
+
+
+class MoodClassifier:
+    """
+    Nearest-centroid classifier over badge hue histograms.
+
+    Each mood has a signature, the mean histogram of its OCR-confirmed captures. A reading is the
+    closest signature. It is trusted only once that mood has MIN_CONFIRMED_SAMPLES captures, and
+    its confidence needs both a close match and a clear gap to the runner-up. Until then the
+    caller reads the badge text, and exact readings are folded back in with learn().
+    """
+
+    def __init__(self, signature_file: str = MOOD_SIGNATURE_FILE):
+        self.signature_file = signature_file
+        self._lock = threading.Lock()
+        self.signatures: Dict[str, np.ndarray] = {
+            mood: _default_signature(hue) for mood, hue in DEFAULT_MOOD_HUES.items()
+        }
+        self.samples: Dict[str, int] = {mood: 0 for mood in DEFAULT_MOOD_HUES}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.signature_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for mood, entry in data.items():
+            histogram = np.asarray(entry.get("histogram", []), dtype=np.float32)
+            if mood in self.signatures and histogram.shape == (HUE_BINS,):
+                self.signatures[mood] = histogram
+                self.samples[mood] = int(entry.get("samples", 1))
+
+    def save(self):
+        try:
+            data = {
+                mood: {"histogram": [round(float(v), 5) for v in hist], "samples": self.samples[mood]}
+                for mood, hist in self.signatures.items()
+            }
+            tmp_path = self.signature_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.signature_file)
+        except OSError as e:
+            print(f"[WARNING] Could not save mood signatures: {e}")
+
+    def is_confirmed(self, mood: str) -> bool:
+        """Whether OCR has confirmed enough captures of a mood for its signature to be trusted"""
+        return self.samples.get(mood, 0) >= MIN_CONFIRMED_SAMPLES
+
+    def classify(self, image_rgb) -> Tuple[str, float]:
+        """
+        Classify a capture of the mood region
+
+        Returns:
+            (mood, confidence) with confidence in 0-1; ("UNKNOWN", 0.0) when no badge is visible.
+            Confidence is 0 while the closest mood is not yet confirmed.
+        """
+        hist, coloured = hue_histogram(image_rgb)
+        if coloured < MIN_COLOURED_FRACTION:
+            return "UNKNOWN", 0.0
+
+        with self._lock:
+            distances = sorted(
+                (float(np.abs(hist - signature).sum()), mood) for mood, signature in self.signatures.items()
+            )
+            (best, mood), (runner_up, _) = distances[0], distances[1]
+            if not self.is_confirmed(mood):
+                return mood, 0.0
+        # Close to the best signature, and the runner-up is clearly further away
+        closeness = max(0.0, 1.0 - best / MAX_MATCH_DISTANCE)
+        separation = min(1.0, (runner_up - best) / MAX_MATCH_DISTANCE)
+        return mood, closeness * separation
+
+    def learn(self, image_rgb, mood: str, persist: bool = True):
+        """Fold a capture with a known mood into that mood's signature"""
+        if mood not in self.signatures:
+            return
+        hist, coloured = hue_histogram(image_rgb)
+        if coloured < MIN_COLOURED_FRACTION:
+            return
+        with self._lock:
+            count = self.samples[mood]
+            # Defaults count as no samples, so the first real capture replaces them outright
+            weight = 1.0 / (min(count, MAX_SIGNATURE_SAMPLES - 1) + 1)
+            self.signatures[mood] = (1 - weight) * self.signatures[mood] + weight * hist
+            self.samples[mood] = count + 1
+        if persist:
+            self.save()
+
+
+_classifier: Optional[MoodClassifier] = None
+
+
+def get_mood_classifier() -> MoodClassifier:
+    """Get the shared mood classifier"""
+    global _classifier
+    if _classifier is None:
+        _classifier = MoodClassifier()
+    return _classifier
@@ -19,6 +19,14 @@ def extract_text(pil_img: Image.Image) -> str:
     print(f"[WARNING] Tesseract text extraction failed: {e}")
     return ""
 
+def warm_up_ocr():
+  """Run one tiny OCR call so the Tesseract binary and language data are loaded before the first real read"""
+  try:
+    pytesseract.get_tesseract_version()
+    extract_text(Image.new("RGB", (32, 16), "white"))
+  except Exception as e:
+    print(f"[WARNING] OCR warm-up failed: {e}")
+
 def extract_text_advanced(pil_img: Image.Image, whitelist: str = None, psm: int = 6) -> str:
   """
   Trích xuất text với cấu hình tùy chỉnh
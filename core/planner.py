@@ -0,0 +1,267 @@
+"""
+Lookahead Planner
+Expectimax search over train/rest/recreation/race a few turns ahead, with a time budget
+"""
+
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.simulator import (
+    CareerModel, DEFAULT_MODEL_PARAMS, MOOD_ORDER, MOOD_STAT_MULTIPLIER, build_date_info
+)
+
+DEFAULT_PLANNER_CONFIG = {
+    'enabled': False,
+    'max_depth': 4,
+    'time_budget_ms': 200,
+    'board_samples': 64,
+    'energy_bucket': 10,
+    'train_energy_cost': 20,
+    'failure_cost': 1.0,
+    'race_value': {'g1': 3.0, 'g2': 2.5, 'g3': 2.0, 'op': 1.5, 'pre_op': 1.0},
+    'leaf_energy_value': 0.5,
+}
+
+ACTIONS = ('train', 'rest', 'recreation', 'race')
+LAST_DAY = 75
+
+
+class _BudgetExceeded(Exception):
+    """Raised inside the search when the time budget runs out"""
+
+
+class PlannerResult:
+    """Best action found by the planner and how it was reached"""
+
+    def __init__(self, action: str, training: Optional[str], values: Dict[str, float],
+                 depth: int, elapsed_ms: float):
+        self.action = action
+        self.training = training
+        self.values = values
+        self.depth = depth
+        self.elapsed_ms = elapsed_ms
+
+    def label(self) -> str:
+        """Short text for the decision log"""
+        if self.action == 'train' and self.training:
+            return self.training.upper()
+        return self.action.upper()
+
+
+class LookaheadPlanner:
+    """Memoized expectimax planner using the simulator's stochastic turn model"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, model_params: Optional[Dict[str, Any]] = None):
+        self.config = dict(DEFAULT_PLANNER_CONFIG, **(config or {}))
+        self.params = dict(DEFAULT_MODEL_PARAMS, **(model_params or {}))
+        self._memo: Dict[Tuple, float] = {}
+        self._expected_best: Dict[int, float] = {}
+        self._race_days: Dict[int, float] = {}
+        self._kernel = None
+        self._race_manager = None
+        self._deadline = 0.0
+
+    def _reset_if_stale(self, kernel, race_manager):
+        """Drop cached values when scoring inputs or the race calendar change"""
+        if kernel is not self._kernel or race_manager is not self._race_manager:
+            self._kernel = kernel
+            self._race_manager = race_manager
+            self._memo.clear()
+            self._expected_best.clear()
+            self._race_days.clear()
+
+    def expected_best_score(self, day: int) -> float:
+        """Mean best training score over sampled support boards for a day"""
+        if day in self._expected_best:
+            return self._expected_best[day]
+
+        from core.scoring_kernel import build_count_array
+        from core.state import get_support_card_state
+        from utils.constants import get_stat_caps
+
+        deck = get_support_card_state() or {}
+        samples = self.config['board_samples']
+        model = CareerModel(random.Random(day), deck, None, get_stat_caps(), self.params)
+        model.day = day
+
+        counts = np.empty((samples,) + build_count_array({}).shape, dtype=np.int64)
+        for i in range(samples):
+            model.roll_board()
+            supports = {key: dict(slot['cards'], hint=slot['hint'], npc=slot['npc'],
+                                  scenario_npc=slot['scenario_npc'])
+                        for key, slot in model.board.items()}
+            counts[i] = build_count_array(supports)
+
+        scores = self._kernel.base_scores(counts, np.full(samples, day), 0.0)
+        value = float(np.mean(np.max(scores, axis=1))) if samples else 0.0
+        self._expected_best[day] = value
+        return value
+
+    def race_value(self, day: int) -> float:
+        """Value of the best race the race filters allow on a day, 0 if none"""
+        if day in self._race_days:
+            return self._race_days[day]
+
+        value = 0.0
+        if self._race_manager is not None and day <= 72:
+            try:
+                should_race, races = self._race_manager.should_race_today(build_date_info(day))
+                if should_race and races:
+                    grades = [self._race_manager.extract_race_properties(race)['grade_type'] for race in races]
+                    value = max(self.config['race_value'].get(grade, 1.0) for grade in grades)
+            except Exception:
+                value = 0.0
+        self._race_days[day] = value
+        return value
+
+    def failure_chance(self, energy: int, training: Optional[str] = None) -> float:
+        """Training failure chance from energy, matching the simulator model"""
+        chance = max(0.0, (self.params['failure_energy_start'] - energy) * self.params['failure_per_energy']) / 100
+        if training == 'wit':
+            chance /= 2
+        return min(0.95, chance)
+
+    def _is_summer(self, day: int) -> bool:
+        date = build_date_info(day)
+        return date['month_num'] in (7, 8) and day > 24
+
+    def _bucket(self, energy: float) -> int:
+        size = self.config['energy_bucket']
+        return int(max(0, min(100, energy)) // size * size)
+
+    def _outcomes(self, action: str, day: int, energy: int, mood: int,
+                  train_score: float, training: Optional[str] = None) -> List[Tuple[float, float, int, int]]:
+        """List of (probability, reward, next energy, next mood) for an action"""
+        top_mood = len(MOOD_ORDER) - 1
+        mood_multiplier = MOOD_STAT_MULTIPLIER[MOOD_ORDER[mood]]
+
+        if action == 'train':
+            fail = self.failure_chance(energy, training)
+            cost = -5 if training == 'wit' else self.config['train_energy_cost']
+            outcomes = [(1 - fail, train_score * mood_multiplier, energy - cost, mood)]
+            if fail > 0:
+                outcomes.append((fail, -self.config['failure_cost'], energy - 5, max(0, mood - 1)))
+            return outcomes
+
+        if action == 'rest':
+            if self._is_summer(day):
+                return [(1.0, 0.0, energy + self.params['summer_rest_energy'], min(top_mood, mood + 1))]
+            return [(weight, 0.0, energy + gain, mood) for gain, weight in self.params['rest_energy']]
+
+        if action == 'recreation':
+            gain = self.params['recreation_energy']
+            return [(0.9, 0.0, energy + gain, min(top_mood, mood + 1)),
+                    (0.1, 0.0, energy + gain, min(top_mood, mood + 2))]
+
+        value = self.race_value(day)
+        return [(1.0, value * mood_multiplier, energy - self.params['race_energy_cost'], mood)]
+
+    def _value(self, day: int, energy: int, mood: int, depth: int) -> float:
+        """Expected value of a future turn under the best action"""
+        if depth == 0 or day > LAST_DAY:
+            return self.config['leaf_energy_value'] * (energy / 100) * (
+                self.expected_best_score(min(day, LAST_DAY)) if day <= LAST_DAY else 0.0)
+
+        energy = self._bucket(energy)
+        key = (day, energy, mood, depth)
+        if key in self._memo:
+            return self._memo[key]
+        if time.perf_counter() > self._deadline:
+            raise _BudgetExceeded()
+
+        train_score = self.expected_best_score(day)
+        best = None
+        for action in ACTIONS:
+            if action == 'race' and self.race_value(day) <= 0:
+                continue
+            value = self._expected(action, day, energy, mood, depth, train_score)
+            best = value if best is None else max(best, value)
+
+        self._memo[key] = best
+        return best
+
+    def _expected(self, action: str, day: int, energy: int, mood: int, depth: int,
+                  train_score: float, training: Optional[str] = None) -> float:
+        """Expectation over an action's outcomes"""
+        total = 0.0
+        for probability, reward, next_energy, next_mood in self._outcomes(action, day, energy, mood,
+                                                                          train_score, training):
+            next_energy = max(0, min(100, next_energy))
+            total += probability * (reward + self._value(day + 1, next_energy, next_mood, depth - 1))
+        return total
+
+    def _root_values(self, results: Dict[str, Dict], day: int, energy: int, mood: int,
+                     depth: int) -> Dict[str, float]:
+        """Value of each concrete root action, trainings scored from this turn's board"""
+        values = {}
+        for training, data in results.items():
+            values[f"train:{training}"] = self._expected('train', day, energy, mood, depth,
+                                                         data.get('total_score', 0.0), training)
+        values['rest'] = self._expected('rest', day, energy, mood, depth, 0.0)
+        values['recreation'] = self._expected('recreation', day, energy, mood, depth, 0.0)
+        if self.race_value(day) > 0:
+            values['race'] = self._expected('race', day, energy, mood, depth, 0.0)
+        return values
+
+    def plan(self, results: Dict[str, Dict], current_date: Dict[str, Any], energy: int,
+             mood: str, race_manager=None) -> Optional[PlannerResult]:
+        """
+        Find the best action for this turn by iterative deepening within the time budget
+
+        Args:
+            results: Training results from check_all_training
+            current_date: Current date info
+            energy: Current energy
+            mood: Current mood label
+            race_manager: RaceManager used to check which future days have races
+
+        Returns:
+            PlannerResult from the deepest fully searched depth, or None
+        """
+        from core.scoring_kernel import get_scoring_kernel
+
+        start = time.perf_counter()
+        self._deadline = start + self.config['time_budget_ms'] / 1000
+        self._reset_if_stale(get_scoring_kernel(), race_manager)
+
+        day = current_date.get('absolute_day', 0) if current_date else 0
+        if day <= 0:
+            return None
+        mood_index = MOOD_ORDER.index(mood) if mood in MOOD_ORDER else MOOD_ORDER.index("NORMAL")
+
+        best_values, best_depth = None, 0
+        for depth in range(1, self.config['max_depth'] + 1):
+            try:
+                best_values = self._root_values(results, day, int(energy), mood_index, depth)
+                best_depth = depth
+            except _BudgetExceeded:
+                break
+            if day + depth > LAST_DAY:
+                break
+
+        if not best_values:
+            return None
+
+        choice = max(best_values, key=best_values.get)
+        action, _, training = choice.partition(':')
+        return PlannerResult(action, training or None, best_values, best_depth,
+                             (time.perf_counter() - start) * 1000)
+
+
+_planner = None
+
+
+def get_planner() -> Optional[LookaheadPlanner]:
+    """Get the shared planner, or None when disabled in config"""
+    global _planner
+    from core.logic import get_config
+
+    planner_config = get_config().get("lookahead_planner", {})
+    if not planner_config.get('enabled', False):
+        return None
+    if _planner is None or _planner.config != dict(DEFAULT_PLANNER_CONFIG, **planner_config):
+        _planner = LookaheadPlanner(planner_config)
+    return _planner
@@ -1,10 +1,13 @@
-import pyautogui
 import time
 from typing import Callable, Optional, Dict, List, Tuple, Any
 from core.recognizer import find_template_position
 
 from core.click_handler import find_and_click, random_click_in_region, random_screen_click
-from utils.constants import RACE_REGION
+from core.location_cache import locate_center_on_screen
+from core.input_executor import get_input_executor, wait_for
+from core.race_list_reader import RaceListReader
+from core.state import get_current_date_info
+from utils.constants import get_current_regions
 
 # Style assets folder
 STYLE_ASSETS_FOLDER = 'assets/buttons/style'
@@ -75,7 +78,8 @@ class RaceHandler:
     def start_race_flow(self, prioritize_g1: bool = False, prioritize_g2: bool = False,
                         allow_continuous_racing: bool = True,
                         skip_grade_check: bool = False,
-                        scheduled_grade: Optional[str] = None) -> bool:
+                        scheduled_grade: Optional[str] = None,
+                        scheduled_name: Optional[str] = None) -> bool:
         """Start the complete race flow from lobby to finish"""
         if self.check_stop():
             self.log("[STOP] Race cancelled due to F3 press")
@@ -113,7 +117,8 @@ class RaceHandler:
 
         # Use new panel-based race selection
         race_found = self._select_race_by_panels(skip_grade_check=skip_grade_check,
-                                                  scheduled_grade=scheduled_grade)
+                                                  scheduled_grade=scheduled_grade,
+                                                  scheduled_name=scheduled_name)
 
         if not race_found or self.check_stop():
             return False
@@ -130,7 +135,8 @@ class RaceHandler:
         return True
 
     def _select_race_by_panels(self, skip_grade_check: bool = False,
-                               scheduled_grade: Optional[str] = None) -> bool:
+                               scheduled_grade: Optional[str] = None,
+                               scheduled_name: Optional[str] = None) -> bool:
         """Select race using panel-based detection with grade priority and fallback mechanism"""
 
         # Get enabled grades from filters (not used when skip_grade_check=True or scheduled_grade set)
@@ -141,8 +147,13 @@ class RaceHandler:
         else:
             enabled_grades = []
 
+        # Read the whole list one view at a time; the panel search below is kept for when it cannot
+        race_found = self._select_race_from_list(skip_grade_check, scheduled_grade, scheduled_name, enabled_grades)
+        if race_found is not None:
+            return race_found
+
         # Calculate panel dimensions (split race region into smaller panels)
-        left, top, width, height = RACE_REGION
+        left, top, width, height = get_current_regions()['RACE_REGION']
         panel_height = height // 2  # Split vertically into 2 panels
         scroll_amount = height  # Scroll by full race region height each step
 
@@ -168,32 +179,27 @@ class RaceHandler:
                     else:
                         match_pos = self._find_grade_and_match_track_pair(panel_region, scheduled_grade)
                     if match_pos:
-                        pyautogui.moveTo(match_pos, duration=0.2)
-                        pyautogui.click()
+                        get_input_executor().click(match_pos, duration=0.2)
                         return self._click_race_buttons_original()
                 elif skip_grade_check:
                     # Legacy skip behavior: just find any match_track without grade check
                     match_pos = self._find_match_track_in_panel(panel_region)
                     if match_pos:
-                        pyautogui.moveTo(match_pos, duration=0.2)
-                        pyautogui.click()
+                        get_input_executor().click(match_pos, duration=0.2)
                         return self._click_race_buttons_original()
                 else:
                     # Normal race: filter by enabled grades
                     race_match = self._find_matching_race_in_panel(panel_region, enabled_grades)
                     if race_match:
                         grade, match_pos = race_match
-                        pyautogui.moveTo(match_pos, duration=0.2)
-                        pyautogui.click()
+                        get_input_executor().click(match_pos, duration=0.2)
                         return self._click_race_buttons_original()
 
             # Move mouse to center of race region before scrolling
             center_x = left + width // 2
             center_y = top + height // 2
-            pyautogui.moveTo(center_x, center_y, duration=0.2)
-
-            # Scroll by panel height amount
-            pyautogui.scroll(-scroll_amount)
+            # Scroll by panel height amount, waiting for it so the settle delay starts after it
+            wait_for(get_input_executor().scroll(-scroll_amount, center_x, center_y, duration=0.2))
             time.sleep(0.3)  # Wait after scrolling
 
         self.log("[DEBUG] Primary search completed, no matching race found. Starting fallback search...")
@@ -201,10 +207,42 @@ class RaceHandler:
         # Fallback search: scroll up and look for any match_track
         return self._fallback_race_search()
 
+    def _select_race_from_list(self, skip_grade_check: bool, scheduled_grade: Optional[str],
+                               scheduled_name: Optional[str], enabled_grades: list) -> Optional[bool]:
+        """
+        Select a race with the race list reader
+
+        Returns:
+            Whether a race was entered, or None if the list could not be read and the panel
+            search should run instead
+        """
+        try:
+            current_date = get_current_date_info()
+            absolute_day = current_date.get('absolute_day', 0) if current_date else 0
+            if scheduled_grade:
+                grades = None if scheduled_grade in ('op', 'pre_op') else [scheduled_grade]
+            elif skip_grade_check:
+                grades = None
+            else:
+                grades = enabled_grades
+
+            reader = RaceListReader(self.check_stop, self.log)
+            card, complete = reader.select(absolute_day, target_name=scheduled_name, grades=grades)
+        except Exception as e:
+            self.log(f"[WARNING] Race list reader failed, using panel search: {e}")
+            return None
+
+        if not complete:
+            return None
+        if card is None or self.check_stop():
+            return False
+        get_input_executor().click(card.match_center, duration=0.2)
+        return self._click_race_buttons_original()
+
     def _fallback_race_search(self) -> bool:
         """Fallback race search that only looks for match_track indicator"""
 
-        left, top, width, height = RACE_REGION
+        left, top, width, height = get_current_regions()['RACE_REGION']
         panel_height = height // 2
         scroll_amount = height  # Scroll by full race region height each step
 
@@ -230,12 +268,10 @@ class RaceHandler:
                 match_track_pos = self._find_match_track_in_panel(panel_region)
                 if match_track_pos:
                     self.log("[DEBUG] Found race with match_track in fallback search")
-                    pyautogui.moveTo(match_track_pos, duration=0.2)
-                    pyautogui.click()
+                    get_input_executor().click(match_track_pos, duration=0.2)
                     return self._click_race_buttons_original()
 
-            pyautogui.moveTo(center_x, center_y, duration=0.2)
-            pyautogui.scroll(-scroll_amount)
+            wait_for(get_input_executor().scroll(-scroll_amount, center_x, center_y, duration=0.2))
             time.sleep(0.5)
 
         self.log("[DEBUG] Fallback search completed, no race with match_track found")
@@ -287,26 +323,23 @@ class RaceHandler:
                 return None
 
             # Find match_track in this panel
-            left, top, width, height = panel_region
-            region_ltrb = (left, top, left + width, top + height)
-
-            match_track_location = pyautogui.locateCenterOnScreen(
+            match_track_location = locate_center_on_screen(
                 "assets/ui/match_track.png",
                 confidence=0.9,
-                minSearchTime=0.3,
-                region=region_ltrb
+                min_search_time=0.3,
+                region=panel_region
             )
 
             if not match_track_location:
                 return None
 
-            vertical_distance = abs(grade_location[1] - match_track_location.y)
+            vertical_distance = abs(grade_location[1] - match_track_location[1])
 
             if vertical_distance <= 50:
                 print(f"[RACE] {grade.upper()} grade={grade_conf:.2%} | "
-                      f"match_track=({match_track_location.x}, {match_track_location.y}) | "
+                      f"match_track=({match_track_location[0]}, {match_track_location[1]}) | "
                       f"vdist={vertical_distance}")
-                return (match_track_location.x, match_track_location.y)
+                return (match_track_location[0], match_track_location[1])
             else:
                 return None
 
@@ -331,20 +364,16 @@ class RaceHandler:
     def _find_match_track_in_panel(self, panel_region: tuple) -> Optional[tuple]:
         """Find match_track indicator in the specified panel region"""
         try:
-            # Convert panel_region from (x, y, width, height) to (left, top, right, bottom)
-            left, top, width, height = panel_region
-            region_ltrb = (left, top, left + width, top + height)
-
-            match_track_location = pyautogui.locateCenterOnScreen(
+            match_track_location = locate_center_on_screen(
                 "assets/ui/match_track.png",
                 confidence=0.8,
-                minSearchTime=0.3,
-                region=region_ltrb
+                min_search_time=0.3,
+                region=panel_region
             )
 
             if match_track_location:
                 # Return tuple coordinates
-                return (match_track_location.x, match_track_location.y)
+                return (match_track_location[0], match_track_location[1])
             else:
                 return None
 
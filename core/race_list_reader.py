@@ -0,0 +1,264 @@
+"""
+Race List Reader
+Reads every race card of the race list view from one frame, OCRs their names and resolves
+them against race_list.json, so a race is picked directly instead of panel by panel
+"""
+
+import re
+import time
+from difflib import get_close_matches
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.event_analyzer import crop_image
+from core.frame_stream import Frame, FrameStream, get_frame_stream
+from core.input_executor import get_input_executor, wait_for
+from core.ocr import extract_text
+from core.race_manager import get_races_by_day, grade_key
+from utils.constants import get_current_regions
+from utils.screenshot import enhance_for_ocr
+
+GRADE_PRIORITY = ['g1', 'g2', 'g3', 'op', 'pre_op']
+GRADE_CONFIDENCE = 0.9
+MATCH_TRACK_CONFIDENCE = 0.8
+MATCH_TRACK_TEMPLATE = "assets/ui/match_track.png"
+# A match_track marker belongs to the grade badge on the same card, as in the panel search
+MAX_CARD_ROW_DISTANCE = 50
+# The race name is printed to the right of the grade badge, on the badge's line
+NAME_GAP = 6
+NAME_PADDING = 6
+NAME_MATCH_CUTOFF = 0.6
+MAX_SCROLLS = 4
+SCROLL_SETTLE = 0.3
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+class RaceCard:
+    """One race card of the race list"""
+
+    __slots__ = ('grade', 'grade_box', 'match_center', 'race', 'view')
+
+    def __init__(self, grade: str, grade_box: Tuple[int, int, int, int],
+                 match_center: Optional[Tuple[int, int]], race: Optional[Dict], view: int):
+        self.grade = grade
+        self.grade_box = grade_box
+        self.match_center = match_center
+        self.race = race
+        self.view = view
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.race.get('name') if self.race else None
+
+    @property
+    def selectable(self) -> bool:
+        """Only races marked as matching the track can be entered, as in the panel search"""
+        return self.match_center is not None
+
+    @property
+    def rank(self) -> int:
+        return GRADE_PRIORITY.index(self.grade) if self.grade in GRADE_PRIORITY else len(GRADE_PRIORITY)
+
+
+def _grade_rank(race: Dict) -> int:
+    grade = grade_key(race.get('grade', ''))
+    return GRADE_PRIORITY.index(grade) if grade in GRADE_PRIORITY else len(GRADE_PRIORITY)
+
+
+class RaceListReader:
+    """
+    Picks a race from the race list screen.
+
+    Every view is captured once and all its cards are read from that frame. Races scheduled for
+    the day are known from race_list.json, so the list is scrolled only while a wanted race has
+    not been seen yet, and the chosen card is scrolled back into view if it was passed.
+    """
+
+    def __init__(self, check_stop: Callable[[], bool], log_func: Callable[[str], None] = print,
+                 stream: Optional[FrameStream] = None, region: Optional[Tuple[int, int, int, int]] = None):
+        self.check_stop = check_stop
+        self.log = log_func
+        self.stream = stream or get_frame_stream()
+        # RACE_REGION where the game window is now, unless a region is given
+        self.region = region or get_current_regions()['RACE_REGION']
+
+    # --- Reading ---
+
+    def read_view(self, frame: Frame, candidates: Sequence[Dict], view: int = 0) -> List[RaceCard]:
+        """
+        Read every race card visible in a frame
+
+        Args:
+            frame: Capture of the race list
+            candidates: Races that can be on the list today, used to resolve the OCR'd names
+            view: Scroll position the frame was taken at
+
+        Returns:
+            Cards from top to bottom
+        """
+        match_boxes = frame.find(MATCH_TRACK_TEMPLATE, region=self.region, confidence=MATCH_TRACK_CONFIDENCE)
+        match_centers = [(x + w // 2, y + h // 2) for x, y, w, h in match_boxes]
+
+        badges = []
+        for grade in GRADE_PRIORITY:
+            for template_path in (f"assets/ui/{grade}_race.png", f"assets/ui/{grade}_race2.png"):
+                for box in frame.find(template_path, region=self.region, confidence=GRADE_CONFIDENCE):
+                    # Both templates of a grade can match the same badge
+                    if not any(abs(box[1] - other[1][1]) < box[3] // 2 for other in badges):
+                        badges.append((grade, box))
+
+        cards = []
+        for grade, box in sorted(badges, key=lambda item: item[1][1]):
+            badge_y = box[1] + box[3] // 2
+            near = [center for center in match_centers if abs(center[1] - badge_y) <= MAX_CARD_ROW_DISTANCE]
+            match_center = min(near, key=lambda center: abs(center[1] - badge_y)) if near else None
+            race = self._read_name(frame, box, grade, candidates)
+            cards.append(RaceCard(grade, box, match_center, race, view))
+        return cards
+
+    def _read_name(self, frame: Frame, badge: Tuple[int, int, int, int], grade: str,
+                   candidates: Sequence[Dict]) -> Optional[Dict]:
+        """OCR the name beside a grade badge and resolve it to a race of that grade"""
+        same_grade = [race for race in candidates if grade_key(race.get('grade', '')) == grade]
+        if not same_grade:
+            return None
+        if len(same_grade) == 1:
+            # The badge alone identifies the race; no OCR needed
+            return same_grade[0]
+
+        x, y, w, h = badge
+        left = x + w + NAME_GAP
+        region_right = self.region[0] + self.region[2]
+        name_region = (left, max(self.region[1], y - NAME_PADDING), region_right - left, h + 2 * NAME_PADDING)
+        if name_region[2] <= 0:
+            return None
+        crop = crop_image(frame, name_region)
+        if crop is None:
+            return None
+        text = _normalize(extract_text(enhance_for_ocr(crop)))
+        if not text:
+            return None
+
+        by_name = {_normalize(race.get('name', '')): race for race in same_grade}
+        matches = get_close_matches(text, list(by_name), n=1, cutoff=NAME_MATCH_CUTOFF)
+        return by_name[matches[0]] if matches else None
+
+    # --- Scrolling ---
+
+    def _scroll(self, views: int) -> Optional[Frame]:
+        """Scroll the list by whole views, down for positive counts, and return the new frame"""
+        left, top, width, height = self.region
+        wait_for(get_input_executor().scroll(-height * views, left + width // 2, top + height // 2, duration=0.2))
+        time.sleep(SCROLL_SETTLE)
+        self.stream.invalidate()
+        return self.stream.latest()
+
+    def _bring_back(self, card: RaceCard, view: int, candidates: Sequence[Dict]) -> Optional[RaceCard]:
+        """Scroll back up to a card passed earlier and find it again in the new frame"""
+        frame = self._scroll(card.view - view)
+        if frame is None:
+            return None
+        for fresh in self.read_view(frame, candidates, card.view):
+            if fresh.selectable and fresh.grade == card.grade and fresh.name == card.name:
+                return fresh
+        return None
+
+    # --- Choosing ---
+
+    @staticmethod
+    def _best(cards: Sequence[RaceCard], target_name: Optional[str],
+              grades: Optional[Sequence[str]]) -> Optional[RaceCard]:
+        selectable = [card for card in cards if card.selectable]
+        if target_name:
+            selectable = [card for card in selectable if card.name == target_name]
+        elif grades is not None:
+            selectable = [card for card in selectable if card.grade in grades]
+        if not selectable:
+            return None
+        return min(selectable, key=lambda card: (card.rank if grades is not None else 0,
+                                                 card.view, card.grade_box[1]))
+
+    def select(self, absolute_day: int, target_name: Optional[str] = None,
+               grades: Optional[Sequence[str]] = None) -> Tuple[Optional[RaceCard], bool]:
+        """
+        Find the race to enter
+
+        Args:
+            absolute_day: Current day, which decides the races that can be on the list
+            target_name: Scheduled race to look for
+            grades: Grades allowed, used when no race is scheduled or the scheduled race is not
+                held today; None for any race
+
+        Returns:
+            (card, complete): the card to click or None, and whether the list could be read at all.
+            When complete is False the caller should fall back to the panel search.
+            Like the panel search, a wanted race that is not on the list falls back to the first
+            race that matches the track.
+        """
+        candidates = get_races_by_day().get(absolute_day, []) if absolute_day > 0 else []
+        if not candidates:
+            return None, False
+
+        wanted = [race for race in candidates if race.get('name') == target_name] if target_name else []
+        if target_name and not wanted:
+            self.log(f"[RACE] {target_name} is not held on day {absolute_day}, looking by grade")
+            target_name = None
+        if not target_name:
+            wanted = [race for race in candidates
+                      if grades is None or grade_key(race.get('grade', '')) in grades]
+
+        frame = self.stream.latest()
+        if frame is None:
+            return None, False
+
+        cards: List[RaceCard] = []
+        seen = set()
+        view = 0
+        while True:
+            if self.check_stop():
+                return None, True
+            view_cards = self.read_view(frame, candidates, view)
+            cards.extend(view_cards)
+            seen.update(card.name for card in view_cards if card.name)
+
+            pick = self._best(cards, target_name, grades)
+            unseen = [race for race in wanted if race.get('name') not in seen]
+            if pick is not None:
+                # Stop unless a better graded race is known to be further down
+                if target_name or grades is None or not any(_grade_rank(race) < pick.rank for race in unseen):
+                    break
+            if not unseen or view >= MAX_SCROLLS:
+                break
+
+            next_frame = self._scroll(1)
+            if next_frame is None or not next_frame.differs_from(frame):
+                # The list did not move: its end is in view
+                break
+            frame = next_frame
+            view += 1
+
+        if not cards:
+            if view:
+                self._scroll(-view)
+            return None, False
+
+        if pick is None:
+            pick = self._best(cards, None, None)
+            if pick is None:
+                self.log("[RACE] No race on the list matches the track")
+                return None, True
+            self.log(f"[RACE] Wanted race not on the list, taking {pick.name or pick.grade.upper()}")
+
+        if pick.view != view:
+            passed_view = pick.view
+            pick = self._bring_back(pick, view, candidates)
+            if pick is None:
+                # Leave the list at the top for the panel search
+                if passed_view:
+                    self._scroll(-passed_view)
+                return None, False
+
+        self.log(f"[RACE] Selected {pick.name or 'race'} ({pick.grade.upper()}) from the race list")
+        return pick, True
@@ -1,8 +1,13 @@
 import json
 import re
 import os
+import threading
 from typing import Dict, List, Optional, Tuple
 
+from utils.log_pipeline import get_logger
+
+log = get_logger()
+
 
 class DateManager:
     """Manages date parsing and conversion from OCR text"""
@@ -67,7 +72,7 @@ class DateManager:
         Special case: "FinaleSeason" -> End of career
         Returns: {'year': 'Classic', 'month': 'Oct', 'period': 'Late', 'day': 2}
         """
-        print(f"[DEBUG] Original OCR text: '{year_text}'")
+        log.debug("Original OCR text: '%s'", year_text)
 
         # Special case: Check for Finale Season first
         cleaned_text = DateManager.clean_ocr_text(year_text)
@@ -88,7 +93,7 @@ class DateManager:
             try:
                 # Clean the OCR text first
                 cleaned_text = DateManager.clean_ocr_text(year_text)
-                print(f"[DEBUG] Cleaned OCR text (attempt {attempt + 1}): '{cleaned_text}'")
+                log.debug("Cleaned OCR text (attempt %d): '%s'", attempt + 1, cleaned_text)
 
                 # Special case: Check for Pre-Debut first
                 pre_debut_pattern = r'(Junior|Classic|Senior)Year(Pre|pre)Debut'
@@ -113,7 +118,7 @@ class DateManager:
                             'is_finale': False
                         }
 
-                        print(f"[DEBUG] Pre-Debut successfully parsed: {result}")
+                        log.debug("Pre-Debut successfully parsed: %s", result)
                         return result
 
                 # Normal pattern: (Junior|Classic|Senior)Year(Early|Late)(Jan|Feb|...)
@@ -145,9 +150,7 @@ class DateManager:
                             'is_finale': False
                         }
 
-                        print(f"[DEBUG] Successfully parsed: {result}")
-                        print(
-                            f"[DEBUG] Date details: {year} {month} {period} = Day {absolute_day}/75, Month #{DateManager.MONTHS[month]}")
+                        log.debug("Successfully parsed: %s", result)
                         return result
 
                 print(f"[WARNING] Date parse attempt {attempt + 1} failed for: '{year_text}' -> '{cleaned_text}'")
@@ -201,7 +204,7 @@ class DateManager:
                     'is_finale': False
                 }
 
-                print(f"[DEBUG] Emergency fallback result: {result}")
+                log.debug("Emergency fallback result: %s", result)
                 print(
                     f"[DEBUG] Fallback date details: {year_found} {month_found} {period_found} = Day {absolute_day}/75, Month #{DateManager.MONTHS[month_found]}")
                 return result
@@ -236,6 +239,57 @@ class DateManager:
         return False
 
 
+_race_data = None
+_race_data_lock = threading.Lock()
+
+
+def load_race_list() -> List[Dict]:
+    """Get race_list.json, parsed once per process and shared"""
+    global _race_data
+    with _race_data_lock:
+        if _race_data is None:
+            try:
+                race_file = os.path.join('assets', 'race_list.json')
+                if os.path.exists(race_file):
+                    with open(race_file, 'r', encoding='utf-8') as f:
+                        _race_data = json.load(f)
+                else:
+                    print(f"[WARNING] Race file not found: {race_file}")
+                    _race_data = []
+            except Exception as e:
+                print(f"[ERROR] Failed to load race data: {e}")
+                _race_data = []
+        return _race_data
+
+
+def preload_race_data():
+    """Parse the race list ahead of first use"""
+    load_race_list()
+
+
+_race_index = None
+
+
+def get_races_by_day() -> Dict[int, List[Dict]]:
+    """race_list.json indexed by absolute day, built once per process"""
+    global _race_index
+    races = load_race_list()
+    with _race_data_lock:
+        if _race_index is None:
+            index: Dict[int, List[Dict]] = {}
+            for race in races:
+                day = RaceManager.race_absolute_day(race)
+                if day is not None:
+                    index.setdefault(day, []).append(race)
+            _race_index = index
+        return _race_index
+
+
+def grade_key(grade: str) -> str:
+    """race_list.json grade ('G1', 'Pre-OP', ...) to the internal grade key ('g1', 'pre_op', ...)"""
+    return {'G1': 'g1', 'G2': 'g2', 'G3': 'g3', 'OP': 'op', 'Pre-OP': 'pre_op'}.get(grade, 'unknown')
+
+
 class RaceManager:
     """Manages race filtering and selection"""
 
@@ -246,27 +300,22 @@ class RaceManager:
     YEAR_INDICES = {'Junior': 0, 'Classic': 1, 'Senior': 2}
 
     def __init__(self):
-        self.races = self.load_race_data()
         self.filters = {
             'track': {'turf': True, 'dirt': True},
             'distance': {'sprint': True, 'mile': True, 'medium': True, 'long': True},
             'grade': {'g1': True, 'g2': True, 'g3': True, 'op': False, 'unknown': False}
         }
         self.preferred_races = []
+        self._preferred_by_day: Dict[int, List[Dict]] = {}
+
+    @property
+    def races(self) -> List[Dict]:
+        """Race list, loaded on first access"""
+        return load_race_list()
 
     def load_race_data(self) -> List[Dict]:
         """Load race data from JSON file"""
-        try:
-            race_file = os.path.join('assets', 'race_list.json')
-            if os.path.exists(race_file):
-                with open(race_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                print(f"[WARNING] Race file not found: {race_file}")
-                return []
-        except Exception as e:
-            print(f"[ERROR] Failed to load race data: {e}")
-            return []
+        return load_race_list()
 
     def update_filters(self, filters: Dict):
         """Update race filters"""
@@ -490,8 +539,17 @@ class RaceManager:
             race_names: List of dicts with 'name' and 'day' keys
         """
         self.preferred_races = race_names
+        by_day: Dict[int, List[Dict]] = {}
+        for entry in race_names or []:
+            by_day.setdefault(entry.get('day'), []).append(entry)
+        self._preferred_by_day = by_day
 
     def compute_absolute_day(self, race: Dict) -> Optional[int]:
+        """Compute absolute_day for a race from its year and date fields"""
+        return self.race_absolute_day(race)
+
+    @classmethod
+    def race_absolute_day(cls, race: Dict) -> Optional[int]:
         """Compute absolute_day for a race from its year and date fields"""
         try:
             year_str = race.get('year', '').split()[0]
@@ -501,8 +559,8 @@ class RaceManager:
             month_str = date_parts[0][:3]
             day = int(date_parts[1])
 
-            year_index = self.YEAR_INDICES.get(year_str)
-            month_num = self.MONTHS.get(month_str)
+            year_index = cls.YEAR_INDICES.get(year_str)
+            month_num = cls.MONTHS.get(month_str)
             if year_index is None or month_num is None:
                 return None
 
@@ -525,8 +583,8 @@ class RaceManager:
             return False, []
 
         # Match only by day - no track/distance/grade filter applied
-        scheduled_today = [p for p in self.preferred_races if p.get('day') == absolute_day]
-        return len(scheduled_today) > 0, scheduled_today
+        scheduled_today = self._preferred_by_day.get(absolute_day, [])
+        return len(scheduled_today) > 0, list(scheduled_today)
 
     def get_race_by_name(self, name: str) -> Optional[Dict]:
         """Look up a race by name from the loaded race data"""
@@ -0,0 +1,302 @@
+"""
+Race Planner
+Plans the races of a whole career at once from race_list.json, the uma's aptitudes and the
+race schedule filters, maximizing fan gain plus the value of the training turns left over,
+under the consecutive-race limit and a cap on the number of races
+"""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.race_manager import get_races_by_day
+
+UMA_MUSUME_DATA_FILE = os.path.join('assets', 'uma_musume_data.csv')
+APTITUDE_ORDER = ['S', 'A', 'B', 'C', 'D', 'E', 'F', 'G']
+# Same threshold as the event choice tab: A or B counts as suitable
+MIN_APTITUDE = 'B'
+CAREER_DAYS = 72
+# Racing more than this many turns in a row costs condition in game
+CONSECUTIVE_RACE_LIMIT = 3
+# Pre-debut turns and the summer camps, where the bot does not race unless told to
+PRE_DEBUT_LAST_DAY = 16
+MAX_CACHED_PLANS = 32
+# Larger than the fans of any career, so running over the limit is never worth it
+OVER_LIMIT_PENALTY = 10 ** 9
+# A turn not spent racing is spent training; its worth in fans is what a race has to beat.
+# Above a G3 (1800 fans), so the plan runs G2 and G1 races and trains through the rest.
+DEFAULT_RACE_PLANNER_CONFIG = {
+    "training_value": 2000,
+    "max_races": 15,
+}
+
+TRACK_CATEGORIES = ['Turf', 'Dirt']
+DISTANCE_CATEGORIES = ['Sprint', 'Mile', 'Medium', 'Long']
+
+
+def load_aptitudes(uma_name: str, csv_path: str = UMA_MUSUME_DATA_FILE) -> Optional[Dict[str, str]]:
+    """
+    Aptitude letters of an uma from uma_musume_data.csv
+
+    Returns:
+        Category ('Turf', 'Mile', ...) to letter, or None when the uma is not listed
+    """
+    try:
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('uma_musume', '') == uma_name:
+                    return {category: row.get(category, '').strip().upper()
+                            for category in TRACK_CATEGORIES + DISTANCE_CATEGORIES}
+    except OSError as e:
+        print(f"[WARNING] Could not read uma data: {e}")
+    return None
+
+
+def _category(value: str, categories: Sequence[str]) -> Optional[str]:
+    """Category a race_list.json track or distance belongs to; None for 'Varies'"""
+    for category in categories:
+        if value.startswith(category):
+            return category
+    return None
+
+
+def _suitable(letter: str, min_aptitude: str) -> bool:
+    if letter not in APTITUDE_ORDER:
+        return False
+    return APTITUDE_ORDER.index(letter) <= APTITUDE_ORDER.index(min_aptitude)
+
+
+def is_restricted_day(absolute_day: int) -> bool:
+    """Same days as DateManager.is_restricted_period: pre-debut and July/August after the first year"""
+    if absolute_day <= PRE_DEBUT_LAST_DAY:
+        return True
+    month_num = ((absolute_day - 1) % 24) // 2 + 1
+    return month_num in (7, 8) and absolute_day > 24
+
+
+class RacePlan:
+    """Races chosen for a career, at most one per day"""
+
+    def __init__(self, races_by_day: Dict[int, Dict], total_fans: int, key: str):
+        self.races_by_day = races_by_day
+        self.total_fans = total_fans
+        self.key = key
+
+    def __len__(self):
+        return len(self.races_by_day)
+
+    def race_on(self, absolute_day: int) -> Optional[Dict]:
+        return self.races_by_day.get(absolute_day)
+
+    def to_schedule(self) -> List[Dict]:
+        """The plan in the preset race_schedule format"""
+        return [{"name": race.get("name", ""), "day": day, "grade": race.get("grade", "")}
+                for day, race in sorted(self.races_by_day.items())]
+
+
+class RacePlanner:
+    """
+    Dynamic programming over the career calendar.
+
+    The state is the day, the number of races run on the days right before it and the number
+    of races in the plan so far. Each day either trains, which is worth training_value and resets
+    the streak, or runs that day's most valuable eligible race while the streak is under the
+    limit and the plan is under max_races. Scheduled races are fixed: they are always run and
+    count toward the streak and the race cap. With 72 days, a limit of 3 and a cap of 15 this is
+    a few thousand states. Plans are cached by a hash of everything they are computed from.
+    """
+
+    def __init__(self, max_cached: int = MAX_CACHED_PLANS):
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[str, RacePlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def eligible_races(self, filters: Optional[Dict] = None, aptitudes: Optional[Dict[str, str]] = None,
+                       min_aptitude: str = MIN_APTITUDE,
+                       skip_restricted: bool = True) -> Dict[int, List[Dict]]:
+        """
+        Races that pass the filters and the uma's aptitudes, by absolute day
+
+        Args:
+            filters: Race schedule filters ('year', 'grades', 'tracks', 'distances'); empty lists allow all
+            aptitudes: Letters from load_aptitudes, None to ignore aptitude
+            min_aptitude: Lowest letter that counts as suitable
+            skip_restricted: Leave out the days the bot does not race on by itself
+        """
+        filters = filters or {}
+        year = filters.get('year', 'All')
+        grades = filters.get('grades') or []
+        tracks = filters.get('tracks') or []
+        distances = filters.get('distances') or []
+
+        eligible: Dict[int, List[Dict]] = {}
+        for day, races in get_races_by_day().items():
+            if day > CAREER_DAYS or (skip_restricted and is_restricted_day(day)):
+                continue
+            for race in races:
+                if year != 'All' and race.get('year', '') != year:
+                    continue
+                if grades and race.get('grade', '') not in grades:
+                    continue
+                # 'Varies' satisfies every category, as in the race schedule dialog
+                track = _category(race.get('track', ''), TRACK_CATEGORIES)
+                distance = _category(race.get('distance', ''), DISTANCE_CATEGORIES)
+                if track and tracks and track not in tracks:
+                    continue
+                if distance and distances and distance not in distances:
+                    continue
+                if aptitudes:
+                    if track and not _suitable(aptitudes.get(track, ''), min_aptitude):
+                        continue
+                    if distance and not _suitable(aptitudes.get(distance, ''), min_aptitude):
+                        continue
+                eligible.setdefault(day, []).append(race)
+        return eligible
+
+    def plan(self, eligible: Dict[int, List[Dict]], fixed: Optional[Sequence[Dict]] = None,
+             consecutive_limit: int = CONSECUTIVE_RACE_LIMIT,
+             training_value: int = DEFAULT_RACE_PLANNER_CONFIG['training_value'],
+             max_races: int = DEFAULT_RACE_PLANNER_CONFIG['max_races']) -> RacePlan:
+        """
+        Best plan for a set of eligible races
+
+        Args:
+            eligible: Races by absolute day, from eligible_races
+            fixed: Entries already in the race schedule ({'name', 'day', ...}), kept as they are
+            consecutive_limit: Most races the plan runs on consecutive days
+            training_value: Worth in fans of a turn spent training instead of racing
+            max_races: Most races in the plan, fixed ones included; 0 or less for no cap
+
+        Returns:
+            RacePlan with the fixed entries and the chosen races
+        """
+        fixed_by_day = {}
+        for entry in fixed or []:
+            day = entry.get('day')
+            if isinstance(day, int) and 0 < day <= CAREER_DAYS:
+                fixed_by_day.setdefault(day, entry)
+
+        # Only the best race of a day can be worth running that day
+        best_by_day = {day: max(races, key=lambda race: race.get('fan_gain', 0))
+                       for day, races in eligible.items() if races}
+
+        max_races = max_races if max_races > 0 else CAREER_DAYS
+        key = self._plan_key(best_by_day, fixed_by_day, consecutive_limit, training_value, max_races)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        plan = self._solve(best_by_day, fixed_by_day, max(consecutive_limit, 1), max_races,
+                           training_value, key)
+
+        with self._lock:
+            self._cache[key] = plan
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return plan
+
+    @staticmethod
+    def _plan_key(best_by_day: Dict[int, Dict], fixed_by_day: Dict[int, Dict], consecutive_limit: int,
+                  training_value: int, max_races: int) -> str:
+        data = {
+            'races': sorted((day, race.get('name', ''), race.get('fan_gain', 0)) for day, race in best_by_day.items()),
+            'fixed': sorted((day, entry.get('name', '')) for day, entry in fixed_by_day.items()),
+            'limit': consecutive_limit,
+            'training_value': training_value,
+            'max_races': max_races,
+        }
+        return hashlib.sha1(json.dumps(data, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _solve(best_by_day: Dict[int, Dict], fixed_by_day: Dict[int, Dict], limit: int, max_races: int,
+               training_value: int, key: str) -> RacePlan:
+        # value[day][streak][used]: best fans plus training value from `day` to the end, with `streak`
+        # races run right before it and `used` races already in the plan. A fixed race past the limit
+        # is penalized rather than impossible, so races are not added next to fixed ones, yet a
+        # schedule that already breaks the limit still gets a plan.
+        value = [[[0] * (max_races + 1) for _ in range(limit + 1)] for _ in range(CAREER_DAYS + 2)]
+        choice: List[List[List[Optional[Tuple[str, Dict]]]]] = [
+            [[None] * (max_races + 1) for _ in range(limit + 1)] for _ in range(CAREER_DAYS + 2)]
+
+        for day in range(CAREER_DAYS, 0, -1):
+            for streak in range(limit + 1):
+                after_race = min(streak + 1, limit)
+                for used in range(max_races + 1):
+                    after_used = min(used + 1, max_races)
+                    if day in fixed_by_day:
+                        penalty = OVER_LIMIT_PENALTY if streak >= limit else 0
+                        value[day][streak][used] = value[day + 1][after_race][after_used] - penalty
+                        choice[day][streak][used] = ('fixed', fixed_by_day[day])
+                        continue
+                    train = training_value + value[day + 1][0][used]
+                    race = best_by_day.get(day)
+                    if race is not None and streak < limit and used < max_races:
+                        run = race.get('fan_gain', 0) + value[day + 1][after_race][after_used]
+                        if run > train:
+                            value[day][streak][used] = run
+                            choice[day][streak][used] = ('race', race)
+                            continue
+                    value[day][streak][used] = train
+
+        races_by_day: Dict[int, Dict] = {}
+        total_fans = 0
+        streak = 0
+        used = 0
+        for day in range(1, CAREER_DAYS + 1):
+            picked = choice[day][streak][used]
+            if picked is None:
+                streak = 0
+                continue
+            kind, race = picked
+            races_by_day[day] = race
+            if kind == 'race':
+                total_fans += race.get('fan_gain', 0)
+            streak = min(streak + 1, limit)
+            used = min(used + 1, max_races)
+        return RacePlan(races_by_day, total_fans, key)
+
+    def plan_career(self, uma_name: Optional[str] = None, filters: Optional[Dict] = None,
+                    fixed: Optional[Sequence[Dict]] = None,
+                    consecutive_limit: int = CONSECUTIVE_RACE_LIMIT,
+                    planner_config: Optional[Dict] = None) -> RacePlan:
+        """
+        Plan a career for an uma
+
+        Args:
+            uma_name: Uma from uma_musume_data.csv; aptitude is ignored when unknown or None
+            filters: Race schedule filters
+            fixed: Entries already in the race schedule, kept in the plan
+            consecutive_limit: Most races run on consecutive days
+            planner_config: 'training_value' and 'max_races'; the race_planner section of
+                config.json when None
+        """
+        if planner_config is None:
+            from core.logic import get_config
+            planner_config = get_config().get("race_planner", {})
+        planner_config = dict(DEFAULT_RACE_PLANNER_CONFIG, **planner_config)
+
+        aptitudes = load_aptitudes(uma_name) if uma_name and uma_name != "None" else None
+        return self.plan(self.eligible_races(filters, aptitudes), fixed, consecutive_limit,
+                         training_value=int(planner_config['training_value']),
+                         max_races=int(planner_config['max_races']))
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_planner: Optional[RacePlanner] = None
+
+
+def get_race_planner() -> RacePlanner:
+    """Get the shared race planner"""
+    global _planner
+    if _planner is None:
+        _planner = RacePlanner()
+    return _planner
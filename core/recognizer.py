@@ -3,6 +3,9 @@ import numpy as np
 from PIL import ImageGrab, ImageStat
 
 from utils.screenshot import capture_region
+from core.scale_manager import load_template
+from core.game_window import get_game_window
+from core.input_executor import get_input_executor, settle_input, wait_for
 
 def validate_region_coordinates(region):
   """Validate and fix region coordinates to prevent PyAutoGUI errors"""
@@ -38,9 +41,13 @@ def validate_region_coordinates(region):
     print(f"[ERROR] Invalid region format: {region}")
     return None
 
-def match_template(template_path, region=None, threshold=0.85, debug=False):
+def match_template(template_path, region=None, threshold=0.85, debug=False, return_confidence=False):
   """Match template with improved region handling and error prevention"""
   try:
+    # Limit capture to the game window when no region is given
+    if not region:
+      region = get_game_window().get_client_region()
+
     # Validate and convert region if provided
     bbox_region = None
     if region:
@@ -49,7 +56,8 @@ def match_template(template_path, region=None, threshold=0.85, debug=False):
         print(f"[ERROR] Invalid region for template matching: {region}")
         return []
 
-    # Get screenshot with error handling
+    # Get screenshot with error handling, once queued clicks have landed
+    settle_input()
     try:
       if bbox_region:
         screen = np.array(ImageGrab.grab(bbox=bbox_region))
@@ -62,9 +70,19 @@ def match_template(template_path, region=None, threshold=0.85, debug=False):
     # Convert color space
     screen = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
 
+    left, top = (bbox_region[0], bbox_region[1]) if bbox_region else (0, 0)
+    return match_screen(screen, (left, top), template_path, threshold, debug, return_confidence)
+
+  except Exception as e:
+    print(f"[ERROR] Unexpected error in match_template: {e}")
+    return []
+
+def match_screen(screen, origin, template_path, threshold=0.85, debug=False, return_confidence=False):
+  """Match a template in an already captured BGR screen whose top-left sits at origin on screen"""
+  try:
     # Load template with error handling
     try:
-      template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+      template = load_template(template_path)
       if template is None:
         print(f"[ERROR] Could not load template: {template_path}")
         return []
@@ -79,60 +97,66 @@ def match_template(template_path, region=None, threshold=0.85, debug=False):
     # Perform template matching with error handling
     try:
       result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-      loc = np.where(result >= threshold)
     except Exception as e:
       print(f"[ERROR] Template matching failed: {e}")
       return []
 
     h, w = template.shape[:2]
-    boxes = []
+    left, top = origin
 
-    # Convert matches to box format
-    for pt in zip(*loc[::-1]):
-      x, y = pt
-      # Adjust coordinates if region was used
-      if bbox_region:
-        left, top = bbox_region[0], bbox_region[1]
-        x += left
-        y += top
-      boxes.append((x, y, w, h))
+    # One box per matched blob instead of one per pixel above threshold
+    peaks = extract_match_peaks(result, threshold)
+    boxes = []
+    for x, y, confidence in peaks:
+      if return_confidence:
+        boxes.append((x + left, y + top, w, h, confidence))
+      else:
+        boxes.append((x + left, y + top, w, h))
 
     # Debug output
     if debug and boxes:
-      for i, (x, y, w, h) in enumerate(boxes):
-        # Calculate confidence for debug
-        screen_y = y - (bbox_region[1] if bbox_region else 0)
-        screen_x = x - (bbox_region[0] if bbox_region else 0)
-        if 0 <= screen_y < result.shape[0] and 0 <= screen_x < result.shape[1]:
-          confidence = result[screen_y, screen_x]
-          print(f"  Match {i+1}: ({x}, {y}) - Confidence: {confidence:.3f}")
+      for i, (x, y, confidence) in enumerate(peaks):
+        print(f"  Match {i+1}: ({x + left}, {y + top}) - Confidence: {confidence:.3f}")
 
-    return deduplicate_boxes(boxes)
+    return boxes
 
   except Exception as e:
-    print(f"[ERROR] Unexpected error in match_template: {e}")
+    print(f"[ERROR] Unexpected error in match_screen: {e}")
     return []
 
-def deduplicate_boxes(boxes, min_dist=20):
-  """Remove duplicate detection boxes that are too close to each other"""
-  if not boxes:
+def extract_match_peaks(result, threshold, min_dist=20):
+  """Reduce a match result map to one (x, y, confidence) peak per above-threshold blob"""
+  mask = (result >= threshold).astype(np.uint8)
+  if not mask.any():
     return []
 
-  filtered = []
-  for x, y, w, h in boxes:
-    cx, cy = x + w // 2, y + h // 2
-    is_duplicate = False
-
-    for fx, fy, fw, fh in filtered:
-      fcx, fcy = fx + fw // 2, fy + fh // 2
-      if abs(cx - fcx) <= min_dist and abs(cy - fcy) <= min_dist:
-        is_duplicate = True
-        break
-
-    if not is_duplicate:
-      filtered.append((x, y, w, h))
-
-  return filtered
+  # Label connected blobs and keep the highest scoring pixel of each
+  _, labels = cv2.connectedComponents(mask, connectivity=8)
+  ys, xs = np.nonzero(mask)
+  blob_ids = labels[ys, xs]
+  scores = result[ys, xs]
+  order = np.lexsort((-scores, blob_ids))
+  sorted_ids = blob_ids[order]
+  is_first = np.empty(len(order), dtype=bool)
+  is_first[0] = True
+  is_first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+  peaks = order[is_first]
+
+  # Merge peaks of split blobs that are closer than min_dist, strongest first
+  peaks = peaks[np.argsort(-scores[peaks], kind='stable')]
+  peak_x, peak_y = xs[peaks], ys[peaks]
+  keep = np.ones(len(peaks), dtype=bool)
+  for i in range(len(peaks)):
+    if not keep[i]:
+      continue
+    close = (np.abs(peak_x - peak_x[i]) <= min_dist) & (np.abs(peak_y - peak_y[i]) <= min_dist)
+    close[:i + 1] = False
+    keep &= ~close
+
+  peaks = peaks[keep]
+  # Keep the top-to-bottom, left-to-right order callers expect
+  peaks = peaks[np.lexsort((xs[peaks], ys[peaks]))]
+  return [(int(xs[i]), int(ys[i]), float(scores[i])) for i in peaks]
 
 def is_infirmary_active(region):
   """Check if infirmary button is active based on brightness"""
@@ -163,6 +187,11 @@ def is_infirmary_active(region):
 def find_template_position(template_path, region=None, threshold=0.85, return_center=True, region_format='xywh', return_confidence=False):
   """Find a single template position on screen and return its location with improved error handling"""
   try:
+    # Limit capture to the game window when no region is given
+    if not region:
+      region = get_game_window().get_client_region()
+      region_format = 'xywh'
+
     # Handle different region formats and validate
     bbox_region = None
     if region:
@@ -181,7 +210,8 @@ def find_template_position(template_path, region=None, threshold=0.85, return_ce
         print(f"[ERROR] Invalid region for template position: {region}")
         return None
 
-    # Capture screenshot with error handling
+    # Capture screenshot with error handling, once queued clicks have landed
+    settle_input()
     try:
       if bbox_region:
         screen = np.array(ImageGrab.grab(bbox=bbox_region))
@@ -198,7 +228,7 @@ def find_template_position(template_path, region=None, threshold=0.85, return_ce
 
     # Load template image with error handling
     try:
-      template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+      template = load_template(template_path)
       if template is None:
         print(f"[ERROR] Template image not found: {template_path}")
         return None
@@ -259,8 +289,7 @@ import numpy as np
 def click_position(x, y):
   """Click at specific coordinates"""
   try:
-    pyautogui.click(x, y)
-    return True
+    return wait_for(get_input_executor().click(x, y))
   except Exception as e:
     print(f"Error clicking position ({x}, {y}): {e}")
     return False
@@ -285,8 +314,7 @@ def recognize_image(image_path, region=None, confidence=0.7):
         if x2 > x1 and y2 > y1:  # (x1, y1, x2, y2) format
           region = (x1, y1, x2 - x1, y2 - y1)
 
-    location = pyautogui.locateOnScreen(image_path, region=region, confidence=confidence)
-    return location is not None
+    return bool(match_template(image_path, region=region, threshold=confidence))
   except Exception as e:
     print(f"Error recognizing image {image_path}: {e}")
     return False
@@ -311,11 +339,10 @@ def click_image_if_found(image_path, region=None, confidence=0.7):
         if x2 > x1 and y2 > y1:  # (x1, y1, x2, y2) format
           region = (x1, y1, x2 - x1, y2 - y1)
 
-    location = pyautogui.locateOnScreen(image_path, region=region, confidence=confidence)
-    if location:
-      center = pyautogui.center(location)
-      pyautogui.click(center)
-      return True
+    boxes = match_template(image_path, region=region, threshold=confidence)
+    if boxes:
+      x, y, w, h = boxes[0]
+      return wait_for(get_input_executor().click(x + w // 2, y + h // 2))
     else:
       return False
   except Exception as e:
@@ -4,6 +4,7 @@ import json
 from typing import Callable, Optional, List, Tuple, Dict
 
 from core.click_handler import enhanced_click, random_click_in_region
+from core.location_cache import locate_center_on_screen, locate_on_screen
 from core.state import get_current_date_info, get_stage_thresholds
 
 def load_scoring_config():
@@ -53,7 +54,7 @@ class RestHandler:
             if self.check_stop():
                 return False
 
-            btn_region = pyautogui.locateOnScreen(button_path, confidence=0.8, minSearchTime=1.0)
+            btn_region = locate_on_screen(button_path, confidence=0.8, min_search_time=1.0)
 
             if btn_region:
                 if self.check_stop():
@@ -86,15 +87,14 @@ class RestHandler:
             if self.check_stop():
                 return False
 
-            btn_region = pyautogui.locateOnScreen(button_path, confidence=0.8, minSearchTime=1.0)
+            btn_region = locate_on_screen(button_path, confidence=0.8, min_search_time=1.0)
 
             if btn_region:
                 if self.check_stop():
                     return False
 
                 # Random click within button region
-                random_click_in_region(btn_region.left, btn_region.top,
-                                       btn_region.width, btn_region.height, duration=0.15)
+                random_click_in_region(*btn_region, duration=0.15)
 
                 return True
 
@@ -164,8 +164,7 @@ class RestHandler:
         """Execute rest button click with appropriate handling"""
         try:
             # Random click within button region
-            random_click_in_region(btn_region.left, btn_region.top,
-                                   btn_region.width, btn_region.height, duration=0.15)
+            random_click_in_region(*btn_region, duration=0.15)
 
             # Handle summer vacation dialog if needed
             if button_type == "regular_rest" and is_summer:
@@ -216,8 +215,8 @@ class RestHandler:
                 return False
 
             # Check if we're already at main menu
-            tazuna_hint = pyautogui.locateCenterOnScreen("assets/ui/tazuna_hint.png",
-                                                         confidence=0.8, minSearchTime=0.3)
+            tazuna_hint = locate_center_on_screen("assets/ui/tazuna_hint.png",
+                                                  confidence=0.8, min_search_time=0.3)
 
             if tazuna_hint:
                 self.log(f"[INFO] At main menu (attempt {attempt + 1})")
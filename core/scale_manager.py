@@ -0,0 +1,167 @@
+"""
+Scale Manager
+Detects the game window scale once and serves templates pre-scaled to it
+"""
+
+import json
+import os
+import threading
+
+import cv2
+import numpy as np
+from PIL import ImageGrab
+
+from core.template_pack import PACK_FOLDERS, read_template
+
+SCALE_SETTINGS_FILE = "scale_settings.json"
+SCALED_TEMPLATE_DIR = "template_cache"
+SCALE_ANCHOR_TEMPLATE = "assets/ui/tazuna_hint.png"
+SCALE_CANDIDATES = tuple(round(0.5 + 0.05 * i, 2) for i in range(21))
+SCALE_DETECT_THRESHOLD = 0.75
+TEMPLATE_FOLDERS = PACK_FOLDERS
+
+
+class ScaleManager:
+    """Holds the detected scale factor and the templates rendered at that scale"""
+
+    def __init__(self, settings_file=SCALE_SETTINGS_FILE, cache_dir=SCALED_TEMPLATE_DIR):
+        self.settings_file = settings_file
+        self.cache_dir = cache_dir
+        self.scale = 1.0
+        self._templates = {}
+        self._lock = threading.Lock()
+        self._load_settings()
+
+    def _load_settings(self):
+        """Load the last detected scale"""
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r') as f:
+                    self.scale = float(json.load(f).get('scale', 1.0))
+        except (json.JSONDecodeError, OSError, ValueError, TypeError) as e:
+            print(f"[WARNING] Could not load scale settings: {e}")
+            self.scale = 1.0
+
+    def _save_settings(self):
+        """Persist the detected scale"""
+        try:
+            with open(self.settings_file, 'w') as f:
+                json.dump({'scale': self.scale}, f, indent=2)
+        except OSError as e:
+            print(f"[WARNING] Could not save scale settings: {e}")
+
+    def set_scale(self, scale):
+        """Switch to a new scale factor and drop templates rendered at the old one"""
+        scale = round(float(scale), 2)
+        with self._lock:
+            if scale == self.scale:
+                return
+            self.scale = scale
+            self._templates.clear()
+        self._save_settings()
+
+    def detect_scale(self, anchor_path=SCALE_ANCHOR_TEMPLATE, candidates=SCALE_CANDIDATES,
+                     threshold=SCALE_DETECT_THRESHOLD):
+        """
+        Detect the game scale by matching the anchor template at each candidate scale
+
+        Returns:
+            Detected scale factor, or None if the anchor is not on screen
+        """
+        try:
+            anchor = read_template(anchor_path)
+            if anchor is None:
+                print(f"[ERROR] Could not load scale anchor: {anchor_path}")
+                return None
+
+            screen = cv2.cvtColor(np.array(ImageGrab.grab()), cv2.COLOR_RGB2BGR)
+            best_scale, best_val = None, threshold
+            for scale in candidates:
+                scaled = _resize_template(anchor, scale)
+                if scaled.shape[0] > screen.shape[0] or scaled.shape[1] > screen.shape[1]:
+                    continue
+                result = cv2.matchTemplate(screen, scaled, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, _ = cv2.minMaxLoc(result)
+                if max_val > best_val:
+                    best_scale, best_val = scale, max_val
+
+            if best_scale is None:
+                return None
+
+            self.set_scale(best_scale)
+            return best_scale
+
+        except Exception as e:
+            print(f"[ERROR] Scale detection failed: {e}")
+            return None
+
+    def _cache_path(self, template_path):
+        """Disk location of a template rendered at the current scale"""
+        return os.path.join(self.cache_dir, f"x{self.scale:.2f}", os.path.normpath(template_path))
+
+    def load_template(self, template_path):
+        """Get a template at the current scale, rendering and caching it on first use"""
+        with self._lock:
+            template = self._templates.get(template_path)
+            if template is not None:
+                return template
+
+            scale = self.scale
+            template = None
+            if scale != 1.0:
+                cache_path = self._cache_path(template_path)
+                try:
+                    if os.path.getmtime(cache_path) >= os.path.getmtime(template_path):
+                        template = cv2.imread(cache_path, cv2.IMREAD_COLOR)
+                except OSError:
+                    template = None
+
+            if template is None:
+                template = read_template(template_path)
+                if template is None:
+                    return None
+                if scale != 1.0:
+                    template = _resize_template(template, scale)
+                    try:
+                        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                        cv2.imwrite(cache_path, template)
+                    except Exception as e:
+                        print(f"[WARNING] Could not cache scaled template {template_path}: {e}")
+
+            self._templates[template_path] = template
+            return template
+
+    def prebuild_templates(self, folders=TEMPLATE_FOLDERS):
+        """Render every template at the current scale ahead of matching"""
+        count = 0
+        for folder in folders:
+            for root, _, files in os.walk(folder):
+                for name in files:
+                    if name.lower().endswith('.png'):
+                        path = os.path.join(root, name).replace(os.sep, '/')
+                        if self.load_template(path) is not None:
+                            count += 1
+        return count
+
+
+def _resize_template(template, scale):
+    """Resize a template, using area sampling when shrinking"""
+    if scale == 1.0:
+        return template
+    height, width = template.shape[:2]
+    new_size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+    return cv2.resize(template, new_size, interpolation=interpolation)
+
+
+_scale_manager = ScaleManager()
+
+
+def get_scale_manager():
+    """Get the shared scale manager"""
+    return _scale_manager
+
+
+def load_template(template_path):
+    """Get a template rendered at the detected game scale"""
+    return _scale_manager.load_template(template_path)
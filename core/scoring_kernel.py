@@ -0,0 +1,265 @@
+"""
+Scoring Kernel
+Scores all five trainings for many turns at once from precomputed per-day tables.
+Produces the same totals as score_support_counts followed by apply_single_training_penalty.
+"""
+
+import json
+
+import numpy as np
+
+TRAINING_TYPES = ("spd", "sta", "pwr", "guts", "wit")
+WIT_INDEX = TRAINING_TYPES.index("wit")
+
+# Feature columns of a (..., 5, N_FEATURES) count array
+FEATURES = ("rainbow", "friend", "other_support", "hint", "npc", "scenario_npc",
+            "special_training", "spirit_explosion")
+F_RAINBOW, F_FRIEND, F_OTHER, F_HINT, F_NPC, F_SCENARIO_NPC, F_SPECIAL, F_SPIRIT = range(len(FEATURES))
+N_FEATURES = len(FEATURES)
+ICON_FEATURES = ("hint", "npc", "scenario_npc", "special_training", "spirit_explosion")
+
+MAX_DAY = 75
+MAX_ICON_COUNT = 16
+DEFAULT_CAP = 1200
+
+
+def month_of_day(absolute_day):
+    """Month number for an absolute day, 13 for the finale"""
+    if absolute_day > 72:
+        return 13
+    if absolute_day <= 0:
+        return 0
+    return ((absolute_day - 1) % 24) // 2 + 1
+
+
+class ScoringKernel:
+    """Per-day lookup tables built from one snapshot of config, deck and scenario"""
+
+    def __init__(self, config, support_state, stat_caps, scenario_name, wit_bonus_day_limit, state_scoring=None):
+        from core.logic import TRAINING_SECONDARY_STATS
+
+        # core.logic reads its cached config, core.state reads config.json on every call
+        logic_scoring = config.get("scoring_config", {})
+        scoring = logic_scoring if state_scoring is None else state_scoring
+        support_config = scoring.get("support_score", {})
+        days = np.arange(MAX_DAY + 1)
+
+        # Values read by core.state during detection
+        self.base_score = support_config.get("base_value", 1.0)
+        npc_base = scoring.get("npc_score", {}).get("base_value", 0.25)
+        self.npc_value = npc_base
+        self.scenario_npc_value = round(npc_base / 2, 2)
+
+        hint_config = scoring.get("hint_score", {})
+        self.hint_value = np.where(days < hint_config.get("day_threshold", 24),
+                                   hint_config.get("early_stage", 1.0), hint_config.get("late_stage", 0.5))
+
+        stages = scoring.get("stage_thresholds", {"pre_debut": 16, "early_stage": 24, "mid_stage": 48})
+        pre_debut, early, mid = stages.get("pre_debut", 16), stages.get("early_stage", 24), stages.get("mid_stage", 48)
+        rainbow_config = support_config.get("rainbow_multiplier", {})
+        self.rainbow_multiplier = np.select(
+            [days <= pre_debut, days <= early, days <= mid],
+            [rainbow_config.get("pre_debut", 1.0), rainbow_config.get("early_stage", 1.0),
+             rainbow_config.get("mid_stage", 1.0)],
+            rainbow_config.get("late_stage", 1.0))
+        self.wit_rainbow_penalty_active = days > early
+
+        # Friend multiplier uses the stage thresholds read by core.logic
+        logic_early = logic_scoring.get("stage_thresholds", {}).get("early_stage", 24)
+        friend_config = logic_scoring.get("support_score", {}).get("friend_multiplier", {})
+        self.friend_multiplier = np.empty((MAX_DAY + 1, len(TRAINING_TYPES)))
+        if isinstance(friend_config, dict):
+            self.friend_multiplier[:] = np.where(days < logic_early, friend_config.get("early_stage", 1.1),
+                                                 friend_config.get("late_stage", 1.0))[:, None]
+            self.friend_multiplier[:, WIT_INDEX] = friend_config.get("friend_wit_multiplier", 0.5)
+        else:
+            self.friend_multiplier[:] = friend_config
+
+        wit_config = logic_scoring.get("wit_training", {})
+        self.wit_bonus = np.where(days < wit_bonus_day_limit, wit_config.get("early_stage_bonus", 0.25), 0.0)
+
+        # Unity Cup icon scores, indexed by icon count so rounding matches the scalar path
+        self.is_unity_cup = scenario_name == "Unity Cup"
+        unity_config = scoring.get("unity_cup", {})
+        special_value = unity_config.get("special_training_score", 1.0)
+        spirit_value = unity_config.get("spirit_explosion_score", 1.0)
+        self.special_table = np.array([0.0] + [round(special_value * (2 ** (n - 1)), 2)
+                                               for n in range(1, MAX_ICON_COUNT + 1)])
+        self.spirit_table = np.array([0.0] + [round(n * spirit_value, 2) for n in range(1, MAX_ICON_COUNT + 1)])
+
+        self.support_card_bonus = np.zeros((MAX_DAY + 1, len(TRAINING_TYPES)))
+        if not self.is_unity_cup:
+            for day in range(1, MAX_DAY + 1):
+                bonus = _support_card_bonus(support_state, day)
+                for index, key in enumerate(TRAINING_TYPES):
+                    self.support_card_bonus[day, index] = bonus.get(key, 0)
+
+        # Stat cap penalty
+        penalty = logic_scoring.get("stat_cap_penalty", {})
+        adjustments = penalty.get("day_cap_adjustments", {})
+        self.penalty_enabled = penalty.get("enabled", True)
+        self.max_penalty = penalty.get("max_penalty_percent", 40)
+        self.start_penalty_percent = penalty.get("start_penalty_percent", 80)
+        self.start_penalty_gap = penalty.get("start_penalty_gap", 200)
+        self.penalty_active = self.penalty_enabled & (days >= config.get("stat_cap_threshold_day", 30))
+
+        adjustment = np.select([days >= 75, days == 74],
+                               [adjustments.get("day_75", 30), adjustments.get("day_74", 45)],
+                               adjustments.get("day_73_and_below", 60))
+        base_caps = np.array([stat_caps.get(key, DEFAULT_CAP) for key in TRAINING_TYPES])
+        has_cap = np.array([key in stat_caps for key in TRAINING_TYPES])
+        self.effective_caps = np.where(has_cap[None, :], base_caps[None, :] - adjustment[:, None], DEFAULT_CAP)
+
+        last_days_count = penalty.get("last_days_count", 5)
+        reduction = 1.0 - (penalty.get("last_days_penalty_reduction", 50) / 100)
+        self.last_days_multiplier = np.where(days > MAX_DAY - last_days_count, reduction, 1.0)
+
+        # Row = training, column = stat whose cap proximity penalizes it
+        self.penalty_weights = np.eye(len(TRAINING_TYPES))
+        for key, secondaries in TRAINING_SECONDARY_STATS.items():
+            for sec_key, ratio in secondaries:
+                self.penalty_weights[TRAINING_TYPES.index(key), TRAINING_TYPES.index(sec_key)] = ratio
+
+    def base_scores(self, counts, days, energy_shortage=0.0):
+        """
+        Score support, hint, NPC and Unity Cup icons for every training
+
+        Args:
+            counts: Integer array (turns, 5, N_FEATURES) of icon counts per training
+            days: Absolute day per turn, shape (turns,)
+            energy_shortage: Missing energy per turn, scalar or shape (turns,)
+
+        Returns:
+            Array (turns, 5) of scores before the stat cap penalty
+        """
+        counts = np.asarray(counts)
+        days = np.asarray(days)
+        shortage = np.broadcast_to(np.asarray(energy_shortage, dtype=float), days.shape)
+
+        rainbow = counts[..., F_RAINBOW]
+        friend = counts[..., F_FRIEND]
+
+        rainbow_score = rainbow * self.rainbow_multiplier[days][:, None] * self.base_score
+        friend_score = np.where(friend > 0, friend * self.friend_multiplier[days], 0)
+        other_score = counts[..., F_OTHER] * self.base_score
+        hint_score = np.where(counts[..., F_HINT] > 0, self.hint_value[days][:, None], 0)
+        npc_score = (np.where(counts[..., F_NPC] > 0, self.npc_value, 0)
+                     + np.where(counts[..., F_SCENARIO_NPC] > 0, self.scenario_npc_value, 0))
+
+        total = rainbow_score + friend_score + other_score + hint_score + npc_score
+        if self.is_unity_cup:
+            total = (total + self.special_table[np.minimum(counts[..., F_SPECIAL], MAX_ICON_COUNT)]
+                     + self.spirit_table[np.minimum(counts[..., F_SPIRIT], MAX_ICON_COUNT)])
+
+        # WIT: early bonus, then the energy recovery penalty for wit rainbows
+        wit = total[:, WIT_INDEX] + self.wit_bonus[days]
+        wit_rainbows = np.where(self.wit_rainbow_penalty_active[days], rainbow[:, WIT_INDEX], 0)
+        recovery_penalty = np.maximum(0.0, (4 * wit_rainbows - (shortage - 4)) / 10)
+        total[:, WIT_INDEX] = wit - recovery_penalty
+
+        return total + self.support_card_bonus[days]
+
+    def stat_penalty_percent(self, stats, days):
+        """Cap proximity penalty percent per stat, shape (turns, 5)"""
+        stats = np.asarray(stats, dtype=float)
+        caps = self.effective_caps[np.asarray(days)]
+
+        trigger = np.minimum(caps * (self.start_penalty_percent / 100), caps - self.start_penalty_gap)
+        span = caps - trigger
+        fill = np.divide(stats - trigger, span, out=np.zeros_like(stats), where=span > 0)
+        percent = np.minimum(self.max_penalty, np.maximum(0, np.square(fill) * self.max_penalty))
+
+        percent = np.where(span <= 0, self.max_penalty, percent)
+        percent = np.where(stats < trigger, 0.0, percent)
+        return np.where(stats >= caps, self.max_penalty, percent)
+
+    def penalty_multipliers(self, stats, days):
+        """Score multiplier per training from the stat cap penalty, shape (turns, 5)"""
+        days = np.asarray(days)
+        stat_percent = self.stat_penalty_percent(stats, days)
+
+        final = np.max(stat_percent[:, None, :] * self.penalty_weights[None, :, :], axis=2)
+        final = final * self.last_days_multiplier[days][:, None]
+        final = np.where(self.penalty_active[days][:, None], final, 0.0)
+        return np.where(final > 0, 1.0 - (final / 100), 1.0)
+
+    def capped_mask(self, stats, days):
+        """Trainings whose stat has reached its effective cap, shape (turns, 5)"""
+        return np.asarray(stats) >= self.effective_caps[np.asarray(days)]
+
+    def score(self, counts, days, energy_shortage=0.0, stats=None):
+        """Score every training for every turn, stat cap penalty included when stats are given"""
+        total = self.base_scores(counts, days, energy_shortage)
+        if stats is None:
+            return total
+        return total * self.penalty_multipliers(stats, days)
+
+
+def _support_card_bonus(support_state, absolute_day):
+    """Deck bonus per training for one day, mirroring calculate_support_card_bonus"""
+    from core.state import calculate_support_card_bonus, get_support_card_state, set_support_card_state
+
+    date = {'absolute_day': absolute_day, 'month_num': month_of_day(absolute_day)}
+    previous_state = get_support_card_state()
+    set_support_card_state(support_state)
+    try:
+        return calculate_support_card_bonus(date)
+    finally:
+        set_support_card_state(previous_state)
+
+
+def build_count_array(training_supports, deck_types=None):
+    """
+    Convert per-training support dicts into a (5, N_FEATURES) count array
+
+    Args:
+        training_supports: {training: {card_type: count, 'hint': n, 'npc': n, 'scenario_npc': n, ...}}
+        deck_types: Card types counted as support (defaults to every non-feature key)
+    """
+    counts = np.zeros((len(TRAINING_TYPES), N_FEATURES), dtype=np.int64)
+    for index, key in enumerate(TRAINING_TYPES):
+        entry = training_supports.get(key, {})
+        for card_type, count in entry.items():
+            if card_type in ICON_FEATURES or (deck_types is not None and card_type not in deck_types):
+                continue
+            if card_type == key:
+                counts[index, F_RAINBOW] += count
+            elif card_type == "friend":
+                counts[index, F_FRIEND] += count
+            else:
+                counts[index, F_OTHER] += count
+        for feature in ICON_FEATURES:
+            counts[index, FEATURES.index(feature)] = entry.get(feature, 0)
+    return counts
+
+
+def stats_array(current_stats):
+    """Convert a stats dict into a length-5 array in training order"""
+    return np.array([(current_stats or {}).get(key, 0) for key in TRAINING_TYPES], dtype=float)
+
+
+_kernel = None
+_kernel_key = None
+
+
+def get_scoring_kernel():
+    """Get a kernel for the current config, deck, stat caps and scenario, rebuilding when any changes"""
+    global _kernel, _kernel_key
+    from core.logic import get_config, get_stat_caps, EARLY_STAGE_THRESHOLD
+    from core.state import get_support_card_state, load_scoring_config
+    from utils.constants import SCENARIO_NAME
+
+    config = get_config()
+    state_scoring = load_scoring_config()
+    support_state = get_support_card_state()
+    stat_caps = get_stat_caps()
+    # Keyed on contents: an edit of config.json reaches core.state before reload_config runs
+    config_key = json.dumps([config.get("scoring_config", {}), config.get("stat_cap_threshold_day", 30),
+                             state_scoring], sort_keys=True, default=str)
+    key = (config_key, SCENARIO_NAME, tuple(sorted(support_state.items())), tuple(sorted(stat_caps.items())))
+
+    if _kernel is None or key != _kernel_key:
+        _kernel = ScoringKernel(config, support_state, stat_caps, SCENARIO_NAME, EARLY_STAGE_THRESHOLD,
+                                state_scoring=state_scoring)
+        _kernel_key = key
+    return _kernel
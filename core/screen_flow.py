@@ -0,0 +1,338 @@
+"""
+Screen Flow
+Declarative step runner for menu-driven loops: each step names the screen it expects and
+what to do there, and the runner moves on as soon as that screen shows up in the frame stream
+"""
+
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from core.frame_stream import FrameStream, get_frame_stream
+from core.game_window import get_game_window
+from core.input_executor import get_input_executor, wait_for
+from core.metrics import get_metrics
+from core.scale_manager import get_scale_manager
+
+DEFAULT_POLL_INTERVAL = 0.15
+DEFAULT_STEP_TIMEOUT = 15.0
+# How long after a click a frame that still looks like the clicked screen is ignored
+CLICK_CHANGE_GRACE = 1.5
+
+
+class Screen:
+    """A screen or button recognised by any one of its templates"""
+
+    def __init__(self, name: str, templates: Union[str, Sequence[str]],
+                 region: Optional[Tuple[int, int, int, int]] = None, confidence: float = 0.8):
+        """
+        Args:
+            name: Name used in logs and timing reports
+            templates: Template path, or paths that all count as this screen
+            region: Optional calibrated (left, top, width, height) search region, mapped to the current window;
+                defaults to the left half of the client area, like find_and_click
+            confidence: Template matching confidence (0-1)
+        """
+        self.name = name
+        self.templates = [templates] if isinstance(templates, str) else list(templates)
+        self.region = region
+        self.confidence = confidence
+
+    def find(self, frame) -> Optional[Tuple[str, Tuple[int, int, int, int]]]:
+        window = get_game_window()
+        if self.region:
+            region = window.to_screen_region(self.region, get_scale_manager().scale)
+        else:
+            client_region = window.get_client_region()
+            region = None
+            if client_region:
+                left, top, width, height = client_region
+                region = (left, top, width // 2, height)
+        for template in self.templates:
+            boxes = frame.find(template, region=region, confidence=self.confidence)
+            if boxes:
+                return template, boxes[0]
+        return None
+
+
+class Hit:
+    """Where a step's screen was found"""
+
+    __slots__ = ('screen', 'template', 'box')
+
+    def __init__(self, screen: Screen, template: str, box: Tuple[int, int, int, int]):
+        self.screen = screen
+        self.template = template
+        self.box = box
+
+    def is_(self, screen: Screen) -> bool:
+        return self.screen is screen
+
+
+class Step:
+    """
+    One state of a flow.
+
+    The step waits for any of its expected screens, clicks it unless click is False, then calls
+    action(runner, hit). The action returns None or True to go to the next step, a step name to jump
+    there, or False to end the flow. While waiting, screens in tap are clicked whenever they
+    appear and tap_point is clicked when nothing changed for tap_interval seconds, which is
+    how skip buttons and "tap to continue" screens are pushed through.
+    """
+
+    def __init__(self, name: str, expect: Union[Screen, Sequence[Screen], None] = None,
+                 action: Optional[Callable[["FlowRunner", Optional[Hit]], Union[None, bool, str]]] = None,
+                 click: bool = True, clicks: int = 1, timeout: float = DEFAULT_STEP_TIMEOUT,
+                 optional: bool = False, missing_goto: Optional[str] = None, goto: Optional[str] = None,
+                 when: Optional[Callable[[], bool]] = None, tap: Sequence[Screen] = (),
+                 tap_clicks: int = 1, tap_point: Optional[Tuple[int, int]] = None,
+                 tap_interval: float = 2.0, fail_message: Optional[str] = None):
+        if isinstance(expect, Screen):
+            expect = [expect]
+        self.name = name
+        self.expect = list(expect or [])
+        self.action = action
+        self.click = click
+        self.clicks = clicks
+        self.timeout = timeout
+        self.optional = optional
+        self.missing_goto = missing_goto
+        self.goto = goto
+        self.when = when
+        self.tap = list(tap)
+        self.tap_clicks = tap_clicks
+        self.tap_point = tap_point
+        self.tap_interval = tap_interval
+        self.fail_message = fail_message
+
+
+class StepTiming:
+    __slots__ = ('count', 'wait', 'action', 'misses')
+
+    def __init__(self):
+        self.count = 0
+        self.wait = 0.0
+        self.action = 0.0
+        self.misses = 0
+
+
+class FlowRunner:
+    """Runs a list of steps against the shared frame stream with stop checks and per-step timing"""
+
+    def __init__(self, name: str, steps: List[Step], check_stop: Callable[[], bool],
+                 log_func: Callable[[str], None] = print, loop_start: Optional[str] = None,
+                 on_cycle: Optional[Callable[[float], bool]] = None,
+                 stream: Optional[FrameStream] = None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            name: Activity name for logs and metrics
+            steps: Steps in order
+            check_stop: Returns True when the flow should stop
+            log_func: Function to log messages
+            loop_start: Step that begins a cycle, used to time whole cycles
+            on_cycle: Called with the cycle time each time a cycle completes; returning False
+                ends the flow as finished
+            stream: Frame source, the shared stream by default
+            poll_interval: Seconds between frame checks while waiting
+        """
+        self.name = name
+        self.steps = steps
+        self.index = {step.name: i for i, step in enumerate(steps)}
+        self.check_stop = check_stop
+        self.log = log_func
+        self.loop_start = loop_start
+        self.on_cycle = on_cycle
+        self.stream = stream or get_frame_stream()
+        self.poll_interval = poll_interval
+        self.timings: Dict[str, StepTiming] = {}
+        self.cycle_times: List[float] = []
+        self._cycle_start = None
+        self._click_frame = None
+        self._click_time = 0.0
+        self._last_frame = None
+
+    # --- Waiting ---
+
+    def _fresh_frame(self):
+        """Next frame to match, skipping frames that still show the screen that was just clicked"""
+        frame = self.stream.latest()
+        if frame is None or self._click_frame is None:
+            return frame
+        if frame.differs_from(self._click_frame) or time.perf_counter() - self._click_time > CLICK_CHANGE_GRACE:
+            self._click_frame = None
+            return frame
+        return None
+
+    def pause(self, seconds: float) -> bool:
+        """Sleep in poll-sized slices; False if the flow was stopped meanwhile"""
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if self.check_stop():
+                return False
+            time.sleep(min(self.poll_interval, max(0.0, deadline - time.perf_counter())))
+        return not self.check_stop()
+
+    def wait_for(self, screens: Sequence[Screen], timeout: float, tap: Sequence[Screen] = (),
+                 tap_clicks: int = 1, tap_point: Optional[Tuple[int, int]] = None,
+                 tap_interval: float = 2.0) -> Optional[Hit]:
+        """
+        Wait until one of the screens is visible
+
+        Returns:
+            Hit for the first screen found, or None on timeout or stop
+        """
+        deadline = time.perf_counter() + timeout
+        last_tap = time.perf_counter()
+        while not self.check_stop():
+            frame = self._fresh_frame()
+            if frame is not None:
+                self._last_frame = frame
+                for screen in screens:
+                    found = screen.find(frame)
+                    if found:
+                        return Hit(screen, *found)
+                for screen in tap:
+                    found = screen.find(frame)
+                    if found:
+                        self.click_box(found[1], clicks=tap_clicks, frame=frame)
+                        last_tap = time.perf_counter()
+                        break
+                else:
+                    if tap_point and time.perf_counter() - last_tap >= tap_interval:
+                        self.click_point(*tap_point, frame=frame)
+                        last_tap = time.perf_counter()
+
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+        return None
+
+    # --- Input ---
+
+    def _after_click(self, future, frame):
+        wait_for(future)
+        self._click_frame = frame or self._last_frame
+        self._click_time = time.perf_counter()
+        self.stream.invalidate()
+
+    def click_box(self, box: Tuple[int, int, int, int], clicks: int = 1, interval: float = 0.3, frame=None):
+        """Click a random point inside a box and wait for the click to land"""
+        x, y, w, h = box
+        margin_x, margin_y = max(2, w // 10), max(2, h // 10)
+        click_x = random.randint(x + margin_x, max(x + margin_x, x + w - margin_x))
+        click_y = random.randint(y + margin_y, max(y + margin_y, y + h - margin_y))
+        self._after_click(get_input_executor().click(click_x, click_y, clicks=clicks, interval=interval,
+                                                     duration=0.175), frame)
+        return click_x, click_y
+
+    def click_point(self, x: int, y: int, frame=None):
+        """Click a calibrated point, mapped to the current window"""
+        point = get_game_window().to_screen_point(x, y, get_scale_manager().scale)
+        self._after_click(get_input_executor().click(*point), frame)
+
+    def click_screen(self, screen: Screen, timeout: float = 5.0, clicks: int = 1) -> Optional[Hit]:
+        """Wait for a screen and click it, for use inside actions"""
+        hit = self.wait_for([screen], timeout)
+        if hit:
+            self.click_box(hit.box, clicks=clicks)
+        return hit
+
+    # --- Running ---
+
+    def start_cycle(self):
+        """Start a cycle now unless one is running, for a path that joins the loop after loop_start"""
+        if self._cycle_start is None:
+            self._cycle_start = time.perf_counter()
+
+    def _timing(self, name: str) -> StepTiming:
+        if name not in self.timings:
+            self.timings[name] = StepTiming()
+        return self.timings[name]
+
+    def _run_step(self, step: Step) -> Union[None, bool, str]:
+        timing = self._timing(step.name)
+        start = time.perf_counter()
+        hit = None
+        if step.expect:
+            hit = self.wait_for(step.expect, step.timeout, step.tap, step.tap_clicks,
+                                step.tap_point, step.tap_interval)
+        waited = time.perf_counter() - start
+        timing.wait += waited
+
+        if self.check_stop():
+            return False
+        if step.expect and hit is None:
+            timing.misses += 1
+            if step.optional:
+                return step.missing_goto
+            names = ", ".join(screen.name for screen in step.expect)
+            self.log(step.fail_message or f"{self.name}: {names} not found")
+            return False
+
+        action_start = time.perf_counter()
+        if hit is not None and step.click:
+            self.click_box(hit.box, clicks=step.clicks)
+            self.log(f"Clicked {hit.screen.name}")
+        result = step.action(self, hit) if step.action else None
+        timing.action += time.perf_counter() - action_start
+        timing.count += 1
+
+        get_metrics().observe("activity_step_seconds", time.perf_counter() - start,
+                              activity=self.name, step=step.name)
+        if result is None or result is True:
+            return step.goto
+        return result
+
+    def run(self, start: Optional[str] = None) -> bool:
+        """
+        Run steps from start until a step ends the flow, a required screen is missing or stop is requested
+
+        Returns:
+            True if the flow ran off the end of its steps or on_cycle ended it, False otherwise
+        """
+        position = self.index[start] if start else 0
+        self._cycle_start = None
+        try:
+            while position < len(self.steps):
+                if self.check_stop():
+                    return False
+                step = self.steps[position]
+
+                if step.name == self.loop_start:
+                    now = time.perf_counter()
+                    if self._cycle_start is not None:
+                        cycle_time = now - self._cycle_start
+                        self.cycle_times.append(cycle_time)
+                        if self.on_cycle is not None and self.on_cycle(cycle_time) is False:
+                            return True
+                    self._cycle_start = now
+
+                if step.when is not None and not step.when():
+                    position += 1
+                    continue
+
+                result = self._run_step(step)
+                if result is False:
+                    return False
+                if isinstance(result, str):
+                    position = self.index[result]
+                else:
+                    position += 1
+            return True
+        finally:
+            self.log(self.report())
+
+    def report(self) -> str:
+        """Per-step timing summary"""
+        lines = [f"{self.name} step timings:"]
+        for name, timing in self.timings.items():
+            if not timing.count and not timing.misses:
+                continue
+            runs = max(timing.count, 1)
+            lines.append(f"  {name}: {timing.count}x, wait {timing.wait / runs:.2f}s, "
+                         f"action {timing.action / runs:.2f}s" +
+                         (f", {timing.misses} missed" if timing.misses else ""))
+        if self.cycle_times:
+            average = sum(self.cycle_times) / len(self.cycle_times)
+            lines.append(f"  cycles: {len(self.cycle_times)}, average {average:.1f}s")
+        return "\n".join(lines)
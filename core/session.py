@@ -0,0 +1,249 @@
+"""
+Sessions
+Per-window run state and a scheduler that drives several game windows from one process
+"""
+
+import importlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from core.career_checkpoint import CAREER_CHECKPOINT_FILE, CareerCheckpoint
+from core.game_window import GameWindowContext, find_game_windows
+from core.location_cache import LOCATION_CACHE_FILE, TemplateLocationCache
+
+# Module globals that belong to one career, with a factory for a fresh session's value.
+# Only the bot thread reads these; the active session's values are installed into them.
+# The event memo and training scan cache live on each session's executor. Deck, scenario,
+# config and the F1 support card counts come from the GUI, are the same for every window
+# and stay process-wide with templates, OCR and event maps.
+SESSION_GLOBALS = (
+    ("core.state", "current_date_info", lambda session: None),
+    ("core.execute", "_main_executor", lambda session: None),
+    ("core.execute", "_global_controller", lambda session: None),
+    ("core.game_window", "_game_window", lambda session: GameWindowContext()),
+    ("core.location_cache", "_location_cache",
+     lambda session: TemplateLocationCache(cache_file=LOCATION_CACHE_FILE.replace(".json", f"_{session.name}.json"))),
+    ("core.career_checkpoint", "_checkpoint",
+     lambda session: CareerCheckpoint(CAREER_CHECKPOINT_FILE.replace(".db", f"_{session.name}.db"))),
+)
+
+_switch_lock = threading.RLock()
+_active_session = None
+_default_session = None
+
+
+class SessionContext:
+    """State for one game window: date, executor, window handle, location cache and checkpoint journal"""
+
+    def __init__(self, name: str, values: Optional[Dict[tuple, Any]] = None):
+        self.name = name
+        self.race_manager = None
+        self.finished = False
+        self.values = values if values is not None else {
+            (module, attr): factory(self) for module, attr, factory in SESSION_GLOBALS
+        }
+
+    @classmethod
+    def from_globals(cls, name: str = "default") -> "SessionContext":
+        """Adopt the current module globals as a session, so single-window runs are unchanged"""
+        values = {(module, attr): getattr(importlib.import_module(module), attr)
+                  for module, attr, _ in SESSION_GLOBALS}
+        return cls(name, values)
+
+    @property
+    def game_window(self) -> GameWindowContext:
+        return self.values[("core.game_window", "_game_window")]
+
+    def _install(self):
+        for (module, attr), value in self.values.items():
+            setattr(importlib.import_module(module), attr, value)
+
+    def _capture(self):
+        for module, attr in self.values:
+            self.values[(module, attr)] = getattr(importlib.import_module(module), attr)
+
+    def activate(self):
+        """Make this session's state the one module-level code sees"""
+        global _active_session
+        with _switch_lock:
+            if _active_session is self:
+                return
+            if _active_session is not None:
+                _active_session._capture()
+            self._install()
+            _active_session = self
+
+    @contextmanager
+    def active(self):
+        """Run a block with this session active, restoring the previous session afterwards"""
+        with _switch_lock:
+            previous = _active_session
+            self.activate()
+            try:
+                yield self
+            finally:
+                if previous is not None and previous is not self:
+                    previous.activate()
+
+    def get_executor(self):
+        """Get this session's MainExecutor, creating it on first use"""
+        from core import execute
+        with self.active():
+            execute.initialize_executor()
+            return execute._main_executor
+
+
+def get_default_session() -> SessionContext:
+    """Session wrapping the process's original globals"""
+    global _default_session, _active_session
+    with _switch_lock:
+        if _default_session is None:
+            _default_session = SessionContext.from_globals("default")
+            if _active_session is None:
+                _active_session = _default_session
+        return _default_session
+
+
+def get_active_session() -> SessionContext:
+    """Session whose state is currently installed"""
+    return _active_session or get_default_session()
+
+
+class SessionScheduler:
+    """Round-robin one bot iteration at a time across sessions sharing the mouse and keyboard"""
+
+    def __init__(self, sessions: List[SessionContext], log_func: Optional[Callable[[str], None]] = None):
+        self.sessions = sessions
+        self.log = log_func or print
+
+    @classmethod
+    def for_open_windows(cls, log_func: Optional[Callable[[str], None]] = None) -> "SessionScheduler":
+        """Create one session per open game window; the first reuses the default session"""
+        sessions = []
+        for index, (window, title) in enumerate(find_game_windows()):
+            session = get_default_session() if index == 0 else SessionContext(f"window{index + 1}")
+            session.game_window.attach(window, title, pin=True)
+            sessions.append(session)
+        return cls(sessions, log_func)
+
+    def _prepare(self, session: SessionContext, gui=None):
+        """Build the session's executor and race manager and start its career as career_lobby does"""
+        from core.race_manager import RaceManager
+
+        # Race filters and schedule come from the GUI and are the same for every window
+        session.race_manager = gui.race_manager if gui else RaceManager()
+        session.finished = False
+        if gui:
+            try:
+                race_schedule = gui.get_event_choice_settings().get('race_schedule', [])
+                session.race_manager.set_preferred_races(race_schedule)
+            except Exception as e:
+                print(f"[WARNING] Could not load race schedule for session {session.name}: {e}")
+
+        executor = session.get_executor()
+        with session.active():
+            executor.controller.set_log_callback(lambda message, name=session.name: self.log(f"[{name}] {message}"))
+            if gui:
+                try:
+                    settings = gui.get_event_choice_settings()
+                    executor.controller.event_choice_handler.preload_database(
+                        settings.get('uma_musume', 'None'), settings.get('support_cards', ['None'] * 6))
+                except Exception as e:
+                    print(f"[WARNING] Could not preload event database for session {session.name}: {e}")
+            # Each window resumes from its own checkpoint or starts its career cold
+            executor.start_run(session.race_manager)
+
+    def _stop_requested(self) -> bool:
+        """A stop on any session (F3 reaches whichever session is active) stops them all"""
+        for session in self.sessions:
+            executor = session.values.get(("core.execute", "_main_executor"))
+            if executor is not None and executor.controller.should_stop:
+                return True
+        return False
+
+    def _focus(self, session: SessionContext):
+        from core.frame_stream import get_frame_stream
+
+        window = session.game_window.window
+        try:
+            if window is not None and not window.isActive:
+                window.activate()
+                time.sleep(0.2)
+        except Exception:
+            pass
+        # The last frame shows the previous session's window
+        get_frame_stream().invalidate()
+
+    def _run_turn(self, session: SessionContext, gui=None):
+        """Run one iteration of a session, marking it finished when its window closes or its career ends"""
+        if not session.game_window.is_available():
+            self.log(f"[{session.name}] Game window closed - session finished")
+            session.finished = True
+            return
+        self._focus(session)
+        executor = session.values[("core.execute", "_main_executor")]
+        if not executor.execute_single_iteration(session.race_manager, gui):
+            time.sleep(0.2)
+        if executor.decision_engine.career_completed:
+            self.log(f"[{session.name}] Career completed - session finished")
+            session.finished = True
+
+    def run(self, gui=None, should_continue: Optional[Callable[[], bool]] = None):
+        """Run sessions in turn until stopped or every session has finished"""
+        from core.input_executor import get_input_executor
+
+        if not self.sessions:
+            self.log("No game windows found for multi-session run")
+            return
+
+        # Warm-up builds the default executor; let it finish before sessions swap it out
+        warm_up = getattr(gui, 'warm_up', None)
+        if warm_up is not None:
+            warm_up.wait()
+
+        for session in self.sessions:
+            self._prepare(session, gui)
+        self.log(f"Running {len(self.sessions)} sessions: {', '.join(s.name for s in self.sessions)}")
+
+        input_executor = get_input_executor()
+        input_executor.set_stop_check(self._stop_requested)
+        try:
+            while not self._stop_requested():
+                if should_continue is not None and not should_continue():
+                    break
+                active = [s for s in self.sessions if not s.finished]
+                if not active:
+                    break
+
+                for session in active:
+                    if self._stop_requested():
+                        break
+                    with session.active():
+                        self._run_turn(session, gui)
+
+            for session in self.sessions:
+                with session.active():
+                    session.values[("core.execute", "_main_executor")].end_run()
+        finally:
+            input_executor.set_stop_check(None)
+            get_default_session().activate()
+
+
+def multi_session_enabled() -> bool:
+    """Check the multi_session switch in config.json"""
+    try:
+        with open("config.json", "r", encoding="utf-8") as file:
+            return json.load(file).get("multi_session", {}).get("enabled", False)
+    except (OSError, ValueError):
+        return False
+
+
+def run_sessions(gui=None):
+    """Drive every open game window from this process"""
+    log_func = gui.log_message if gui else print
+    scheduler = SessionScheduler.for_open_windows(log_func)
+    should_continue = (lambda: gui.is_running) if gui else None
+    scheduler.run(gui, should_continue)
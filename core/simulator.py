@@ -0,0 +1,592 @@
+"""
+Career Simulator
+Offline stand-in for the game that runs the real decision code over many careers
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+TRAINING_TYPES = ["spd", "sta", "pwr", "guts", "wit"]
+MOOD_ORDER = ["AWFUL", "BAD", "NORMAL", "GOOD", "GREAT"]
+MOOD_STAT_MULTIPLIER = {"AWFUL": 0.8, "BAD": 0.9, "NORMAL": 1.0, "GOOD": 1.1, "GREAT": 1.2}
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+YEAR_NAMES = ['Junior', 'Classic', 'Senior']
+
+CAREER_DAYS = 72
+FINALE_DAYS = (73, 74, 75)
+DEBUT_DAY = 12
+PRE_DEBUT_LAST_DAY = 16
+
+# Stat gains for a training with no support cards, primary stat first
+TRAINING_GAINS = {
+    'spd': {'spd': 10, 'pwr': 3},
+    'sta': {'sta': 9, 'guts': 3},
+    'pwr': {'pwr': 9, 'sta': 3},
+    'guts': {'guts': 8, 'spd': 3, 'pwr': 3},
+    'wit': {'wit': 9, 'spd': 2},
+}
+TRAINING_ENERGY_COST = {'spd': 21, 'sta': 20, 'pwr': 21, 'guts': 22, 'wit': -5}
+
+DEFAULT_DECK = {'spd': 2, 'sta': 1, 'pwr': 1, 'guts': 0, 'wit': 1, 'friend': 1}
+
+DEFAULT_MODEL_PARAMS = {
+    'start_stat': 90,
+    'start_energy': 100,
+    'support_absent_chance': 0.2,
+    'support_own_training_chance': 0.35,
+    'hint_chance': 0.1,
+    'npc_chance': 0.15,
+    'scenario_npc_chance': 0.1,
+    'support_gain_bonus': 0.08,
+    'rainbow_gain_bonus': 0.25,
+    'failure_energy_start': 55,
+    'failure_per_energy': 1.8,
+    'rest_energy': ((30, 0.25), (50, 0.5), (70, 0.25)),
+    'summer_rest_energy': 40,
+    'recreation_energy': 10,
+    'race_energy_cost': 15,
+    'mood_drop_chance': 0.04,
+    'mood_rise_chance': 0.03,
+    'consecutive_race_limit': 3,
+}
+
+DEFAULT_STRATEGY_SETTINGS = {
+    'minimum_mood': 'NORMAL',
+    'priority_strategy': 'Train Score 3.5+',
+    'allow_continuous_racing': True,
+    'enable_stop_conditions': False,
+    'enable_friend_events': False,
+    'stop_on_ura_final': False,
+}
+
+
+def build_date_info(day: int) -> Dict[str, Any]:
+    """Build the same date dict DateManager produces for an absolute day"""
+    if day > CAREER_DAYS:
+        return {
+            'year': 'Finale Season',
+            'month': 'Season',
+            'period': 'End',
+            'day': 1,
+            'absolute_day': day,
+            'month_num': 13,
+            'is_pre_debut': False,
+            'is_finale': True
+        }
+
+    year_index, day_in_year = divmod(day - 1, 24)
+    month_index, half = divmod(day_in_year, 2)
+    return {
+        'year': YEAR_NAMES[year_index],
+        'month': MONTH_NAMES[month_index],
+        'period': 'Early' if half == 0 else 'Late',
+        'day': half + 1,
+        'absolute_day': day,
+        'month_num': month_index + 1,
+        'is_pre_debut': day <= PRE_DEBUT_LAST_DAY,
+        'is_finale': False
+    }
+
+
+class CareerModel:
+    """Stochastic model of one career: energy, mood, stats, support appearances and races"""
+
+    def __init__(self, rng: random.Random, deck_counts: Dict[str, int], race_manager,
+                 stat_caps: Dict[str, int], params: Optional[Dict[str, Any]] = None):
+        self.rng = rng
+        self.deck_counts = deck_counts
+        self.race_manager = race_manager
+        self.stat_caps = stat_caps
+        self.params = dict(DEFAULT_MODEL_PARAMS, **(params or {}))
+
+        self.day = 1
+        self.energy = self.params['start_energy']
+        self.energy_max = 100
+        self.mood_index = MOOD_ORDER.index("NORMAL")
+        self.stats = {stat: self.params['start_stat'] for stat in TRAINING_TYPES}
+        self.skill_points = 120
+        self.fans = 1
+        self.consecutive_races = 0
+        self.board = {}
+        self.action_taken = None
+        self.counters = {'train': 0, 'failed_train': 0, 'rest': 0, 'recreation': 0,
+                         'race': 0, 'race_won': 0, 'idle': 0}
+
+    @property
+    def mood(self) -> str:
+        return MOOD_ORDER[self.mood_index]
+
+    @property
+    def current_date(self) -> Dict[str, Any]:
+        return build_date_info(self.day)
+
+    def is_race_day(self) -> bool:
+        """Mandatory race turns: the debut and each finale stage"""
+        return self.day == DEBUT_DAY
+
+    def is_summer(self) -> bool:
+        date = self.current_date
+        return date['month_num'] in (7, 8) and self.day > 24
+
+    def game_state(self) -> Dict[str, Any]:
+        """Game state in the format GameStateManager.update_game_state returns"""
+        date = self.current_date
+        return {
+            'mood': self.mood,
+            'turn': "Race Day" if self.is_race_day() else CAREER_DAYS - self.day + 1,
+            'year': date['year'] if date['is_finale'] else f"{date['year']} Year",
+            'energy_percentage': self.energy,
+            'energy_max': self.energy_max,
+            'current_date': date,
+        }
+
+    def _change_mood(self, delta: int):
+        self.mood_index = max(0, min(len(MOOD_ORDER) - 1, self.mood_index + delta))
+
+    def _change_energy(self, delta: float):
+        self.energy = int(max(0, min(self.energy_max, self.energy + delta)))
+
+    def roll_board(self):
+        """Place support cards, hints and NPCs on the five trainings for this turn"""
+        board = {key: {'cards': {}, 'hint': 0, 'npc': 0, 'scenario_npc': 0} for key in TRAINING_TYPES}
+        for card_type, count in self.deck_counts.items():
+            for _ in range(count):
+                if self.rng.random() < self.params['support_absent_chance']:
+                    continue
+                if card_type in TRAINING_TYPES and self.rng.random() < self.params['support_own_training_chance']:
+                    target = card_type
+                else:
+                    target = self.rng.choice(TRAINING_TYPES)
+                cards = board[target]['cards']
+                cards[card_type] = cards.get(card_type, 0) + 1
+                if self.rng.random() < self.params['hint_chance']:
+                    board[target]['hint'] += 1
+
+        if self.rng.random() < self.params['npc_chance']:
+            board[self.rng.choice(TRAINING_TYPES)]['npc'] += 1
+        if self.rng.random() < self.params['scenario_npc_chance']:
+            board[self.rng.choice(TRAINING_TYPES)]['scenario_npc'] += 1
+
+        self.board = board
+
+    def scored_board(self, training_types: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Score the rolled board with the vectorized scoring kernel"""
+        from core.scoring_kernel import TRAINING_TYPES as KERNEL_ORDER, build_count_array, get_scoring_kernel, stats_array
+
+        deck_types = [card_type for card_type, count in self.deck_counts.items() if count > 0]
+        supports = {key: dict(slot['cards'], hint=slot['hint'], npc=slot['npc'], scenario_npc=slot['scenario_npc'])
+                    for key, slot in self.board.items()}
+        counts = build_count_array(supports, deck_types)
+        scores = get_scoring_kernel().score(counts[None], [self.day], self.energy_max - self.energy,
+                                            stats_array(self.stats)[None])[0]
+
+        results = {}
+        for key in training_types:
+            slot = self.board[key]
+            support = {card_type: slot['cards'].get(card_type, 0) for card_type in deck_types}
+            support['npc'] = slot['npc'] + slot['scenario_npc']
+            results[key] = {
+                'support': support,
+                'hint_count': slot['hint'],
+                'npc_count': support['npc'],
+                'total_score': float(scores[KERNEL_ORDER.index(key)]),
+            }
+        return results
+
+    def train(self, key: str) -> bool:
+        """Apply one training, including failure chance from low energy"""
+        params = self.params
+        failure_chance = max(0.0, (params['failure_energy_start'] - self.energy) * params['failure_per_energy']) / 100
+        if key == 'wit':
+            failure_chance /= 2
+
+        self.action_taken = 'train'
+        if self.rng.random() < min(0.95, failure_chance):
+            self.counters['failed_train'] += 1
+            self._change_energy(-5)
+            self.stats[key] = max(1, self.stats[key] - 5)
+            if self.rng.random() < 0.5:
+                self._change_mood(-1)
+            return True
+
+        slot = self.board.get(key, {'cards': {}, 'hint': 0})
+        supports = sum(slot['cards'].values())
+        rainbows = slot['cards'].get(key, 0) if self.day > 24 else 0
+        friend = slot['cards'].get('friend', 0)
+        multiplier = ((1 + params['support_gain_bonus'] * supports + params['rainbow_gain_bonus'] * rainbows)
+                      * MOOD_STAT_MULTIPLIER[self.mood] * (1 + 0.1 * friend))
+
+        for stat, gain in TRAINING_GAINS[key].items():
+            cap = self.stat_caps.get(stat, 1200)
+            self.stats[stat] = min(cap, self.stats[stat] + int(round(gain * multiplier)))
+
+        self.skill_points += 2 + 10 * slot['hint']
+        self._change_energy(-TRAINING_ENERGY_COST[key])
+        self.counters['train'] += 1
+        self.consecutive_races = 0
+        return True
+
+    def rest(self) -> bool:
+        self.action_taken = 'rest'
+        if self.is_summer():
+            self._change_energy(self.params['summer_rest_energy'])
+            self._change_mood(1)
+        else:
+            values, weights = zip(*self.params['rest_energy'])
+            self._change_energy(self.rng.choices(values, weights=weights)[0])
+        self.counters['rest'] += 1
+        self.consecutive_races = 0
+        return True
+
+    def recreation(self) -> bool:
+        self.action_taken = 'recreation'
+        self._change_mood(2 if self.rng.random() < 0.1 else 1)
+        self._change_energy(self.params['recreation_energy'])
+        self.counters['recreation'] += 1
+        self.consecutive_races = 0
+        return True
+
+    def _run_race(self, fan_gain: int, difficulty: float) -> bool:
+        """Resolve a race against a field whose strength grows through the career"""
+        expected_total = 450 + self.day * 20 + difficulty
+        margin = sum(self.stats.values()) * MOOD_STAT_MULTIPLIER[self.mood] - expected_total
+        won = self.rng.random() < 1 / (1 + math.exp(-margin / 150))
+
+        self.fans += int(fan_gain * (1.0 if won else 0.3))
+        for stat in TRAINING_TYPES:
+            self.stats[stat] = min(self.stat_caps.get(stat, 1200), self.stats[stat] + (5 if won else 2))
+        self.skill_points += 45 if won else 25
+        self._change_energy(-self.params['race_energy_cost'])
+
+        self.counters['race'] += 1
+        if won:
+            self.counters['race_won'] += 1
+        return won
+
+    def race(self, scheduled_grade: Optional[str] = None, allow_continuous_racing: bool = True) -> bool:
+        """Enter the best race on today's calendar, as start_race_flow would"""
+        races = self.race_manager.get_available_races(self.current_date)
+        if scheduled_grade:
+            races = [r for r in races
+                     if self.race_manager.extract_race_properties(r)['grade_type'] == scheduled_grade] or races
+        if not races:
+            return False
+
+        if self.consecutive_races >= self.params['consecutive_race_limit'] and not allow_continuous_racing:
+            return False
+
+        race = races[0]
+        grade = self.race_manager.extract_race_properties(race)['grade_type']
+        difficulty = {'g1': 250, 'g2': 150, 'g3': 100, 'op': 50}.get(grade, 0)
+        self._run_race(race.get('fan_gain', 1000), difficulty)
+
+        self.consecutive_races += 1
+        if self.consecutive_races >= self.params['consecutive_race_limit'] and self.rng.random() < 0.25:
+            self._change_mood(-1)
+        self.action_taken = 'race'
+        return True
+
+    def race_day(self, is_ura_final: bool = False) -> bool:
+        """Run a mandatory debut or finale race"""
+        self._run_race(5000 if is_ura_final else 500, 300 if is_ura_final else 0)
+        self.action_taken = 'race'
+        return True
+
+    def end_turn(self):
+        """Random mood events, then the finale race after each finale turn"""
+        if self.action_taken is None:
+            self.counters['idle'] += 1
+        self.action_taken = None
+
+        roll = self.rng.random()
+        if roll < self.params['mood_drop_chance']:
+            self._change_mood(-1)
+        elif roll < self.params['mood_drop_chance'] + self.params['mood_rise_chance']:
+            self._change_mood(1)
+
+        if self.day in FINALE_DAYS:
+            self.race_day(is_ura_final=True)
+            self.action_taken = None
+
+        self.day += 1
+
+    def outcome(self) -> Dict[str, Any]:
+        """Final career summary"""
+        result = {stat: self.stats[stat] for stat in TRAINING_TYPES}
+        result.update({
+            'total_stats': sum(self.stats.values()),
+            'fans': self.fans,
+            'skill_points': self.skill_points,
+            'final_mood': self.mood,
+        })
+        result.update(self.counters)
+        return result
+
+
+class _SimTrainingHandler:
+    """Training handler backed by the career model"""
+
+    def __init__(self, model: CareerModel):
+        self.model = model
+
+    def go_to_training(self) -> bool:
+        return True
+
+    # The model changes with every action, so scans are never reused
+    def begin_turn(self, turn_key):
+        pass
+
+    def invalidate_scan(self):
+        pass
+
+    def cached_scan(self, energy_percentage: float):
+        return None
+
+    def check_all_training(self, energy_percentage: float = 100, energy_max: float = 100):
+        from utils.constants import MINIMUM_ENERGY_PERCENTAGE, CRITICAL_ENERGY_PERCENTAGE
+
+        if energy_percentage < CRITICAL_ENERGY_PERCENTAGE:
+            return {}, None
+        training_types = ["wit"] if energy_percentage < MINIMUM_ENERGY_PERCENTAGE else TRAINING_TYPES
+        return self.model.scored_board(training_types), dict(self.model.stats)
+
+    def execute_training(self, training_type: str) -> bool:
+        return self.model.train(training_type)
+
+
+class _SimRaceHandler:
+    """Race handler backed by the career model"""
+
+    def __init__(self, model: CareerModel):
+        self.model = model
+
+    def start_race_flow(self, prioritize_g1: bool = False, prioritize_g2: bool = False,
+                        allow_continuous_racing: bool = True, skip_grade_check: bool = False,
+                        scheduled_grade: Optional[str] = None) -> bool:
+        return self.model.race(scheduled_grade=scheduled_grade, allow_continuous_racing=allow_continuous_racing)
+
+    def handle_race_day(self, is_ura_final: bool = False, style_settings: Dict[str, Any] = None,
+                        is_pre_debut: bool = False) -> bool:
+        return self.model.race_day(is_ura_final=is_ura_final)
+
+
+class _SimRestHandler:
+    """Rest handler backed by the career model"""
+
+    def __init__(self, model: CareerModel):
+        self.model = model
+
+    def execute_rest(self, strategy_context: str = None) -> bool:
+        return self.model.rest()
+
+    def execute_recreation(self) -> bool:
+        return self.model.recreation()
+
+
+class SimulatedController:
+    """Stands in for BotController so DecisionEngine acts on the career model"""
+
+    def __init__(self, model: CareerModel):
+        self.training_handler = _SimTrainingHandler(model)
+        self.race_handler = _SimRaceHandler(model)
+        self.rest_handler = _SimRestHandler(model)
+        self.event_choice_handler = None
+        self.messages = []
+
+    def log_message(self, message: str):
+        self.messages.append(message)
+
+    def check_should_stop(self) -> bool:
+        return False
+
+    def is_game_window_active(self) -> bool:
+        return True
+
+
+def _make_engine(controller: SimulatedController):
+    """Create a DecisionEngine that skips UI waits and screen-only actions"""
+    from core.execute import DecisionEngine
+
+    class SimulatedDecisionEngine(DecisionEngine):
+        def _sleep(self, seconds: float):
+            pass
+
+        def _click_back_button(self, text=""):
+            pass
+
+        def _try_friend_event(self, *args, **kwargs):
+            return None
+
+        # Simulated careers never touch the real checkpoint journal
+        def finish_career(self):
+            self.career_completed = True
+
+        def record_turn(self, game_state, race_manager):
+            pass
+
+    return SimulatedDecisionEngine(controller)
+
+
+def simulate_career(seed: int, strategy_settings: Dict[str, Any], deck_counts: Dict[str, int],
+                    race_filters: Optional[Dict] = None, model_params: Optional[Dict] = None,
+                    race_manager=None) -> Dict[str, Any]:
+    """Run one full career through DecisionEngine.make_decision"""
+    from core.race_manager import RaceManager
+    from core.state import set_current_date_info, set_support_card_state
+    from utils.constants import get_stat_caps
+
+    if race_manager is None:
+        race_manager = RaceManager()
+        if race_filters:
+            race_manager.update_filters(race_filters)
+    set_support_card_state(deck_counts)
+
+    model = CareerModel(random.Random(seed), deck_counts, race_manager, get_stat_caps(), model_params)
+    controller = SimulatedController(model)
+    engine = _make_engine(controller)
+
+    while model.day <= FINALE_DAYS[-1]:
+        set_current_date_info(model.current_date)
+        model.roll_board()
+        engine.make_decision(model.game_state(), strategy_settings, race_manager)
+        model.end_turn()
+
+    result = model.outcome()
+    result['seed'] = seed
+    return result
+
+
+def _run_batch(seeds: List[int], strategy_settings: Dict[str, Any], deck_counts: Dict[str, int],
+               race_filters: Optional[Dict], model_params: Optional[Dict]) -> List[Dict[str, Any]]:
+    """Worker entry point: run a batch of careers with decision logging silenced"""
+    from core.race_manager import RaceManager
+
+    race_manager = RaceManager()
+    if race_filters:
+        race_manager.update_filters(race_filters)
+
+    outcomes = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for seed in seeds:
+            outcomes.append(simulate_career(seed, strategy_settings, deck_counts,
+                                            race_filters, model_params, race_manager))
+    return outcomes
+
+
+def run_simulation(careers: int, strategy_settings: Optional[Dict[str, Any]] = None,
+                   deck_counts: Optional[Dict[str, int]] = None, race_filters: Optional[Dict] = None,
+                   model_params: Optional[Dict] = None, workers: Optional[int] = None,
+                   seed: int = 0, batch_size: int = 50) -> List[Dict[str, Any]]:
+    """
+    Run many careers across a process pool
+
+    Args:
+        careers: Number of careers to simulate
+        strategy_settings: Strategy settings as returned by the GUI
+        deck_counts: Support card counts per type (spd, sta, pwr, guts, wit, friend)
+        race_filters: RaceManager filters dict
+        model_params: Overrides for DEFAULT_MODEL_PARAMS
+        workers: Process count (defaults to CPU count)
+        seed: Base seed; career i uses seed + i
+        batch_size: Careers per worker task
+
+    Returns:
+        List of career outcome dicts
+    """
+    strategy_settings = dict(DEFAULT_STRATEGY_SETTINGS, **(strategy_settings or {}))
+    deck_counts = deck_counts or DEFAULT_DECK
+    seeds = [seed + i for i in range(careers)]
+    batches = [seeds[i:i + batch_size] for i in range(0, len(seeds), batch_size)]
+
+    if workers == 1:
+        outcomes = []
+        for batch in batches:
+            outcomes.extend(_run_batch(batch, strategy_settings, deck_counts, race_filters, model_params))
+        return outcomes
+
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_batch, batch, strategy_settings, deck_counts, race_filters, model_params)
+                   for batch in batches]
+        for future in futures:
+            outcomes.extend(future.result())
+    return outcomes
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize_outcomes(outcomes: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Mean, spread and percentiles for every numeric outcome field"""
+    summary = {}
+    if not outcomes:
+        return summary
+
+    for field, value in outcomes[0].items():
+        if field == 'seed' or not isinstance(value, (int, float)):
+            continue
+        values = sorted(o[field] for o in outcomes)
+        summary[field] = {
+            'mean': statistics.fmean(values),
+            'stdev': statistics.pstdev(values),
+            'p10': _percentile(values, 0.1),
+            'p50': _percentile(values, 0.5),
+            'p90': _percentile(values, 0.9),
+        }
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render a summary as a text table"""
+    lines = [f"{'metric':<14}{'mean':>10}{'stdev':>10}{'p10':>10}{'p50':>10}{'p90':>10}"]
+    for field, stats in summary.items():
+        lines.append(f"{field:<14}{stats['mean']:>10.1f}{stats['stdev']:>10.1f}"
+                     f"{stats['p10']:>10.1f}{stats['p50']:>10.1f}{stats['p90']:>10.1f}")
+    return "\n".join(lines)
+
+
+def _parse_deck(text: str) -> Dict[str, int]:
+    deck = {}
+    for part in text.split(','):
+        if '=' in part:
+            key, value = part.split('=', 1)
+            deck[key.strip()] = int(value)
+    return deck
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Simulate careers offline with the bot's decision logic")
+    parser.add_argument('--careers', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--strategy', default=DEFAULT_STRATEGY_SETTINGS['priority_strategy'])
+    parser.add_argument('--minimum-mood', default=DEFAULT_STRATEGY_SETTINGS['minimum_mood'])
+    parser.add_argument('--deck', default="spd=2,sta=1,pwr=1,guts=0,wit=1,friend=1",
+                        help="Support card counts, e.g. spd=2,sta=1,wit=2,friend=1")
+    args = parser.parse_args()
+
+    strategy_settings = {'priority_strategy': args.strategy, 'minimum_mood': args.minimum_mood}
+    start_time = time.time()
+    outcomes = run_simulation(args.careers, strategy_settings, _parse_deck(args.deck),
+                              workers=args.workers, seed=args.seed)
+    elapsed = time.time() - start_time
+
+    print(f"Simulated {len(outcomes)} careers in {elapsed:.1f}s "
+          f"({len(outcomes) / max(elapsed, 1e-9) * 60:.0f} careers/min)")
+    print(format_summary(summarize_outcomes(outcomes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ from utils.screenshot import capture_region, enhanced_screenshot
 from core.ocr import extract_text, extract_text_advanced, extract_stat_number
 from core.recognizer import match_template
 from core.race_manager import DateManager
+from core.metrics import get_metrics
+from core.mood_classifier import get_mood_classifier, MIN_CONFIDENCE as MOOD_MIN_CONFIDENCE
+from utils.log_pipeline import get_logger
 
 from utils.constants import (
   SUPPORT_CARD_ICON_REGION, MOOD_REGION, TURN_REGION, FAILURE_REGION,
@@ -14,6 +17,9 @@ from utils.constants import (
   STAT_REGIONS, get_current_regions
 )
 
+log = get_logger()
+wit_log = get_logger("WIT")
+
 # Global variable to store current date info
 current_date_info = None
 # Global variable to store support card state
@@ -127,7 +133,8 @@ def calculate_unified_training_score(training_type, support_counts, current_date
     if energy_recovery_penalty > 0:
       total_score -= energy_recovery_penalty
       support_counts["energy_recovery_penalty"] = energy_recovery_penalty
-      print(f"[WIT] Energy recovery penalty: -{energy_recovery_penalty:.2f} (wit_rainbow={wit_rainbow_penalty_count}, energy_shortage={energy_shortage:.1f})")
+      wit_log.debug("Energy recovery penalty: -%.2f (wit_rainbow=%s, energy_shortage=%.1f)",
+                    energy_recovery_penalty, wit_rainbow_penalty_count, energy_shortage)
 
   return total_score
 
@@ -206,7 +213,7 @@ def stat_state(stats_filter=None):
     value = extract_stat_number(img)
     result[stat] = value
 
-    print(f"[DEBUG] Stat {stat.upper()}: {value}")
+    log.debug("Stat %s: %s", stat.upper(), value)
 
     is_low, warning_msg = validate_stat_value(stat, value, stat_threshold)
     if is_low:
@@ -214,6 +221,7 @@ def stat_state(stats_filter=None):
       reread_stats.append((stat, region, img))
 
   if reread_stats:
+    get_metrics().inc("ocr_rereads_total", len(reread_stats))
     print(f"\n[OCR REREAD] Detected {len(reread_stats)} stat(s) below {stat_threshold}, performing enhanced OCR...")
 
     for stat, region, img in reread_stats:
@@ -289,7 +297,7 @@ def check_energy_percentage(return_max_energy=False):
             first_white_found = True
 
       except Exception as e:
-        print(f"[DEBUG] Error at pixel {x}: {e}")
+        log.debug("Error at pixel %s: %s", x, e)
         continue
 
     if energy_start_pos is not None and energy_end_pos is None:
@@ -463,11 +471,19 @@ def match_mood_with_priority_patterns(ocr_text):
 
 
 def check_mood_optimized():
-  """Optimized mood check with reduced processing steps"""
+  """Classify the mood badge by colour, reading its text only when the colour is ambiguous"""
   current_regions = get_current_regions()
   mood_region = current_regions['MOOD_REGION']
 
   try:
+    badge = np.array(capture_region(mood_region))
+    classifier = get_mood_classifier()
+    mood, confidence = classifier.classify(badge)
+    if confidence >= MOOD_MIN_CONFIDENCE:
+      log.debug("Mood %s from badge colour (confidence %.2f)", mood, confidence)
+      return mood
+
+    get_metrics().inc("mood_ocr_fallbacks_total")
     enhanced_img = enhanced_screenshot(mood_region)
 
     ocr_results = extract_mood_with_dual_methods(enhanced_img)
@@ -476,6 +492,9 @@ def check_mood_optimized():
       if ocr_text:
         mood = match_mood_with_priority_patterns(ocr_text)
         if mood != "UNKNOWN":
+          # Exact readings teach the colour classifier what this badge looks like
+          if ocr_text.upper().strip() == mood:
+            classifier.learn(badge, mood)
           return mood
 
     return "UNKNOWN"
@@ -580,12 +599,32 @@ def check_support_card(threshold=0.8, is_pre_debut=False, training_type=None, cu
     matches = match_template(icon_path, support_region, threshold)
     scenario_npc_count += len(matches)
 
-  total_npc_count = normal_npc_count + scenario_npc_count
-  count_result["npc"] = total_npc_count
-
   hint_matches = match_template("assets/icons/support_card_hint.png", support_region, threshold)
   hint_count = len(hint_matches)
 
+  special_training_count = 0
+  spirit_explosion_count = 0
+  if SCENARIO_NAME == "Unity Cup":
+    special_training_matches = match_template("assets/buttons/unity_cup/special_training.png", support_region, 0.65)
+    special_training_count = len(special_training_matches)
+
+    spirit_explosion_matches = match_template("assets/buttons/unity_cup/spirit_explosion.png", support_region, 0.65)
+    spirit_explosion_count = len(spirit_explosion_matches)
+
+  return score_support_counts(count_result, normal_npc_count, scenario_npc_count, hint_count,
+                              special_training_count, spirit_explosion_count,
+                              training_type=training_type, current_date=current_date,
+                              energy_shortage=energy_shortage)
+
+def score_support_counts(count_result, normal_npc_count, scenario_npc_count, hint_count,
+                         special_training_count=0, spirit_explosion_count=0,
+                         training_type=None, current_date=None, energy_shortage=0.0):
+  """Score detected support, NPC, hint and Unity Cup icon counts for one training"""
+  from utils.constants import SCENARIO_NAME
+
+  total_npc_count = normal_npc_count + scenario_npc_count
+  count_result["npc"] = total_npc_count
+
   hint_score = 0
   if hint_count > 0 and current_date:
     absolute_day = current_date.get('absolute_day', 0)
@@ -603,18 +642,10 @@ def check_support_card(threshold=0.8, is_pre_debut=False, training_type=None, cu
   count_result["npc_count"] = total_npc_count
   count_result["npc_score"] = npc_score
 
-  special_training_count = 0
   special_training_score = 0
-  spirit_explosion_count = 0
   spirit_explosion_score = 0
 
   if SCENARIO_NAME == "Unity Cup":
-    special_training_matches = match_template("assets/buttons/unity_cup/special_training.png", support_region, 0.65)
-    special_training_count = len(special_training_matches)
-
-    spirit_explosion_matches = match_template("assets/buttons/unity_cup/spirit_explosion.png", support_region, 0.65)
-    spirit_explosion_count = len(spirit_explosion_matches)
-
     if special_training_count > 0 or spirit_explosion_count > 0:
       scoring_config = load_scoring_config()
       unity_cup_config = scoring_config.get("unity_cup", {})
@@ -737,6 +768,11 @@ def get_current_date_info():
   """Get the current parsed date information"""
   return current_date_info
 
+def set_current_date_info(date_info):
+  """Set the current date information without reading it from screen"""
+  global current_date_info
+  current_date_info = date_info
+
 
 def check_criteria():
   """Check criteria text from UI region"""
@@ -816,9 +852,10 @@ def get_support_card_state():
   return _support_card_state.copy()
 
 
-def get_support_card_bonus_config():
+def get_support_card_bonus_config(current_date=None):
   """Get support card bonus configuration from config file"""
-  current_date = get_current_date_info()
+  if current_date is None:
+    current_date = get_current_date_info()
 
   if current_date:
     month_num = current_date.get('month_num', 0)
@@ -845,7 +882,7 @@ def calculate_support_card_bonus(current_date):
     return {}
 
   absolute_day = current_date.get('absolute_day', 0)
-  bonus_config = get_support_card_bonus_config()
+  bonus_config = get_support_card_bonus_config(current_date)
   threshold_day = bonus_config.get("threshold_day", 24)
 
   if absolute_day <= threshold_day:
@@ -5,24 +5,19 @@ Handles detection of the style selection screen and automatic selection
 of the preferred running style during debut.
 """
 
-import pyautogui
 import time
 import cv2
 import numpy as np
 from PIL import ImageGrab
-from typing import Dict, Optional, Callable, Any, List, Tuple
+from typing import Dict, Optional, Callable, Any, List
 
 from core.click_handler import enhanced_click
+from core.location_cache import locate_center_on_screen
+from core.scale_manager import load_template
+from core.input_executor import get_input_executor, settle_input
+from utils.constants import STYLE_DISPLAY, get_style_options, get_style_display_name
 
 
-STYLE_DISPLAY = {
-    'none': 'None',
-    'front': 'Front',
-    'pace': 'Pace',
-    'late': 'Late',
-    'end': 'End',
-}
-
 # Assets folder for style buttons
 STYLE_ASSETS_FOLDER = 'assets/buttons/style'
 
@@ -66,7 +61,7 @@ class StyleHandler:
 
         for key, path in template_paths.items():
             if os.path.exists(path):
-                template = cv2.imread(path, cv2.IMREAD_COLOR)
+                template = load_template(path)
                 if template is not None:
                     self.style_templates[key] = template
 
@@ -86,6 +81,7 @@ class StyleHandler:
 
         if 'screen' in self.style_templates:
             try:
+                settle_input()
                 screen = np.array(ImageGrab.grab())
                 screen_bgr = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
 
@@ -98,12 +94,12 @@ class StyleHandler:
             except Exception as e:
                 print(f"Error checking style screen with template: {e}")
 
-        # Fallback: use pyautogui to check for style selection screen
+        # Fallback: search the game window for the style selection screen
         try:
-            style_screen = pyautogui.locateCenterOnScreen(
+            style_screen = locate_center_on_screen(
                 "assets/scenario/style_selection.png",
                 confidence=0.8,
-                minSearchTime=0.3
+                min_search_time=0.3
             )
             return style_screen is not None
         except Exception as e:
@@ -140,16 +136,16 @@ class StyleHandler:
                 if not os.path.exists(template_path):
                     continue
 
-                pos = pyautogui.locateCenterOnScreen(
+                pos = locate_center_on_screen(
                     template_path,
                     confidence=0.8,
-                    minSearchTime=0.2
+                    min_search_time=0.2
                 )
 
                 if pos:
                     buttons.append({
                         'style': style_id,
-                        'position': (pos.x, pos.y),
+                        'position': pos,
                         'confidence': 0.8
                     })
             except Exception as e:
@@ -282,7 +278,7 @@ class StyleHandler:
 
         try:
             self.log(f"Using position-based style selection at ({x}, {y})")
-            pyautogui.click(x, y)
+            get_input_executor().click(x, y)
             time.sleep(0.5)
 
             if self.check_stop():
@@ -329,27 +325,6 @@ class StyleHandler:
         return False
 
 
-def get_style_options() -> List[Tuple[str, str]]:
-    """
-    Get list of available style options for UI dropdown
-
-    Returns:
-        List of tuples (style_id, display_name)
-    """
-    return [
-        ('none', 'None'),
-        ('front', 'Front'),
-        ('pace', 'Pace'),
-        ('late', 'Late'),
-        ('end', 'End'),
-    ]
-
-
-def get_style_display_name(style_id: str) -> str:
-    """Get display name for a style ID"""
-    return STYLE_DISPLAY.get(style_id, style_id)
-
-
 __all__ = [
     'StyleHandler',
     'STYLE_DISPLAY',
@@ -0,0 +1,170 @@
+"""
+Template Pack
+All template images decoded once at build time into one memory-mapped file, read without copying
+"""
+
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterable, Optional
+
+import cv2
+import numpy as np
+
+PACK_FILE = "assets/templates.pack"
+PACK_INDEX_FILE = PACK_FILE + ".json"
+PACK_VERSION = 1
+PACK_ALIGNMENT = 64
+PACK_FOLDERS = ("assets/buttons", "assets/icons", "assets/ui", "assets/scenario")
+# Zip archives store modification times at two second precision
+MTIME_TOLERANCE = 2.0
+
+
+def _iter_pngs(folders: Iterable[str]):
+    for folder in folders:
+        for root, _, files in os.walk(folder):
+            for name in sorted(files):
+                if name.lower().endswith('.png'):
+                    yield os.path.join(root, name).replace(os.sep, '/')
+
+
+def build_template_pack(folders: Iterable[str] = PACK_FOLDERS, pack_file: str = PACK_FILE,
+                        index_file: str = PACK_INDEX_FILE) -> int:
+    """
+    Decode every PNG under the folders and write them into one aligned binary file plus a JSON index
+
+    Returns:
+        Number of templates packed
+    """
+    entries = {}
+    offset = 0
+    tmp_pack = pack_file + ".tmp"
+
+    with open(tmp_pack, 'wb') as f:
+        for path in _iter_pngs(folders):
+            image = cv2.imread(path, cv2.IMREAD_COLOR)
+            if image is None:
+                print(f"[WARNING] Could not decode template for pack: {path}")
+                continue
+
+            padding = -offset % PACK_ALIGNMENT
+            if padding:
+                f.write(b'\0' * padding)
+                offset += padding
+
+            data = np.ascontiguousarray(image)
+            f.write(data.tobytes())
+            entries[path] = {
+                'offset': offset,
+                'shape': list(data.shape),
+                'dtype': data.dtype.str,
+                'mtime': os.path.getmtime(path),
+            }
+            offset += data.nbytes
+
+    index = {'version': PACK_VERSION, 'size': offset, 'entries': entries}
+    tmp_index = index_file + ".tmp"
+    with open(tmp_index, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+
+    os.replace(tmp_pack, pack_file)
+    os.replace(tmp_index, index_file)
+    return len(entries)
+
+
+class TemplatePack:
+    """Read-only view of a template pack; get() returns arrays backed by the mapped file"""
+
+    def __init__(self, pack_file: str = PACK_FILE, index_file: str = PACK_INDEX_FILE):
+        self.pack_file = pack_file
+        self.index_file = index_file
+        self.entries: Dict[str, dict] = {}
+        self._data = None
+        self._open()
+
+    def _open(self):
+        """Map the pack if it exists and matches its index; otherwise stay empty"""
+        try:
+            if not (os.path.exists(self.pack_file) and os.path.exists(self.index_file)):
+                return
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != PACK_VERSION or os.path.getsize(self.pack_file) != index.get('size'):
+                print("[WARNING] Template pack does not match its index, using loose PNG files")
+                return
+            if index['size'] > 0:
+                self._data = np.memmap(self.pack_file, dtype=np.uint8, mode='r')
+            self.entries = index.get('entries', {})
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] Could not open template pack: {e}")
+            self.entries = {}
+            self._data = None
+
+    @property
+    def available(self) -> bool:
+        return self._data is not None
+
+    def get(self, template_path: str) -> Optional[np.ndarray]:
+        """Packed image for a path, or None if it is not packed or the PNG changed since packing"""
+        entry = self.entries.get(template_path)
+        if entry is None or self._data is None:
+            return None
+
+        # In a dev checkout an edited PNG wins over the stale packed copy
+        try:
+            if os.path.getmtime(template_path) > entry['mtime'] + MTIME_TOLERANCE:
+                return None
+        except OSError:
+            pass
+
+        dtype = np.dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        count = int(np.prod(shape))
+        start = entry['offset']
+        return self._data[start:start + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    def __contains__(self, template_path: str) -> bool:
+        return template_path in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+_template_pack = None
+_template_pack_lock = threading.Lock()
+
+
+def get_template_pack() -> TemplatePack:
+    """Get the shared template pack, opening it on first use"""
+    global _template_pack
+    with _template_pack_lock:
+        if _template_pack is None:
+            _template_pack = TemplatePack()
+        return _template_pack
+
+
+def read_template(template_path: str) -> Optional[np.ndarray]:
+    """Template image from the pack, falling back to decoding the loose PNG"""
+    image = get_template_pack().get(template_path)
+    if image is not None:
+        return image
+    return cv2.imread(template_path, cv2.IMREAD_COLOR)
+
+
+def main(argv=None):
+    """Build the template pack from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pack template PNGs into a memory-mapped file")
+    parser.add_argument("folders", nargs="*", default=list(PACK_FOLDERS), help="Folders to pack")
+    parser.add_argument("--output", default=PACK_FILE, help="Pack file path")
+    args = parser.parse_args(argv)
+
+    count = build_template_pack(args.folders, args.output, args.output + ".json")
+    print(f"Packed {count} templates into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
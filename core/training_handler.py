@@ -1,10 +1,13 @@
 import pyautogui
+import copy
 import time
 import json
-from typing import Dict, Optional, Callable, Any
+from typing import Dict, Optional, Callable, Any, Tuple
 
 from core.state import check_support_card, get_current_date_info, get_stage_thresholds, stat_state
 from core.click_handler import enhanced_click, random_click_in_region, triple_click_random
+from core.input_executor import get_input_executor, wait_for
+from core.location_cache import locate_center_on_screen
 from utils.constants import MINIMUM_ENERGY_PERCENTAGE, CRITICAL_ENERGY_PERCENTAGE
 
 
@@ -18,6 +21,36 @@ def load_scoring_config():
         return {}
 
 
+_TOTAL_SUPPORT_EXCLUDE = ["hint", "hint_score", "total_score", "npc_count", "npc_score",
+                          "support_card_bonus", "special_training", "special_training_score",
+                          "spirit_explosion", "spirit_explosion_score"]
+
+_SUPPORT_EXCLUDE = _TOTAL_SUPPORT_EXCLUDE + ["energy_recovery_penalty"]
+
+
+def count_total_support(support_counts: Dict) -> int:
+    """Count support and NPC icons in a scored support result"""
+    return sum(count for key, count in support_counts.items() if key not in _TOTAL_SUPPORT_EXCLUDE)
+
+
+def build_training_result(support_counts: Dict) -> Dict:
+    """Convert a scored support result into the training result format used for decisions"""
+    return {
+        'support': {k: v for k, v in support_counts.items() if k not in _SUPPORT_EXCLUDE},
+        'hint_count': support_counts.get("hint", 0),
+        'hint_score': support_counts.get("hint_score", 0),
+        'npc_count': support_counts.get("npc_count", 0),
+        'npc_score': support_counts.get("npc_score", 0),
+        'special_training_count': support_counts.get("special_training", 0),
+        'special_training_score': support_counts.get("special_training_score", 0),
+        'spirit_explosion_count': support_counts.get("spirit_explosion", 0),
+        'spirit_explosion_score': support_counts.get("spirit_explosion_score", 0),
+        'energy_recovery_penalty': support_counts.get("energy_recovery_penalty", 0),
+        'total_score': support_counts.get("total_score", 0),
+        'support_card_bonus': support_counts.get("support_card_bonus", 0)
+    }
+
+
 class TrainingHandler:
     """Handles all training-related operations with unified score calculation"""
 
@@ -33,6 +66,48 @@ class TrainingHandler:
         self.check_stop = check_stop_func
         self.check_window = check_window_func
         self.log = log_func
+        # Training scans of the current turn, by the training types that were checked
+        self._scan_turn = None
+        self._scan_cache: Dict[Tuple[str, ...], Tuple[Dict, Any]] = {}
+
+    def begin_turn(self, turn_key):
+        """Start a turn; scans cached for any other turn are dropped"""
+        if turn_key != self._scan_turn:
+            self._scan_turn = turn_key
+            self._scan_cache.clear()
+
+    def invalidate_scan(self):
+        """Drop cached scans, e.g. once the turn's action was taken"""
+        self._scan_cache.clear()
+
+    def _training_types(self, energy_percentage: float) -> Dict[str, str]:
+        """Training icons to check at an energy level; empty when energy is critical"""
+        if energy_percentage < CRITICAL_ENERGY_PERCENTAGE:
+            return {}
+        if energy_percentage < MINIMUM_ENERGY_PERCENTAGE:
+            return {
+                "wit": "assets/icons/train_wit.png"
+            }
+        return {
+            "spd": "assets/icons/train_spd.png",
+            "sta": "assets/icons/train_sta.png",
+            "pwr": "assets/icons/train_pwr.png",
+            "guts": "assets/icons/train_guts.png",
+            "wit": "assets/icons/train_wit.png"
+        }
+
+    def cached_scan(self, energy_percentage: float) -> Optional[Tuple[Dict, Any]]:
+        """
+        Results of this turn's earlier scan at the same energy level, if there was one
+
+        Returns:
+            Copies of (results, current_stats), so callers may change them freely, or None
+        """
+        training_types = self._training_types(energy_percentage)
+        if self._scan_turn is None or not training_types:
+            return None
+        cached = self._scan_cache.get(tuple(training_types))
+        return copy.deepcopy(cached) if cached is not None else None
 
     def go_to_training(self) -> bool:
         """Navigate to training menu"""
@@ -66,29 +141,8 @@ class TrainingHandler:
             current_date=current_date, energy_shortage = energy_shortage
         )
 
-        total_score = support_counts.get("total_score", 0)
-        total_support = sum(count for key, count in support_counts.items()
-                            if key not in ["hint", "hint_score", "total_score", "npc_count", "npc_score",
-                                           "support_card_bonus", "special_training", "special_training_score",
-                                           "spirit_explosion", "spirit_explosion_score"])
-
-        _SUPPORT_EXCLUDE = ["hint", "hint_score", "total_score", "npc_count", "npc_score",
-                            "support_card_bonus", "special_training", "special_training_score",
-                            "spirit_explosion", "spirit_explosion_score", "energy_recovery_penalty"]
-        first_result = {
-            'support': {k: v for k, v in support_counts.items() if k not in _SUPPORT_EXCLUDE},
-            'hint_count': support_counts.get("hint", 0),
-            'hint_score': support_counts.get("hint_score", 0),
-            'npc_count': support_counts.get("npc_count", 0),
-            'npc_score': support_counts.get("npc_score", 0),
-            'special_training_count': support_counts.get("special_training", 0),
-            'special_training_score': support_counts.get("special_training_score", 0),
-            'spirit_explosion_count': support_counts.get("spirit_explosion", 0),
-            'spirit_explosion_score': support_counts.get("spirit_explosion_score", 0),
-            'energy_recovery_penalty': support_counts.get("energy_recovery_penalty", 0),
-            'total_score': total_score,
-            'support_card_bonus': support_counts.get("support_card_bonus", 0)
-        }
+        total_support = count_total_support(support_counts)
+        first_result = build_training_result(support_counts)
 
         if total_support <= 6:
             return first_result
@@ -109,26 +163,7 @@ class TrainingHandler:
                 training_type=training_type,
                 current_date=current_date
             )
-            total_score = support_counts.get("total_score", 0)
-            total_support = sum(count for key, count in support_counts.items()
-                                if key not in ["hint", "hint_score", "total_score", "npc_count", "npc_score",
-                                               "support_card_bonus", "special_training", "special_training_score",
-                                               "spirit_explosion", "spirit_explosion_score"])
-
-            support_results.append({
-                'support': {k: v for k, v in support_counts.items() if k not in _SUPPORT_EXCLUDE},
-                'hint_count': support_counts.get("hint", 0),
-                'hint_score': support_counts.get("hint_score", 0),
-                'npc_count': support_counts.get("npc_count", 0),
-                'npc_score': support_counts.get("npc_score", 0),
-                'special_training_count': support_counts.get("special_training", 0),
-                'special_training_score': support_counts.get("special_training_score", 0),
-                'spirit_explosion_count': support_counts.get("spirit_explosion", 0),
-                'spirit_explosion_score': support_counts.get("spirit_explosion_score", 0),
-                'energy_recovery_penalty': support_counts.get("energy_recovery_penalty", 0),
-                'total_score': total_score,
-                'support_card_bonus': support_counts.get("support_card_bonus", 0)
-            })
+            support_results.append(build_training_result(support_counts))
 
         support_results.sort(key=lambda x: x['total_score'])
         median_index = len(support_results) // 2
@@ -204,25 +239,14 @@ class TrainingHandler:
         is_pre_debut = absolute_day <= stage_thresholds.get("pre_debut", 16)
         energy_shortage = energy_max - energy_percentage
         # Define which training types to check based on energy level
-        if energy_percentage < CRITICAL_ENERGY_PERCENTAGE:
+        training_types = self._training_types(energy_percentage)
+        if not training_types:
             # Critical energy: no training check at all
             self.log(f"Critical energy ({energy_percentage}%), skipping all training checks")
             return {}, None
-        elif energy_percentage < MINIMUM_ENERGY_PERCENTAGE:
+        elif len(training_types) == 1:
             # Low energy: only check WIT
-            training_types = {
-                "wit": "assets/icons/train_wit.png"
-            }
             self.log(f"Low energy ({energy_percentage}%), only checking WIT training")
-        else:
-            # Normal energy: check all training types
-            training_types = {
-                "spd": "assets/icons/train_spd.png",
-                "sta": "assets/icons/train_sta.png",
-                "pwr": "assets/icons/train_pwr.png",
-                "guts": "assets/icons/train_guts.png",
-                "wit": "assets/icons/train_wit.png"
-            }
 
         results = {}
 
@@ -240,20 +264,21 @@ class TrainingHandler:
             current_stats = None
 
         # Execute mouse handling logic for each training type
+        input_executor = get_input_executor()
         for key, icon_path in training_types.items():
             if self.check_stop():
                 break
 
-            pos = pyautogui.locateCenterOnScreen(icon_path, confidence=0.8)
+            pos = locate_center_on_screen(icon_path, confidence=0.8)
             if pos:
-                pyautogui.moveTo(pos, duration=0.1)
-                pyautogui.mouseDown()
+                # The support icons are read while the button is held, so wait for the press
+                wait_for(input_executor.mouse_down(pos, duration=0.1))
 
                 # Use unified support checking with stability verification
                 training_result = self.check_training_support_stable(key, energy_shortage=energy_shortage)
 
                 if training_result is None:  # Could be due to stop flag
-                    pyautogui.mouseUp()
+                    wait_for(input_executor.mouse_up())
                     break
 
                 results[key] = training_result
@@ -267,12 +292,16 @@ class TrainingHandler:
 
         # Move mouse to specific position before releasing if only one training type to avoid accidental clicks
         if len(training_types) == 1:
+            input_executor.wait_idle()
             current_x, current_y = pyautogui.position()
-            pyautogui.moveTo(current_x, current_y - 100, duration=0.1)
+            input_executor.move(current_x, current_y - 100, duration=0.1)
 
         # Mouse release and back navigation
-        pyautogui.mouseUp()
+        wait_for(input_executor.mouse_up())
         if not self.check_stop():
+            # Only a scan that ran to the end is worth reusing later this turn
+            if self._scan_turn is not None:
+                self._scan_cache[tuple(training_types)] = copy.deepcopy((results, current_stats))
             enhanced_click(
                 "assets/buttons/back_btn.png",
                 minSearch=1.0,
@@ -293,11 +322,12 @@ class TrainingHandler:
             return False
 
         # Direct triple click logic
-        train_btn = pyautogui.locateCenterOnScreen(f"assets/icons/train_{training_type}.png", confidence=0.8)
+        train_btn = locate_center_on_screen(f"assets/icons/train_{training_type}.png", confidence=0.8)
         if train_btn:
             if self.check_stop():
                 return False
-            pyautogui.tripleClick(train_btn, interval=0.1, duration=0.2)
+            get_input_executor().triple_click(train_btn, interval=0.1, duration=0.2)
+            self.invalidate_scan()
             return True
         else:
             self.log(f"[ERROR] Could not find {training_type.upper()} training button")
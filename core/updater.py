@@ -5,10 +5,10 @@ Also checks for event map file updates from the GitHub repository.
 """
 
 import os
-import ssl
 import sys
 import json
 import tempfile
+import http.client
 import zipfile
 import subprocess
 import urllib.request
@@ -16,21 +16,11 @@ import urllib.error
 from pathlib import Path
 
 from version import APP_VERSION, GITHUB_REPO
+from core.http_client import get_ssl_context
+from core.delta_update import DeltaUpdate, MANIFEST_ASSET, cleanup_previous_update
 
 
-def _get_ssl_context():
-    """Get SSL context for HTTPS requests. Uses certifi if available."""
-    try:
-        import certifi
-        return ssl.create_default_context(cafile=certifi.where())
-    except ImportError:
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-        return ctx
-
-
-_ssl_ctx = _get_ssl_context()
+_ssl_ctx = get_ssl_context()
 
 # Files that should NOT be overwritten during update (user settings)
 PROTECTED_FILES = [
@@ -87,12 +77,14 @@ def check_for_update():
         if _compare_versions(latest_version, APP_VERSION) <= 0:
             return {"has_update": False, "latest_version": latest_version}
 
-        # Find zip asset
+        # Find zip asset and the optional per-file manifest for delta updates
         download_url = None
+        manifest_url = None
         for asset in data.get("assets", []):
-            if asset["name"].endswith(".zip"):
+            if asset["name"].endswith(".zip") and download_url is None:
                 download_url = asset["browser_download_url"]
-                break
+            elif asset["name"] == MANIFEST_ASSET:
+                manifest_url = asset["browser_download_url"]
 
         if not download_url:
             return {"has_update": False}
@@ -102,6 +94,7 @@ def check_for_update():
             "latest_version": latest_version,
             "release_notes": data.get("body", ""),
             "download_url": download_url,
+            "manifest_url": manifest_url,
             "html_url": data.get("html_url", ""),
         }
 
@@ -275,6 +268,85 @@ REM Self-delete
         return False
 
 
+def download_delta_update(update_info, progress_callback=None):
+    """
+    Download only the files that changed in the new release.
+
+    Args:
+        update_info: dict from check_for_update()
+        progress_callback: callable(downloaded_bytes, total_bytes) for progress updates
+
+    Returns:
+        DeltaUpdate ready to apply, or None when the release has no manifest or the
+        delta download failed and the full zip should be used instead
+    """
+    if not update_info.get("manifest_url"):
+        return None
+    try:
+        delta = DeltaUpdate.from_url(update_info["manifest_url"], update_info["download_url"],
+                                     _get_app_dir(), protected_files=PROTECTED_FILES)
+        delta.plan()
+        if not delta.download(progress_callback):
+            return None
+        return delta
+    except (OSError, ValueError, KeyError, http.client.HTTPException) as e:
+        print(f"[WARNING] Delta update unavailable, using full download: {e}")
+        return None
+
+
+def _restart_after_exit():
+    """Launch a hidden batch script that waits for this process to exit, then restarts the app."""
+    app_dir = _get_app_dir()
+    if getattr(sys, "frozen", False):
+        restart_cmd = f'start "" "{sys.executable}"'
+    else:
+        restart_cmd = f'start "" "{sys.executable}" "{os.path.join(app_dir, "main.py")}"'
+
+    pid = os.getpid()
+    batch_path = os.path.join(tempfile.mkdtemp(prefix="uma_update_"), "uma_restart.bat")
+    with open(batch_path, "w", encoding="utf-8") as f:
+        f.write(f"""@echo off
+:wait_loop
+tasklist /FI "PID eq {pid}" 2>nul | find /I "{pid}" >nul
+if not errorlevel 1 (
+    timeout /t 1 /nobreak >nul
+    goto wait_loop
+)
+cd /d "{app_dir}"
+{restart_cmd}
+(goto) 2>nul & del "%~f0"
+""")
+
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    subprocess.Popen(["cmd.exe", "/c", batch_path], startupinfo=startupinfo, close_fds=True)
+
+
+def apply_delta_update(delta):
+    """
+    Swap the staged files into place and schedule a restart once the app exits.
+
+    Files are renamed into place while the app is still running, so the restart
+    only has to wait for this process to close.
+
+    Returns:
+        True if the files were swapped and the restart was scheduled
+    """
+    if not delta.apply():
+        return False
+    try:
+        _restart_after_exit()
+        return True
+    except Exception:
+        return False
+
+
+def cleanup_after_update():
+    """Remove files left in use by the last delta update."""
+    cleanup_previous_update(_get_app_dir())
+
+
 # --- Event map update functions ---
 
 # Directories to check for NEW files only (missing locally)
@@ -297,84 +369,6 @@ EVENT_MAP_LINE_CHECK_FILES = [
 GITHUB_CONTENTS_API = f"https://api.github.com/repos/{GITHUB_REPO}/contents/"
 
 
-def _fetch_github_dir(dir_path):
-    """Fetch file listing from a GitHub directory via the Contents API.
-
-    Returns list of dicts with keys: name, path, download_url
-    or empty list on error.
-    """
-    url = GITHUB_CONTENTS_API + dir_path
-    try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "UmaAutoTrain-Updater",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=15, context=_ssl_ctx) as resp:
-            items = json.loads(resp.read().decode("utf-8"))
-        return [
-            {
-                "name": item["name"],
-                "path": item["path"],
-                "download_url": item["download_url"],
-            }
-            for item in items
-            if item["type"] == "file" and item["name"].endswith(".json")
-        ]
-    except (urllib.error.URLError, urllib.error.HTTPError,
-            json.JSONDecodeError, OSError, KeyError):
-        return []
-
-
-def _fetch_github_file_info(file_path):
-    """Fetch info for a single file from GitHub Contents API.
-
-    Returns dict with keys: name, path, download_url
-    or None on error.
-    """
-    url = GITHUB_CONTENTS_API + file_path
-    try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "UmaAutoTrain-Updater",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=15, context=_ssl_ctx) as resp:
-            item = json.loads(resp.read().decode("utf-8"))
-        if item.get("type") != "file":
-            return None
-        return {
-            "name": item["name"],
-            "path": item["path"],
-            "download_url": item["download_url"],
-        }
-    except (urllib.error.URLError, urllib.error.HTTPError,
-            json.JSONDecodeError, OSError, KeyError):
-        return None
-
-
-def _fetch_raw_content(download_url):
-    """Download raw file content from GitHub. Returns bytes or None."""
-    try:
-        req = urllib.request.Request(
-            download_url,
-            headers={"User-Agent": "UmaAutoTrain-Updater"},
-        )
-        with urllib.request.urlopen(req, timeout=15, context=_ssl_ctx) as resp:
-            return resp.read()
-    except (urllib.error.URLError, urllib.error.HTTPError, OSError):
-        return None
-
-
-def _count_lines(data):
-    """Count lines in bytes data."""
-    return len(data.split(b"\n"))
-
-
 def _get_app_dir():
     """Get the application root directory."""
     if getattr(sys, "frozen", False):
@@ -382,74 +376,31 @@ def _get_app_dir():
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
+def _get_event_map_updater():
+    from core.event_map_updater import get_event_map_updater
+    return get_event_map_updater(GITHUB_CONTENTS_API, _get_app_dir(),
+                                 EVENT_MAP_DIRS, EVENT_MAP_LINE_CHECK_FILES)
+
+
 def check_event_updates():
     """Check GitHub for new/updated event map files.
 
     - support_card/* and uma_musume/*: detect NEW files only (missing locally)
     - other_sp_event.json, common.json: overwrite if remote has more lines
 
+    Listings are fetched concurrently and revalidated with their ETags; files whose
+    local hash matches the remote sha are skipped without downloading.
+
     Returns:
         dict with keys:
             has_updates (bool): True if there are files to update
             files_to_update (list): list of dicts with {path, download_url, status}
             error (str or None): error message if something went wrong
     """
-    app_dir = _get_app_dir()
-    files_to_update = []
-    errors = []
-
-    # Check directories for NEW files only
-    for dir_path in EVENT_MAP_DIRS:
-        remote_files = _fetch_github_dir(dir_path)
-        if not remote_files and dir_path == EVENT_MAP_DIRS[0]:
-            errors.append(f"Could not fetch {dir_path}")
-            continue
-
-        for remote_file in remote_files:
-            local_path = os.path.join(app_dir, remote_file["path"])
-
-            if not os.path.exists(local_path):
-                files_to_update.append({
-                    "path": remote_file["path"],
-                    "download_url": remote_file["download_url"],
-                    "status": "New",
-                })
-
-    # Check line-count files (overwrite if remote has more lines)
-    for file_path in EVENT_MAP_LINE_CHECK_FILES:
-        remote_file = _fetch_github_file_info(file_path)
-        if remote_file is None:
-            continue
-
-        local_path = os.path.join(app_dir, remote_file["path"])
-
-        if not os.path.exists(local_path):
-            files_to_update.append({
-                "path": remote_file["path"],
-                "download_url": remote_file["download_url"],
-                "status": "New",
-            })
-        else:
-            # Compare line counts
-            remote_data = _fetch_raw_content(remote_file["download_url"])
-            if remote_data is None:
-                continue
-            remote_lines = _count_lines(remote_data)
-            with open(local_path, "rb") as f:
-                local_lines = _count_lines(f.read())
-            if remote_lines > local_lines:
-                files_to_update.append({
-                    "path": remote_file["path"],
-                    "download_url": remote_file["download_url"],
-                    "status": "Updated",
-                })
-
-    error_msg = "; ".join(errors) if errors else None
-    return {
-        "has_updates": len(files_to_update) > 0,
-        "files_to_update": files_to_update,
-        "error": error_msg,
-    }
+    try:
+        return _get_event_map_updater().check()
+    except Exception as e:
+        return {"has_updates": False, "files_to_update": [], "error": str(e)}
 
 
 def download_event_files(files_to_update, progress_callback=None):
@@ -457,40 +408,9 @@ def download_event_files(files_to_update, progress_callback=None):
 
     Args:
         files_to_update: list of dicts with {path, download_url, status}
-        progress_callback: callable(current_index, total_count, file_path)
+        progress_callback: callable(completed_count, total_count, file_path)
 
     Returns:
         int: number of files updated successfully
     """
-    app_dir = _get_app_dir()
-    success_count = 0
-    total = len(files_to_update)
-
-    for i, file_info in enumerate(files_to_update):
-        if progress_callback:
-            progress_callback(i, total, file_info["path"])
-
-        local_path = os.path.join(app_dir, file_info["path"])
-
-        try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-
-            req = urllib.request.Request(
-                file_info["download_url"],
-                headers={"User-Agent": "UmaAutoTrain-Updater"},
-            )
-            with urllib.request.urlopen(req, timeout=15, context=_ssl_ctx) as resp:
-                data = resp.read()
-
-            with open(local_path, "wb") as f:
-                f.write(data)
-
-            success_count += 1
-        except (urllib.error.URLError, urllib.error.HTTPError, OSError):
-            continue
-
-    if progress_callback:
-        progress_callback(total, total, "")
-
-    return success_count
+    return _get_event_map_updater().download(files_to_update, progress_callback)
@@ -2,7 +2,10 @@ import threading
 import keyboard
 from tkinter import messagebox
 
-from core.execute import set_stop_flag, career_lobby
+from utils.startup import lazy_import
+
+# Bot modules pull in cv2, numpy and pyautogui; import them when the bot first needs them
+execute = lazy_import("core.execute")
 
 
 class BotController:
@@ -51,7 +54,8 @@ class BotController:
         # Preload event database for current deck configuration
         self.preload_event_database()
 
-        set_stop_flag(False)
+        execute.set_log_callback(self.main_window.log_message)
+        execute.set_stop_flag(False)
         self.main_window.is_running = True
 
         # Update UI
@@ -113,18 +117,34 @@ class BotController:
     def preload_event_database(self):
         """Preload event database at bot start for current deck configuration"""
         try:
-            from core.execute import _main_executor, initialize_executor
-            if _main_executor is None:
-                initialize_executor()
+            execute.initialize_executor()
+            main_executor = execute._main_executor
 
             current_settings = self.main_window.get_event_choice_settings()
             uma_musume = current_settings.get('uma_musume', 'None')
             support_cards = current_settings.get('support_cards', ['None'] * 6)
 
-            _main_executor.controller.event_choice_handler.preload_database(uma_musume, support_cards)
+            main_executor.controller.event_choice_handler.preload_database(uma_musume, support_cards)
         except Exception as e:
             self.main_window.log_message(f"Error preloading event database: {e}")
 
+    def detect_game_scale(self):
+        """Detect game scale from the lobby and pre-render templates at that scale"""
+        try:
+            from core.scale_manager import get_scale_manager
+            scale_manager = get_scale_manager()
+            previous_scale = scale_manager.scale
+            scale = scale_manager.detect_scale()
+            if scale is None:
+                return
+
+            if scale != previous_scale:
+                self.main_window.log_message(f"Game scale changed: {previous_scale:.2f} -> {scale:.2f}")
+                template_count = scale_manager.prebuild_templates()
+                self.main_window.log_message(f"Prepared {template_count} templates at scale {scale:.2f}")
+        except Exception as e:
+            self.main_window.log_message(f"Error detecting game scale: {e}")
+
     def stop_bot(self):
         """Stop the bot"""
         if not self.main_window.is_running:
@@ -135,7 +155,7 @@ class BotController:
             self.main_window.team_trials_tab.stop_team_trials()
 
         # Stop main bot
-        set_stop_flag(True)
+        execute.set_stop_flag(True)
         self.main_window.is_running = False
 
         # Update UI
@@ -146,7 +166,7 @@ class BotController:
 
     def enhanced_stop_bot(self):
         """Enhanced F3 stop functionality - handles both main bot and team trials"""
-        set_stop_flag(True)
+        execute.set_stop_flag(True)
         self.stop_bot()
 
         # Also stop team trials if running
@@ -176,7 +196,15 @@ class BotController:
     def bot_loop(self):
         """Main bot loop running in separate thread"""
         try:
-            career_lobby(self.main_window)
+            from core.metrics import start_metrics_exporter
+            from core.session import multi_session_enabled, run_sessions
+
+            start_metrics_exporter()
+            self.detect_game_scale()
+            if multi_session_enabled():
+                run_sessions(self.main_window)
+            else:
+                execute.career_lobby(self.main_window)
         except Exception as e:
             self.main_window.log_message(f"Bot error: {e}")
         finally:
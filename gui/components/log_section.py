@@ -1,6 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 
+from utils.log_pipeline import LogRingBuffer
+
+LOG_MAX_LINES = 1000
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_DRAIN_BATCH = 500
+
 
 class LogSection:
     """Activity log section component"""
@@ -9,8 +15,11 @@ class LogSection:
         self.parent = parent
         self.main_window = main_window
         self.row = row
+        self.buffer = LogRingBuffer()
+        self.max_lines = LOG_MAX_LINES
 
         self.create_section()
+        self.log_text.after(LOG_DRAIN_INTERVAL_MS, self._drain)
 
     def create_section(self):
         """Create the activity log section"""
@@ -36,9 +45,34 @@ class LogSection:
         )
         clear_button.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
 
+    def enqueue(self, message):
+        """Queue a message for the next drain (safe from any thread)"""
+        self.buffer.push(message)
+
     def add_message(self, message):
         """Add message to log (must be called from main thread)"""
-        self.log_text.insert(tk.END, message)
+        self._append(message)
+
+    def _drain(self):
+        """Move queued messages into the widget in one batch"""
+        try:
+            messages = self.buffer.drain(LOG_DRAIN_BATCH)
+            dropped = self.buffer.take_dropped()
+            if dropped:
+                messages.insert(0, f"[LOG] {dropped} messages dropped\n")
+            if messages:
+                self._append("".join(messages))
+            self.log_text.after(LOG_DRAIN_INTERVAL_MS, self._drain)
+        except tk.TclError:
+            # Widget destroyed, stop draining
+            pass
+
+    def _append(self, text):
+        """Insert text and trim the widget to the line cap"""
+        self.log_text.insert(tk.END, text)
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > self.max_lines:
+            self.log_text.delete('1.0', f'{line_count - self.max_lines + 1}.0')
         self.log_text.see(tk.END)
 
     def clear_log(self):
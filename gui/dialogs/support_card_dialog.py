@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
-import os
-import glob
+
+from gui.utils.catalog_index import get_support_card_index
 
 
 class SupportCardDialog:
@@ -24,7 +24,7 @@ class SupportCardDialog:
         self.window.grab_set()
 
         # Load support cards data
-        self.support_cards_by_type = self._load_support_cards()
+        self.card_index = self._load_support_cards()
 
         # Setup UI
         self._setup_ui()
@@ -36,59 +36,8 @@ class SupportCardDialog:
         self.window.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
     def _load_support_cards(self):
-        """Load support cards organized by type"""
-        cards_by_type = {
-            'all': [],
-            'spd': [],
-            'sta': [],
-            'pow': [],
-            'gut': [],
-            'wit': [],
-            'frd': []
-        }
-
-        try:
-            support_folder = "assets/event_map/support_card"
-            if not os.path.exists(support_folder):
-                return cards_by_type
-
-            # Define card types
-            card_types = ["spd", "sta", "pow", "gut", "wit", "frd"]
-
-            # Load cards by type
-            for card_type in card_types:
-                type_folder = os.path.join(support_folder, card_type)
-                if os.path.exists(type_folder):
-                    json_files = glob.glob(os.path.join(type_folder, "*.json"))
-
-                    filenames = []
-                    for file_path in json_files:
-                        filename = os.path.basename(file_path).replace('.json', '')
-                        filenames.append(filename)
-
-                    # Sort alphabetically
-                    filenames.sort(key=lambda x: x.lower())
-
-                    for filename in filenames:
-                        display_name = f"{card_type}: {filename}"
-                        cards_by_type[card_type].append(display_name)
-                        cards_by_type['all'].append(display_name)
-
-            # Also check for direct JSON files
-            direct_json_files = glob.glob(os.path.join(support_folder, "*.json"))
-            direct_filenames = []
-            for file_path in direct_json_files:
-                filename = os.path.basename(file_path).replace('.json', '')
-                direct_filenames.append(filename)
-
-            direct_filenames.sort(key=lambda x: x.lower())
-            for filename in direct_filenames:
-                cards_by_type['all'].append(filename)
-
-        except Exception as e:
-            print(f"Error loading support cards: {e}")
-
-        return cards_by_type
+        """Get the support card index, built once and shared between dialog openings"""
+        return get_support_card_index()
 
     def _setup_ui(self):
         """Setup dialog UI"""
@@ -200,20 +149,12 @@ class SupportCardDialog:
         select_button.pack(side=tk.RIGHT)
 
     def _populate_listbox(self, tab_key, filter_text=""):
-        """Populate listbox with cards"""
+        """Populate listbox with cards matching the search text"""
         listbox = self.tab_listboxes[tab_key]
         listbox.delete(0, tk.END)
 
-        cards = self.support_cards_by_type.get(tab_key, [])
-
-        # Filter cards if search text provided
-        if filter_text:
-            filter_text = filter_text.lower()
-            cards = [card for card in cards if filter_text in card.lower()]
-
-        # Add cards to listbox
-        for card in cards:
-            listbox.insert(tk.END, card)
+        cards = self.card_index.names(filter_text, tab_key)
+        listbox.insert(tk.END, *cards)
 
         # Highlight current selection if it exists in the list
         if self.current_selection != "None":
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
-import os
-import glob
+
+from gui.utils.catalog_index import get_uma_musume_index
 
 
 class UmaMusumeDialog:
@@ -24,7 +24,7 @@ class UmaMusumeDialog:
         self.window.grab_set()
 
         # Load uma musume list
-        self.uma_musume_list = self._load_uma_musume_list()
+        self.uma_index = self._load_uma_musume_list()
 
         # Setup UI
         self._setup_ui()
@@ -36,34 +36,8 @@ class UmaMusumeDialog:
         self.window.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
     def _load_uma_musume_list(self):
-        """Load Uma Musume list from event_map folder"""
-        uma_list = []
-
-        try:
-            # Load from assets/event_map/uma_musume
-            uma_folder = "assets/event_map/uma_musume"
-            if os.path.exists(uma_folder):
-                json_files = glob.glob(os.path.join(uma_folder, "*.json"))
-                for file_path in json_files:
-                    filename = os.path.basename(file_path).replace('.json', '')
-                    uma_list.append(filename)
-
-            # Also load from assets/uma_musume if exists
-            other_uma_folder = "assets/uma_musume"
-            if os.path.exists(other_uma_folder):
-                json_files = glob.glob(os.path.join(other_uma_folder, "*.json"))
-                for file_path in json_files:
-                    filename = os.path.basename(file_path).replace('.json', '')
-                    if filename not in uma_list:
-                        uma_list.append(filename)
-
-            # Sort alphabetically
-            uma_list.sort(key=lambda x: x.lower())
-
-        except Exception as e:
-            print(f"Error loading Uma Musume list: {e}")
-
-        return uma_list
+        """Get the Uma Musume index, built once and shared between dialog openings"""
+        return get_uma_musume_index()
 
     def _setup_ui(self):
         """Setup dialog UI"""
@@ -149,19 +123,11 @@ class UmaMusumeDialog:
         select_button.pack(side=tk.RIGHT)
 
     def _populate_listbox(self, filter_text=""):
-        """Populate listbox with Uma Musume names"""
+        """Populate listbox with Uma Musume names matching the search text"""
         self.listbox.delete(0, tk.END)
 
-        uma_list = self.uma_musume_list
-
-        # Filter if search text provided
-        if filter_text:
-            filter_text = filter_text.lower()
-            uma_list = [uma for uma in uma_list if filter_text in uma.lower()]
-
-        # Add to listbox
-        for uma in uma_list:
-            self.listbox.insert(tk.END, uma)
+        uma_list = self.uma_index.names(filter_text)
+        self.listbox.insert(tk.END, *uma_list)
 
         # Highlight current selection if it exists
         if self.current_selection and self.current_selection != "None":
@@ -9,7 +9,7 @@ from tkinter import ttk, messagebox
 import threading
 
 from version import APP_VERSION
-from core.updater import download_update, apply_update
+from core.updater import download_update, apply_update, download_delta_update, apply_delta_update
 
 
 class UpdateDialog:
@@ -129,6 +129,12 @@ class UpdateDialog:
             self.dialog.after(0, self._update_progress, percent,
                               f"Downloading... {mb_down:.1f} / {mb_total:.1f} MB ({percent}%)")
 
+        # Fetch only the changed files when the release publishes a manifest
+        delta = download_delta_update(self.update_info, progress_callback=on_progress)
+        if delta is not None:
+            self.dialog.after(0, self._download_complete, delta)
+            return
+
         zip_path = download_update(url, progress_callback=on_progress)
 
         if zip_path:
@@ -140,11 +146,14 @@ class UpdateDialog:
         self.progress_bar["value"] = percent
         self.progress_label.config(text=text)
 
-    def _download_complete(self, zip_path):
+    def _download_complete(self, update):
         self.progress_label.config(text="Download complete. Applying update...")
         self.progress_bar["value"] = 100
 
-        success = apply_update(zip_path)
+        if isinstance(update, str):
+            success = apply_update(update)
+        else:
+            success = apply_delta_update(update)
         if success:
             messagebox.showinfo(
                 "Update Ready",
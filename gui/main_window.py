@@ -12,10 +12,13 @@ from gui.tabs.event_choice_tab import EventChoiceTab
 from gui.tabs.team_trials_tab import TeamTrialsTab
 from gui.utils.game_window_monitor import GameWindowMonitor
 
-from core.execute import set_log_callback
-from core.race_manager import RaceManager
+from core.race_manager import RaceManager, preload_race_data
+from utils.log_pipeline import get_logger
+from utils.startup import WarmUp, get_import_timer, seconds_since_start
 from version import APP_VERSION
 
+logger = get_logger("STARTUP")
+
 
 class UmaAutoGUI:
     """Main GUI application class with tabbed interface"""
@@ -44,13 +47,14 @@ class UmaAutoGUI:
         # Setup GUI components
         self.setup_gui()
 
-        # Initialize core systems
-        set_log_callback(self.log_message)
-
         # Setup events and monitoring
         self.setup_events()
         self.start_monitoring()
 
+        # Heavy modules and data load in the background once the window is on screen
+        self.warm_up = WarmUp()
+        self.root.after(100, self._start_warm_up)
+
         # Auto-check for updates after 2 seconds
         self.root.after(2000, self._check_for_updates)
 
@@ -278,7 +282,7 @@ class UmaAutoGUI:
         """Add message to log with timestamp"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] {message}\n"
-        self.root.after(0, self.log_section.add_message, formatted_message)
+        self.log_section.enqueue(formatted_message)
 
     def update_current_date(self, date_info):
         """Update current date display"""
@@ -417,6 +421,41 @@ class UmaAutoGUI:
         except Exception as e:
             print(f"Warning: Could not update strategy filters: {e}")
 
+    def _start_warm_up(self):
+        """Preload bot modules, event maps, templates, race data and OCR on a background thread"""
+        logger.info("Window ready after %.2fs", seconds_since_start())
+        self.warm_up.add("bot modules", self._warm_up_bot_modules)
+        self.warm_up.add("race index", preload_race_data)
+        self.warm_up.add("templates", self._warm_up_templates)
+        self.warm_up.add("ocr", self._warm_up_ocr)
+        self.warm_up.add("update cleanup", self._clean_up_previous_update)
+        self.warm_up.start(on_done=self._on_warm_up_done)
+
+    def _warm_up_bot_modules(self):
+        """Import the bot core and build the executor, which loads the event maps"""
+        from core.execute import initialize_executor, set_log_callback
+        initialize_executor()
+        set_log_callback(self.log_message)
+
+    def _warm_up_templates(self):
+        from core.scale_manager import get_scale_manager
+        get_scale_manager().prebuild_templates()
+
+    def _clean_up_previous_update(self):
+        from core.updater import cleanup_after_update
+        cleanup_after_update()
+
+    def _warm_up_ocr(self):
+        from core.ocr import warm_up_ocr
+        warm_up_ocr()
+
+    def _on_warm_up_done(self, warm_up):
+        """Stop timing imports and print the startup report"""
+        import_timer = get_import_timer()
+        import_timer.uninstall()
+        logger.info("%s", warm_up.summary())
+        logger.info("%s", import_timer.report())
+
     def _check_for_updates(self):
         """Auto-check for updates on startup (respects auto_check_update setting)"""
         import json, os
@@ -0,0 +1,255 @@
+"""
+Activity Scheduler
+Queue of daily activity jobs run back-to-back in one session, checkpointed after every run
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from core.metrics import get_metrics
+
+ACTIVITY_QUEUE_CHECKPOINT = "activity_queue.json"
+WINDOW_WAIT_SLICE = 1.0
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ENDED = "ended"
+
+
+def _parse_window(window: str):
+    """'HH:MM-HH:MM' to start and end minutes of the day, or None for all day"""
+    if not window:
+        return None
+    try:
+        start, end = window.split("-")
+        start_h, start_m = (int(part) for part in start.strip().split(":"))
+        end_h, end_m = (int(part) for part in end.strip().split(":"))
+        return start_h * 60 + start_m, end_h * 60 + end_m
+    except ValueError:
+        print(f"[WARNING] Ignoring invalid activity time window: {window}")
+        return None
+
+
+class ActivityJob:
+    """
+    One activity to repeat: how many runs (0 for until out of turns), its priority,
+    an optional daily time window and the progress made so far
+    """
+
+    def __init__(self, activity: str, count: int = 0, priority: int = 0, window: str = "",
+                 done: int = 0, status: str = PENDING, elapsed: float = 0.0):
+        self.activity = activity
+        self.count = count
+        self.priority = priority
+        self.window = window
+        self.done = done
+        self.status = status
+        self.elapsed = elapsed
+        self._window = _parse_window(window)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, ENDED) or (self.count > 0 and self.done >= self.count)
+
+    @property
+    def runs_per_hour(self) -> float:
+        return self.done * 3600 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def in_window(self, now: datetime) -> bool:
+        if self._window is None:
+            return True
+        start, end = self._window
+        minute = now.hour * 60 + now.minute
+        if start <= end:
+            return start <= minute < end
+        # Window wraps past midnight
+        return minute >= start or minute < end
+
+    def next_window_start(self, now: datetime) -> datetime:
+        if self._window is None or self.in_window(now):
+            return now
+        start = now.replace(hour=self._window[0] // 60, minute=self._window[0] % 60, second=0, microsecond=0)
+        return start if start > now else start + timedelta(days=1)
+
+    def describe(self) -> str:
+        target = f"{self.done}/{self.count}" if self.count else f"{self.done}/until out of turns"
+        window = f", {self.window}" if self.window else ""
+        return f"{self.activity} ({target}, priority {self.priority}{window})"
+
+    def to_dict(self) -> dict:
+        return {
+            "activity": self.activity, "count": self.count, "priority": self.priority,
+            "window": self.window, "done": self.done, "status": self.status, "elapsed": self.elapsed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ActivityJob":
+        return cls(data["activity"], int(data.get("count", 0)), int(data.get("priority", 0)),
+                   data.get("window", ""), int(data.get("done", 0)), data.get("status", PENDING),
+                   float(data.get("elapsed", 0.0)))
+
+
+class ActivityScheduler:
+    """
+    Runs queued jobs highest priority first, only inside their time windows.
+
+    Progress is written to a checkpoint after every completed run, so a queue interrupted by F3,
+    a crash or a closed window resumes with the same jobs and counts the next time it starts.
+    """
+
+    def __init__(self, jobs: List[ActivityJob], run_job: Callable[[ActivityJob, Callable[[float], bool]], bool],
+                 check_stop: Callable[[], bool], log_func: Callable[[str], None] = print,
+                 checkpoint_file: str = ACTIVITY_QUEUE_CHECKPOINT, now_func: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            jobs: Jobs in queue order; priority decides, queue order breaks ties
+            run_job: Runs one job's flow, calling the given on_cycle after every run
+            check_stop: Returns True when the queue should stop
+            log_func: Function to log messages
+            checkpoint_file: Where progress is saved
+            now_func: Clock used for time windows
+        """
+        self.jobs = jobs
+        self.run_job = run_job
+        self.check_stop = check_stop
+        self.log = log_func
+        self.checkpoint_file = checkpoint_file
+        self.now = now_func
+
+    @staticmethod
+    def load_checkpoint(checkpoint_file: str = ACTIVITY_QUEUE_CHECKPOINT) -> Optional[List[ActivityJob]]:
+        """Jobs of an unfinished queue, or None if there is nothing to resume"""
+        try:
+            with open(checkpoint_file, "r", encoding="utf-8") as f:
+                jobs = [ActivityJob.from_dict(item) for item in json.load(f).get("jobs", [])]
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(checkpoint_file):
+                print(f"[WARNING] Could not read activity queue checkpoint: {e}")
+            return None
+        for job in jobs:
+            if job.status == RUNNING:
+                job.status = PENDING
+        return jobs if any(not job.finished for job in jobs) else None
+
+    def save(self):
+        """Write the checkpoint atomically"""
+        try:
+            tmp_path = self.checkpoint_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": self.now().isoformat(timespec="seconds"),
+                           "jobs": [job.to_dict() for job in self.jobs]}, f, indent=2)
+            os.replace(tmp_path, self.checkpoint_file)
+        except OSError as e:
+            print(f"[WARNING] Could not save activity queue checkpoint: {e}")
+
+    def clear(self):
+        try:
+            os.remove(self.checkpoint_file)
+        except OSError:
+            pass
+
+    def next_job(self) -> Optional[ActivityJob]:
+        """Highest priority unfinished job whose window is open now"""
+        now = self.now()
+        ready = [job for job in self.jobs if not job.finished and job.in_window(now)]
+        if not ready:
+            return None
+        return max(ready, key=lambda job: (job.priority, -self.jobs.index(job)))
+
+    def _wait_for_window(self) -> bool:
+        """Sleep until the earliest pending window opens; False if stopped or nothing is pending"""
+        pending = [job for job in self.jobs if not job.finished]
+        if not pending:
+            return False
+        now = self.now()
+        job = min(pending, key=lambda job: job.next_window_start(now))
+        opens_at = job.next_window_start(now)
+        self.log(f"Waiting until {opens_at:%H:%M} for {job.activity}")
+        while self.now() < opens_at:
+            if self.check_stop():
+                return False
+            time.sleep(WINDOW_WAIT_SLICE)
+        return True
+
+    def _run(self, job: ActivityJob):
+        job.status = RUNNING
+        self.save()
+        self.log(f"Starting job: {job.describe()}")
+        segment_start = time.perf_counter()
+
+        def on_cycle(cycle_seconds: float) -> bool:
+            nonlocal segment_start
+            now = time.perf_counter()
+            job.elapsed += now - segment_start
+            segment_start = now
+            job.done += 1
+            get_metrics().inc("activity_runs_total", activity=job.activity)
+            self.save()
+            self.log(f"{job.activity}: run {job.done} in {cycle_seconds:.1f}s ({job.runs_per_hour:.1f} runs/h)")
+            if job.count and job.done >= job.count:
+                return False
+            if not job.in_window(self.now()):
+                self.log(f"{job.activity}: time window closed")
+                return False
+            return True
+
+        completed = self.run_job(job, on_cycle)
+        job.elapsed += time.perf_counter() - segment_start
+
+        if self.check_stop():
+            # Stopped by the user: leave the job pending so the next start resumes it
+            job.status = PENDING
+        elif job.count and job.done >= job.count:
+            job.status = DONE
+        elif completed and not job.in_window(self.now()):
+            job.status = PENDING
+        else:
+            # Out of turns, or the flow could not find its way
+            job.status = ENDED
+        self.save()
+        self.log(f"Job {job.status}: {job.describe()}, {job.runs_per_hour:.1f} runs/h")
+
+    def run(self) -> bool:
+        """
+        Run jobs until all are finished or stop is requested
+
+        Returns:
+            True if every job finished
+        """
+        self.log("Job queue: " + "; ".join(job.describe() for job in self.jobs))
+        while not self.check_stop():
+            job = self.next_job()
+            if job is None:
+                if all(job.finished for job in self.jobs) or not self._wait_for_window():
+                    break
+                continue
+            self._run(job)
+
+        self.log(self.report())
+        if all(job.finished for job in self.jobs):
+            self.clear()
+            return True
+        return False
+
+    def report(self) -> str:
+        """Per-job throughput summary"""
+        lines = ["Job queue summary:"]
+        for job in self.jobs:
+            minutes = job.elapsed / 60
+            lines.append(f"  {job.describe()}: {job.status}, {minutes:.1f} min, {job.runs_per_hour:.1f} runs/h")
+        return "\n".join(lines)
+
+
+def load_queue_config(config_file: str = "config.json") -> List[ActivityJob]:
+    """Jobs from the daily_activity_queue section of config.json"""
+    try:
+        with open(config_file, "r", encoding="utf-8") as f:
+            items = json.load(f).get("daily_activity_queue", {}).get("jobs", [])
+        return [ActivityJob.from_dict(item) for item in items]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[WARNING] Could not read daily_activity_queue from config: {e}")
+        return []
@@ -10,7 +10,7 @@ from gui.dialogs.preset_dialog import PresetDialog
 from gui.dialogs.uma_musume_dialog import UmaMusumeDialog
 from gui.dialogs.race_schedule_dialog import RaceScheduleDialog
 
-from core.style_handler import get_style_options, get_style_display_name
+from utils.constants import get_style_options, get_style_display_name
 
 
 DEFAULT_RACE_SCHEDULE = [
@@ -502,7 +502,9 @@ class EventChoiceTab:
             "Preferred races the bot will prioritize.\n"
             "On a scheduled race day, the bot will race\n"
             "instead of training (if race passes Strategy filters).\n"
-            "Resets to defaults when Uma Musume changes."
+            "Resets to defaults when Uma Musume changes.\n"
+            "Auto fills the rest of the career with the races\n"
+            "that give the most fans for this Uma Musume."
         )
 
         ttk.Frame(schedule_header, width=5).pack(side=tk.LEFT)
@@ -526,6 +528,13 @@ class EventChoiceTab:
             text="Reset",
             command=self._reset_race_schedule,
             width=5
+        ).pack(side=tk.LEFT, padx=(0, 3))
+
+        ttk.Button(
+            schedule_header,
+            text="Auto",
+            command=self._auto_plan_race_schedule,
+            width=5
         ).pack(side=tk.LEFT)
 
     def create_race_schedule_tree(self, parent):
@@ -604,11 +613,13 @@ class EventChoiceTab:
         if not values:
             return
 
+        race_day = str(values[0])
         race_name = values[1]
         current_preset = self.current_set.get()
         schedule = self.preset_sets[current_preset].get('race_schedule', [])
+        # A planned schedule can hold the same race in two years, so match the day too
         self.preset_sets[current_preset]['race_schedule'] = [
-            r for r in schedule if r['name'] != race_name
+            r for r in schedule if r['name'] != race_name or str(r.get('day')) != race_day
         ]
 
         self._refresh_schedule_tree()
@@ -649,6 +660,31 @@ class EventChoiceTab:
         self._refresh_schedule_tree()
         self._safe_save_settings()
 
+    def _auto_plan_race_schedule(self):
+        """Fill the schedule with the planned races for the current uma, keeping existing entries"""
+        try:
+            from core.race_planner import get_race_planner
+            current_preset = self.current_set.get()
+            schedule = self.preset_sets[current_preset].get('race_schedule', [])
+            plan = get_race_planner().plan_career(
+                self.selected_uma_musume.get(),
+                filters=self.race_schedule_filters,
+                fixed=schedule
+            )
+        except Exception as e:
+            print(f"[ERROR] Failed to plan race schedule: {e}")
+            return
+
+        planned = plan.to_schedule()
+        # Entries the plan does not cover (after day 72, or a second race on a day) stay as they are
+        planned_keys = {(r['name'], r['day']) for r in planned}
+        planned.extend(r for r in schedule if (r.get('name'), r.get('day')) not in planned_keys)
+        planned.sort(key=lambda r: r.get('day', 0))
+        self.preset_sets[current_preset]['race_schedule'] = planned
+        print(f"[INFO] Planned {len(plan)} races, {plan.total_fans} fans from added races")
+        self._refresh_schedule_tree()
+        self._safe_save_settings()
+
     @staticmethod
     def _extract_race_info(race_data):
         """Extract short info string like 'Turf, Mile' from race data"""
@@ -686,13 +722,9 @@ class EventChoiceTab:
         # Look up race details from race_list data
         race_lookup = {}
         try:
-            import json
-            race_file = os.path.join("assets", "race_list.json")
-            if os.path.exists(race_file):
-                with open(race_file, "r", encoding="utf-8") as f:
-                    all_races = json.load(f)
-                for race in all_races:
-                    race_lookup[race.get("name", "")] = race
+            from core.race_manager import load_race_list
+            for race in load_race_list():
+                race_lookup[race.get("name", "")] = race
         except Exception:
             pass
 
@@ -1,8 +1,49 @@
-import pyautogui
-import time
 import threading
 
-from core.click_handler import find_and_click as _find_and_click
+from utils.startup import lazy_import
+
+# Heavy modules are imported when Team Trials first runs, not when the tab is built
+screen_flow = lazy_import("core.screen_flow")
+activity_scheduler = lazy_import("gui.tabs.activity_scheduler")
+
+NEXT_BTN = "assets/buttons/next_btn.png"
+NEXT2_BTN = "assets/buttons/next2_btn.png"
+SKIP_BTN = "assets/buttons/skip_btn.png"
+CANCEL_BTN = "assets/buttons/cancel_btn.png"
+BACK_BTN = "assets/buttons/back_btn.png"
+CLOSE_BTN = "assets/buttons/close_btn.png"
+CONFIRM_BTN = "assets/buttons/confirm_btn.png"
+RESTORE_BTN = "assets/buttons/restore_btn.png"
+REFRESH_BTN = "assets/buttons/refresh_btn.png"
+NO_BTN = "assets/buttons/no_btn.png"
+VIEW_RESULTS_BTN = "assets/buttons/view_results.png"
+QUICK_MODE_BTNS = ["assets/buttons/quick_mode_on.png", "assets/buttons/quick_mode_off.png"]
+RACE_START_BTN = "assets/buttons/home/daily_race/race!_btn.png"
+RACE_TAB_BTNS = ["assets/buttons/home/team_trials/race_tab.png",
+                 "assets/buttons/home/team_trials/race_tab_2.png"]
+TEAM_TRIAL_BTN = "assets/buttons/home/team_trials/team_trial_btn.png"
+TEAM_RACE_BTN = "assets/buttons/home/team_trials/team_race_btn.png"
+TT_RACE_BTN = "assets/buttons/home/team_trials/race_btn.png"
+PVP_GIFT_BTN = "assets/buttons/home/team_trials/pvp_win_gift.png"
+PARFAIT_BTN = "assets/buttons/home/team_trials/parfait.png"
+SEE_ALL_RESULTS_BTN = "assets/buttons/home/team_trials/see_all_race_results.png"
+RACE_AGAIN_BTN = "assets/buttons/home/team_trials/race_again_btn.png"
+SHOP_BTN = "assets/buttons/home/team_trials/shop_btn.png"
+CM_FIND_RACE_BTN = "assets/buttons/home/champion_meeting/find_race_btn.png"
+CM_RACE_BTN = "assets/buttons/home/champion_meeting/race_brn.png"
+CM_CLAIM_BTN = "assets/buttons/home/champion_meeting/claim_btn.png"
+RACE_EVENT_BTN = "assets/buttons/home/race_event/race_event_btn.png"
+LEGEND_RACE_BTN = "assets/buttons/home/race_event/legend_race_btn.png"
+EX_BTN = "assets/buttons/home/race_event/ex_btn.png"
+
+HOME_RACE_TAB_REGION = (200, 780, 680, 860)
+CM_FIND_RACE_REGION = (200, 600, 680, 800)
+TAP_POINT = (400, 400)
+OPPONENT_POSITIONS = {
+    "Opponent 1": (500, 300),
+    "Opponent 2": (500, 550),
+    "Opponent 3": (500, 800)
+}
 
 
 class TeamTrialsLogic:
@@ -30,6 +71,10 @@ class TeamTrialsLogic:
         """Start Legend Race with specified parameters"""
         return self.start_generic_activity(self.legend_race_loop, "Legend Races")
 
+    def start_job_queue(self):
+        """Start the queued daily activity jobs"""
+        return self.start_generic_activity(self.job_queue_loop, "Job Queue")
+
     def start_generic_activity(self, loop_method, activity_name):
         """Generic method to start an activity"""
         if self.is_team_trials_running:
@@ -51,558 +96,254 @@ class TeamTrialsLogic:
         self.main_window.is_running = False
         self.main_window.log_message("Daily Activities stopped")
 
-    def find_and_click(self, image_path, full_screen=False, region=None, max_attempts=1, delay_between=1,
-                       click=True, log_attempts=True, click_count=1, confidence=0.8,
-                       click_count_delay=0.3, post_click_delay=0, alt_img_paths=None):
-        """Wrapper around core find_and_click with class stop/log context"""
-        return _find_and_click(
-            image_path, region=region, full_screen=full_screen,
-            max_attempts=max_attempts, delay_between=delay_between,
-            click=click, confidence=confidence, log_attempts=log_attempts,
-            click_count=click_count, click_count_delay=click_count_delay,
-            post_click_delay=post_click_delay, alt_img_paths=alt_img_paths,
-            check_stop_func=self.check_stop_condition,
-            log_func=self.main_window.log_message
-        )
-
-    def navigate_to_champion_meet(self):
-        """Navigate to Champion Meeting section"""
-        # Check stop condition
-        if self.check_stop_condition():
-            return False
-
-        # Home screen race tab selection
-        race_tab_region = (200, 600, 680, 800)
-        race_images = ["assets/buttons/home/champion_meeting/find_race_btn.png"]
-        race_clicked = False
-        for race_image in race_images:
-            if self.check_stop_condition():
-                return False
-
-            if self.find_and_click(race_image, region=race_tab_region, click=False):
-                race_clicked = True
-                time.sleep(1)
-                break
-
-        if not race_clicked:
-            self.main_window.log_message("Race button not found - Not in Champion Meeting")
-            return False
-
-        return True
-
-    def execute_champion_meet_cycle(self):
-        """Execute one complete daily race cycle"""
-        # Race button home
-        if not self.find_and_click("assets/buttons/home/champion_meeting/find_race_btn.png", max_attempts=5,
-                                   delay_between=2):
-            return False
-        print("execute_champion_meet_cycle")
-        if not self.find_and_click("assets/buttons/next_btn.png", max_attempts=18, delay_between=5):
-            return False
-
-        if not self.find_and_click("assets/buttons/home/champion_meeting/race_brn.png", max_attempts=5, delay_between=3,
-                                   click_count=3):
-            return False
-        time.sleep(3)
-
-        # # RECHECK if race_brn was clicked
-        # if self.find_and_click("assets/buttons/home/champion_meeting/race_brn.png", max_attempts=1, delay_between=1, log_attempts=""):
-        #     time.sleep(2)
-
-        if not self.find_and_click("assets/buttons/home/daily_race/race!_btn.png", max_attempts=5, delay_between=5):
-            return False
-        time.sleep(2)
-
-        for i in range(4):
-            self.find_and_click("assets/buttons/skip_btn.png", max_attempts=3, delay_between=2, click_count=2,
-                                log_attempts=False)
-
-        time.sleep(2)
-        for i in range(4):
-            next_btn_pos = self.find_and_click("assets/buttons/next_btn.png", max_attempts=1, delay_between=1,
-                                               click_count=2)
-            if not next_btn_pos:
-                pyautogui.click(400, 400)
-                time.sleep(3)
-                if i == 4:
-                    return False
-            else:
-                time.sleep(3)
-                if self.find_and_click("assets/buttons/next_btn.png", max_attempts=1, delay_between=1,
-                                       click_count=3):
-                    time.sleep(5)
-                else:
-                    time.sleep(2)
-                break
-
-        # # RECHECK if race_brn was clicked
-        # if self.find_and_click("assets/buttons/home/champion_meeting/race_brn.png", max_attempts=1, delay_between=1, log_attempts=""):
-        #     time.sleep(5)
-
-        # Check no more turns
-        if self.find_and_click("assets/buttons/home/champion_meeting/claim_btn.png", click=False):
-            self.main_window.log_message("No more turns available - stopping bot")
-            return False
-
-        return True
-
-    def champion_meet_loop(self):
-        """Main Champion Meeting loop"""
-        try:
-            if self.check_stop_condition():
-                self.main_window.log_message("Champion Meeting stopped before navigation")
-                return
-
-            if not self.navigate_to_champion_meet():
-                return
-
-            while self.is_team_trials_running:
-                if self.check_stop_condition():
-                    self.main_window.log_message("Champion Meeting stopped during execution")
-                    break
 
-                if not self.execute_champion_meet_cycle():
-                    break
 
-        except Exception as e:
-            self.main_window.log_message(f"Champion Meeting error: {e}")
-        finally:
-            self.main_window.root.after(0, self.stop_team_trials)
+    def run_flow(self, activity_name, steps, loop_start=None, on_cycle=None):
+        """Run an activity's steps until they end, a screen is missing or F3 stops the run"""
+        runner = screen_flow.FlowRunner(activity_name, steps, check_stop=self.check_stop_condition,
+                                        log_func=self.main_window.log_message, loop_start=loop_start,
+                                        on_cycle=on_cycle)
+        return runner.run()
 
-    def legend_race_loop(self):
-        """Main legend race loop with stop checking"""
+    def run_activity(self, activity_name, build_steps, loop_start=None):
+        """Thread body for a single activity started from the tab"""
         try:
-            # Check stop condition before navigation
             if self.check_stop_condition():
-                self.main_window.log_message("Legend Races stopped before navigation")
-                return
-
-            if not self.navigate_to_legend_race():
+                self.main_window.log_message(f"{activity_name} stopped before navigation")
                 return
-
+            self.run_flow(activity_name, build_steps(), loop_start)
         except Exception as e:
-            self.main_window.log_message(f"Legend Races error: {e}")
+            self.main_window.log_message(f"{activity_name} error: {e}")
         finally:
             self.main_window.root.after(0, self.stop_team_trials)
 
-    def navigate_to_legend_race(self):
-        # Check active tab and ensure no ongoing processes
-        # if not self.ui_tab.is_active_tab() or self.is_team_trials_running:
-        #     return False
-        #
-        # # Set running flag
-        # self.is_team_trials_running = True
+    def no_more_turns(self):
+        self.main_window.log_message("No more turns available - stopping bot")
+        return False
 
-        try:
-            # 1. Check race images
-            race_tab_region = (200, 780, 680, 860)
-            race_images = ["assets/buttons/home/team_trials/race_tab.png",
-                           "assets/buttons/home/team_trials/race_tab_2.png"]
-
-            race_clicked = False
-            for race_image in race_images:
-                # Check stop condition before each race image attempt
-                if self.check_stop_condition():
-                    return False
-
-                if self.find_and_click(race_image, region=race_tab_region):
-                    self.main_window.log_message(f"Successfully clicked race tab")
-                    race_clicked = True
-                    time.sleep(1)
-                    break
-
-            if not race_clicked:
-                self.main_window.log_message("Race tab not found - Not on Home screen")
-                return False
-            # 2. Click Race Event button
-            if not self.find_and_click("assets/buttons/home/race_event/race_event_btn.png", click=True, max_attempts=3,
-                                       delay_between=5):
-                return False
-                # Click Legend Race button
-            if not self.find_and_click("assets/buttons/home/race_event/legend_race_btn.png", click=True, max_attempts=3,
-                                       delay_between=3):
-                return False
-
-            time.sleep(5)
-
-            while True:
-                # 3. Check EX unavailability
-                if not self.find_and_click("assets/buttons/next_btn.png", click=False, log_attempts=False):
-
-                    # if self.find_and_click("assets/buttons/home/race_event/ex-unavailable_btn.png", click=False, log_attempts=False):
-                    #         self.main_window.log_message("No more Legend Race attempts available.")
-                    #         break
-
-                    # 4. Click EX button
-                    if not self.find_and_click("assets/buttons/home/race_event/ex_btn.png", click=True, max_attempts=3,
-                                               delay_between=3):
-                        return False
-
-                    # 5. Click Race button
-                    if not self.find_and_click("assets/buttons/home/team_trials/race_btn.png", click=True,
-                                               max_attempts=3, delay_between=2):
-                        return False
-
-                    self.find_and_click("assets/buttons/home/daily_race/race!_btn.png", confidence=0.9,
-                                        click=True, log_attempts=False, max_attempts=2, delay_between=3)
-
-                    # 6. Confirm
-                    if not self.find_and_click("assets/buttons/confirm_btn.png", click=True, max_attempts=3,
-                                               delay_between=3):
-                        return False
-
-                # 7. Next button
-                if not self.find_and_click("assets/buttons/next_btn.png", click=True, max_attempts=5, delay_between=3):
-                    return False
-
-                # 8. Use Parfait if enabled
-                if self.ui_tab.legend_race_use_parfait.get():
-                    self.find_and_click("assets/buttons/home/team_trials/parfait.png", click=True, max_attempts=3,
-                                        delay_between=1)
-
-                # 9. Race button
-                if not self.find_and_click("assets/buttons/home/team_trials/race_btn.png", click=True, max_attempts=5,
-                                           delay_between=2):
-                    return False
-
-                # 10. View results and click
-                see_result_pos = self.find_and_click("assets/buttons/view_results.png", max_attempts=5, delay_between=3)
-                if not see_result_pos:
-                    return False
-
-                # Click result multiple times
-                for i in range(2):
-                    pyautogui.click(see_result_pos)
-                    time.sleep(4)
-
-                    # 11 & 12. Next buttons
-                if not self.find_and_click("assets/buttons/next_btn.png", click=True, max_attempts=3, delay_between=3):
-                    return False
-
-                if not self.find_and_click("assets/buttons/next_btn.png", click=True, max_attempts=3, delay_between=2):
-                    return False
-
-                    # 13. Handle shop if present
-                if self.find_and_click("assets/buttons/home/team_trials/shop_btn.png", click=False, log_attempts=False):
-                    self.main_window.log_message("Shop available")
-
-                    if self.ui_tab.legend_race_stop_if_shop.get():
-                        # Check stop condition before shop click
-                        if self.check_stop_condition():
-                            return False
-
-                        self.find_and_click("assets/buttons/home/team_trials/shop_btn.png", log_attempts=False)
-                        self.main_window.log_message("Shop detected - stopping as requested")
-                        return False
-                    else:
-                        # Check stop condition before cancel click
-                        if self.check_stop_condition():
-                            return False
-
-                        self.find_and_click("assets/buttons/cancel_btn.png", log_attempts=False)
-                        self.main_window.log_message("Shop bypassed - clicked cancel")
-
-                    # 14. Continue to next iteration
-                    if not self.find_and_click("assets/buttons/next_btn.png", click=True, max_attempts=3,
-                                               delay_between=2):
-                        return False
-
-        except Exception as e:
-            print(f"Error in Legend Race: {e}")
-            return False
-        finally:
-            self.is_team_trials_running = False
-
-    def navigate_to_team_trials(self):
-        """Navigate to team trials section with stop checking"""
-        # Check stop condition before starting navigation
-        if self.check_stop_condition():
-            return False
-
-        # Step 2: Check and click race tab
-        race_tab_region = (200, 780, 680, 860)
-        race_images = ["assets/buttons/home/team_trials/race_tab.png",
-                       "assets/buttons/home/team_trials/race_tab_2.png"]
-
-        race_clicked = False
-        for race_image in race_images:
-            # Check stop condition before each race image attempt
-            if self.check_stop_condition():
-                return False
-
-            if self.find_and_click(race_image, race_tab_region):
-                self.main_window.log_message(f"Successfully clicked race tab")
-                race_clicked = True
-                time.sleep(1)
-                break
-
-        if not race_clicked:
-            self.main_window.log_message("Race tab not found - Not on Home screen")
-            return False
-
-        # Check stop condition before team trial button
-        if self.check_stop_condition():
-            return False
-
-        # Step 2 continued: Click team trial button
-        if not self.find_and_click("assets/buttons/home/team_trials/team_trial_btn.png",
-                                   max_attempts=6, delay_between=3):
-            return False
-
-        # Check stop condition before team race button
-        if self.check_stop_condition():
+    def handle_shop(self, runner, hit, stop_if_shop, stop_message):
+        """Open the shop and stop, or dismiss it and carry on"""
+        if stop_if_shop:
+            runner.click_box(hit.box)
+            self.main_window.log_message(stop_message)
             return False
+        runner.click_screen(screen_flow.Screen("cancel", CANCEL_BTN))
+        return True
 
-        # Step 3: Click team race button
-        if not self.find_and_click("assets/buttons/home/team_trials/team_race_btn.png",
-                                   max_attempts=6, delay_between=3):
-            return False
-        elif self.find_and_click("assets/buttons/restore_btn.png", click=False, log_attempts=False):
-            self.main_window.log_message("No more turns available - stopping bot")
-            return False
-        if not self.find_and_click("assets/buttons/refresh_btn.png", click=False, log_attempts=False, max_attempts=2,
-                                   delay_between=2):
-            time.sleep(4)
+    # --- Champion Meeting ---
 
-        # Check stop condition before next button check
-        if self.check_stop_condition():
-            return False
+    def champion_meet_loop(self):
+        """Main Champion Meeting loop"""
+        self.run_activity("Champion Meeting", self.champion_meet_steps, loop_start="find_race")
+
+    def champion_meet_steps(self):
+        S, Step = screen_flow.Screen, screen_flow.Step
+        find_race = S("find race", CM_FIND_RACE_BTN)
+        next_btn = S("next", NEXT_BTN)
+        claim = S("claim", CM_CLAIM_BTN)
+
+        def check_turns(runner, hit):
+            return self.no_more_turns() if hit.is_(claim) else "find_race"
+
+        return [
+            Step("home", S("find race", CM_FIND_RACE_BTN, region=CM_FIND_RACE_REGION), click=False, timeout=3,
+                 fail_message="Race button not found - Not in Champion Meeting"),
+            Step("find_race", find_race, timeout=10),
+            Step("next", next_btn, timeout=90),
+            Step("race", S("race", CM_RACE_BTN), clicks=3, timeout=15),
+            Step("race_start", S("race!", RACE_START_BTN), timeout=25),
+            # Skip the replays and tap through until the result screen's next button
+            Step("results", next_btn, clicks=2, timeout=60, tap=[S("skip", SKIP_BTN)], tap_clicks=2,
+                 tap_point=TAP_POINT, tap_interval=3),
+            Step("rewards", next_btn, clicks=3, timeout=5, optional=True),
+            Step("check_turns", [claim, find_race], click=False, timeout=20, action=check_turns),
+        ]
 
-        # Step 3 continued: Check for immediate next button (skip to race results)
-        if self.find_and_click("assets/buttons/quick_mode_on.png", click=False, confidence=0.7, max_attempts=3,
-                               delay_between=1, log_attempts=False) or self.find_and_click("assets/buttons/quick_mode_off.png",
-                                                                       click=False, log_attempts=False):
-            self.main_window.log_message("Proceeding directly to race")
+    # --- Legend Race ---
 
-            # Check stop condition before race button
-            if self.check_stop_condition():
+    def legend_race_loop(self):
+        """Main legend race loop with stop checking"""
+        self.run_activity("Legend Races", self.legend_race_steps, loop_start="entry")
+
+    def legend_race_steps(self):
+        S, Step = screen_flow.Screen, screen_flow.Step
+        next_btn = S("next", NEXT_BTN)
+        ex_btn = S("EX", EX_BTN)
+        shop = S("shop", SHOP_BTN)
+        race_btn = S("race", TT_RACE_BTN)
+
+        def entry(runner, hit):
+            # A pending next button means the race was already entered
+            return "next" if hit.is_(next_btn) else "ex"
+
+        def after_race(runner, hit):
+            if not hit.is_(shop):
+                return "entry"
+            self.main_window.log_message("Shop available")
+            if not self.handle_shop(runner, hit, self.ui_tab.legend_race_stop_if_shop.get(),
+                                    "Shop detected - stopping as requested"):
                 return False
+            self.main_window.log_message("Shop bypassed - clicked cancel")
+            return "shop_next"
+
+        return [
+            Step("race_tab", S("race tab", RACE_TAB_BTNS, region=HOME_RACE_TAB_REGION), timeout=3,
+                 fail_message="Race tab not found - Not on Home screen"),
+            Step("race_event", S("race event", RACE_EVENT_BTN), timeout=15),
+            Step("legend_race", S("legend race", LEGEND_RACE_BTN), timeout=10),
+            Step("entry", [next_btn, ex_btn], click=False, timeout=15, action=entry),
+            Step("ex", ex_btn, timeout=10),
+            Step("ex_race", race_btn, timeout=10),
+            Step("race_start", S("race!", RACE_START_BTN, confidence=0.9), timeout=6, optional=True),
+            Step("confirm", S("confirm", CONFIRM_BTN), timeout=10),
+            Step("next", next_btn, timeout=15),
+            Step("parfait", S("parfait", PARFAIT_BTN), timeout=4, optional=True,
+                 when=self.ui_tab.legend_race_use_parfait.get),
+            Step("race", race_btn, timeout=15),
+            Step("view_results", S("view results", VIEW_RESULTS_BTN), timeout=15),
+            Step("results", next_btn, timeout=60, tap_point=TAP_POINT, tap_interval=4),
+            Step("results_next", next_btn, timeout=10),
+            Step("after_race", [shop, ex_btn, next_btn], click=False, timeout=15, action=after_race),
+            Step("shop_next", next_btn, timeout=10, goto="entry"),
+        ]
 
-            return self.handle_race_results()
-
-        return True
-
-    def execute_team_trial_cycle(self):
-        """Execute one complete team trial cycle with stop checking"""
-        # Check stop condition at start of cycle
-        if self.check_stop_condition():
-            return False
-
-        # Step 3 final: Check for refresh button
-        if not self.find_and_click("assets/buttons/refresh_btn.png", max_attempts=8, delay_between=3, click=False,
-                                   log_attempts=False, alt_img_paths=["assets/buttons/next_btn.png"]):
-            self.main_window.log_message("Neither refresh nor next button found")
-            return False
-
-        # Check PvP gift
-        pvp_gift_pos = self.find_and_click("assets/buttons/home/team_trials/pvp_win_gift.png",
-                                           post_click_delay=8)
-
-        # Select opponent if no PvP gift
-        if not pvp_gift_pos:
-            # Select opponent if no PvP gift
-            opponent_positions = {
-                "Opponent 1": (500, 300),
-                "Opponent 2": (500, 550),
-                "Opponent 3": (500, 800)
-            }
-
-            opponent_choice = self.ui_tab.opponent_type.get()
-            if opponent_choice in opponent_positions:
-                # Check stop condition before clicking opponent
-                if self.check_stop_condition():
-                    return False
-
-                pos = opponent_positions[opponent_choice]
-                pyautogui.click(pos)
-                self.main_window.log_message(f"Selected {opponent_choice}")
-                time.sleep(2)
+    # --- Team Trials ---
 
-                # Check stop condition before next button
-                if self.check_stop_condition():
+    def team_trials_loop(self):
+        """Main team trials loop with stop checking"""
+        self.run_activity("Team Trials", self.team_trials_steps, loop_start="lobby")
+
+    def team_trials_steps(self):
+        S, Step = screen_flow.Screen, screen_flow.Step
+        next_btn = S("next", NEXT_BTN)
+        next2_btn = S("next2", NEXT2_BTN)
+        refresh = S("refresh", REFRESH_BTN)
+        restore = S("restore", RESTORE_BTN)
+        quick_mode = S("quick mode", QUICK_MODE_BTNS, confidence=0.7)
+        race_again = S("race again", RACE_AGAIN_BTN)
+        shop = S("shop", SHOP_BTN)
+        close = S("close", CLOSE_BTN)
+        cycle = {"gift": False}
+
+        def team_race(runner, hit):
+            if hit.is_(restore):
+                return self.no_more_turns()
+            if hit.is_(quick_mode):
+                self.main_window.log_message("Proceeding directly to race")
+                # This race skips the lobby, so it begins the first cycle itself
+                runner.start_cycle()
+                return "see_all"
+            return "lobby"
+
+        def gift(runner, hit):
+            cycle["gift"] = True
+            # The gift animation has no end screen of its own to wait for
+            return runner.pause(8) and "next"
+
+        def opponent(runner, hit):
+            cycle["gift"] = False
+            choice = self.ui_tab.opponent_type.get()
+            if choice in OPPONENT_POSITIONS:
+                runner.click_point(*OPPONENT_POSITIONS[choice])
+                self.main_window.log_message(f"Selected {choice}")
+
+        def after_results(runner, hit):
+            # Story unlocked popups are closed, then the results are tapped through again
+            if hit.is_(close):
+                runner.click_box(hit.box)
+                return "after_results"
+            return "finish"
+
+        def finish(runner, hit):
+            if hit.is_(race_again):
+                return "race_again"
+            if hit.is_(next2_btn):
+                return "after_next2"
+            if hit.is_(shop):
+                if not self.handle_shop(runner, hit, self.ui_tab.stop_if_shop.get(),
+                                        "Shop detected after next2 - stopping as requested"):
                     return False
-
-        # Click next button after opponent selection
-        if not self.find_and_click("assets/buttons/next_btn.png", max_attempts=8, delay_between=3):
+                return "finish"
+            self.main_window.log_message("End condition detected - stopping team trials")
             return False
 
-        # Check stop condition before parfait handling
-        if self.check_stop_condition():
-            return False
+        return [
+            Step("race_tab", S("race tab", RACE_TAB_BTNS, region=HOME_RACE_TAB_REGION), timeout=3,
+                 fail_message="Race tab not found - Not on Home screen"),
+            Step("team_trial", S("team trial", TEAM_TRIAL_BTN), timeout=20),
+            Step("team_race", S("team race", TEAM_RACE_BTN), timeout=20),
+            Step("team_race_result", [restore, quick_mode, refresh, next_btn], click=False, timeout=20,
+                 action=team_race),
+            Step("lobby", [refresh, next_btn], click=False, timeout=25,
+                 fail_message="Neither refresh nor next button found"),
+            Step("gift", S("PvP gift", PVP_GIFT_BTN), timeout=1.5, optional=True, action=gift),
+            Step("opponent", action=opponent),
+            Step("next", next_btn, timeout=25),
+            Step("parfait", S("parfait", PARFAIT_BTN), timeout=3, optional=True,
+                 when=lambda: cycle["gift"] and self.ui_tab.use_parfait_gift_pvp.get()),
+            Step("race", S("race", TT_RACE_BTN), timeout=10, fail_message="Failed to find race button"),
+            Step("see_all", S("see all results", SEE_ALL_RESULTS_BTN), clicks=2, timeout=15,
+                 fail_message="Failed to find see_all_race_results button"),
+            Step("skip", S("skip", SKIP_BTN), clicks=3, timeout=10),
+            Step("results_next", next_btn, timeout=10),
+            Step("after_results", [close, S("cancel", CANCEL_BTN), next2_btn, race_again], timeout=15,
+                 optional=True, missing_goto="finish", tap_point=TAP_POINT, tap_interval=1,
+                 click=False, action=after_results),
+            Step("finish", [race_again, next2_btn, shop, S("no", NO_BTN)], click=False, timeout=5,
+                 optional=True, missing_goto="lobby", action=finish),
+            Step("after_next2", next2_btn, optional=True, timeout=3),
+            Step("after_next2_next", next_btn, timeout=5, optional=True, goto="finish", missing_goto="finish"),
+            Step("race_again", race_again, timeout=5),
+            Step("race_again_result", [restore, refresh, next_btn], click=False, timeout=15,
+                 action=lambda runner, hit: self.no_more_turns() if hit.is_(restore) else "lobby"),
+        ]
 
-        # Step 5: Handle parfait and race preparation
-        # Use parfait if PvP gift was clicked and option is enabled
-        if pvp_gift_pos and self.ui_tab.use_parfait_gift_pvp.get():
-            if self.check_stop_condition():
-                return False
-            self.find_and_click("assets/buttons/home/team_trials/parfait.png", log_attempts=False)
+    # --- Job queue ---
+
+    def activity_flows(self):
+        """Step builder and cycle start for each activity name used by the job queue"""
+        return {
+            "Team Trial": (self.team_trials_steps, "lobby"),
+            "Champion Meeting": (self.champion_meet_steps, "find_race"),
+            "Legend Race": (self.legend_race_steps, "entry"),
+        }
+
+    def return_home_steps(self):
+        S, Step = screen_flow.Screen, screen_flow.Step
+        return [
+            Step("home", S("race tab", RACE_TAB_BTNS, region=HOME_RACE_TAB_REGION), click=False, timeout=60,
+                 tap=[S("back", BACK_BTN), S("close", CLOSE_BTN), S("cancel", CANCEL_BTN)],
+                 fail_message="Could not return to the Home screen"),
+        ]
 
-        # Check stop condition before race button
-        if self.check_stop_condition():
+    def run_job(self, job, on_cycle):
+        """Run one queued job from the Home screen"""
+        flows = self.activity_flows()
+        if job.activity not in flows:
+            self.main_window.log_message(f"Unknown activity in job queue: {job.activity}")
             return False
-
-        # Click race button to start race
-        if not self.find_and_click("assets/buttons/home/team_trials/race_btn.png"):
-            self.main_window.log_message("Failed to find race button")
+        build_steps, loop_start = flows[job.activity]
+        # Champion Meeting has no route from Home, so it only runs from its own screen
+        if job.activity != "Champion Meeting" and not self.run_flow("Return Home", self.return_home_steps()):
             return False
+        return self.run_flow(job.activity, build_steps(), loop_start, on_cycle=on_cycle)
 
-        time.sleep(2)
-
-        # Handle race results
-        return self.handle_race_results()
-
-    def team_trials_loop(self):
-        """Main team trials loop with stop checking"""
+    def job_queue_loop(self):
+        """Run the daily activity job queue, resuming an interrupted one"""
         try:
-            # Check stop condition before navigation
-            if self.check_stop_condition():
-                self.main_window.log_message("Team Trials stopped before navigation")
-                return
-
-            if not self.navigate_to_team_trials():
+            jobs = activity_scheduler.ActivityScheduler.load_checkpoint()
+            if jobs:
+                self.main_window.log_message("Resuming interrupted job queue")
+            else:
+                jobs = activity_scheduler.load_queue_config()
+            if not jobs:
+                self.main_window.log_message("No jobs in daily_activity_queue - add them to config.json")
                 return
 
-            while self.is_team_trials_running:
-                # Check stop condition at start of each cycle
-                if self.check_stop_condition():
-                    self.main_window.log_message("Team Trials stopped during execution")
-                    break
-
-                if not self.execute_team_trial_cycle():
-                    break
-
+            scheduler = activity_scheduler.ActivityScheduler(jobs, self.run_job, self.check_stop_condition,
+                                                             log_func=self.main_window.log_message)
+            scheduler.run()
         except Exception as e:
-            self.main_window.log_message(f"Team Trials error: {e}")
+            self.main_window.log_message(f"Job Queue error: {e}")
         finally:
             self.main_window.root.after(0, self.stop_team_trials)
-
-    def handle_race_results(self):
-        """Handle race results processing with stop checking"""
-        print('handle_race_results')
-        # Check stop condition before handling results
-        if self.check_stop_condition():
-            return False
-
-        if not self.find_and_click("assets/buttons/home/team_trials/see_all_race_results.png", max_attempts=5, delay_between=2, click_count=2):
-            self.main_window.log_message("Failed to find see_all_race_results button")
-            return False
-
-        if self.check_stop_condition():
-            return False
-
-        if not self.find_and_click("assets/buttons/skip_btn.png", max_attempts=5, delay_between=1, click_count=3):
-            return False
-
-        if self.check_stop_condition():
-            return False
-
-        if not self.find_and_click("assets/buttons/next_btn.png", max_attempts=5, delay_between=1):
-            return False
-
-        time.sleep(1)
-
-        if not self.handle_shop_and_continue():
-            return False
-
-        return True
-
-    def handle_shop_and_continue(self):
-        """Handle shop detection and race continuation with stop checking"""
-        # Check stop condition before shop handling
-        time.sleep(2)
-        if self.check_stop_condition():
-            return False
-
-        # Step 7: Check Story Unlocked
-        if self.find_and_click("assets/buttons/close_btn.png", log_attempts=False):
-            time.sleep(2)
-
-        # Check for completion buttons after 10 clicks
-        should_break = False
-        completion_buttons = [
-            "assets/buttons/cancel_btn.png", "assets/buttons/next2_btn.png",
-            # "assets/buttons/next_btn.png",
-            "assets/buttons/home/team_trials/race_again_btn.png"
-        ]
-        for i in range(10):
-
-            if self.check_stop_condition():
-                self.main_window.log_message("Team Trials stopped during race results processing")
-                return False
-
-            for button in completion_buttons:
-                # Check stop condition before each button check
-                if self.check_stop_condition():
-                    return False
-
-                if self.find_and_click(button, click=False, log_attempts=False):
-                    self.main_window.log_message(f"Completion button found.")
-                    should_break = True
-                    break
-            if should_break:
-                break
-            pyautogui.click(400, 400)
-            time.sleep(1)
-        else:
-            time.sleep(0.5)
-
-        # Check stop condition before race again button
-        if self.check_stop_condition():
-            return False
-
-            # Step 7 final: Final race again attempt
-        if self.find_and_click("assets/buttons/home/team_trials/race_again_btn.png", log_attempts=False):
-            if self.find_and_click("assets/buttons/restore_btn.png", click=False, log_attempts=False):
-                self.main_window.log_message("No more turns available - stopping bot")
-                return False
-            return True
-        else:
-            # Step 7 alternate: Try next2 button sequence
-            if self.find_and_click("assets/buttons/next2_btn.png", log_attempts=False):
-                # Check stop condition before next button
-                if self.check_stop_condition():
-                    return False
-
-                self.find_and_click("assets/buttons/next_btn.png", log_attempts=False, max_attempts=5, delay_between=1)
-
-        # Check stop condition before shop check again
-        if self.check_stop_condition():
-            return False
-
-        if self.find_and_click("assets/buttons/home/team_trials/shop_btn.png", click=False, log_attempts=False):
-            if self.ui_tab.stop_if_shop.get():
-                # Check stop condition before shop click
-                if self.check_stop_condition():
-                    return False
-
-                self.find_and_click("assets/buttons/home/team_trials/shop_btn.png", log_attempts=False)
-                self.main_window.log_message("Shop detected after next2 - stopping as requested")
-                return False
-            else:
-                # Check stop condition before cancel click
-                if self.check_stop_condition():
-                    return False
-
-                self.find_and_click("assets/buttons/cancel_btn.png", log_attempts=False)
-
-        # Check stop condition before final race again attempt
-        if self.check_stop_condition():
-            return False
-
-        # Step 7 final: Final race again attempt
-        if self.find_and_click("assets/buttons/home/team_trials/race_again_btn.png", log_attempts=False):
-            if self.find_and_click("assets/buttons/restore_btn.png", click=False, log_attempts=False):
-                self.main_window.log_message("No more turns available - stopping bot")
-                return False
-            return True
-
-        # Check stop condition before end condition check
-        if self.check_stop_condition():
-            return False
-
-        # Step 8: Check for end condition
-        if self.find_and_click("assets/buttons/no_btn.png", click=False, log_attempts=False):
-            self.main_window.log_message("End condition detected - stopping team trials")
-            return False
-
-        return True
@@ -82,7 +82,7 @@ class TeamTrialsTab:
         daily_activity_dropdown = ttk.Combobox(
             daily_activity_frame,
             textvariable=self.daily_activity_type,
-            values=["Team Trial", "Champion Meeting", "Legend Race"],
+            values=["Team Trial", "Champion Meeting", "Legend Race", "Job Queue"],
             state="readonly",
             width=15
         )
@@ -112,6 +112,8 @@ class TeamTrialsTab:
             self.create_champion_meet_options()
         elif activity_type == "Legend Race":
             self.create_legend_race_options()
+        elif activity_type == "Job Queue":
+            self.create_job_queue_options()
 
     def create_team_trial_options(self):
         """Create options for Team Trial"""
@@ -170,6 +172,23 @@ class TeamTrialsTab:
         )
         shop_check.grid(row=0, column=1, sticky=tk.W, pady=5)
 
+    def create_job_queue_options(self):
+        """Show the queued jobs, or the interrupted queue that will be resumed"""
+        from .activity_scheduler import ActivityScheduler, load_queue_config
+
+        jobs = ActivityScheduler.load_checkpoint()
+        title = "Interrupted queue (resumes on Start):" if jobs else "Jobs from daily_activity_queue in config.json:"
+        jobs = jobs or load_queue_config()
+
+        ttk.Label(self.options_frame, text=title).grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        if not jobs:
+            ttk.Label(self.options_frame, text="No jobs configured").grid(row=1, column=0, sticky=tk.W)
+        for row, job in enumerate(jobs, start=1):
+            ttk.Label(self.options_frame, text=f"{row}. {job.describe()}").grid(
+                row=row, column=0, sticky=tk.W, padx=(10, 0))
+        ttk.Label(self.options_frame, text="Activity options below each type are used by its jobs.").grid(
+            row=len(jobs) + 2, column=0, sticky=tk.W, pady=(5, 0))
+
     def start_team_trials(self):
         """Start functionality based on selected daily activity type"""
         activity_type = self.daily_activity_type.get()
@@ -180,6 +199,8 @@ class TeamTrialsTab:
             return self.logic.start_champion_meets()
         elif activity_type == "Legend Race":
             return self.logic.start_legend_race()
+        elif activity_type == "Job Queue":
+            return self.logic.start_job_queue()
 
     def stop_team_trials(self):
         """Stop team trials - delegates to logic handler"""
@@ -4,5 +4,6 @@ Contains utility classes for GUI operations
 """
 
 from .game_window_monitor import GameWindowMonitor
+from .catalog_index import CatalogIndex, get_support_card_index, get_uma_musume_index
 
-__all__ = ['GameWindowMonitor']
\ No newline at end of file
+__all__ = ['GameWindowMonitor', 'CatalogIndex', 'get_support_card_index', 'get_uma_musume_index']
\ No newline at end of file
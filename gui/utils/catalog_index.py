@@ -0,0 +1,129 @@
+"""
+Catalog Index
+Prebuilt, cached name lists for the support card and Uma Musume pickers with fast incremental search
+"""
+
+import glob
+import os
+from typing import Dict, List, Optional, Tuple
+
+SUPPORT_CARD_FOLDER = "assets/event_map/support_card"
+SUPPORT_CARD_TYPES = ("spd", "sta", "pow", "gut", "wit", "frd")
+UMA_MUSUME_FOLDERS = ("assets/event_map/uma_musume", "assets/uma_musume")
+
+
+class CatalogEntry:
+    """One selectable name with its group and the event map file it came from"""
+
+    __slots__ = ('name', 'group', 'source', 'key')
+
+    def __init__(self, name: str, group: str, source: str):
+        self.name = name
+        self.group = group
+        self.source = source
+        self.key = name.lower()
+
+
+class CatalogIndex:
+    """
+    Entries grouped once at load time, with lower-cased search keys precomputed.
+    Each search narrows the previous result when the new text extends the old one,
+    so typing stays fast as the catalogue grows.
+    """
+
+    def __init__(self, entries: List[CatalogEntry]):
+        self.entries = entries
+        self.groups: Dict[str, List[CatalogEntry]] = {'all': list(entries)}
+        for entry in entries:
+            if entry.group:
+                self.groups.setdefault(entry.group, []).append(entry)
+        self._last: Dict[str, Tuple[str, List[CatalogEntry]]] = {}
+
+    def search(self, text: str = "", group: str = "all") -> List[CatalogEntry]:
+        """Entries in a group whose name contains the text, case-insensitive"""
+        candidates = self.groups.get(group, [])
+        text = text.strip().lower()
+        if not text:
+            return candidates
+
+        last_text, last_result = self._last.get(group, ("", candidates))
+        if last_text and text.startswith(last_text):
+            candidates = last_result
+
+        result = [entry for entry in candidates if text in entry.key]
+        self._last[group] = (text, result)
+        return result
+
+    def names(self, text: str = "", group: str = "all") -> List[str]:
+        return [entry.name for entry in self.search(text, group)]
+
+
+def _folder_signature(folders) -> Tuple:
+    """Modification times of the folders, so the cached index is rebuilt when files are added"""
+    signature = []
+    for folder in folders:
+        try:
+            signature.append(os.path.getmtime(folder))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _sorted_json_names(folder: str) -> List[Tuple[str, str]]:
+    files = glob.glob(os.path.join(folder, "*.json"))
+    names = [(os.path.basename(path)[:-len('.json')], path) for path in files]
+    return sorted(names, key=lambda item: item[0].lower())
+
+
+def _build_support_card_index() -> CatalogIndex:
+    entries = []
+    direct = []
+    try:
+        for card_type in SUPPORT_CARD_TYPES:
+            for name, path in _sorted_json_names(os.path.join(SUPPORT_CARD_FOLDER, card_type)):
+                entries.append(CatalogEntry(f"{card_type}: {name}", card_type, path))
+
+        # Cards stored directly in the folder only appear in the All tab
+        for name, path in _sorted_json_names(SUPPORT_CARD_FOLDER):
+            direct.append(CatalogEntry(name, '', path))
+    except Exception as e:
+        print(f"Error loading support cards: {e}")
+
+    return CatalogIndex(entries + direct)
+
+
+def _build_uma_musume_index() -> CatalogIndex:
+    entries = []
+    seen = set()
+    try:
+        for folder in UMA_MUSUME_FOLDERS:
+            for name, path in _sorted_json_names(folder):
+                if name not in seen:
+                    seen.add(name)
+                    entries.append(CatalogEntry(name, 'uma', path))
+        entries.sort(key=lambda entry: entry.key)
+    except Exception as e:
+        print(f"Error loading Uma Musume list: {e}")
+    return CatalogIndex(entries)
+
+
+_indexes: Dict[str, Tuple[Tuple, CatalogIndex]] = {}
+
+
+def _cached_index(name: str, folders, builder) -> CatalogIndex:
+    signature = _folder_signature(folders)
+    cached: Optional[Tuple[Tuple, CatalogIndex]] = _indexes.get(name)
+    if cached is None or cached[0] != signature:
+        cached = _indexes[name] = (signature, builder())
+    return cached[1]
+
+
+def get_support_card_index() -> CatalogIndex:
+    """Support card index, rebuilt only when the event map folders change"""
+    folders = (SUPPORT_CARD_FOLDER,) + tuple(os.path.join(SUPPORT_CARD_FOLDER, t) for t in SUPPORT_CARD_TYPES)
+    return _cached_index('support_card', folders, _build_support_card_index)
+
+
+def get_uma_musume_index() -> CatalogIndex:
+    """Uma Musume index, rebuilt only when the event map folders change"""
+    return _cached_index('uma_musume', UMA_MUSUME_FOLDERS, _build_uma_musume_index)
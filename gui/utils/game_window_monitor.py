@@ -2,6 +2,8 @@ import threading
 import time
 import pygetwindow as gw
 
+from core.game_window import get_game_window
+
 
 class GameWindowMonitor:
     """Monitors game window status and provides window management functions"""
@@ -10,6 +12,8 @@ class GameWindowMonitor:
         self.main_window = main_window
         self.monitoring = False
         self.monitor_thread = None
+        # Held directly: multi-session runs swap the module-level window on the bot thread
+        self.game_window = get_game_window()
 
     def start(self):
         """Start game window monitoring in background thread"""
@@ -37,24 +41,15 @@ class GameWindowMonitor:
     def check_game_window(self):
         """Check game window status and update GUI"""
         try:
-            window_titles = ["Umamusume", "ウマ娘", "Uma Musume", "DMM GAME PLAYER"]
-
-            found_window = None
-            window_title_found = ""
-
-            # Search for game window
-            for title in window_titles:
-                try:
-                    windows = gw.getWindowsWithTitle(title)
-                    if windows:
-                        found_window = windows[0]
-                        window_title_found = title
-                        break
-                except Exception:
-                    continue
-
-            if found_window:
-                self._handle_found_window(found_window, window_title_found)
+            game_window = self.game_window
+            changed = game_window.refresh(force=True)
+
+            if game_window.window is not None and game_window.client_rect:
+                self._handle_found_window(game_window.window, game_window.title)
+                if changed:
+                    left, top, width, height = game_window.client_rect
+                    self.main_window.log_message(
+                        f"Game window moved/resized: {width}x{height} at ({left}, {top})")
             else:
                 self._handle_missing_window()
 
@@ -103,27 +98,8 @@ class GameWindowMonitor:
     def focus_game_window(self):
         """Focus and activate game window"""
         try:
-            window_titles = ["Umamusume", "ウマ娘", "Uma Musume", "DMM GAME PLAYER"]
-
-            found_window = None
-            for title in window_titles:
-                try:
-                    windows = gw.getWindowsWithTitle(title)
-                    if windows:
-                        found_window = windows[0]
-                        break
-                except Exception:
-                    continue
-
-            # Fallback search
-            if not found_window:
-                all_windows = gw.getAllWindows()
-                game_windows = [w for w in all_windows
-                                if any(keyword in w.title.lower()
-                                       for keyword in ['uma', 'ウマ', 'dmm'])
-                                and w.title.strip()]
-                if game_windows:
-                    found_window = game_windows[0]
+            game_window = self.game_window
+            found_window, title = game_window.find_window(allow_fallback=True)
 
             if not found_window:
                 self.main_window.log_message("Error: No game window found with any recognized title")
@@ -141,6 +117,9 @@ class GameWindowMonitor:
                 pass
 
             time.sleep(0.5)
+
+            # Share the focused window's client area with capture and clicks
+            game_window.attach(found_window, title)
             return True
 
         except Exception as e:
@@ -10,6 +10,10 @@ import os
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Time every import from here on for the startup report
+from utils.startup import get_import_timer
+get_import_timer().install()
+
 from gui.main_window import UmaAutoGUI
 
 
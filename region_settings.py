@@ -20,7 +20,7 @@ class RegionSettingsWindow:
         self.window.grab_set()  # Make it modal
 
         # Current region values
-        self.current_regions = get_current_regions()
+        self.current_regions = get_current_regions(scaled=False)
         self.region_vars = {}
 
         # Preview variables
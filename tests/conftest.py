@@ -0,0 +1,88 @@
+"""
+Shared fixtures: a local HTTP server standing in for GitHub in the updater tests
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Route result that makes the server answer with something that is not HTTP
+PROTOCOL_ERROR = object()
+
+
+class LocalServer:
+    """
+    Routes are path -> callable(headers) returning (status, headers, body) or PROTOCOL_ERROR.
+    Every request is logged, and the number of requests in flight at once is tracked.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.delay = 0.0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                headers = {key.lower(): value for key, value in self.headers.items()}
+                with server._lock:
+                    server.requests.append((self.path, headers))
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    if server.delay:
+                        time.sleep(server.delay)
+                    route = server.routes.get(self.path)
+                    result = route(headers) if route else (404, {}, b"")
+                    if result is PROTOCOL_ERROR:
+                        self.wfile.write(b"NOT HTTP AT ALL\r\n\r\n")
+                        self.close_connection = True
+                        return
+                    status, response_headers, body = result
+                    self.send_response(status)
+                    for key, value in response_headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def paths(self, prefix=""):
+        """Paths requested so far, optionally only those under a prefix"""
+        with self._lock:
+            return [path for path, _ in self.requests if path.startswith(prefix)]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_server():
+    server = LocalServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,142 @@
+"""
+Delta update against a local HTTP server serving a release zip with ranged requests
+"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+from core.delta_update import DeltaUpdate, build_release_manifest
+from core.http_client import HttpClient
+
+RELEASE_FILES = {
+    "Uma_Musume_Auto_Train.exe": b"MZ" + bytes(range(256)) * 64,
+    "assets/event_map/other_special_events.json": b'{"events": ["%d"]}\n' * 400,
+    "version.py": b'VERSION = "2.0.0"\n',
+}
+OLD_FILES = {
+    "Uma_Musume_Auto_Train.exe": b"MZ old build",
+    "assets/event_map/other_special_events.json": b'{"events": []}\n',
+    "version.py": b'VERSION = "1.0.0"\n',
+}
+
+
+def ranged_archive(archive):
+    """Route answering Range requests on the release zip with 206 Partial Content"""
+    def route(headers):
+        if "range" not in headers:
+            return (200, {}, archive)
+        start, end = (int(value) for value in headers["range"].split("=", 1)[1].split("-"))
+        return (206, {"Content-Range": f"bytes {start}-{end}/{len(archive)}"}, archive[start:end + 1])
+    return route
+
+
+@pytest.fixture
+def release(tmp_path):
+    """Release zip with one top-level folder, its manifest and its bytes"""
+    zip_path = tmp_path / "release.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for path, data in RELEASE_FILES.items():
+            method = zipfile.ZIP_STORED if path == "version.py" else zipfile.ZIP_DEFLATED
+            zf.writestr(f"Uma_Musume_Auto_Train/{path}", data, compress_type=method)
+    manifest = build_release_manifest(str(zip_path), "2.0.0", str(tmp_path / "release_manifest.json"))
+    return manifest, zip_path.read_bytes()
+
+
+@pytest.fixture
+def install(tmp_path):
+    app_dir = tmp_path / "app"
+    for path, data in OLD_FILES.items():
+        target = app_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+    return app_dir
+
+
+def make_update(http_server, manifest, install):
+    update = DeltaUpdate(manifest, f"{http_server.base_url}/release.zip", str(install), client=HttpClient())
+    update.plan()
+    return update
+
+
+def read_install(install):
+    return {path: (install / path).read_bytes() for path in RELEASE_FILES}
+
+
+def test_manifest_strips_the_top_level_folder(release):
+    manifest, _ = release
+    assert sorted(manifest["files"]) == sorted(RELEASE_FILES)
+    assert manifest["files"]["version.py"]["method"] == "store"
+
+
+def test_partial_download_resumes_from_its_part_file(http_server, release, install):
+    manifest, archive = release
+    http_server.routes["/release.zip"] = ranged_archive(archive)
+    update = make_update(http_server, manifest, install)
+
+    # A previous run stopped 100 bytes into the executable
+    path, entry = next(change for change in update.changes if change[0] == "Uma_Musume_Auto_Train.exe")
+    os.makedirs(update.objects_dir)
+    with open(os.path.join(update.objects_dir, entry["sha256"] + ".part"), "wb") as f:
+        f.write(archive[entry["offset"]:entry["offset"] + 100])
+
+    progress = []
+    assert update.download(lambda done, total: progress.append((done, total)))
+    ranges = [headers["range"] for _, headers in http_server.requests]
+    assert f"bytes={entry['offset'] + 100}-{entry['offset'] + entry['length'] - 1}" in ranges
+    assert progress[-1] == (update.download_size, update.download_size)
+
+    assert update.apply()
+    assert read_install(install) == RELEASE_FILES
+    assert not os.path.exists(update.staging_dir)
+
+
+def test_reply_that_ignores_range_is_refused_before_writing(http_server, release, install):
+    manifest, archive = release
+    http_server.routes["/release.zip"] = lambda headers: (200, {}, archive)
+    update = make_update(http_server, manifest, install)
+
+    assert not update.download()
+    for _, entry in update.changes:
+        part_path = os.path.join(update.objects_dir, entry["sha256"] + ".part")
+        assert not os.path.exists(part_path) or os.path.getsize(part_path) == 0
+        assert not os.path.exists(os.path.join(update.objects_dir, entry["sha256"]))
+    assert read_install(install) == OLD_FILES
+
+
+def test_hash_mismatch_fails_the_download(http_server, release, install):
+    manifest, archive = release
+    manifest = json.loads(json.dumps(manifest))
+    manifest["files"]["version.py"]["sha256"] = "0" * 64
+    http_server.routes["/release.zip"] = ranged_archive(archive)
+    update = make_update(http_server, manifest, install)
+
+    assert not update.download()
+    objects = os.listdir(update.objects_dir)
+    assert "0" * 64 not in objects
+    assert not any(name.endswith((".part", ".tmp")) for name in objects)
+    assert read_install(install) == OLD_FILES
+
+
+def test_failed_rename_rolls_back_the_install(http_server, release, install, monkeypatch):
+    manifest, archive = release
+    http_server.routes["/release.zip"] = ranged_archive(archive)
+    update = make_update(http_server, manifest, install)
+    assert update.download()
+
+    # The last file's new copy cannot be renamed into place
+    failing_target = os.path.join(str(install), update.changes[-1][0])
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if dst == failing_target and str(src).endswith(".new"):
+            raise PermissionError("file in use")
+        real_replace(src, dst)
+    monkeypatch.setattr(os, "replace", replace)
+
+    assert not update.apply()
+    assert read_install(install) == OLD_FILES
+    leftovers = [name for _, _, names in os.walk(install) for name in names if name.endswith((".new", ".old"))]
+    assert leftovers == []
@@ -0,0 +1,40 @@
+"""
+Event choice detection on a synthetic popup: the numbered icons look alike, so each must win its own spot
+"""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from core.event_analyzer import MAX_CHOICES, _find_choices, choice_icon
+from core.frame_stream import Frame
+
+ICON_LEFT = 50
+ICON_GAP = 40
+
+
+def stacked_icons(count):
+    """BGR frame with choice icons 1..count stacked top to bottom, and the center of each"""
+    icons = [cv2.imread(choice_icon(number), cv2.IMREAD_COLOR) for number in range(1, count + 1)]
+    height = sum(icon.shape[0] + ICON_GAP for icon in icons) + ICON_GAP
+    image = np.full((height, 200, 3), 235, dtype=np.uint8)
+    centers = {}
+    top = ICON_GAP
+    for number, icon in enumerate(icons, start=1):
+        h, w = icon.shape[:2]
+        image[top:top + h, ICON_LEFT:ICON_LEFT + w] = icon
+        centers[number] = (ICON_LEFT + w // 2, top + h // 2)
+        top += h + ICON_GAP
+    return Frame(image, (0, 0, image.shape[1], image.shape[0]), time.perf_counter()), centers
+
+
+@pytest.mark.parametrize("count", range(2, MAX_CHOICES + 1))
+def test_each_choice_resolves_to_its_own_icon(count):
+    frame, expected = stacked_icons(count)
+    found = _find_choices(frame, frame.region)
+    assert set(found) == set(expected)
+    for number, (x, y) in expected.items():
+        found_x, found_y = found[number]
+        assert abs(found_x - x) <= 2 and abs(found_y - y) <= 2, f"choice {number}"
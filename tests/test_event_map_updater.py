@@ -0,0 +1,138 @@
+"""
+Event map updater against a local HTTP server standing in for the GitHub Contents API
+"""
+
+import json
+import os
+
+import pytest
+
+from conftest import PROTOCOL_ERROR
+from core.event_map_updater import EventMapUpdater, git_blob_sha
+from core.http_client import HttpClient
+
+UMA_DIR = "assets/event_map/uma_musume"
+SHARED_FILE = "assets/event_map/other_special_events.json"
+
+
+def file_item(server, path, data):
+    return {"name": os.path.basename(path), "path": path, "type": "file",
+            "download_url": f"{server.base_url}/raw/{path}", "sha": git_blob_sha(data)}
+
+
+def serve_file(server, path, data):
+    server.routes[f"/raw/{path}"] = lambda headers: (200, {}, data)
+
+
+def serve_listing(server, dir_path, files, etag):
+    """Directory listing that answers 304 to a matching If-None-Match"""
+    items = [file_item(server, path, data) for path, data in files.items()]
+    for path, data in files.items():
+        serve_file(server, path, data)
+
+    def listing(headers):
+        if headers.get("if-none-match") == etag:
+            return (304, {"ETag": etag}, b"")
+        return (200, {"ETag": etag}, json.dumps(items).encode("utf-8"))
+    server.routes[f"/contents/{dir_path}"] = listing
+
+
+def serve_file_info(server, path, data):
+    serve_file(server, path, data)
+    body = json.dumps(file_item(server, path, data)).encode("utf-8")
+    server.routes[f"/contents/{path}"] = lambda headers: (200, {}, body)
+
+
+def write_local(app_dir, path, data):
+    full_path = os.path.join(app_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "wb") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def make_updater(http_server, tmp_path):
+    clients = []
+
+    def make(dirs=(UMA_DIR,), line_check_files=(), max_workers=4):
+        client = HttpClient()
+        clients.append(client)
+        return EventMapUpdater(f"{http_server.base_url}/contents/", str(tmp_path), list(dirs),
+                               list(line_check_files), client=client, max_workers=max_workers)
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_unchanged_listing_is_revalidated_with_its_etag(http_server, tmp_path, make_updater):
+    serve_listing(http_server, UMA_DIR, {f"{UMA_DIR}/a.json": b"{}"}, etag='"v1"')
+
+    first = make_updater().check()
+    assert first["files_to_update"][0]["status"] == "New"
+    assert "if-none-match" not in http_server.requests[0][1]
+
+    # A new updater reads the ETag back from the manifest and gets a 304
+    second = make_updater().check()
+    _, headers = http_server.requests[-1]
+    assert headers["if-none-match"] == '"v1"'
+    assert second["files_to_update"] == first["files_to_update"]
+    assert second["error"] is None
+
+
+def test_file_with_matching_blob_sha_is_not_downloaded(http_server, tmp_path, make_updater):
+    data = b'{"events": []}\n'
+    write_local(str(tmp_path), SHARED_FILE, data)
+    serve_listing(http_server, UMA_DIR, {}, etag='"v1"')
+    serve_file_info(http_server, SHARED_FILE, data)
+
+    result = make_updater(line_check_files=[SHARED_FILE]).check()
+    assert not result["has_updates"]
+    assert http_server.paths("/raw/") == []
+
+    grown = data + b'{"more": true}\n'
+    serve_file_info(http_server, SHARED_FILE, grown)
+    updater = make_updater(line_check_files=[SHARED_FILE])
+    result = updater.check()
+    assert [f["status"] for f in result["files_to_update"]] == ["Updated"]
+
+    # The body fetched for the line check is written without a second request
+    assert updater.download(result["files_to_update"]) == 1
+    assert len(http_server.paths("/raw/")) == 1
+    with open(os.path.join(str(tmp_path), SHARED_FILE), "rb") as f:
+        assert f.read() == grown
+
+
+def test_downloads_run_concurrently_within_the_worker_limit(http_server, tmp_path, make_updater):
+    files = {f"{UMA_DIR}/{index:02d}.json": b'{"index": %d}' % index for index in range(12)}
+    serve_listing(http_server, UMA_DIR, files, etag='"v1"')
+    updater = make_updater(max_workers=3)
+    result = updater.check()
+
+    http_server.delay = 0.05
+    progress = []
+    written = updater.download(result["files_to_update"], lambda done, total, path: progress.append(done))
+
+    assert written == len(files)
+    assert 2 <= http_server.max_active <= 3
+    assert progress[-1] == len(files)
+    for path, data in files.items():
+        with open(os.path.join(str(tmp_path), path), "rb") as f:
+            assert f.read() == data
+
+
+def test_protocol_errors_count_as_missing_files(http_server, tmp_path, make_updater):
+    http_server.routes[f"/contents/{UMA_DIR}"] = lambda headers: PROTOCOL_ERROR
+    result = make_updater().check()
+    assert result["error"] == f"Could not fetch {UMA_DIR}"
+    assert not result["has_updates"]
+
+    files = {f"{UMA_DIR}/good.json": b"{}", f"{UMA_DIR}/broken.json": b"[]"}
+    serve_listing(http_server, UMA_DIR, files, etag='"v2"')
+    http_server.routes[f"/raw/{UMA_DIR}/broken.json"] = lambda headers: PROTOCOL_ERROR
+    updater = make_updater()
+    result = updater.check()
+
+    assert updater.download(result["files_to_update"]) == 1
+    assert os.path.exists(os.path.join(str(tmp_path), UMA_DIR, "good.json"))
+    assert not os.path.exists(os.path.join(str(tmp_path), UMA_DIR, "broken.json"))
@@ -0,0 +1,83 @@
+"""
+Mood classifier on synthetic badges: a saturated fill of one hue with shading, noise and white text
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from core.mood_classifier import (
+    DEFAULT_MOOD_HUES, MIN_CONFIDENCE, MIN_CONFIRMED_SAMPLES, MoodClassifier
+)
+
+# Hues away from the built-in guesses, as a real screen may show them
+CALIBRATED_HUES = {"GREAT": 170, "GOOD": 14, "NORMAL": 28, "BAD": 100, "AWFUL": 140}
+
+
+def make_badge(hue: int, seed: int = 0, width: int = 120, height: int = 27):
+    """RGB capture of a mood badge with the given fill hue"""
+    rng = np.random.default_rng(seed)
+    hsv = np.empty((height, width, 3), dtype=np.uint8)
+    shading = np.linspace(-2, 2, width)[None, :] + rng.normal(0, 0.7, (height, width))
+    hsv[:, :, 0] = np.mod(np.round(hue + shading), 180).astype(np.uint8)
+    hsv[:, :, 1] = rng.integers(180, 230, (height, width), dtype=np.uint8)
+    hsv[:, :, 2] = rng.integers(200, 245, (height, width), dtype=np.uint8)
+    rgb = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
+    # White label text across the middle of the badge
+    rgb[height // 3:2 * height // 3, width // 4:3 * width // 4] = 255
+    return rgb
+
+
+@pytest.fixture
+def classifier(tmp_path):
+    return MoodClassifier(signature_file=str(tmp_path / "mood_signatures.json"))
+
+
+def calibrate(classifier, hues, samples=MIN_CONFIRMED_SAMPLES):
+    for mood, hue in hues.items():
+        for seed in range(samples):
+            classifier.learn(make_badge(hue, seed=100 + seed), mood, persist=False)
+
+
+def test_uncalibrated_reading_is_never_trusted(classifier):
+    for mood, hue in DEFAULT_MOOD_HUES.items():
+        _, confidence = classifier.classify(make_badge(hue))
+        assert confidence < MIN_CONFIDENCE
+
+
+def test_calibrated_moods_are_read_from_colour(classifier):
+    calibrate(classifier, CALIBRATED_HUES)
+    for mood, hue in CALIBRATED_HUES.items():
+        for seed in range(5):
+            result, confidence = classifier.classify(make_badge(hue, seed=seed))
+            assert result == mood
+            assert confidence >= MIN_CONFIDENCE
+
+
+def test_badge_between_calibrated_hues_falls_back_to_ocr(classifier):
+    calibrate(classifier, {"GOOD": 12})
+    _, confidence = classifier.classify(make_badge(20))
+    assert confidence < MIN_CONFIDENCE
+
+
+def test_mood_needs_enough_confirmed_captures(classifier):
+    calibrate(classifier, {"GOOD": 12}, samples=MIN_CONFIRMED_SAMPLES - 1)
+    assert classifier.classify(make_badge(12))[1] < MIN_CONFIDENCE
+    classifier.learn(make_badge(12, seed=7), "GOOD", persist=False)
+    assert classifier.classify(make_badge(12))[1] >= MIN_CONFIDENCE
+
+
+def test_grey_region_has_no_badge(classifier):
+    grey = np.full((27, 120, 3), 128, dtype=np.uint8)
+    assert classifier.classify(grey) == ("UNKNOWN", 0.0)
+
+
+def test_signatures_survive_a_restart(tmp_path):
+    path = str(tmp_path / "mood_signatures.json")
+    first = MoodClassifier(signature_file=path)
+    calibrate(first, {"BAD": 100})
+    first.save()
+
+    second = MoodClassifier(signature_file=path)
+    assert second.is_confirmed("BAD")
+    assert second.classify(make_badge(100))[0] == "BAD"
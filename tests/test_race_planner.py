@@ -0,0 +1,57 @@
+"""
+Race planner on a small calendar: five race days in a row, the rest of the career trains
+"""
+
+import pytest
+
+from core.race_planner import RacePlanner
+
+
+def race(name, grade, fans):
+    return {"name": name, "grade": grade, "fan_gain": fans}
+
+
+CALENDAR = {
+    30: [race("G2 A", "G2", 3000), race("OP A", "OP", 1000)],
+    31: [race("G3 A", "G3", 1800)],
+    32: [race("G1 A", "G1", 6000)],
+    33: [race("G2 B", "G2", 3000)],
+    34: [race("G1 B", "G1", 6000)],
+}
+
+
+@pytest.fixture
+def planner():
+    return RacePlanner()
+
+
+def test_races_below_training_value_are_skipped(planner):
+    plan = planner.plan(CALENDAR, training_value=2000, max_races=0)
+    assert sorted(plan.races_by_day) == [30, 32, 33, 34]
+    assert plan.race_on(30)["name"] == "G2 A"
+    assert plan.total_fans == 18000
+
+
+def test_race_cap_keeps_the_most_valuable_races(planner):
+    plan = planner.plan(CALENDAR, training_value=2000, max_races=2)
+    assert sorted(plan.races_by_day) == [32, 34]
+    assert plan.total_fans == 12000
+
+
+def test_free_training_still_respects_the_streak_limit(planner):
+    plan = planner.plan(CALENDAR, consecutive_limit=2, training_value=0, max_races=0)
+    assert sorted(plan.races_by_day) == [30, 32, 34]
+
+
+def test_fixed_races_are_kept_and_count_toward_the_streak(planner):
+    fixed = [{"name": "G3 A", "day": 31, "grade": "G3"}]
+    plan = planner.plan(CALENDAR, fixed=fixed, training_value=2000, max_races=0)
+    assert sorted(plan.races_by_day) == [30, 31, 32, 34]
+    assert plan.total_fans == 15000
+    assert plan.to_schedule()[1] == fixed[0]
+
+
+def test_plans_are_cached_per_training_value(planner):
+    first = planner.plan(CALENDAR, training_value=2000, max_races=0)
+    assert planner.plan(CALENDAR, training_value=2000, max_races=0) is first
+    assert planner.plan(CALENDAR, training_value=0, max_races=0).key != first.key
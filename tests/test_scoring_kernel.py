@@ -0,0 +1,106 @@
+"""
+Scoring kernel against the scalar path: score_support_counts followed by apply_single_training_penalty
+"""
+
+import numpy as np
+import pytest
+
+import utils.constants as constants
+from core.logic import EARLY_STAGE_THRESHOLD, apply_single_training_penalty, get_config
+from core.scoring_kernel import (
+    F_FRIEND, F_HINT, F_NPC, F_OTHER, F_RAINBOW, F_SCENARIO_NPC, F_SPECIAL, F_SPIRIT,
+    N_FEATURES, TRAINING_TYPES, ScoringKernel, month_of_day
+)
+from core.state import load_scoring_config, score_support_counts, set_support_card_state
+
+# Both sides of every stage threshold (16, 24, 48), the stat cap threshold day, both summers,
+# the last-days penalty reduction and the day 73/74/75 cap adjustments
+DAYS = [1, 16, 17, 23, 24, 25, 29, 30, 31, 37, 38, 39, 40, 41, 48, 49, 50, 51,
+        61, 62, 63, 64, 65, 70, 71, 72, 73, 74, 75]
+SUPPORT_STATE = {"spd": 2, "sta": 1, "pwr": 1, "guts": 0, "wit": 1, "friend": 1}
+STAT_CAPS = {"spd": 1100, "sta": 900, "pwr": 1000, "guts": 800, "wit": 1000}
+
+
+@pytest.fixture(params=["URA Final", "Unity Cup"])
+def scenario(request, monkeypatch):
+    monkeypatch.setattr(constants, "SCENARIO_NAME", request.param)
+    monkeypatch.setitem(constants.CURRENT_DECK, "stat_caps", dict(STAT_CAPS))
+    set_support_card_state(SUPPORT_STATE)
+    yield request.param
+    set_support_card_state({})
+
+
+def random_turn(rng, wit_rainbows=None):
+    """Icon counts (5, N_FEATURES) and stats for one turn"""
+    counts = np.zeros((len(TRAINING_TYPES), N_FEATURES), dtype=np.int64)
+    counts[:, F_RAINBOW] = rng.integers(0, 3, len(TRAINING_TYPES))
+    counts[:, F_FRIEND] = rng.integers(0, 2, len(TRAINING_TYPES))
+    counts[:, F_OTHER] = rng.integers(0, 3, len(TRAINING_TYPES))
+    counts[:, F_HINT] = rng.integers(0, 2, len(TRAINING_TYPES))
+    counts[:, F_NPC] = rng.integers(0, 2, len(TRAINING_TYPES))
+    counts[:, F_SCENARIO_NPC] = rng.integers(0, 2, len(TRAINING_TYPES))
+    counts[:, F_SPECIAL] = rng.integers(0, 4, len(TRAINING_TYPES))
+    counts[:, F_SPIRIT] = rng.integers(0, 4, len(TRAINING_TYPES))
+    if wit_rainbows is not None:
+        counts[TRAINING_TYPES.index("wit"), F_RAINBOW] = wit_rainbows
+    stats = rng.integers(300, 1150, len(TRAINING_TYPES)).astype(float)
+    return counts, stats
+
+
+def scalar_score(key, counts_row, day, stats, energy_shortage):
+    """Score one training the way the bot does during a scan"""
+    other_key = TRAINING_TYPES[(TRAINING_TYPES.index(key) + 1) % len(TRAINING_TYPES)]
+    count_result = {key: int(counts_row[F_RAINBOW])}
+    if counts_row[F_FRIEND]:
+        count_result["friend"] = int(counts_row[F_FRIEND])
+    if counts_row[F_OTHER]:
+        count_result[other_key] = int(counts_row[F_OTHER])
+
+    current_date = {"absolute_day": day, "month_num": month_of_day(day)}
+    data = score_support_counts(count_result, int(counts_row[F_NPC]), int(counts_row[F_SCENARIO_NPC]),
+                                int(counts_row[F_HINT]), int(counts_row[F_SPECIAL]), int(counts_row[F_SPIRIT]),
+                                training_type=key, current_date=current_date, energy_shortage=energy_shortage)
+    apply_single_training_penalty(key, data, current_date,
+                                  current_stats=dict(zip(TRAINING_TYPES, stats.tolist())))
+    return data["total_score"]
+
+
+def kernel_for(scenario):
+    return ScoringKernel(get_config(), SUPPORT_STATE, STAT_CAPS, scenario, EARLY_STAGE_THRESHOLD,
+                         state_scoring=load_scoring_config())
+
+
+def assert_matches_scalar(kernel, counts, day, stats, energy_shortage):
+    scores = kernel.score(counts[None], [day], energy_shortage, stats[None])[0]
+    for index, key in enumerate(TRAINING_TYPES):
+        expected = scalar_score(key, counts[index], day, stats, energy_shortage)
+        assert scores[index] == pytest.approx(expected, abs=1e-9), f"{key} on day {day}"
+
+
+@pytest.mark.parametrize("day", DAYS)
+def test_kernel_matches_scalar_path(scenario, day):
+    kernel = kernel_for(scenario)
+    rng = np.random.default_rng(day)
+    for _ in range(5):
+        counts, stats = random_turn(rng)
+        assert_matches_scalar(kernel, counts, day, stats, float(rng.integers(0, 60)))
+
+
+@pytest.mark.parametrize("day", [23, 24, 25, 49])
+@pytest.mark.parametrize("energy_shortage", [0.0, 4.0, 10.0, 35.0])
+def test_wit_rainbow_energy_penalty(scenario, day, energy_shortage):
+    kernel = kernel_for(scenario)
+    rng = np.random.default_rng(int(energy_shortage) + day)
+    for wit_rainbows in range(4):
+        counts, stats = random_turn(rng, wit_rainbows=wit_rainbows)
+        assert_matches_scalar(kernel, counts, day, stats, energy_shortage)
+
+
+def test_summer_drops_the_support_card_bonus(scenario):
+    kernel = kernel_for(scenario)
+    bonus = kernel.support_card_bonus
+    if scenario == "Unity Cup":
+        assert not bonus.any()
+        return
+    assert bonus[36].any() and bonus[41].any()
+    assert not bonus[37:41].any() and not bonus[61:65].any()
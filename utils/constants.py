@@ -10,6 +10,9 @@ from utils.constants_support import (
     MOOD_FALLBACK_CONFIG,
     DEFAULT_REGIONS
 )
+from utils.log_pipeline import get_logger
+
+log = get_logger()
 
 # Career Stage Constants
 PRE_DEBUT_DAY_THRESHOLD = 24
@@ -375,6 +378,34 @@ def deck_has_card_type(card_type: str, min_count: int = 1) -> bool:
     """
     return get_deck_card_count(card_type) >= min_count
 
+# =============================================================================
+# RUNNING STYLES
+# =============================================================================
+
+STYLE_DISPLAY = {
+    'none': 'None',
+    'front': 'Front',
+    'pace': 'Pace',
+    'late': 'Late',
+    'end': 'End',
+}
+
+
+def get_style_options() -> list:
+    """
+    Get list of available style options for UI dropdown
+
+    Returns:
+        List of tuples (style_id, display_name)
+    """
+    return list(STYLE_DISPLAY.items())
+
+
+def get_style_display_name(style_id: str) -> str:
+    """Get display name for a style ID"""
+    return STYLE_DISPLAY.get(style_id, style_id)
+
+
 # =============================================================================
 # PUBLIC API FUNCTIONS
 # =============================================================================
@@ -397,8 +428,25 @@ def save_region_settings(regions):
         print(f"Error saving region settings: {e}")
         return False
 
-def get_turn_year_regions():
-    """Get TURN_REGION and YEAR_REGION based on global scenario selection"""
+def _map_to_screen(regions, settings):
+    """Map calibrated regions to the game window's current position and scale"""
+    from core.game_window import get_game_window
+    from core.scale_manager import get_scale_manager
+    game_window = get_game_window()
+    if settings.get('WINDOW_ORIGIN'):
+        game_window.set_reference_origin(settings['WINDOW_ORIGIN'])
+    return game_window.to_screen_regions(regions, get_scale_manager().scale)
+
+def screen_region(region):
+    """Map one calibrated (left, top, width, height) region, e.g. a fixed region constant, to the screen"""
+    return _map_to_screen({'region': region}, load_region_settings())['region']
+
+def get_turn_year_regions(scaled=True):
+    """Get TURN_REGION and YEAR_REGION based on global scenario selection
+
+    Args:
+        scaled: Return regions mapped to the game window's current position and scale instead of the saved values
+    """
     settings = load_region_settings()
 
     # Load all turn/year regions
@@ -406,7 +454,7 @@ def get_turn_year_regions():
     year_region = tuple(settings.get('YEAR_REGION', DEFAULT_REGIONS['YEAR_REGION']))
     unity_cup_turn_region = tuple(settings.get('UNITY_CUP_TURN_REGION', DEFAULT_REGIONS['UNITY_CUP_TURN_REGION']))
     unity_cup_year_region = tuple(settings.get('UNITY_CUP_YEAR_REGION', DEFAULT_REGIONS['UNITY_CUP_YEAR_REGION']))
-    print(f'scenario: {SCENARIO_NAME}')
+    log.debug("scenario: %s", SCENARIO_NAME)
     # Select active regions based on global scenario
     if SCENARIO_NAME == "Unity Cup":
         active_turn_region = unity_cup_turn_region
@@ -415,15 +463,24 @@ def get_turn_year_regions():
         active_turn_region = turn_region
         active_year_region = year_region
 
-    return {
+    regions = {
         'TURN_REGION': active_turn_region,
         'YEAR_REGION': active_year_region,
         'UNITY_CUP_TURN_REGION': unity_cup_turn_region,
         'UNITY_CUP_YEAR_REGION': unity_cup_year_region
     }
 
-def get_current_regions():
-    """Get current region values, loading from file if available"""
+    if scaled:
+        regions = _map_to_screen(regions, settings)
+
+    return regions
+
+def get_current_regions(scaled=True):
+    """Get current region values, loading from file if available
+
+    Args:
+        scaled: Return regions mapped to the game window's current position and scale instead of the saved values
+    """
     global SUPPORT_CARD_ICON_REGION, MOOD_REGION, TURN_REGION, ENERGY_BAR
     global RACE_REGION, FAILURE_REGION, YEAR_REGION, CRITERIA_REGION, STAT_REGIONS, EVENT_REGIONS
     global UNITY_CUP_TURN_REGION, UNITY_CUP_YEAR_REGION, RECREATION_REGION
@@ -445,7 +502,7 @@ def get_current_regions():
     STAT_REGIONS = settings.get('STAT_REGIONS', DEFAULT_REGIONS['STAT_REGIONS'])
     EVENT_REGIONS = settings.get('EVENT_REGIONS', DEFAULT_REGIONS['EVENT_REGIONS'])
 
-    return {
+    regions = {
         'SUPPORT_CARD_ICON_REGION': SUPPORT_CARD_ICON_REGION,
         'MOOD_REGION': MOOD_REGION,
         'TURN_REGION': TURN_REGION,
@@ -461,6 +518,11 @@ def get_current_regions():
         'EVENT_REGIONS': EVENT_REGIONS
     }
 
+    if scaled:
+        regions = _map_to_screen(regions, settings)
+
+    return regions
+
 def update_regions(new_regions):
     """Update region values and save to file"""
     global SUPPORT_CARD_ICON_REGION, MOOD_REGION, TURN_REGION, ENERGY_BAR
@@ -499,6 +561,13 @@ def update_regions(new_regions):
         'EVENT_REGIONS': EVENT_REGIONS
     }
 
+    # Remember where the game window was so regions follow it when it moves
+    from core.game_window import get_game_window
+    client_region = get_game_window().get_client_region()
+    if client_region:
+        current_regions['WINDOW_ORIGIN'] = client_region[:2]
+        get_game_window().set_reference_origin(client_region[:2])
+
     return save_region_settings(current_regions)
 
 def set_scenario(scenario_name):
@@ -557,7 +626,7 @@ def _initialize_regions():
     """Initialize regions from saved settings"""
     global _regions_initialized
     if not _regions_initialized:
-        get_current_regions()
+        get_current_regions(scaled=False)
         _regions_initialized = True
 
 # Ensure regions are loaded when module is imported
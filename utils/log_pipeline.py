@@ -0,0 +1,120 @@
+"""
+Log Pipeline
+Non-blocking ring buffer between the bot thread and the GUI log, plus levelled console loggers
+"""
+
+import json
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+
+DEFAULT_LOG_CAPACITY = 5000
+
+
+class LogRingBuffer:
+    """
+    Fixed-size message buffer that producers append to without taking a lock.
+    deque.append and deque.popleft are atomic, so the bot thread never waits on the GUI;
+    when the GUI falls behind the oldest messages are dropped and counted.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LOG_CAPACITY):
+        self.capacity = capacity
+        self._messages = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def push(self, message: str):
+        """Enqueue a message from any thread"""
+        if len(self._messages) >= self.capacity:
+            self.dropped += 1
+        self._messages.append(message)
+
+    def drain(self, max_items: int = 500) -> list:
+        """Remove up to max_items messages, oldest first"""
+        batch = []
+        try:
+            for _ in range(max_items):
+                batch.append(self._messages.popleft())
+        except IndexError:
+            pass
+        return batch
+
+    def take_dropped(self) -> int:
+        """Get and reset the dropped message count"""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def __len__(self):
+        return len(self._messages)
+
+
+def _load_level() -> int:
+    """Read the console log level from config, defaulting to INFO"""
+    try:
+        with open("config.json", "r", encoding="utf-8") as file:
+            return LEVEL_NAMES.get(str(json.load(file).get("log_level", "INFO")).upper(), INFO)
+    except (OSError, ValueError):
+        return INFO
+
+
+_level = _load_level()
+
+
+def set_log_level(level):
+    """Set the console log level by name or number"""
+    global _level
+    _level = LEVEL_NAMES.get(str(level).upper(), INFO) if isinstance(level, str) else int(level)
+
+
+def get_log_level() -> int:
+    """Get the console log level"""
+    return _level
+
+
+class LevelLogger:
+    """Console logger with a tag; calls below the active level return before formatting"""
+
+    def __init__(self, tag: str = None):
+        self.tag = tag
+
+    def is_enabled(self, level: int) -> bool:
+        return level >= _level
+
+    def _emit(self, level_name: str, message: str, args):
+        if args:
+            message = message % args
+        print(f"[{self.tag or level_name}] {message}")
+
+    def debug(self, message: str, *args):
+        if DEBUG < _level:
+            return
+        self._emit("DEBUG", message, args)
+
+    def info(self, message: str, *args):
+        if INFO < _level:
+            return
+        self._emit("INFO", message, args)
+
+    def warning(self, message: str, *args):
+        if WARNING < _level:
+            return
+        self._emit("WARNING", message, args)
+
+    def error(self, message: str, *args):
+        self._emit("ERROR", message, args)
+
+
+_loggers = {}
+
+
+def get_logger(tag: str = None) -> LevelLogger:
+    """Get a shared logger; untagged loggers prefix lines with the level name"""
+    logger = _loggers.get(tag)
+    if logger is None:
+        logger = _loggers[tag] = LevelLogger(tag)
+    return logger
@@ -2,7 +2,10 @@ from PIL import Image, ImageEnhance
 import mss
 import numpy as np
 
+from core.input_executor import settle_input
+
 def enhanced_screenshot(region=(0, 0, 1920, 1080)) -> Image.Image:
+  settle_input()
   with mss.mss() as sct:
     monitor = {
       "left": region[0],
@@ -15,6 +18,10 @@ def enhanced_screenshot(region=(0, 0, 1920, 1080)) -> Image.Image:
     img_rgb = img_np[:, :, :3][:, :, ::-1]
     pil_img = Image.fromarray(img_rgb)
 
+  return enhance_for_ocr(pil_img)
+
+def enhance_for_ocr(pil_img: Image.Image) -> Image.Image:
+  """Upscale, grayscale and boost contrast the way enhanced_screenshot does, for crops of an existing capture"""
   pil_img = pil_img.resize((pil_img.width * 2, pil_img.height * 2), Image.BICUBIC)
   pil_img = pil_img.convert("L")
   pil_img = ImageEnhance.Contrast(pil_img).enhance(1.5)
@@ -22,6 +29,7 @@ def enhanced_screenshot(region=(0, 0, 1920, 1080)) -> Image.Image:
   return pil_img
 
 def capture_region(region=(0, 0, 1920, 1080)) -> Image.Image:
+  settle_input()
   with mss.mss() as sct:
     monitor = {
       "left": region[0],
@@ -0,0 +1,161 @@
+"""
+Startup
+Import timing, lazy module loading and the background warm-up run once the window is shown
+"""
+
+import builtins
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.log_pipeline import get_logger
+
+logger = get_logger("STARTUP")
+
+PROCESS_START = time.perf_counter()
+
+
+class ImportTimer:
+    """Records how long each module took to import, excluding the modules it imported in turn"""
+
+    def __init__(self):
+        self.self_times: Dict[str, float] = {}
+        self._local = threading.local()
+        self._original_import = None
+
+    def install(self):
+        """Start timing imports"""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import or importlib.__import__
+        if level == 0 and name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            key = "." * level + name
+            self.self_times[key] = self.self_times.get(key, 0.0) + elapsed - children
+
+    def slowest(self, top: int = 15) -> List[Tuple[str, float]]:
+        """Modules with the largest own import time, slowest first"""
+        return sorted(self.self_times.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    def report(self, top: int = 15) -> str:
+        """Text table of the slowest imports"""
+        total = sum(self.self_times.values())
+        lines = [f"Import time: {total * 1000:.0f} ms across {len(self.self_times)} modules"]
+        for name, seconds in self.slowest(top):
+            lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+        return "\n".join(lines)
+
+
+_import_timer = ImportTimer()
+
+
+def get_import_timer() -> ImportTimer:
+    """Get the process import timer"""
+    return _import_timer
+
+
+class LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self.__dict__['_name'])
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        return f"<lazy module '{self.__dict__['_name']}'>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Defer importing a module until it is first used"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+class WarmUp:
+    """Runs preload tasks in order on a background thread and records how long each took"""
+
+    def __init__(self):
+        self.tasks: List[Tuple[str, Callable[[], None]]] = []
+        self.timings: Dict[str, float] = {}
+        self.done = threading.Event()
+        self._thread = None
+
+    def add(self, name: str, func: Callable[[], None]):
+        """Add a task; tasks run in the order they were added"""
+        self.tasks.append((name, func))
+
+    def start(self, on_done: Optional[Callable[["WarmUp"], None]] = None):
+        """Start the warm-up thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(on_done,), name="WarmUp", daemon=True)
+        self._thread.start()
+
+    def _run(self, on_done):
+        for name, func in self.tasks:
+            start = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                print(f"[WARNING] Warm-up task '{name}' failed: {e}")
+            self.timings[name] = time.perf_counter() - start
+        self.done.set()
+        if on_done:
+            try:
+                on_done(self)
+            except Exception as e:
+                print(f"[WARNING] Warm-up completion handler failed: {e}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every task has run"""
+        return self.done.wait(timeout)
+
+    def summary(self) -> str:
+        """One line with the time spent per task"""
+        parts = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.timings.items()]
+        return f"Warm-up finished in {sum(self.timings.values()) * 1000:.0f} ms ({', '.join(parts)})"
+
+
+def seconds_since_start() -> float:
+    """Seconds since this module was first imported, which main.py does first"""
+    return time.perf_counter() - PROCESS_START